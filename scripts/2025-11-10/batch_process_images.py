@@ -3,15 +3,28 @@
 
 This script processes images in parallel, handles failures gracefully with retry logic,
 and can resume from a checkpoint if interrupted.
+
+Besides the single-machine ``local`` mode, ``--mode`` runs a sharded extraction
+across any number of machines sharing a work queue file (``--queue``):
+
+- ``coordinate`` shards the images not queued yet, each camera's frames together
+  in capture order.
+- ``work`` claims shards under a heartbeated lease, extracts them with models
+  loaded once per worker process and writes one result fragment per shard.
+  Leases of workers that stop heartbeating are reclaimed by the others.
+- ``merge`` combines the fragments of finished shards into the usual outputs.
 """
 
 import argparse
 import json
 import logging
 import multiprocessing
+import os
+import socket
 import sys
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -21,43 +34,18 @@ from tqdm import tqdm
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
+from pax.config import PaxSettings
+from pax.storage.layout import camera_id_from_path
+from pax.storage.work_queue import FAILED, LEASED, PENDING, LeaseHeartbeat, WorkQueue
+from pax.telemetry import REGISTRY, configure_telemetry
 from pax.vision.extractor import FeatureExtractor
+from pax.vision.registry import REGISTRY as MODEL_REGISTRY
+from pax.vision.registry import configure_models, get_model, warm_up
 
 LOGGER = logging.getLogger(__name__)
 
-
-def extract_camera_id_from_path(image_path: Path) -> str | None:
-    """Extract camera ID from image path.
-
-    Supports formats:
-    - YYYY-MM-DD/camera-id_timestamp.jpg
-    - images/camera-id/timestamp.jpg
-    - camera-id_timestamp.jpg
-    """
-    parts = image_path.parts
-    filename = image_path.stem  # Without extension
-
-    # Try format: YYYY-MM-DD/camera-id_timestamp.jpg
-    if len(parts) >= 2:
-        # Check if filename contains underscore (camera-id_timestamp)
-        if "_" in filename:
-            camera_id = filename.split("_")[0]
-            return camera_id
-
-    # Try format: images/camera-id/timestamp.jpg
-    if "images" in parts:
-        idx = parts.index("images")
-        if idx + 1 < len(parts):
-            return parts[idx + 1]
-
-    # Try parent directory as camera ID
-    if len(parts) >= 2:
-        parent = parts[-2]
-        # Skip date directories (YYYY-MM-DD format)
-        if not parent.replace("-", "").isdigit():
-            return parent
-
-    return None
+# Extraction processes sharing this machine's cores; set in each worker by init_worker.
+_WORKERS = 1
 
 
 def extract_timestamp_from_path(image_path: Path) -> datetime | None:
@@ -85,6 +73,15 @@ def extract_timestamp_from_path(image_path: Path) -> datetime | None:
         return None
 
 
+def capture_order(image_path: Path) -> tuple[str, datetime, str]:
+    """Sort key grouping each camera's frames in capture order."""
+    return (
+        camera_id_from_path(image_path) or "",
+        extract_timestamp_from_path(image_path) or datetime.min,
+        str(image_path),
+    )
+
+
 def process_single_image(
     image_path: Path,
     extractor: FeatureExtractor | None = None,
@@ -95,7 +92,8 @@ def process_single_image(
 
     Args:
         image_path: Path to the image file.
-        extractor: FeatureExtractor instance (will be created if None).
+        extractor: FeatureExtractor instance (default: the process-wide one from the
+            model registry, loaded once per worker).
         max_retries: Maximum number of retry attempts.
         retry_delay: Delay between retries in seconds.
 
@@ -103,9 +101,9 @@ def process_single_image(
         Dictionary with extraction result or error information.
     """
     if extractor is None:
-        extractor = FeatureExtractor()
+        extractor = get_model("extractor", **extractor_config(_WORKERS))
 
-    camera_id = extract_camera_id_from_path(image_path)
+    camera_id = camera_id_from_path(image_path)
     timestamp = extract_timestamp_from_path(image_path)
 
     result = {
@@ -122,7 +120,7 @@ def process_single_image(
 
     for attempt in range(max_retries):
         try:
-            features = extractor.extract(image_path)
+            features = extractor.extract(image_path, camera_id=camera_id)
             result.update(features)
             result["success"] = len(features.get("errors", [])) == 0
             result["retry_count"] = attempt
@@ -142,17 +140,62 @@ def process_single_image(
     return result
 
 
-def process_worker(args: tuple[Path, int, float]) -> dict[str, Any]:
+@lru_cache(maxsize=None)
+def extractor_config(workers: int = 1) -> dict[str, Any]:
+    """FeatureExtractor backends from ``PAX_VISION`` settings (read once per process).
+
+    With ``workers`` extraction processes on the machine, each ONNX session
+    gets ``cpu_count // workers`` intra-op threads unless set explicitly.
+    """
+    return PaxSettings().vision.extractor_config(workers=workers)
+
+
+def prepare_models(workers: int) -> None:
+    """Export ONNX graphs and quantize CLIP once, before worker processes start.
+
+    Workers starting together on a cold cache would otherwise all try to
+    build the cached files; here the parent does it once and the workers only
+    load them. The parent's copies are dropped again so workers are not forked
+    with them.
+    """
+    config = extractor_config(workers)
+    onnx = "onnx" in (config.get("yolo_backend"), config.get("clip_backend"))
+    if not (onnx or config.get("clip_quantize")):
+        return
+    LOGGER.info("Preparing cached models before starting %d workers", workers)
+    get_model("extractor", **config)
+    MODEL_REGISTRY.clear()
+
+
+def init_worker(workers: int = 1, metrics_file: Path | None = None) -> None:
+    """Load the models once when a worker process starts, not on its first image.
+
+    Each worker has its own metrics registry: spans go straight to
+    ``metrics_file``, and the metrics are sent back with every result
+    (see ``process_worker``) so the parent can serve and flush the totals.
+    """
+    global _WORKERS
+    _WORKERS = workers
+    # A forked worker starts with a copy of the parent's values; drop them so
+    # they are not sent back and counted twice.
+    REGISTRY.drain()
+    configure_telemetry(metrics_file)
+    warm_up([("extractor", extractor_config(workers))])
+
+
+def process_worker(args: tuple[Path, int, float]) -> tuple[dict[str, Any], dict[str, Any]]:
     """Worker function for parallel processing.
 
     Args:
         args: Tuple of (image_path, max_retries, retry_delay).
 
     Returns:
-        Extraction result dictionary.
+        Extraction result dictionary, and the metrics the worker recorded
+        since its previous result (to merge into the parent's registry).
     """
     image_path, max_retries, retry_delay = args
-    return process_single_image(image_path, max_retries=max_retries, retry_delay=retry_delay)
+    result = process_single_image(image_path, max_retries=max_retries, retry_delay=retry_delay)
+    return result, REGISTRY.drain()
 
 
 def load_checkpoint(checkpoint_file: Path) -> set[str]:
@@ -216,6 +259,7 @@ def process_images_batch(
     checkpoint_file: Path | None = None,
     checkpoint_interval: int = 10,
     show_progress: bool = True,
+    metrics_file: Path | None = None,
 ) -> dict[str, Any]:
     """Process images in parallel with checkpointing and retry logic.
 
@@ -229,6 +273,7 @@ def process_images_batch(
         checkpoint_file: Path to checkpoint file for resuming.
         checkpoint_interval: Save checkpoint every N images.
         show_progress: Whether to show progress bar.
+        metrics_file: JSONL file for the workers' timing spans.
 
     Returns:
         Summary dictionary with processing statistics.
@@ -256,6 +301,15 @@ def process_images_batch(
     if num_workers is None:
         num_workers = multiprocessing.cpu_count()
 
+    cascade = extractor_config().get("cascade") is not None
+    chunksize = 1
+    if cascade:
+        # The cascade keeps per-camera state in each worker: keep a camera's frames
+        # in capture order and hand them out in contiguous chunks.
+        remaining_images = sorted(remaining_images, key=capture_order)
+        chunksize = max(1, len(remaining_images) // (num_workers * 4))
+        LOGGER.info("Cascade enabled: %d images per worker chunk", chunksize)
+
     # Prepare worker arguments
     worker_args = [
         (img_path, max_retries, retry_delay) for img_path in remaining_images
@@ -265,17 +319,21 @@ def process_images_batch(
     results = []
     processed_count = 0
 
-    with multiprocessing.Pool(processes=num_workers) as pool:
+    prepare_models(num_workers)
+    with multiprocessing.Pool(
+        processes=num_workers, initializer=init_worker, initargs=(num_workers, metrics_file)
+    ) as pool:
         if show_progress:
             iterator = tqdm(
-                pool.imap(process_worker, worker_args),
+                pool.imap(process_worker, worker_args, chunksize=chunksize),
                 total=len(remaining_images),
                 desc="Extracting features",
             )
         else:
-            iterator = pool.imap(process_worker, worker_args)
+            iterator = pool.imap(process_worker, worker_args, chunksize=chunksize)
 
-        for result in iterator:
+        for result, metrics in iterator:
+            REGISTRY.merge(metrics)
             results.append(result)
             processed_count += 1
 
@@ -300,6 +358,66 @@ def process_images_batch(
         }
         save_checkpoint(checkpoint_file, processed_images, stats)
 
+    return save_results(
+        results,
+        output_dir,
+        output_format=output_format,
+        num_workers=num_workers,
+        max_retries=max_retries,
+        cascade=cascade,
+    )
+
+
+def flatten_result(result: dict[str, Any]) -> dict[str, Any]:
+    """One Parquet row of an extraction result."""
+    return {
+        "image_path": result["image_path"],
+        "camera_id": result.get("camera_id"),
+        "timestamp": result.get("timestamp"),
+        "yolo_pedestrians": result.get("yolo", {}).get("pedestrian_count", 0),
+        "yolo_vehicles": result.get("yolo", {}).get("vehicle_count", 0),
+        "yolo_bikes": result.get("yolo", {}).get("bike_count", 0),
+        "yolo_total": result.get("yolo", {}).get("total_detections", 0),
+        "d2_pedestrians": result.get("detectron2", {}).get("pedestrian_count", 0),
+        "d2_vehicles": result.get("detectron2", {}).get("vehicle_count", 0),
+        "d2_bikes": result.get("detectron2", {}).get("bike_count", 0),
+        "d2_crowd_density": result.get("detectron2", {}).get("crowd_density", 0.0),
+        "d2_area_covered": result.get("detectron2", {}).get("total_area_covered", 0.0),
+        "d2_total": result.get("detectron2", {}).get("total_instances", 0),
+        "clip_top_scene": result.get("clip", {}).get("top_scene", ""),
+        "clip_confidence": result.get("clip", {}).get("top_confidence", 0.0),
+        "d2_filled": "filled_from" in result.get("detectron2", {}),
+        "clip_filled": "filled_from" in result.get("clip", {}),
+        "has_errors": len(result.get("errors", [])) > 0,
+        "error_count": len(result.get("errors", [])),
+        "retry_count": result.get("retry_count", 0),
+        "success": result.get("success", False),
+    }
+
+
+def save_results(
+    results: list[dict[str, Any]],
+    output_dir: Path,
+    output_format: str = "both",
+    num_workers: int | None = None,
+    max_retries: int = 3,
+    cascade: bool = False,
+    shards: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Write extraction results and the summary report.
+
+    Args:
+        results: Extraction results, one per image.
+        output_dir: Output directory for features.
+        output_format: Output format ("json", "parquet", or "both").
+        num_workers: Worker count recorded in the report.
+        max_retries: Retry limit recorded in the report.
+        cascade: Whether to report cascade skip rates.
+        shards: Work queue shard counts and failures, for merged sharded runs.
+
+    Returns:
+        Summary dictionary with processing statistics.
+    """
     # Generate timestamp for output files
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -314,33 +432,7 @@ def process_images_batch(
         LOGGER.info("Saved JSON features to: %s", json_file)
 
     if output_format in {"parquet", "both"}:
-        # Flatten results for Parquet
-        flattened = []
-        for result in results:
-            flat = {
-                "image_path": result["image_path"],
-                "camera_id": result.get("camera_id"),
-                "timestamp": result.get("timestamp"),
-                "yolo_pedestrians": result.get("yolo", {}).get("pedestrian_count", 0),
-                "yolo_vehicles": result.get("yolo", {}).get("vehicle_count", 0),
-                "yolo_bikes": result.get("yolo", {}).get("bike_count", 0),
-                "yolo_total": result.get("yolo", {}).get("total_detections", 0),
-                "d2_pedestrians": result.get("detectron2", {}).get("pedestrian_count", 0),
-                "d2_vehicles": result.get("detectron2", {}).get("vehicle_count", 0),
-                "d2_bikes": result.get("detectron2", {}).get("bike_count", 0),
-                "d2_crowd_density": result.get("detectron2", {}).get("crowd_density", 0.0),
-                "d2_area_covered": result.get("detectron2", {}).get("total_area_covered", 0.0),
-                "d2_total": result.get("detectron2", {}).get("total_instances", 0),
-                "clip_top_scene": result.get("clip", {}).get("top_scene", ""),
-                "clip_confidence": result.get("clip", {}).get("top_confidence", 0.0),
-                "has_errors": len(result.get("errors", [])) > 0,
-                "error_count": len(result.get("errors", [])),
-                "retry_count": result.get("retry_count", 0),
-                "success": result.get("success", False),
-            }
-            flattened.append(flat)
-
-        df = pd.DataFrame(flattened)
+        df = pd.DataFrame([flatten_result(result) for result in results])
         parquet_file = output_dir / f"features_{timestamp}.parquet"
         df.to_parquet(parquet_file, index=False)
         LOGGER.info("Saved Parquet features to: %s (%d rows)", parquet_file, len(df))
@@ -375,6 +467,17 @@ def process_images_batch(
             ),
         },
     }
+    if cascade:
+        summary["cascade_skip_rates"] = {
+            model: (
+                sum(r.get("cascade", {}).get(model) == "skipped" for r in results) / len(results)
+                if results
+                else 0
+            )
+            for model in ("detectron2", "clip")
+        }
+    if shards is not None:
+        summary["shards"] = shards
 
     report_file = output_dir / f"extraction_report_{timestamp}.json"
     with report_file.open("w") as f:
@@ -388,15 +491,257 @@ def process_images_batch(
     LOGGER.info("  Average pedestrians (YOLO): %.1f", summary["summary_stats"]["avg_yolo_pedestrians"])
     LOGGER.info("  Average vehicles (YOLO): %.1f", summary["summary_stats"]["avg_yolo_vehicles"])
     LOGGER.info("  Average crowd density (Detectron2): %.2f", summary["summary_stats"]["avg_d2_crowd_density"])
+    for model, rate in summary.get("cascade_skip_rates", {}).items():
+        LOGGER.info("  Cascade skip rate (%s): %.0f%%", model, rate * 100)
 
     return summary
 
 
+def discover_images(input_dir: Path | None = None, limit: int | None = None) -> list[Path]:
+    """Images under ``input_dir``, or under the default image directories when not given."""
+    if input_dir:
+        image_dirs = [input_dir]
+    else:
+        # Auto-detect: check both data/raw/images and backup location
+        project_root = Path(__file__).parent.parent.parent
+        image_dirs = [
+            project_root / "data" / "raw" / "images",
+            project_root / "docs" / "backup" / "data_bkup" / "raw" / "images",
+        ]
+
+    all_images = []
+    for img_dir in image_dirs:
+        images = find_all_images(img_dir)
+        all_images.extend(images)
+        if images:
+            LOGGER.info("Found %d images in %s", len(images), img_dir)
+
+    # Remove duplicates
+    all_images = sorted(set(all_images))
+
+    if limit:
+        all_images = all_images[:limit]
+        LOGGER.info("Limiting to %d images", limit)
+    return all_images
+
+
+def enqueue_shards(queue_path: Path, image_paths: list[Path], shard_size: int) -> int:
+    """Coordinator: shard the images that are not in the work queue yet.
+
+    Args:
+        queue_path: Work queue file shared by all workers.
+        image_paths: Images to extract.
+        shard_size: Images per shard (one lease).
+
+    Returns:
+        Number of shards added.
+    """
+    queue = WorkQueue(queue_path)
+    try:
+        # Contiguous per-camera shards keep the cascade's per-camera state useful.
+        ordered = sorted(image_paths, key=capture_order)
+        added = queue.enqueue((str(path) for path in ordered), shard_size)
+        LOGGER.info("Queued %d new shards in %s (%s)", added, queue_path, queue.counts())
+    finally:
+        queue.close()
+    return added
+
+
+def write_fragment(results: list[dict[str, Any]], fragments_dir: Path, name: str) -> Path:
+    """Write a shard's results atomically, so a reader never sees a partial fragment."""
+    fragments_dir.mkdir(parents=True, exist_ok=True)
+    fragment = fragments_dir / f"{name}.json"
+    tmp_file = fragments_dir / f".{name}.{socket.gethostname()}-{os.getpid()}.tmp"
+    with tmp_file.open("w") as f:
+        json.dump(results, f)
+    os.replace(tmp_file, fragment)
+    return fragment
+
+
+def run_queue_worker(
+    queue_path: Path,
+    output_dir: Path,
+    lease_seconds: float = 600.0,
+    max_retries: int = 3,
+    retry_delay: float = 1.0,
+    poll_interval: float = 5.0,
+    worker: str | None = None,
+    workers: int = 1,
+    metrics_file: Path | None = None,
+) -> int:
+    """Claim and extract shards until the work queue is drained.
+
+    Args:
+        queue_path: Work queue file shared by all workers.
+        output_dir: Output directory; fragments go to ``output_dir/fragments``.
+        lease_seconds: Lease length. The lease is renewed every third of it,
+            so a worker that dies loses its shard after at most this long.
+        max_retries: Maximum retry attempts per image.
+        retry_delay: Delay between retries in seconds.
+        poll_interval: Wait between claims while other workers hold the last leases.
+        worker: Worker name recorded on leases (default: ``host-pid``).
+        workers: Queue workers running on this machine, for sizing ONNX thread pools.
+        metrics_file: JSONL file for this worker's spans and final metrics snapshot.
+
+    Returns:
+        Number of shards this worker completed.
+    """
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    configure_telemetry(metrics_file)
+    queue = WorkQueue(queue_path)
+    extractor = get_model("extractor", **extractor_config(workers))
+    completed = 0
+    try:
+        while True:
+            lease = queue.claim(worker, lease_seconds)
+            if lease is None:
+                if queue.outstanding() == 0:
+                    break
+                # The remaining shards are leased; wait in case one of them expires.
+                time.sleep(poll_interval)
+                continue
+
+            LOGGER.info("%s: extracting %s (%d images)", worker, lease.name, len(lease.items))
+            results = []
+            try:
+                with LeaseHeartbeat(queue, lease, lease_seconds, lease_seconds / 3) as heartbeat:
+                    for item in lease.items:
+                        if heartbeat.lost.is_set():
+                            break
+                        results.append(
+                            process_single_image(Path(item), extractor, max_retries, retry_delay)
+                        )
+            except Exception as e:
+                LOGGER.error("%s: %s failed: %s", worker, lease.name, e)
+                queue.fail(lease, str(e))
+                continue
+            if heartbeat.lost.is_set():
+                LOGGER.warning("%s: dropping %s, its lease was reclaimed", worker, lease.name)
+                continue
+
+            # Name the fragment per attempt: a worker whose lease expired mid-write
+            # must not replace the fragment of the worker that reclaimed the shard.
+            fragment = write_fragment(
+                results, output_dir / "fragments", f"{lease.name}.a{lease.attempts}"
+            )
+            if queue.complete(lease, fragment.resolve()):
+                completed += 1
+            else:
+                LOGGER.warning("%s: dropping %s, its lease was reclaimed", worker, lease.name)
+                fragment.unlink(missing_ok=True)
+    finally:
+        queue.close()
+        REGISTRY.flush()
+
+    LOGGER.info("%s: completed %d shards", worker, completed)
+    return completed
+
+
+def init_queue_worker() -> None:
+    """Start a forked queue worker with empty metrics; it flushes its own snapshot."""
+    REGISTRY.drain()
+
+
+def run_queue_workers(num_workers: int, queue_path: Path, output_dir: Path, **kwargs: Any) -> int:
+    """Run ``num_workers`` queue worker processes on this machine; returns shards completed."""
+    if num_workers <= 1:
+        return run_queue_worker(queue_path, output_dir, **kwargs)
+    kwargs["workers"] = num_workers
+    prepare_models(num_workers)
+    with multiprocessing.Pool(processes=num_workers, initializer=init_queue_worker) as pool:
+        runs = [
+            pool.apply_async(run_queue_worker, (queue_path, output_dir), kwargs)
+            for _ in range(num_workers)
+        ]
+        return sum(run.get() for run in runs)
+
+
+def merge_fragments(
+    queue_path: Path,
+    output_dir: Path,
+    output_format: str = "both",
+    max_retries: int = 3,
+    allow_partial: bool = False,
+) -> dict[str, Any]:
+    """Combine the fragments of completed shards into the usual outputs and report.
+
+    Exits with status 1 if any shard is unfinished or failed, unless
+    ``allow_partial`` is set; failed shards can be retried with ``--retry-failed``.
+    """
+    queue = WorkQueue(queue_path)
+    try:
+        counts = queue.counts()
+        failures = queue.failures()
+        fragments = queue.fragments()
+    finally:
+        queue.close()
+    unfinished = counts.get(PENDING, 0) + counts.get(LEASED, 0)
+    if unfinished:
+        LOGGER.warning("%d shards are unfinished", unfinished)
+    if failures:
+        LOGGER.error("%d shards failed:", counts.get(FAILED, 0))
+        for name, error in failures:
+            LOGGER.error("  %s: %s", name, error)
+    if unfinished or failures:
+        if not allow_partial:
+            LOGGER.error("Not merging an incomplete run; pass --allow-partial to merge anyway")
+            sys.exit(1)
+        LOGGER.warning("Merging the %d completed shards only", len(fragments))
+
+    results = []
+    for fragment in fragments:
+        with fragment.open("r") as f:
+            results.extend(json.load(f))
+    return save_results(
+        results,
+        output_dir,
+        output_format=output_format,
+        max_retries=max_retries,
+        cascade=extractor_config().get("cascade") is not None,
+        shards={"counts": counts, "failed": dict(failures)},
+    )
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
         description="Batch process images with parallelization, retry logic, and checkpointing"
     )
+    parser.add_argument(
+        "--mode",
+        choices=["local", "coordinate", "work", "merge"],
+        default="local",
+        help="local: process on this machine; coordinate/work/merge: sharded extraction "
+        "through --queue (default: local)",
+    )
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        help="Work queue file shared by coordinator and workers "
+        "(default: output_dir/work_queue.sqlite)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=500,
+        help="Images per shard in coordinate mode (default: 500)",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=600.0,
+        help="Shard lease length in work mode; expired leases are reclaimed (default: 600)",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Put shards that ran out of attempts back in the queue before running",
+    )
+    parser.add_argument(
+        "--allow-partial",
+        action="store_true",
+        help="In merge mode, merge completed shards even if others failed or are unfinished",
+    )
     parser.add_argument(
         "--input-dir",
         type=Path,
@@ -452,6 +797,16 @@ def main():
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
         help="Logging level (default: INFO)",
     )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help="Append per-image and per-model timing spans to this JSONL file",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on this port while processing",
+    )
 
     args = parser.parse_args()
 
@@ -461,36 +816,6 @@ def main():
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
-    # Find images
-    if args.input_dir:
-        image_dirs = [args.input_dir]
-    else:
-        # Auto-detect: check both data/raw/images and backup location
-        project_root = Path(__file__).parent.parent.parent
-        image_dirs = [
-            project_root / "data" / "raw" / "images",
-            project_root / "docs" / "backup" / "data_bkup" / "raw" / "images",
-        ]
-
-    all_images = []
-    for img_dir in image_dirs:
-        images = find_all_images(img_dir)
-        all_images.extend(images)
-        if images:
-            LOGGER.info("Found %d images in %s", len(images), img_dir)
-
-    if not all_images:
-        LOGGER.error("No images found!")
-        sys.exit(1)
-
-    # Remove duplicates
-    all_images = list(set(all_images))
-    all_images.sort()
-
-    if args.limit:
-        all_images = all_images[: args.limit]
-        LOGGER.info("Limiting to %d images", args.limit)
-
     # Set up output directory
     if args.output_dir:
         output_dir = args.output_dir
@@ -498,6 +823,62 @@ def main():
         project_root = Path(__file__).parent.parent.parent
         output_dir = project_root / "data" / "features"
     output_dir.mkdir(parents=True, exist_ok=True)
+    queue_path = args.queue or output_dir / "work_queue.sqlite"
+
+    if args.retry_failed:
+        queue = WorkQueue(queue_path)
+        try:
+            queue.requeue_failed()
+        finally:
+            queue.close()
+
+    if args.mode == "merge":
+        merge_fragments(
+            queue_path,
+            output_dir,
+            output_format=args.format,
+            max_retries=args.max_retries,
+            allow_partial=args.allow_partial,
+        )
+        return
+
+    if args.mode != "work":
+        all_images = discover_images(args.input_dir, args.limit)
+        if not all_images:
+            LOGGER.error("No images found!")
+            sys.exit(1)
+        if args.mode == "coordinate":
+            enqueue_shards(queue_path, all_images, args.shard_size)
+            return
+
+    vision = PaxSettings().vision
+    configure_models(vision.max_models, vision.max_memory_mb)
+
+    if args.mode == "work":
+        num_workers = args.workers or multiprocessing.cpu_count()
+        metrics_port = args.metrics_port
+        if metrics_port is not None and num_workers > 1:
+            # Queue workers keep their metrics until they exit; there is nothing live to serve.
+            LOGGER.warning(
+                "--metrics-port is only served with --workers 1 in work mode; "
+                "each worker writes its snapshot to --metrics-file instead"
+            )
+            metrics_port = None
+        configure_telemetry(None, metrics_port)
+        run_queue_workers(
+            num_workers,
+            queue_path,
+            output_dir,
+            lease_seconds=args.lease_seconds,
+            max_retries=args.max_retries,
+            retry_delay=args.retry_delay,
+            metrics_file=args.metrics_file,
+        )
+        return
+
+    # Pool workers write their own spans to the file and send their metrics back
+    # with each result, so the snapshot and the Prometheus endpoint cover them.
+    configure_telemetry(args.metrics_file, args.metrics_port)
 
     # Set up checkpoint file
     checkpoint_file = args.checkpoint
@@ -515,7 +896,9 @@ def main():
         checkpoint_file=checkpoint_file,
         checkpoint_interval=args.checkpoint_interval,
         show_progress=True,
+        metrics_file=args.metrics_file,
     )
+    REGISTRY.flush()
 
 
 if __name__ == "__main__":
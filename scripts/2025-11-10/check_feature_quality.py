@@ -17,8 +17,7 @@ import pandas as pd
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
-from pax.schemas.feature_vector import FeatureVector
-from pax.schemas.validation import ValidationResult, validate_feature_vector_dict
+from pax.schemas.validation import FRAME_RULES, validate_feature_frame
 from pax.storage.feature_query import FeatureQuery
 
 LOGGER = logging.getLogger(__name__)
@@ -126,99 +125,42 @@ def check_outliers(df: pd.DataFrame) -> dict[str, Any]:
 
 
 def validate_feature_vectors(df: pd.DataFrame, strict: bool = False) -> dict[str, Any]:
-    """Validate feature vectors using BRANCH 2's validation functions."""
+    """Validate feature vectors column-wise with BRANCH 2's validation rules."""
+    result = validate_feature_frame(df, strict=strict)
+
     validation_results = {
-        "total_validated": 0,
-        "valid_count": 0,
-        "invalid_count": 0,
-        "error_summary": {},
-        "warning_summary": {},
+        "total_validated": result.total,
+        "valid_count": result.valid_count,
+        "invalid_count": result.invalid_count,
+        "error_summary": result.field_summary(severity="error"),
+        "warning_summary": result.field_summary(severity="warning"),
+        "rule_counts": {rule: count for rule, count in result.counts.items() if count},
         "sample_errors": [],
         "sample_warnings": [],
     }
 
-    # Convert DataFrame rows back to feature vector dictionaries
-    for idx, row in df.iterrows():
-        try:
-            # Convert flattened row to feature vector dict format
-            fv_dict = {
-                "spatial": {
-                    "pedestrian_count": int(row.get("spatial_pedestrian_count", 0)),
-                    "vehicle_count": int(row.get("spatial_vehicle_count", 0)),
-                    "bicycle_count": int(row.get("spatial_bicycle_count", 0)),
-                    "total_object_count": int(row.get("spatial_total_object_count", 0)),
-                    "pedestrian_density": float(row.get("spatial_pedestrian_density", 0.0)),
-                    "vehicle_density": float(row.get("spatial_vehicle_density", 0.0)),
-                    "crowd_density": float(row.get("spatial_crowd_density", 0.0)),
-                    "object_density": float(row.get("spatial_object_density", 0.0)),
-                },
-                "visual_complexity": {
-                    "scene_complexity": float(row.get("visual_scene_complexity", 0.0)),
-                    "visual_noise": float(row.get("visual_noise", 0.0)),
-                    "lighting_condition": row.get("visual_lighting_condition", "unknown"),
-                    "lighting_brightness": float(row.get("visual_lighting_brightness", 0.5)),
-                    "weather_condition": row.get("visual_weather_condition", "unknown"),
-                    "visibility_score": float(row.get("visual_visibility_score", 1.0)),
-                    "occlusion_score": float(row.get("visual_occlusion_score", 0.0)),
-                },
-                "temporal": {
-                    "timestamp": pd.to_datetime(row.get("temporal_timestamp")).isoformat(),
-                    "hour": int(row.get("temporal_hour", 0)),
-                    "minute": int(row.get("temporal_minute", 0)),
-                    "day_of_week": int(row.get("temporal_day_of_week", 1)),
-                    "is_weekend": bool(row.get("temporal_is_weekend", False)),
-                    "is_rush_hour": bool(row.get("temporal_is_rush_hour", False)),
-                    "time_of_day_encoding": float(row.get("temporal_time_of_day_encoding", 0.0)),
-                    "day_of_week_encoding": float(row.get("temporal_day_of_week_encoding", 0.0)),
-                },
+    image_paths = df["image_path"] if "image_path" in df.columns else None
+    for idx in result.invalid_rows[:10]:
+        rules = [rule for rule in result.rules_for_row(idx) if strict or FRAME_RULES[rule][1] == "error"]
+        validation_results["sample_errors"].append(
+            {
+                "index": int(idx),
+                "image_path": image_paths.loc[idx] if image_paths is not None else "unknown",
+                "errors": rules[:3],  # First 3 violated rules
             }
+        )
 
-            # Optional fields
-            if pd.notna(row.get("clip_embedding")):
-                import json
-
-                fv_dict["clip_embedding"] = json.loads(row["clip_embedding"])
-
-            # Validate
-            result = validate_feature_vector_dict(fv_dict, strict=strict)
-            validation_results["total_validated"] += 1
-
-            if result.is_valid:
-                validation_results["valid_count"] += 1
-            else:
-                validation_results["invalid_count"] += 1
-                if len(validation_results["sample_errors"]) < 10:
-                    validation_results["sample_errors"].append(
-                        {
-                            "index": int(idx),
-                            "image_path": row.get("image_path", "unknown"),
-                            "errors": result.errors[:3],  # First 3 errors
-                        }
-                    )
-
-            # Collect warnings
-            if result.warnings:
-                for warning in result.warnings:
-                    field = warning.field if hasattr(warning, "field") else "unknown"
-                    if field not in validation_results["warning_summary"]:
-                        validation_results["warning_summary"][field] = 0
-                    validation_results["warning_summary"][field] += 1
-
-                    if len(validation_results["sample_warnings"]) < 10:
-                        validation_results["sample_warnings"].append(
-                            {
-                                "index": int(idx),
-                                "image_path": row.get("image_path", "unknown"),
-                                "warning": str(warning),
-                            }
-                        )
-
-        except Exception as e:
-            validation_results["invalid_count"] += 1
-            if "validation_error" not in validation_results["error_summary"]:
-                validation_results["error_summary"]["validation_error"] = 0
-            validation_results["error_summary"]["validation_error"] += 1
-            LOGGER.warning("Validation failed for row %d: %s", idx, e)
+    for rule, rows in result.violations.items():
+        if FRAME_RULES[rule][1] != "warning":
+            continue
+        for idx in rows[: 10 - len(validation_results["sample_warnings"])]:
+            validation_results["sample_warnings"].append(
+                {
+                    "index": int(idx),
+                    "image_path": image_paths.loc[idx] if image_paths is not None else "unknown",
+                    "warning": f"WARNING: {FRAME_RULES[rule][0]}",
+                }
+            )
 
     return validation_results
 
@@ -20,11 +20,10 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
-import yaml
-
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
+from pax.storage.image_manifest import open_image_manifest, resolve_image_manifest
 from pax.vision.extractor import FeatureExtractor
 
 
@@ -48,14 +47,14 @@ def load_camera_manifest(manifest_path: Path) -> dict[str, dict]:
 
 def load_image_manifest(manifest_path: Path) -> dict[str, dict]:
     """Load image manifest and extract image paths."""
-    with open(manifest_path) as f:
-        manifest = yaml.safe_load(f)
+    manifest = open_image_manifest(manifest_path)
+    images = manifest.camera_images(columns=["timestamp", "date", "local_path"])
 
     camera_images = {}
-    for camera_id, camera_data in manifest.get("cameras", {}).items():
+    for camera_id, camera_data in manifest.cameras.items():
         camera_images[camera_id] = {
             "total_images": camera_data.get("total_images", 0),
-            "images": camera_data.get("images", []),
+            "images": images.get(camera_id, []),
         }
 
     return camera_images
@@ -313,8 +312,8 @@ def main():
     parser.add_argument(
         "--image-manifest",
         type=Path,
-        default=Path("data/manifests/image_manifest.yaml"),
-        help="Path to image manifest (default: data/manifests/image_manifest.yaml)",
+        default=Path("data/manifests/image_manifest"),
+        help="Image manifest directory or legacy YAML (default: data/manifests/image_manifest)",
     )
     parser.add_argument(
         "--base-image-dir",
@@ -344,6 +343,7 @@ def main():
         print(f"ERROR: Camera manifest not found: {args.camera_manifest}")
         sys.exit(1)
 
+    args.image_manifest = resolve_image_manifest(args.image_manifest)
     if not args.image_manifest.exists():
         print(f"ERROR: Image manifest not found: {args.image_manifest}")
         sys.exit(1)
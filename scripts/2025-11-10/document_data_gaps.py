@@ -12,7 +12,10 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import yaml
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from pax.storage.image_manifest import open_image_manifest, resolve_image_manifest
 
 
 def load_camera_manifest(manifest_path: Path) -> dict[str, dict]:
@@ -35,14 +38,12 @@ def load_camera_manifest(manifest_path: Path) -> dict[str, dict]:
 
 def load_image_manifest(manifest_path: Path) -> dict[str, dict]:
     """Load image manifest and extract image counts per camera."""
-    with open(manifest_path) as f:
-        manifest = yaml.safe_load(f)
+    manifest = open_image_manifest(manifest_path)
 
     camera_images = {}
-    for camera_id, camera_data in manifest.get("cameras", {}).items():
+    for camera_id, camera_data in manifest.cameras.items():
         camera_images[camera_id] = {
             "total_images": camera_data.get("total_images", 0),
-            "images": camera_data.get("images", []),
             "images_by_date": camera_data.get("images_by_date", {}),
         }
 
@@ -74,8 +75,7 @@ def document_data_gaps(
     print(f"Loaded {len(camera_map)} cameras")
 
     print("Loading image manifest...")
-    with open(image_manifest_path) as f:
-        image_manifest = yaml.safe_load(f)
+    image_manifest = open_image_manifest(image_manifest_path).summary
     image_data = load_image_manifest(image_manifest_path)
     print(f"Loaded image data for {len(image_data)} cameras")
 
@@ -220,8 +220,8 @@ def main():
     parser.add_argument(
         "--image-manifest",
         type=Path,
-        default=Path("data/manifests/image_manifest.yaml"),
-        help="Path to image manifest (default: data/manifests/image_manifest.yaml)",
+        default=Path("data/manifests/image_manifest"),
+        help="Image manifest directory or legacy YAML (default: data/manifests/image_manifest)",
     )
     parser.add_argument(
         "--target-images",
@@ -242,6 +242,7 @@ def main():
         print(f"ERROR: Camera manifest not found: {args.camera_manifest}")
         sys.exit(1)
 
+    args.image_manifest = resolve_image_manifest(args.image_manifest)
     if not args.image_manifest.exists():
         print(f"ERROR: Image manifest not found: {args.image_manifest}")
         sys.exit(1)
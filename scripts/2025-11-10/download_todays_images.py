@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Download all images from today's collection runs.
 
-Downloads images from GCS that were collected today (since last download).
+Downloads images from GCS that were collected today (since last download)
+using the shared parallel, resumable downloader in ``pax.storage.transfer``.
 Launches a progress monitor in a separate terminal window.
 """
 
@@ -11,13 +12,24 @@ import argparse
 import os
 import subprocess
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
+from pax.storage.transfer import (
+    STATE_FILENAME,
+    BlobInfo,
+    BlobSource,
+    BulkDownloader,
+    GCSBlobSource,
+    TransferReport,
+    list_image_blobs,
+)
+
 
 def get_todays_date_et() -> str:
     """Get today's date string in Eastern Time."""
@@ -31,17 +43,24 @@ def list_todays_images_gcs(
     start_hour: int = 12,
     end_hour: int = 18,
     target_date: str | None = None,
-) -> list[tuple[str, int]]:
+    workers: int = 16,
+    source: BlobSource | None = None,
+) -> list[BlobInfo]:
     """List all images from a specific date in GCS within specified time range.
     
+    Only the camera/date prefixes around the target date are listed; blobs are
+    then filtered by ``time_created`` as before.
+    
     Args:
         bucket: GCS bucket name
         prefix: GCS prefix
         start_hour: Start hour (0-23) in ET
         end_hour: End hour (0-23) in ET
         target_date: Date in YYYY-MM-DD format (default: today)
+        workers: Parallel listing requests
+        source: Bucket to list (default: the GCS bucket ``bucket``)
     
-    Returns list of tuples: (gcs_path, file_size_bytes)
+    Returns list of BlobInfo for matching images.
     """
     if target_date:
         print(f"Fetching images from GCS ({start_hour}:00-{end_hour}:59 ET on {target_date})...")
@@ -49,10 +68,7 @@ def list_todays_images_gcs(
         print(f"Fetching today's images from GCS ({start_hour}:00-{end_hour}:59 ET)...")
     
     try:
-        from google.cloud import storage
-        
-        client = storage.Client()
-        bucket_obj = client.bucket(bucket)
+        source = source or GCSBlobSource(bucket)
         
         # Get target date range in ET
         if target_date:
@@ -69,145 +85,28 @@ def list_todays_images_gcs(
         time_start_utc = time_start.astimezone(ZoneInfo("UTC"))
         time_end_utc = time_end.astimezone(ZoneInfo("UTC"))
         
-        # List all blobs
-        blobs = list(bucket_obj.list_blobs(prefix=prefix))
+        # Filenames may be stamped in ET or (older files) UTC, so list the
+        # neighbouring days' prefixes too
+        day = target_dt.date()
+        dates = [day - timedelta(days=1), day, day + timedelta(days=1)]
+        blobs = list_image_blobs(source, prefix, dates=dates, workers=workers)
         
-        # Filter to images in time range
-        filtered_images = []
-        for blob in blobs:
-            if not blob.name.endswith((".jpg", ".jpeg")):
-                continue
-            
-            # Check if blob was created in the time range (by time_created)
-            if blob.time_created:
-                created_utc = blob.time_created
-                if time_start_utc <= created_utc <= time_end_utc:
-                    filtered_images.append((f"gs://{bucket}/{blob.name}", blob.size))
+        # Filter to images created in the time range
+        filtered_images = [
+            blob
+            for blob in blobs
+            if blob.time_created and time_start_utc <= blob.time_created <= time_end_utc
+        ]
         
         date_str = target_date if target_date else "today"
         print(f"Found {len(filtered_images)} images from {start_hour}:00-{end_hour}:59 ET on {date_str} in GCS")
         return filtered_images
         
-    except ImportError:
-        print("ERROR: google-cloud-storage not installed. Using gsutil fallback...")
-        # Fallback to gsutil
-        gcs_path = f"gs://{bucket}/{prefix}/"
-        try:
-            result = subprocess.run(
-                ["gsutil", "ls", "-r", gcs_path],
-                capture_output=True,
-                text=True,
-                timeout=120,
-            )
-            
-            if result.returncode != 0:
-                print(f"ERROR: Failed to list GCS: {result.stderr}")
-                return []
-            
-            # Parse filename format: YYYYMMDDTHHMMSS.jpg
-            today_et = datetime.now(ZoneInfo("America/New_York"))
-            today_str = today_et.strftime("%Y%m%d")
-            
-            lines = result.stdout.strip().split("\n")
-            today_images = [
-                line.strip()
-                for line in lines
-                if today_str in line and line.strip().endswith(".jpg")
-            ]
-            
-            print(f"Found {len(today_images)} images from today in GCS")
-            return today_images
-            
-        except Exception as e:
-            print(f"ERROR: Failed to list GCS: {e}")
-            return []
     except Exception as e:
         print(f"ERROR: Failed to list GCS: {e}")
         return []
 
 
-def get_local_image_paths(local_dir: Path) -> dict[str, int]:
-    """Get dict of local image paths and their sizes (relative to local_dir).
-    
-    Returns dict mapping relative path to file size in bytes.
-    This allows us to check if files are partially downloaded (small size).
-    """
-    if not local_dir.exists():
-        return {}
-    
-    local_images = {}
-    for img_path in local_dir.rglob("*.jpg"):
-        try:
-            # Get relative path from local_dir
-            rel_path = img_path.relative_to(local_dir)
-            # Get file size to detect partial downloads
-            file_size = img_path.stat().st_size
-            local_images[str(rel_path)] = file_size
-        except (OSError, ValueError):
-            # Skip files that can't be accessed or are invalid
-            continue
-    
-    return local_images
-
-
-def download_image(gcs_path: str, local_path: Path, expected_size: int | None = None) -> bool:
-    """Download a single image from GCS.
-    
-    If file exists, checks if it's complete by comparing sizes.
-    Re-downloads if file is missing or smaller than expected.
-    """
-    try:
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Check if file already exists and is complete
-        if local_path.exists():
-            if expected_size is not None:
-                local_size = local_path.stat().st_size
-                # If file size matches expected size, skip (already downloaded)
-                if local_size == expected_size:
-                    return True
-                # If file is smaller, it's partial - delete and re-download
-                elif local_size < expected_size:
-                    print(f"  Re-downloading partial file: {local_path.name} ({local_size}/{expected_size} bytes)")
-                    local_path.unlink()
-            else:
-                # No expected size, check if file is reasonable size (>1KB)
-                local_size = local_path.stat().st_size
-                if local_size > 1024:  # Assume >1KB is complete
-                    return True
-                else:
-                    print(f"  Re-downloading suspiciously small file: {local_path.name} ({local_size} bytes)")
-                    local_path.unlink()
-        
-        # Download the file
-        result = subprocess.run(
-            ["gsutil", "cp", gcs_path, str(local_path)],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        
-        if result.returncode == 0:
-            # Verify download completed successfully
-            if local_path.exists():
-                if expected_size is not None:
-                    local_size = local_path.stat().st_size
-                    if local_size != expected_size:
-                        print(f"  WARNING: Size mismatch after download: {local_size}/{expected_size} bytes")
-                        return False
-                return True
-            else:
-                print(f"  ERROR: File not found after download")
-                return False
-        else:
-            print(f"  ERROR downloading {gcs_path}: {result.stderr}")
-            return False
-            
-    except Exception as e:
-        print(f"  ERROR downloading {gcs_path}: {e}")
-        return False
-
-
 def launch_progress_monitor(local_dir: Path, expected_total: int, date_filter: str | None = None) -> None:
     """Launch progress monitor in a separate terminal window."""
     script_dir = Path(__file__).parent
@@ -250,9 +149,14 @@ def download_todays_images(
     start_hour: int = 12,
     end_hour: int = 18,
     target_date: str | None = None,
-) -> None:
+    workers: int = 16,
+    source: BlobSource | None = None,
+) -> TransferReport | None:
     """Download all images from a specific date's collection runs (12pm-6pm ET by default).
     
+    Downloads run in parallel, are verified by size and CRC32C, and are recorded
+    in ``<local_dir>/.transfer_state.json`` so an interrupted run resumes.
+    
     Args:
         bucket: GCS bucket name
         prefix: GCS prefix
@@ -262,6 +166,8 @@ def download_todays_images(
         start_hour: Start hour (0-23) in ET
         end_hour: End hour (0-23) in ET
         target_date: Date in YYYY-MM-DD format (default: today)
+        workers: Parallel download workers
+        source: Bucket to read from (default: the GCS bucket ``bucket``)
     """
     if local_dir is None:
         local_dir = Path("data/raw/images")
@@ -271,114 +177,61 @@ def download_todays_images(
     print(f"Local directory: {local_dir}")
     print(f"Time range: {start_hour}:00-{end_hour}:59 ET on {date_str}")
     
-    # Get images from GCS (with file sizes)
-    gcs_images_with_sizes = list_todays_images_gcs(bucket, prefix, start_hour, end_hour, target_date)
+    source = source or GCSBlobSource(bucket)
+    blobs = list_todays_images_gcs(bucket, prefix, start_hour, end_hour, target_date, workers, source)
     
-    if not gcs_images_with_sizes:
+    if not blobs:
         print("No images found from specified time range in GCS")
-        return
-    
-    # Get local images (with sizes)
-    print("\nChecking local images...")
-    local_images = get_local_image_paths(local_dir)
-    print(f"Found {len(local_images)} existing local images")
+        return None
     
-    # Determine which images to download
-    # Re-download if: missing, partial (smaller size), or size mismatch
-    images_to_download = []
-    for gcs_path, gcs_size in gcs_images_with_sizes:
-        # Extract relative path from GCS path
-        # Format: gs://bucket/prefix/camera_id/timestamp.jpg
-        parts = gcs_path.replace(f"gs://{bucket}/{prefix}/", "").split("/")
-        if len(parts) >= 2:
-            rel_path = "/".join(parts)
-            local_path = local_dir / rel_path
-            
-            # Check if we need to download
-            needs_download = True
-            if rel_path in local_images:
-                local_size = local_images[rel_path]
-                # File exists and size matches - skip
-                if local_size == gcs_size:
-                    needs_download = False
-                # File exists but size is different - re-download
-                elif local_size < gcs_size:
-                    print(f"  Found partial file: {rel_path} ({local_size}/{gcs_size} bytes) - will re-download")
-            
-            if needs_download:
-                images_to_download.append((gcs_path, rel_path, gcs_size))
-    
-    print(f"\nImages to download: {len(images_to_download)}")
-    if len(gcs_images_with_sizes) - len(images_to_download) > 0:
-        print(f"Already complete: {len(gcs_images_with_sizes) - len(images_to_download)}")
+    # Local layout mirrors the bucket: <local_dir>/<camera_id>/<timestamp>.jpg
+    image_prefix = prefix.rstrip("/") + "/"
+    tasks = [(blob, local_dir / blob.name[len(image_prefix):]) for blob in blobs]
+    downloader = BulkDownloader(source, workers=workers, state_path=local_dir / STATE_FILENAME)
     
     if dry_run:
+        pending = [(blob, path) for blob, path in tasks if downloader.needs_download(blob, path)]
+        print(f"\nImages to download: {len(pending)}")
+        print(f"Already complete: {len(tasks) - len(pending)}")
         print("\nDRY RUN - Would download:")
-        for gcs_path, rel_path, gcs_size in images_to_download[:10]:
-            local_path = local_dir / rel_path
-            if local_path.exists():
-                local_size = local_path.stat().st_size
-                print(f"  {gcs_path} -> {local_path} (re-download: {local_size}/{gcs_size} bytes)")
-            else:
-                print(f"  {gcs_path} -> {local_path} (new: {gcs_size} bytes)")
-        if len(images_to_download) > 10:
-            print(f"  ... and {len(images_to_download) - 10} more")
-        return
+        for blob, local_path in pending[:10]:
+            print(f"  gs://{source.name}/{blob.name} -> {local_path} ({blob.size} bytes)")
+        if len(pending) > 10:
+            print(f"  ... and {len(pending) - 10} more")
+        return None
     
     # Get today's date for filtering (YYYYMMDD format)
     today_et = datetime.now(ZoneInfo("America/New_York"))
     today_date_filter = today_et.strftime("%Y%m%d")
     
     # Launch progress monitor if requested
-    if launch_monitor and len(images_to_download) > 0:
+    if launch_monitor:
         print("\nLaunching progress monitor...")
-        launch_progress_monitor(local_dir, len(images_to_download), today_date_filter)
+        launch_progress_monitor(local_dir, len(tasks), today_date_filter)
         print("Waiting 2 seconds for monitor to start...")
-        import time
         time.sleep(2)
         print()
     
-    # Download images
     print("=" * 60)
     print("DOWNLOADING IMAGES")
     print("=" * 60)
-    print(f"Total to download: {len(images_to_download)}")
-    print(f"Progress monitor is running in separate window")
+    print(f"Total in range: {len(tasks)} ({workers} workers)")
     print("=" * 60)
     print()
     
-    downloaded = 0
-    failed = 0
-    redownloaded = 0
-    
-    for i, (gcs_path, rel_path, gcs_size) in enumerate(images_to_download, 1):
-        local_path = local_dir / rel_path
-        
-        # Print progress every 50 images or at milestones
-        if (i % 50 == 0) or (i == len(images_to_download)) or (i == 1):
-            print(f"[{i}/{len(images_to_download)}] ({i/len(images_to_download)*100:.1f}%) Downloading...")
-        
-        # Check if this is a re-download
-        is_redownload = local_path.exists()
-        
-        if download_image(gcs_path, local_path, gcs_size):
-            downloaded += 1
-            if is_redownload:
-                redownloaded += 1
-        else:
-            failed += 1
+    report = downloader.download(tasks)
     
     print("\n" + "=" * 60)
     print("DOWNLOAD SUMMARY")
     print("=" * 60)
-    print(f"Total images in GCS ({start_hour}:00-{end_hour}:59 ET today): {len(gcs_images_with_sizes)}")
-    print(f"Already complete: {len(gcs_images_with_sizes) - len(images_to_download)}")
-    print(f"Downloaded: {downloaded}")
-    if redownloaded > 0:
-        print(f"  (Re-downloaded: {redownloaded} partial files)")
-    print(f"Failed: {failed}")
+    print(f"Total images in GCS ({start_hour}:00-{end_hour}:59 ET {date_str}): {report.total}")
+    print(f"Already complete: {report.skipped}")
+    print(f"Downloaded: {report.downloaded}")
+    print(f"Failed: {len(report.failed)}")
+    print(f"Throughput: {report.throughput_mb_s:.2f} MB/s ({report.files_per_s:.1f} files/s)")
     print(f"Local directory: {local_dir}")
     print("=" * 60)
+    return report
 
 
 def main():
@@ -427,6 +280,12 @@ def main():
         type=str,
         help="Date in YYYY-MM-DD format (default: today)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Parallel download workers (default: 16)",
+    )
     
     args = parser.parse_args()
     
@@ -439,6 +298,7 @@ def main():
         start_hour=args.start_hour,
         end_hour=args.end_hour,
         target_date=args.date,
+        workers=args.workers,
     )
 
 
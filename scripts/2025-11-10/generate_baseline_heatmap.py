@@ -16,7 +16,11 @@ import geopandas as gpd
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import numpy as np
-import yaml
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from pax.storage.image_manifest import open_image_manifest, resolve_image_manifest
 
 LOGGER = logging.getLogger(__name__)
 
@@ -49,7 +53,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--manifest",
         type=Path,
-        default=Path("data/manifests/image_manifest.yaml"),
+        default=Path("data/manifests/image_manifest"),
         help="Path to image manifest (used if stress-scores not provided, for partial data)",
     )
     parser.add_argument(
@@ -97,12 +101,10 @@ def load_stress_scores(stress_path: Path | None, manifest_path: Path | None) ->
                 stress_scores = {item["camera_id"]: item["stress_score"] for item in data}
             elif "camera_stress" in data:
                 stress_scores = data["camera_stress"]
-    elif manifest_path and manifest_path.exists():
+    elif manifest_path and resolve_image_manifest(manifest_path).exists():
         LOGGER.info("Generating placeholder stress scores from manifest (using image counts)")
         # Use image counts as placeholder stress scores
-        with open(manifest_path) as f:
-            manifest = yaml.safe_load(f)
-        cameras_data = manifest.get("cameras", {})
+        cameras_data = open_image_manifest(manifest_path).cameras
         for camera_id, camera_data in cameras_data.items():
             # Use image count as proxy for stress (more images = more data = higher confidence)
             image_count = camera_data.get("total_images", 0)
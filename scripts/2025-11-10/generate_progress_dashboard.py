@@ -15,7 +15,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-import yaml
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from pax.storage.image_manifest import open_image_manifest, resolve_image_manifest
+
 
 LOGGER = logging.getLogger(__name__)
 
@@ -27,8 +31,8 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--manifest",
         type=Path,
-        default=Path("data/manifests/image_manifest.yaml"),
-        help="Path to image manifest YAML",
+        default=Path("data/manifests/image_manifest"),
+        help="Path to image manifest directory or legacy YAML",
     )
     parser.add_argument(
         "--output",
@@ -51,9 +55,8 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def load_manifest(manifest_path: Path) -> dict[str, Any]:
-    """Load manifest YAML."""
-    with open(manifest_path) as f:
-        return yaml.safe_load(f)
+    """Load the image manifest summary (per-camera counts, no image rows)."""
+    return open_image_manifest(manifest_path).summary
 
 
 def calculate_progress_stats(
@@ -509,6 +512,7 @@ def main(argv: list[str] | None = None) -> int:
         level=args.log_level.upper(), format="%(levelname)s: %(message)s"
     )
 
+    args.manifest = resolve_image_manifest(args.manifest)
     if not args.manifest.exists():
         LOGGER.error("Manifest not found: %s", args.manifest)
         return 1
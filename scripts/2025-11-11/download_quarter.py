@@ -52,6 +52,7 @@ def download_quarter(
     local_dir: Path | None = None,
     dry_run: bool = False,
     launch_monitor: bool = True,
+    workers: int = 16,
 ) -> None:
     """Download images for a specific quarter.
     
@@ -63,6 +64,7 @@ def download_quarter(
         local_dir: Local directory to save images
         dry_run: If True, only show what would be downloaded
         launch_monitor: If True, launch progress monitor
+        workers: Parallel download workers
     """
     now_et = datetime.now(ZoneInfo("America/New_York"))
     
@@ -113,6 +115,7 @@ def download_quarter(
         start_hour=start_hour,
         end_hour=end_hour,
         target_date=target_date.strftime("%Y-%m-%d"),
+        workers=workers,
     )
 
 
@@ -179,6 +182,12 @@ Examples:
         action="store_true",
         help="Don't launch progress monitor window",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Parallel download workers (default: 16)",
+    )
     
     args = parser.parse_args()
     
@@ -190,6 +199,7 @@ Examples:
         local_dir=args.local_dir,
         dry_run=args.dry_run,
         launch_monitor=not args.no_monitor,
+        workers=args.workers,
     )
 
 
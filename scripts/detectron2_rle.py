@@ -0,0 +1,20 @@
+"""Run-length encoding of instance masks for the Detectron2 runner's npz output.
+
+Kept apart from ``detectron2_runner.py`` and free of everything but NumPy, so
+the encoder can be imported (and tested against ``pax.vision.detectron2``'s
+decoder) without cv2 or detectron2 installed.
+"""
+
+import numpy as np
+
+
+def rle_encode(mask: np.ndarray) -> np.ndarray:
+    """Run lengths of a boolean mask, row-major, alternating background and foreground."""
+    flat = mask.ravel()
+    if flat.size == 0:
+        return np.zeros(0, dtype=np.uint32)
+    changes = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    counts = np.diff(np.concatenate([[0], changes, [flat.size]]))
+    if flat[0]:
+        counts = np.concatenate([[0], counts])
+    return counts.astype(np.uint32)
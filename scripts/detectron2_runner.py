@@ -2,12 +2,35 @@
 """Standalone Detectron2 script that runs in Python 3.12 environment.
 
 This script is invoked by the main codebase wrapper via subprocess.
-It performs instance segmentation using Detectron2 and outputs JSON results.
+It performs instance segmentation using Detectron2 and writes the results to
+stdout in one of three formats (``--output``):
+
+- ``json`` (default): every instance with its box, mask area and boundary
+  polygon, as indented JSON.
+- ``summary``: only the aggregate counts, density and coverage, as JSON.
+  Contours are not traced at all.
+- ``npz``: an uncompressed NumPy ``.npz`` archive holding the same instances
+  as flat arrays. Masks are run-length encoded rather than traced:
+
+  - ``summary``: UTF-8 JSON of the aggregate fields plus ``image_size`` and
+    ``class_names``, stored as a ``uint8`` array.
+  - ``class_ids`` (int16), ``scores`` (float32), ``boxes`` (float32, N x 4
+    xyxy) and ``mask_areas`` (float32).
+  - ``mask_shape`` (int32, height and width).
+  - ``rle_counts`` (uint32) and ``rle_offsets`` (int64, N + 1). Instance i's
+    mask is ``rle_counts[rle_offsets[i]:rle_offsets[i + 1]]``. The runs
+    alternate, background first, over the row-major flattened mask (see
+    ``detectron2_rle.py`` next to this script).
+  - ``boundary_points`` (float32, M x 2) and ``boundary_offsets`` (int64,
+    N + 1). These hold each mask's largest external contour.
+
+  ``pax.vision.detectron2`` decodes this layout.
 """
 
+import argparse
+import io
 import json
 import sys
-from pathlib import Path
 
 import cv2
 import numpy as np
@@ -15,26 +38,32 @@ from detectron2.config import get_cfg
 from detectron2.data import MetadataCatalog
 from detectron2.engine import DefaultPredictor
 from detectron2.model_zoo import model_zoo
+from detectron2_rle import rle_encode
 
+OUTPUT_FORMATS = ("json", "summary", "npz")
 
-def segment_image(image_path: str, conf_threshold: float = 0.5) -> dict:
-    """
-    Perform instance segmentation on an image using Detectron2.
+# COCO class IDs
+PERSON_CLASS_ID = 0
+BICYCLE_CLASS_ID = 1
+CAR_CLASS_ID = 2
+MOTORCYCLE_CLASS_ID = 3
+BUS_CLASS_ID = 5
+TRUCK_CLASS_ID = 7
+VEHICLE_CLASS_IDS = {CAR_CLASS_ID, MOTORCYCLE_CLASS_ID, BUS_CLASS_ID, TRUCK_CLASS_ID}
 
-    Args:
-        image_path: Path to the image file
-        conf_threshold: Confidence threshold for detections
+
+def predict(image_path: str, conf_threshold: float = 0.5):
+    """
+    Run Mask R-CNN on an image.
 
     Returns:
-        Dictionary with segmentation results
+        Tuple of (instances on the CPU, COCO class names, (height, width))
     """
     # Load image
     image = cv2.imread(image_path)
     if image is None:
         raise ValueError(f"Could not load image: {image_path}")
 
-    height, width = image.shape[:2]
-
     # Setup Detectron2 config
     cfg = get_cfg()
     # Use COCO-InstanceSegmentation model
@@ -52,102 +81,137 @@ def segment_image(image_path: str, conf_threshold: float = 0.5) -> dict:
 
     # Run prediction
     outputs = predictor(image)
-
-    # Extract results
-    instances = outputs["instances"]
     metadata = MetadataCatalog.get(cfg.DATASETS.TRAIN[0])
+    return outputs["instances"].to("cpu"), list(metadata.thing_classes), image.shape[:2]
 
-    # COCO class IDs
-    PERSON_CLASS_ID = 0
-    BICYCLE_CLASS_ID = 1
-    CAR_CLASS_ID = 2
-    MOTORCYCLE_CLASS_ID = 3
-    BUS_CLASS_ID = 5
-    TRUCK_CLASS_ID = 7
-    VEHICLE_CLASS_IDS = {CAR_CLASS_ID, MOTORCYCLE_CLASS_ID, BUS_CLASS_ID, TRUCK_CLASS_ID}
 
-    result_instances = []
-    pedestrian_count = 0
-    vehicle_count = 0
-    bike_count = 0
-    total_area = 0.0
+def summarize(class_ids: np.ndarray, mask_areas: np.ndarray, width: int, height: int) -> dict:
+    """Aggregate counts, crowd density and coverage of a frame's instances."""
+    pixels = width * height
+    pedestrians = class_ids == PERSON_CLASS_ID
+    pedestrian_count = int(np.sum(pedestrians))
 
-    for i in range(len(instances)):
-        class_id = int(instances.pred_classes[i])
-        score = float(instances.scores[i])
-        bbox = instances.pred_boxes[i].tensor[0].cpu().numpy().tolist()
-
-        # Get mask
-        mask = instances.pred_masks[i].cpu().numpy()
-        mask_area = float(np.sum(mask))
-        total_area += mask_area
-
-        # Extract boundary points from mask
-        contours, _ = cv2.findContours(
-            mask.astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-        )
-        boundary_points = []
-        if len(contours) > 0:
-            # Use the largest contour
-            largest_contour = max(contours, key=cv2.contourArea)
-            boundary_points = [[float(p[0][0]), float(p[0][1])] for p in largest_contour]
-
-        class_name = metadata.thing_classes[class_id] if class_id < len(metadata.thing_classes) else f"class_{class_id}"
+    # Calculate crowd density
+    pedestrian_area = float(np.sum(mask_areas[pedestrians])) / pixels if pixels > 0 else 0.0
+    crowd_density = pedestrian_count / pedestrian_area if pedestrian_area > 0 else 0.0
+
+    return {
+        "pedestrian_count": pedestrian_count,
+        "vehicle_count": int(np.isin(class_ids, list(VEHICLE_CLASS_IDS)).sum()),
+        "bike_count": int(np.sum(class_ids == BICYCLE_CLASS_ID)),
+        "crowd_density": crowd_density,
+        "total_area_covered": float(np.sum(mask_areas)) / pixels if len(class_ids) > 0 else 0.0,
+        "total_instances": len(class_ids),
+    }
+
+
+def largest_boundary(mask: np.ndarray) -> np.ndarray:
+    """Points of the largest external contour of a mask, as an (M, 2) float32 array."""
+    contours, _ = cv2.findContours(
+        mask.astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+    )
+    if len(contours) == 0:
+        return np.empty((0, 2), dtype=np.float32)
+    # Use the largest contour
+    largest_contour = max(contours, key=cv2.contourArea)
+    return largest_contour.reshape(-1, 2).astype(np.float32)
+
+
+def segment_image(image_path: str, conf_threshold: float = 0.5) -> dict:
+    """
+    Perform instance segmentation on an image using Detectron2.
+
+    Args:
+        image_path: Path to the image file
+        conf_threshold: Confidence threshold for detections
+
+    Returns:
+        Dictionary with segmentation results
+    """
+    instances, class_names, (height, width) = predict(image_path, conf_threshold)
+    class_ids = instances.pred_classes.numpy()
+    masks = instances.pred_masks.numpy()
+    mask_areas = masks.sum(axis=(1, 2)).astype(np.float64)
 
+    result_instances = []
+    for i in range(len(instances)):
+        class_id = int(class_ids[i])
+        class_name = class_names[class_id] if class_id < len(class_names) else f"class_{class_id}"
         instance = {
             "class_id": class_id,
             "class_name": class_name,
-            "confidence": score,
-            "bbox": bbox,
-            "mask_area": mask_area,
-            "mask_area_normalized": mask_area / (width * height) if width * height > 0 else 0.0,
-            "boundary_points": boundary_points,
+            "confidence": float(instances.scores[i]),
+            "bbox": instances.pred_boxes.tensor[i].numpy().tolist(),
+            "mask_area": float(mask_areas[i]),
+            "mask_area_normalized": (
+                float(mask_areas[i]) / (width * height) if width * height > 0 else 0.0
+            ),
+            "boundary_points": largest_boundary(masks[i]).tolist(),
             "has_mask": True,
         }
         result_instances.append(instance)
 
-        # Count objects
-        if class_id == PERSON_CLASS_ID:
-            pedestrian_count += 1
-        elif class_id == BICYCLE_CLASS_ID:
-            bike_count += 1
-        elif class_id in VEHICLE_CLASS_IDS:
-            vehicle_count += 1
-
-    # Calculate crowd density
-    pedestrian_area = sum(
-        inst["mask_area_normalized"]
-        for inst in result_instances
-        if inst["class_id"] == PERSON_CLASS_ID
+    return {"instances": result_instances, **summarize(class_ids, mask_areas, width, height)}
+
+
+def segment_summary(image_path: str, conf_threshold: float = 0.5) -> dict:
+    """Aggregate counts only; masks are summed but neither traced nor serialized."""
+    instances, _, (height, width) = predict(image_path, conf_threshold)
+    mask_areas = instances.pred_masks.sum(dim=(1, 2)).numpy().astype(np.float64)
+    return summarize(instances.pred_classes.numpy(), mask_areas, width, height)
+
+
+def segment_compact(image_path: str, conf_threshold: float = 0.5) -> bytes:
+    """Instances as the flat-array ``.npz`` payload described in the module docstring."""
+    instances, class_names, (height, width) = predict(image_path, conf_threshold)
+    class_ids = instances.pred_classes.numpy()
+    masks = instances.pred_masks.numpy()
+    mask_areas = masks.sum(axis=(1, 2)).astype(np.float64)
+
+    rles = [rle_encode(mask) for mask in masks]
+    boundaries = [largest_boundary(mask) for mask in masks]
+    summary = summarize(class_ids, mask_areas, width, height)
+    summary.update(image_size=[width, height], class_names=class_names)
+
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        summary=np.frombuffer(json.dumps(summary).encode("utf-8"), dtype=np.uint8),
+        class_ids=class_ids.astype(np.int16),
+        scores=instances.scores.numpy().astype(np.float32),
+        boxes=instances.pred_boxes.tensor.numpy().astype(np.float32).reshape(-1, 4),
+        mask_areas=mask_areas.astype(np.float32),
+        mask_shape=np.array([height, width], dtype=np.int32),
+        rle_counts=np.concatenate(rles) if rles else np.zeros(0, dtype=np.uint32),
+        rle_offsets=np.cumsum([0] + [len(rle) for rle in rles], dtype=np.int64),
+        boundary_points=(
+            np.concatenate(boundaries) if boundaries else np.empty((0, 2), dtype=np.float32)
+        ),
+        boundary_offsets=np.cumsum([0] + [len(points) for points in boundaries], dtype=np.int64),
     )
-    crowd_density = (
-        pedestrian_count / pedestrian_area if pedestrian_area > 0 else 0.0
-    )
-
-    return {
-        "instances": result_instances,
-        "pedestrian_count": pedestrian_count,
-        "vehicle_count": vehicle_count,
-        "bike_count": bike_count,
-        "crowd_density": crowd_density,
-        "total_area_covered": total_area / (width * height) if len(result_instances) > 0 else 0.0,
-        "total_instances": len(result_instances),
-    }
+    return buffer.getvalue()
 
 
 def main():
     """Main entry point for the script."""
-    if len(sys.argv) < 2:
-        print("Usage: detectron2_runner.py <image_path> [conf_threshold]", file=sys.stderr)
-        sys.exit(1)
-
-    image_path = sys.argv[1]
-    conf_threshold = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    parser = argparse.ArgumentParser(description="Run Detectron2 on one image.")
+    parser.add_argument("image_path")
+    parser.add_argument("conf_threshold", nargs="?", type=float, default=0.5)
+    parser.add_argument("--output", choices=OUTPUT_FORMATS, default="json")
+    args = parser.parse_args()
+    image_path = args.image_path
 
     try:
-        result = segment_image(image_path, conf_threshold)
+        if args.output == "npz":
+            sys.stdout.buffer.write(segment_compact(image_path, args.conf_threshold))
+            sys.stdout.buffer.flush()
+            return
+        if args.output == "summary":
+            result = segment_summary(image_path, args.conf_threshold)
+        else:
+            result = segment_image(image_path, args.conf_threshold)
         result["image_path"] = image_path
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=2 if args.output == "json" else None))
     except Exception as e:
         error_result = {
             "error": str(e),
@@ -166,4 +230,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
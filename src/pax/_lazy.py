@@ -0,0 +1,46 @@
+"""Lazy package exports.
+
+Package ``__init__`` modules re-export their public classes so callers can
+write ``from pax.storage import FeatureQuery``. Importing every submodule up
+front, though, drags geopandas, google-cloud-storage or torch into processes
+that never use them. ``lazy_exports`` builds a module ``__getattr__`` (PEP 562)
+that imports the defining submodule on first attribute access instead.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Any, Callable, Mapping
+
+
+def lazy_exports(
+    package: str, exports: Mapping[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build ``__getattr__`` and ``__dir__`` for a package with lazy re-exports.
+
+    Args:
+        package: The package's ``__name__``.
+        exports: Public name to the relative submodule defining it (``".transfer"``).
+
+    Returns:
+        ``(__getattr__, __dir__)`` to assign at module level.
+    """
+
+    def __getattr__(name: str) -> Any:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, package), name)
+        # Cache on the package so later lookups skip __getattr__.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+__all__ = ["lazy_exports"]
@@ -0,0 +1,23 @@
+"""Reproducible benchmarks for the vision, storage and scoring hot paths."""
+
+from pax.benchmarks.harness import (
+    REGISTRY,
+    Benchmark,
+    BenchmarkResult,
+    benchmark,
+    compare_runs,
+    load_run,
+    run_benchmarks,
+    save_run,
+)
+
+__all__ = [
+    "REGISTRY",
+    "Benchmark",
+    "BenchmarkResult",
+    "benchmark",
+    "compare_runs",
+    "load_run",
+    "run_benchmarks",
+    "save_run",
+]
@@ -0,0 +1,261 @@
+"""Minimal benchmark runner with JSON results.
+
+A benchmark is a setup function registered with ``@benchmark``. It receives
+one parameter value (row count, frame count, ...) and a scratch directory,
+does any untimed preparation, and returns the zero-argument callable to time.
+Each callable is run a few times after a warm-up; the runner records every
+timing together with the git commit and environment, so result files from
+different commits can be compared with ``compare_runs``.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import importlib.util
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+SetupFn = Callable[[Any, Path], Callable[[], object]]
+
+
+@dataclass(slots=True)
+class Benchmark:
+    """A registered benchmark and the parameter values it runs at."""
+
+    name: str
+    setup: SetupFn
+    params: tuple[Any, ...] = (None,)
+    requires: tuple[str, ...] = ()
+    repeats: int | None = None
+    throughput: bool = False
+
+    def missing_requirements(self) -> list[str]:
+        return [module for module in self.requires if importlib.util.find_spec(module) is None]
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Timings for one benchmark at one parameter value."""
+
+    name: str
+    param: Any
+    times_s: list[float] = field(default_factory=list)
+    skipped: str | None = None
+    error: str | None = None
+    throughput: bool = False
+
+    @property
+    def key(self) -> str:
+        return self.name if self.param is None else f"{self.name}[{self.param}]"
+
+    @property
+    def min_s(self) -> float | None:
+        return min(self.times_s) if self.times_s else None
+
+    @property
+    def median_s(self) -> float | None:
+        return statistics.median(self.times_s) if self.times_s else None
+
+    @property
+    def items_per_s(self) -> float | None:
+        """``param`` items (frames, rows) per second at the median time, if reported."""
+        if not self.throughput or not self.median_s or not isinstance(self.param, (int, float)):
+            return None
+        return self.param / self.median_s
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data.update(
+            key=self.key, min_s=self.min_s, median_s=self.median_s, items_per_s=self.items_per_s
+        )
+        return data
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str,
+    params: Sequence[Any] = (None,),
+    requires: Sequence[str] = (),
+    repeats: int | None = None,
+    throughput: bool = False,
+) -> Callable[[SetupFn], SetupFn]:
+    """
+    Register a benchmark setup function.
+
+    Args:
+        name: Dotted benchmark name, e.g. ``storage.save_parquet``.
+        params: Parameter values; the benchmark runs once per value.
+        requires: Importable modules needed (e.g. ``ultralytics``); the
+            benchmark is reported as skipped when any is missing.
+        repeats: Override the run-wide repeat count (for slow benchmarks).
+        throughput: Also report ``param / median`` items per second (``param``
+            is then the number of items processed per call).
+    """
+
+    def register(setup: SetupFn) -> SetupFn:
+        REGISTRY[name] = Benchmark(
+            name, setup, tuple(params), tuple(requires), repeats, throughput
+        )
+        return setup
+
+    return register
+
+
+def git_commit(cwd: Path | None = None) -> str | None:
+    """Commit of the checkout containing ``cwd`` (default: this package's source tree)."""
+    cwd = cwd or Path(__file__).resolve().parent
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmark(
+    bench: Benchmark, param: Any, repeats: int = 5, warmup: int = 1
+) -> BenchmarkResult:
+    """Set up and time one benchmark at one parameter value."""
+    result = BenchmarkResult(bench.name, param, throughput=bench.throughput)
+    missing = bench.missing_requirements()
+    if missing:
+        result.skipped = f"missing {', '.join(missing)}"
+        return result
+    repeats = bench.repeats or repeats
+    with tempfile.TemporaryDirectory(prefix="pax-bench-") as workdir:
+        try:
+            func = bench.setup(param, Path(workdir))
+            for _ in range(warmup):
+                func()
+            for _ in range(repeats):
+                started = time.perf_counter()
+                func()
+                result.times_s.append(time.perf_counter() - started)
+        except Exception as exc:  # noqa: BLE001 - recorded in the results file
+            LOGGER.exception("Benchmark %s failed", result.key)
+            result.error = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def run_benchmarks(
+    patterns: Sequence[str] = ("*",),
+    quick: bool = False,
+    repeats: int = 5,
+    warmup: int = 1,
+) -> dict[str, Any]:
+    """
+    Run every registered benchmark whose name matches one of ``patterns``.
+
+    Args:
+        patterns: Shell-style name patterns (``storage.*``).
+        quick: Only run each benchmark at its first (smallest) parameter.
+        repeats: Timed runs per benchmark and parameter.
+        warmup: Untimed runs before timing.
+
+    Returns:
+        JSON-serialisable run record with ``commit``, ``environment`` and ``results``.
+    """
+    import pax.benchmarks.suites  # noqa: F401 - registers the built-in benchmarks
+
+    results = []
+    for name in sorted(REGISTRY):
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            continue
+        bench = REGISTRY[name]
+        for param in bench.params[:1] if quick else bench.params:
+            result = run_benchmark(bench, param, repeats=repeats, warmup=warmup)
+            if result.skipped:
+                LOGGER.info("%-45s skipped (%s)", result.key, result.skipped)
+            elif result.error is None:
+                rate = f"  {result.items_per_s:.1f}/s" if result.items_per_s else ""
+                LOGGER.info(
+                    "%-45s median %.4fs  min %.4fs%s",
+                    result.key,
+                    result.median_s,
+                    result.min_s,
+                    rate,
+                )
+            results.append(result.to_dict())
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "settings": {"quick": quick, "repeats": repeats, "warmup": warmup},
+        "results": results,
+    }
+
+
+def save_run(run: dict[str, Any], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(run, indent=2, default=str), encoding="utf-8")
+    return path
+
+
+def load_run(path: Path) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_runs(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 1.2
+) -> list[dict[str, Any]]:
+    """
+    Compare median timings of benchmarks present (and successful) in both runs.
+
+    Args:
+        baseline: Earlier run record.
+        current: Later run record.
+        threshold: Ratio of current to baseline median that counts as a regression.
+
+    Returns:
+        One row per shared benchmark with ``key``, ``baseline_s``,
+        ``current_s``, ``ratio`` and ``regression``, slowest ratio first.
+    """
+    before = {r["key"]: r["median_s"] for r in baseline["results"] if r.get("median_s")}
+    rows = []
+    for result in current["results"]:
+        key, median = result["key"], result.get("median_s")
+        if not median or key not in before:
+            continue
+        ratio = median / before[key]
+        rows.append(
+            {
+                "key": key,
+                "baseline_s": before[key],
+                "current_s": median,
+                "ratio": ratio,
+                "regression": ratio > threshold,
+            }
+        )
+    return sorted(rows, key=lambda row: row["ratio"], reverse=True)
+
+
+__all__ = [
+    "REGISTRY",
+    "Benchmark",
+    "BenchmarkResult",
+    "benchmark",
+    "compare_runs",
+    "git_commit",
+    "load_run",
+    "run_benchmark",
+    "run_benchmarks",
+    "save_run",
+]
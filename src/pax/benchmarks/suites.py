@@ -0,0 +1,285 @@
+"""Built-in benchmarks for the vision, storage, warehouse and scoring hot paths.
+
+Vision benchmarks import their models inside setup and are skipped when
+ultralytics/torch/transformers are not installed. Model construction and
+synthetic data generation happen in setup and are never timed.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+from shapely.geometry import Point
+
+from pax.benchmarks.harness import benchmark
+from pax.benchmarks.synthetic import (
+    CORRIDOR_LAT,
+    CORRIDOR_LON,
+    synthetic_camera_ids,
+    synthetic_cameras,
+    synthetic_feature_batch,
+    synthetic_frames,
+    synthetic_snapshot_metadata,
+)
+from pax.config import PaxSettings, StorageConfig
+from pax.corridor import CorridorBounds
+from pax.storage.feature_query import FeatureQuery
+from pax.storage.feature_storage import FeatureStorage
+from pax.voronoi.incremental import VersionedZoneSet
+from pax.voronoi.locator import ZoneLocator
+
+TABLE_ROWS = (10_000, 100_000, 1_000_000)
+ZONE_CAMERAS = 200
+
+BOUNDS = CorridorBounds(34, 66, "Lexington Avenue", "9 Avenue", *CORRIDOR_LAT, *CORRIDOR_LON)
+
+
+def _stored_features(rows: int, workdir: Path) -> FeatureStorage:
+    storage = FeatureStorage(workdir / "features", format="parquet")
+    storage.save_feature_vectors_batch(
+        synthetic_feature_batch(rows),
+        [f"frame_{i}.jpg" for i in range(rows)],
+        camera_ids=synthetic_camera_ids(rows),
+        append=False,
+    )
+    return storage
+
+
+def _zone_set(cameras: int) -> VersionedZoneSet:
+    return VersionedZoneSet.from_cameras(synthetic_cameras(cameras), BOUNDS, BOUNDS.polygon())
+
+
+def _random_points(count: int, seed: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(*CORRIDOR_LON, count), rng.uniform(*CORRIDOR_LAT, count)
+
+
+# Vision -------------------------------------------------------------------
+
+
+@benchmark(
+    "vision.yolov8n_detect", params=(8,), requires=("ultralytics",), repeats=3, throughput=True
+)
+def bench_yolov8n_detect(frames: int, workdir: Path):
+    from pax.vision.yolov8n import YOLOv8nDetector
+
+    detector = YOLOv8nDetector()
+    paths = synthetic_frames(workdir / "frames", frames)
+    return lambda: [detector.detect(path) for path in paths]
+
+
+@benchmark("vision.yolov8n_detect_batch", params=(8, 32), requires=("ultralytics",), repeats=3)
+def bench_yolov8n_detect_batch(frames: int, workdir: Path):
+    from pax.vision.yolov8n import YOLOv8nDetector
+
+    detector = YOLOv8nDetector()
+    paths = synthetic_frames(workdir / "frames", frames)
+    return lambda: detector.detect_batch(paths)
+
+
+@benchmark(
+    "vision.clip_understand_scene",
+    params=(8,),
+    requires=("torch", "transformers"),
+    repeats=3,
+    throughput=True,
+)
+def bench_clip_understand_scene(frames: int, workdir: Path):
+    from pax.vision.clip import CLIPWrapper
+
+    clip = CLIPWrapper()
+    paths = synthetic_frames(workdir / "frames", frames)
+    return lambda: [clip.understand_scene(path) for path in paths]
+
+
+@benchmark(
+    "vision.yolov8n_detect_onnx",
+    params=(8,),
+    requires=("ultralytics", "onnx", "onnxruntime"),
+    repeats=3,
+    throughput=True,
+)
+def bench_yolov8n_detect_onnx(frames: int, workdir: Path):
+    from pax.vision.onnx_backend import OnnxRuntimeOptions
+    from pax.vision.yolov8n import YOLOv8nDetector
+
+    # The export lands in the scratch directory, so its cost stays in (untimed) setup.
+    options = OnnxRuntimeOptions(cache_dir=workdir / "onnx")
+    detector = YOLOv8nDetector(backend="onnx", onnx_options=options)
+    paths = synthetic_frames(workdir / "frames", frames)
+    return lambda: [detector.detect(path) for path in paths]
+
+
+@benchmark(
+    "vision.clip_understand_scene_onnx",
+    params=(8,),
+    requires=("torch", "transformers", "onnx", "onnxruntime"),
+    repeats=3,
+    throughput=True,
+)
+def bench_clip_understand_scene_onnx(frames: int, workdir: Path):
+    from pax.vision.clip import CLIPWrapper
+    from pax.vision.onnx_backend import OnnxRuntimeOptions
+
+    options = OnnxRuntimeOptions(cache_dir=workdir / "onnx")
+    clip = CLIPWrapper(backend="onnx", onnx_options=options)
+    paths = synthetic_frames(workdir / "frames", frames)
+    return lambda: [clip.understand_scene(path) for path in paths]
+
+
+@benchmark(
+    "vision.clip_understand_scene_int8",
+    params=(8,),
+    requires=("torch", "transformers"),
+    repeats=3,
+    throughput=True,
+)
+def bench_clip_understand_scene_int8(frames: int, workdir: Path):
+    from pax.vision.clip import CLIPWrapper
+
+    clip = CLIPWrapper(quantize=True)
+    paths = synthetic_frames(workdir / "frames", frames)
+    return lambda: [clip.understand_scene(path) for path in paths]
+
+
+@benchmark(
+    "vision.extractor_extract_batch",
+    params=(8,),
+    requires=("ultralytics", "torch", "transformers"),
+    repeats=3,
+)
+def bench_extractor_extract_batch(frames: int, workdir: Path):
+    from pax.vision.extractor import FeatureExtractor
+
+    # Detectron2 is an optional source build; keep the benchmark comparable across machines.
+    extractor = FeatureExtractor(use_detectron2=False)
+    paths = synthetic_frames(workdir / "frames", frames)
+    return lambda: extractor.extract_batch(paths, show_progress=False)
+
+
+# Feature storage and queries ----------------------------------------------
+
+
+@benchmark("storage.save_parquet", params=TABLE_ROWS)
+def bench_storage_save_parquet(rows: int, workdir: Path):
+    storage = FeatureStorage(workdir / "features", format="parquet")
+    batch = synthetic_feature_batch(rows)
+    image_paths = [f"frame_{i}.jpg" for i in range(rows)]
+    camera_ids = synthetic_camera_ids(rows)
+    return lambda: storage.save_feature_vectors_batch(
+        batch, image_paths, camera_ids=camera_ids, append=False
+    )
+
+
+@benchmark("storage.load_feature_batch", params=TABLE_ROWS)
+def bench_storage_load_feature_batch(rows: int, workdir: Path):
+    storage = _stored_features(rows, workdir)
+    return storage.load_feature_batch
+
+
+@benchmark("storage.save_json", params=(1_000,))
+def bench_storage_save_json(rows: int, workdir: Path):
+    storage = FeatureStorage(workdir / "features", format="json")
+    batch = synthetic_feature_batch(rows)
+    image_paths = [f"frame_{i}.jpg" for i in range(rows)]
+    camera_ids = synthetic_camera_ids(rows)
+    return lambda: storage.save_feature_vectors_batch(batch, image_paths, camera_ids=camera_ids)
+
+
+@benchmark("query.by_camera", params=TABLE_ROWS)
+def bench_query_by_camera(rows: int, workdir: Path):
+    _stored_features(rows, workdir)
+    query = FeatureQuery(workdir / "features")
+    return lambda: query.get_features_by_camera("cam-007")
+
+
+@benchmark("query.by_time_range", params=TABLE_ROWS)
+def bench_query_by_time_range(rows: int, workdir: Path):
+    _stored_features(rows, workdir)
+    query = FeatureQuery(workdir / "features")
+    batch_start = synthetic_feature_batch(1).columns["temporal_timestamp"][0]
+    start, end = batch_start.replace(hour=7), batch_start.replace(hour=10)
+    return lambda: query.get_features_by_time_range(start, end, camera_ids=["cam-001", "cam-002"])
+
+
+@benchmark("query.by_camera_list", params=TABLE_ROWS)
+def bench_query_by_camera_list(rows: int, workdir: Path):
+    _stored_features(rows, workdir)
+    query = FeatureQuery(workdir / "features")
+    cameras = [f"cam-{i:03d}" for i in range(0, 80, 4)]
+    return lambda: query.get_features_by_camera_list(cameras)
+
+
+# Warehouse ----------------------------------------------------------------
+
+
+@benchmark("warehouse.build", params=(1_000, 10_000), repeats=3)
+def bench_warehouse_build(files: int, workdir: Path):
+    from pax.warehouse.snapshot_warehouse import SnapshotWarehouse
+
+    settings = PaxSettings(storage=StorageConfig(root=workdir / "data"))
+    warehouse = SnapshotWarehouse.create(settings)
+    synthetic_snapshot_metadata(settings.storage.metadata, files)
+    return lambda: warehouse.build(overwrite=True)
+
+
+# Voronoi zones and scoring --------------------------------------------------
+
+
+@benchmark("voronoi.zone_set_build", params=(50, ZONE_CAMERAS), repeats=3)
+def bench_voronoi_zone_set_build(cameras: int, workdir: Path):
+    camera_table = synthetic_cameras(cameras)
+    return lambda: VersionedZoneSet.from_cameras(camera_table, BOUNDS, BOUNDS.polygon())
+
+
+@benchmark("voronoi.incremental_add_remove", params=(ZONE_CAMERAS,))
+def bench_voronoi_incremental(cameras: int, workdir: Path):
+    zone_set = _zone_set(cameras)
+    camera = {"id": "cam-new", "name": "New", "latitude": 40.76, "longitude": -73.98}
+
+    def add_remove() -> None:
+        zone_set.add_camera(camera)
+        zone_set.remove_camera("cam-new")
+
+    return add_remove
+
+
+@benchmark("voronoi.locate_many", params=(10_000, 100_000))
+def bench_voronoi_locate_many(points: int, workdir: Path):
+    locator = ZoneLocator.from_geodataframe(_zone_set(ZONE_CAMERAS).zones)
+    lons, lats = _random_points(points)
+    return lambda: locator.locate_many(lons, lats)
+
+
+@benchmark("scoring.voronoi_weighted_stress", params=(100, 1_000), repeats=3)
+def bench_voronoi_weighted_stress(points: int, workdir: Path):
+    from pax.scripts.voronoi_stress_scoring import calculate_weighted_stress, find_neighbors
+
+    zones = _zone_set(ZONE_CAMERAS).zones.reset_index()
+    locator = ZoneLocator.from_geodataframe(zones)
+    neighbors = find_neighbors(zones)
+    rng = np.random.default_rng(2)
+    camera_stress = dict(zip(zones["camera_id"], rng.uniform(0, 1, len(zones))))
+    lons, lats = _random_points(points)
+    shapes = [Point(lon, lat) for lon, lat in zip(lons, lats)]
+    return lambda: [
+        calculate_weighted_stress(point, zones, neighbors, camera_stress, locator=locator)
+        for point in shapes
+    ]
+
+
+@benchmark("scoring.stress_along_route", params=(1_000, 10_000))
+def bench_stress_along_route(points: int, workdir: Path):
+    from pax.routes.costs import CameraRecord, stress_along_route
+    from pax.routes.maps import RoutePoint
+
+    table = synthetic_cameras(ZONE_CAMERAS)
+    rng = np.random.default_rng(3)
+    cameras = [
+        CameraRecord(row.id, row.latitude, row.longitude, float(stress))
+        for row, stress in zip(table.itertuples(), rng.uniform(0, 1, len(table)))
+    ]
+    lons, lats = _random_points(points)
+    route = [RoutePoint(lat, lon, idx) for idx, (lon, lat) in enumerate(zip(lons, lats))]
+    return lambda: stress_along_route(route, cameras)
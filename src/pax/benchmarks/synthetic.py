@@ -0,0 +1,211 @@
+"""Deterministic synthetic inputs for benchmarks.
+
+Everything here is generated from a seed so that two runs (or two commits)
+time exactly the same work: camera frames shaped like NYCTMC snapshots,
+feature tables in the ``features.parquet`` layout, camera lists inside the
+corridor bounds, and collector-style snapshot metadata files.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw
+
+from pax.schemas.feature_batch import FEATURE_COLUMNS, FeatureBatch
+
+# NYCTMC camera snapshots are 352x240 JPEGs.
+FRAME_SIZE = (352, 240)
+
+LIGHTING_CONDITIONS = np.array(["daylight", "twilight", "night", "artificial"], dtype=object)
+WEATHER_CONDITIONS = np.array(["clear", "cloudy", "rainy", "foggy"], dtype=object)
+
+# Corridor bounding box used by the Voronoi tests (Lexington Ave to 9 Ave, 34th to 66th).
+CORRIDOR_LAT = (40.75, 40.77)
+CORRIDOR_LON = (-73.99, -73.97)
+
+
+def synthetic_frames(
+    directory: Path,
+    count: int,
+    size: tuple[int, int] = FRAME_SIZE,
+    seed: int = 0,
+) -> list[Path]:
+    """
+    Write ``count`` street-scene-like JPEG frames.
+
+    Frames are a noisy road gradient with a few random boxes standing in for
+    vehicles and pedestrians, so decoders and detectors do realistic work.
+
+    Args:
+        directory: Output directory (created if needed).
+        count: Number of frames.
+        size: ``(width, height)`` in pixels.
+        seed: Random seed.
+
+    Returns:
+        Paths of the written frames, in order.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    width, height = size
+    gradient = np.linspace(60, 180, height, dtype=np.float32)[:, None, None]
+    paths = []
+    for idx in range(count):
+        noise = rng.normal(0, 18, (height, width, 3)).astype(np.float32)
+        pixels = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+        image = Image.fromarray(pixels, "RGB")
+        draw = ImageDraw.Draw(image)
+        for _ in range(int(rng.integers(3, 12))):
+            x, y = int(rng.integers(0, width - 40)), int(rng.integers(height // 3, height - 30))
+            w, h = int(rng.integers(8, 40)), int(rng.integers(15, 30))
+            draw.rectangle((x, y, x + w, y + h), fill=tuple(int(c) for c in rng.integers(0, 255, 3)))
+        path = directory / f"frame_{idx:05d}.jpg"
+        image.save(path, "JPEG", quality=85)
+        paths.append(path)
+    return paths
+
+
+def synthetic_feature_batch(rows: int, seed: int = 0, start: datetime | None = None) -> FeatureBatch:
+    """
+    Build a schema-valid ``FeatureBatch`` column by column.
+
+    Args:
+        rows: Number of feature vectors.
+        seed: Random seed.
+        start: Timestamp of the first row; rows are spaced 30 seconds apart.
+
+    Returns:
+        FeatureBatch without CLIP embeddings or semantic scores.
+    """
+    rng = np.random.default_rng(seed)
+    start = start or datetime(2025, 11, 10)
+    timestamps = [start + timedelta(seconds=30 * i) for i in range(rows)]
+    stamps = pd.DatetimeIndex(timestamps)
+
+    pedestrians = rng.poisson(8, rows)
+    vehicles = rng.poisson(5, rows)
+    bicycles = rng.poisson(1, rows)
+    hours = stamps.hour.to_numpy()
+    weekday = stamps.dayofweek.to_numpy() + 1  # ISO 8601: 1=Monday
+
+    columns: dict[str, np.ndarray] = {
+        "spatial_pedestrian_count": pedestrians,
+        "spatial_vehicle_count": vehicles,
+        "spatial_bicycle_count": bicycles,
+        "spatial_total_object_count": pedestrians + vehicles + bicycles,
+        "spatial_pedestrian_density": rng.uniform(0, 0.5, rows),
+        "spatial_vehicle_density": rng.uniform(0, 0.5, rows),
+        "spatial_crowd_density": rng.uniform(0, 1, rows),
+        "spatial_object_density": rng.uniform(0, 1, rows),
+        "visual_scene_complexity": rng.uniform(0, 1, rows),
+        "visual_noise": rng.uniform(0, 1, rows),
+        "visual_lighting_condition": LIGHTING_CONDITIONS[rng.integers(0, 4, rows)],
+        "visual_lighting_brightness": rng.uniform(0, 1, rows),
+        "visual_weather_condition": WEATHER_CONDITIONS[rng.integers(0, 4, rows)],
+        "visual_visibility_score": rng.uniform(0, 1, rows),
+        "visual_occlusion_score": rng.uniform(0, 1, rows),
+        "temporal_timestamp": np.array(timestamps, dtype=object),
+        "temporal_hour": hours,
+        "temporal_minute": stamps.minute.to_numpy(),
+        "temporal_day_of_week": weekday,
+        "temporal_is_weekend": weekday >= 6,
+        "temporal_is_rush_hour": np.isin(hours, (7, 8, 9, 16, 17, 18)),
+        "temporal_time_of_day_encoding": (hours * 60 + stamps.minute.to_numpy()) / 1440,
+        "temporal_day_of_week_encoding": (weekday - 1) / 6,
+    }
+    for column, _group, _name, dtype in FEATURE_COLUMNS:
+        if dtype != "object":
+            columns[column] = np.asarray(columns[column], dtype=dtype)
+    empty = np.full(rows, None, dtype=object)
+    return FeatureBatch(
+        columns=columns,
+        clip_embedding=empty,
+        semantic_scores=empty.copy(),
+        model_metadata=empty.copy(),
+    )
+
+
+def synthetic_camera_ids(rows: int, cameras: int = 80, seed: int = 0) -> list[str]:
+    """Camera ID per row, drawn from ``cameras`` distinct IDs."""
+    rng = np.random.default_rng(seed)
+    return [f"cam-{idx:03d}" for idx in rng.integers(0, cameras, rows)]
+
+
+def synthetic_cameras(count: int, seed: int = 0) -> pd.DataFrame:
+    """Camera list (``id``, ``name``, ``latitude``, ``longitude``) inside the corridor."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "id": [f"cam-{i:03d}" for i in range(count)],
+            "name": [f"Camera {i}" for i in range(count)],
+            "latitude": rng.uniform(*CORRIDOR_LAT, count),
+            "longitude": rng.uniform(*CORRIDOR_LON, count),
+        }
+    )
+
+
+def synthetic_snapshot_metadata(
+    metadata_root: Path,
+    count: int,
+    cameras: int = 80,
+    days: int = 3,
+    seed: int = 0,
+) -> list[Path]:
+    """
+    Write collector-style per-snapshot metadata JSON files.
+
+    Args:
+        metadata_root: ``storage.metadata`` directory; files go under one
+            sub-directory per camera.
+        count: Number of snapshot files.
+        cameras: Number of distinct cameras.
+        days: Captures are spread evenly over this many days.
+        seed: Random seed.
+
+    Returns:
+        Paths of the written files.
+    """
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 11, 10, 5)
+    step = timedelta(days=days) / max(count, 1)
+    paths = []
+    for idx in range(count):
+        camera_id = f"cam-{int(rng.integers(0, cameras)):03d}"
+        captured_at = start + step * idx
+        record = {
+            "camera_id": camera_id,
+            "captured_at": captured_at.isoformat() + "+00:00",
+            "image_url": f"https://webcams.nyctmc.org/api/cameras/{camera_id}/image",
+            "features": {
+                "pedestrian_density": float(rng.uniform(0, 1)),
+                "bike_lane_violations": 0.0,
+                "vehicle_volume": float(rng.uniform(0, 1)),
+                "obstruction_score": 0.0,
+                "visibility_score": 1.0,
+                "stress_score": float(rng.uniform(0, 1)),
+            },
+            "metadata": {"name": camera_id, "latitude": 40.76, "longitude": -73.98},
+            "image_path": None,
+            "image_bytes": int(rng.integers(15_000, 30_000)),
+            "image_remote_uri": None,
+        }
+        path = metadata_root / camera_id / f"{captured_at:%Y%m%dT%H%M%S}_{idx:06d}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(record), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+__all__ = [
+    "FRAME_SIZE",
+    "synthetic_camera_ids",
+    "synthetic_cameras",
+    "synthetic_feature_batch",
+    "synthetic_frames",
+    "synthetic_snapshot_metadata",
+]
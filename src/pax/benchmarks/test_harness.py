@@ -0,0 +1,43 @@
+"""Test the benchmark harness and synthetic data generators."""
+
+from __future__ import annotations
+
+from pax.benchmarks.harness import REGISTRY, Benchmark, compare_runs, run_benchmark, run_benchmarks
+from pax.benchmarks.synthetic import synthetic_feature_batch, synthetic_frames
+from pax.storage.feature_storage import FeatureStorage
+
+
+def test_synthetic_inputs_are_valid(tmp_path):
+    batch = synthetic_feature_batch(500)
+    batch.check_schema()
+    storage = FeatureStorage(tmp_path / "features")
+    storage.save_feature_vectors_batch(batch, [f"{i}.jpg" for i in range(500)], append=False)
+    assert len(storage.load_feature_batch()) == 500
+
+    frames = synthetic_frames(tmp_path / "frames", 2)
+    assert [path.name for path in frames] == ["frame_00000.jpg", "frame_00001.jpg"]
+    assert frames[0].read_bytes() == synthetic_frames(tmp_path / "again", 1)[0].read_bytes()
+
+
+def test_run_records_and_compares(tmp_path):
+    run = run_benchmarks(["storage.save_parquet", "vision.yolov8n_detect"], quick=True, repeats=2)
+    results = {result["key"]: result for result in run["results"]}
+    assert len(results["storage.save_parquet[10000]"]["times_s"]) == 2
+    assert results["storage.save_parquet[10000]"]["error"] is None
+    assert "vision.yolov8n_detect[8]" in results
+
+    failing = run_benchmark(Benchmark("broken", lambda param, workdir: 1 / 0), None)
+    assert failing.error.startswith("ZeroDivisionError")
+    rated = run_benchmark(Benchmark("rated", lambda n, workdir: list, (4,), throughput=True), 4)
+    assert rated.to_dict()["items_per_s"] == 4 / rated.median_s
+    assert "query.by_camera" in REGISTRY
+
+    slower = {
+        "results": [
+            dict(result, median_s=result["median_s"] and result["median_s"] * 2)
+            for result in run["results"]
+        ]
+    }
+    rows = compare_runs(run, slower, threshold=1.5)
+    assert [row["key"] for row in rows] == ["storage.save_parquet[10000]"]
+    assert rows[0]["regression"]
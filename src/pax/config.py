@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Annotated, Literal
+from typing import Annotated, Any, Literal
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -47,14 +48,162 @@ class CameraAPISettings(BaseModel):
 class RemoteStorageSettings(BaseModel):
     """Optional remote storage configuration for uploaded artifacts."""
 
-    provider: Literal["none", "gcs"] = "none"
+    provider: Literal["none", "gcs", "local"] = "none"
     bucket: str | None = None
     prefix: str = "pax"
     credentials_path: Path | None = None
+    local_root: Path | None = Field(
+        default=None,
+        description="Directory standing in for the bucket when provider is 'local'.",
+    )
+    key_layout: Literal["camera", "date"] = Field(
+        default="camera",
+        description=(
+            "Object key scheme for uploaded images: 'camera' writes <camera>/<timestamp>.jpg, "
+            "'date' writes date=YYYY-MM-DD/hour=HH/<camera>/<timestamp>.jpg so listings can "
+            "be scoped to the days queried."
+        ),
+    )
+    inventory_path: Path | None = Field(
+        default=None,
+        description="SQLite bucket inventory that the collector updates on each upload.",
+    )
+    upload_mode: Literal["inline", "queue"] = Field(
+        default="queue",
+        description="'queue' hands uploads to background workers through a durable on-disk queue.",
+    )
+    upload_workers: int = Field(default=4, ge=1)
+    upload_max_attempts: int = Field(default=5, ge=1)
+    upload_rate_per_s: float | None = Field(default=None, gt=0)
+    upload_drain_seconds: float = Field(
+        default=120.0,
+        ge=0,
+        description="How long a sweep waits at the end for queued uploads before leaving them for the next run.",
+    )
 
     def is_enabled(self) -> bool:
+        if self.provider == "local":
+            return self.local_root is not None
         return self.provider != "none" and self.bucket is not None
 
+    def blob_store_root(self) -> Path | None:
+        """Local bucket directory, or None when the real bucket should be used."""
+
+        return self.local_root if self.provider == "local" else None
+
+
+class TelemetrySettings(BaseModel):
+    """Where collection and extraction metrics are exported."""
+
+    jsonl_path: Path | None = Field(
+        default=None,
+        description="Append span events and end-of-run metric snapshots to this JSONL file.",
+    )
+    prometheus_port: int | None = Field(
+        default=None,
+        ge=0,
+        le=65535,
+        description="Serve a Prometheus /metrics endpoint on this port while collecting.",
+    )
+    prometheus_host: str = "127.0.0.1"
+
+
+class CascadeRuleSettings(BaseModel):
+    """When a gated model runs; see ``pax.vision.cascade.ModelRule``."""
+
+    min_pedestrians: int | None = Field(default=None, ge=0)
+    min_change: int | None = Field(default=None, ge=1)
+    refresh_every: int | None = Field(default=None, ge=1)
+
+
+class CascadeSettings(BaseModel):
+    """Cascade policy for ``FeatureExtractor``; a ``null`` rule runs that model on every frame."""
+
+    detectron2: CascadeRuleSettings | None = Field(
+        default_factory=lambda: CascadeRuleSettings(min_pedestrians=1, refresh_every=20)
+    )
+    clip: CascadeRuleSettings | None = Field(
+        default_factory=lambda: CascadeRuleSettings(min_change=3, refresh_every=10)
+    )
+
+
+class VisionSettings(BaseModel):
+    """Vision model registry limits and inference backends."""
+
+    max_models: int | None = Field(
+        default=None,
+        ge=1,
+        description="Keep at most this many loaded model variants (least recently used evicted).",
+    )
+    max_memory_mb: float | None = Field(
+        default=None,
+        gt=0,
+        description="Evict least recently used models once their weights exceed this size.",
+    )
+    yolo_backend: Literal["torch", "onnx"] = "torch"
+    clip_backend: Literal["torch", "onnx"] = "torch"
+    clip_quantize: bool = Field(
+        default=False,
+        description="Run CLIP with int8 dynamically quantized linear layers (CPU).",
+    )
+    onnx_cache_dir: Path | None = Field(
+        default=None,
+        description="Where exported ONNX graphs are cached (default: ~/.cache/pax/onnx).",
+    )
+    onnx_intra_op_threads: int | None = Field(default=None, ge=1)
+    onnx_inter_op_threads: int | None = Field(default=None, ge=1)
+    cascade: CascadeSettings | None = Field(
+        default=None,
+        description="Gate Detectron2 and CLIP on YOLO's output (default: run every model).",
+    )
+    roi_path: Path | None = Field(
+        default=None,
+        description="Per-camera ROI file (e.g. data/manifests/corridor_camera_rois.json).",
+    )
+
+    def extractor_config(self, workers: int | None = None) -> dict[str, Any]:
+        """
+        ``FeatureExtractor`` keyword arguments selecting the configured backends.
+
+        Args:
+            workers: Extraction processes sharing this machine. Unless
+                ``onnx_intra_op_threads`` is set, each ONNX session then gets
+                an equal share of the cores instead of all of them.
+        """
+
+        config: dict[str, Any] = {}
+        if self.yolo_backend != "torch":
+            config["yolo_backend"] = self.yolo_backend
+        if self.clip_backend != "torch":
+            config["clip_backend"] = self.clip_backend
+        if self.clip_quantize:
+            config["clip_quantize"] = True
+        if "onnx" in (self.yolo_backend, self.clip_backend):
+            from .vision.onnx_backend import DEFAULT_CACHE_DIR, OnnxRuntimeOptions
+
+            intra_op_threads = self.onnx_intra_op_threads
+            if intra_op_threads is None and workers:
+                intra_op_threads = max(1, (os.cpu_count() or 1) // workers)
+            config["onnx_options"] = OnnxRuntimeOptions(
+                intra_op_threads=intra_op_threads,
+                inter_op_threads=self.onnx_inter_op_threads,
+                cache_dir=self.onnx_cache_dir or DEFAULT_CACHE_DIR,
+            )
+        if self.cascade is not None:
+            from .vision.cascade import CascadePolicy, ModelRule
+
+            rules = {
+                model: ModelRule(**rule.model_dump()) if rule is not None else None
+                for model, rule in (
+                    ("detectron2", self.cascade.detectron2),
+                    ("clip", self.cascade.clip),
+                )
+            }
+            config["cascade"] = CascadePolicy(**rules)
+        if self.roi_path is not None:
+            config["rois"] = str(self.roi_path)
+        return config
+
 
 class PaxSettings(BaseSettings):
     """Top-level settings model for the project."""
@@ -65,12 +214,19 @@ class PaxSettings(BaseSettings):
     camera_api: CameraAPISettings = CameraAPISettings()
     sampling_minutes: int = Field(default=30, ge=5, le=180)
     remote: RemoteStorageSettings = RemoteStorageSettings()
+    telemetry: TelemetrySettings = TelemetrySettings()
+    vision: VisionSettings = VisionSettings()
 
     def ensure_dirs(self) -> None:
         """Ensure storage-related directories exist."""
 
         self.storage.ensure()
 
+    def bucket_inventory_path(self) -> Path:
+        """Bucket inventory used by the GCS stats scripts."""
+
+        return self.remote.inventory_path or self.storage.root / "inventory" / "gcs_inventory.sqlite"
+
 
 settings = PaxSettings()
 
@@ -9,8 +9,12 @@ from pathlib import Path
 from typing import Iterable
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from shapely.geometry import Point, Polygon, box
+import shapely
+from shapely.geometry import Polygon, box
+
+from .geometry_cache import DEFAULT_CACHE_DIR, load_manhattan_centerlines
 
 LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +38,11 @@ EXCLUDED_NAME_TOKENS = (
     " WEST STREET",
 )
 
+# Single alternation over all tokens so exclusion is one regex scan per name.
+_EXCLUDED_NAME_RE = re.compile(
+    "|".join(re.escape(token) for token in sorted(set(EXCLUDED_NAME_TOKENS), key=len, reverse=True))
+)
+
 
 @dataclass(slots=True)
 class CorridorBounds:
@@ -55,16 +64,10 @@ class CorridorBounds:
         return box(self.lon_min - self.buffer, self.lat_min - self.buffer, self.lon_max + self.buffer, self.lat_max + self.buffer)
 
 
-def _load_dcm(dcm_path: Path) -> gpd.GeoDataFrame:
-    LOGGER.info("Loading DCM street centerlines: %s", dcm_path)
-    dcm = gpd.read_file(dcm_path)
-    if dcm.crs is None or dcm.crs.to_epsg() != 4326:
-        LOGGER.info("Reprojecting DCM to EPSG:4326")
-        dcm = dcm.to_crs(epsg=4326)
+def _load_dcm(dcm_path: Path, cache_dir: Path | None = DEFAULT_CACHE_DIR) -> gpd.GeoDataFrame:
+    dcm = load_manhattan_centerlines(dcm_path, cache_dir=cache_dir)
     if "Street_NM" not in dcm.columns:
         raise KeyError("Expected 'Street_NM' column in DCM shapefile")
-    if "Borough" in dcm.columns:
-        dcm = dcm[dcm["Borough"].str.upper() == "MANHATTAN"].copy()
     return dcm
 
 
@@ -82,10 +85,15 @@ def derive_corridor_bounds(
     east_avenue: str = "Lexington Avenue",
     west_avenue: str = "9 Avenue",
     pad_degrees: float = 0.0007,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
 ) -> CorridorBounds:
-    """Compute corridor bounds from street names."""
+    """Compute corridor bounds from street names.
+
+    ``cache_dir`` holds the reprojected centerlines; pass ``None`` to re-read
+    the shapefile.
+    """
 
-    dcm = _load_dcm(dcm_path)
+    dcm = _load_dcm(dcm_path, cache_dir=cache_dir)
 
     street_pattern = rf"^(?:East|West)\s+{south_street}\s+Street$"
     south_subset = _subset_by_pattern(dcm, street_pattern)
@@ -142,60 +150,70 @@ def derive_corridor_bounds(
 
 
 def _name_is_excluded(name: str) -> bool:
-    upper = name.upper()
-    return any(token in upper for token in EXCLUDED_NAME_TOKENS)
+    return _EXCLUDED_NAME_RE.search(name.upper()) is not None
+
+
+def _coerce_coordinate(value: object) -> float:
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return np.nan
 
 
 def filter_cameras_to_corridor(
     cameras: Iterable[dict[str, object]],
     corridor_bounds: CorridorBounds,
 ) -> pd.DataFrame:
-    """Return cameras that fall within the derived corridor polygon."""
-
-    records: list[dict[str, object]] = []
-    for cam in cameras:
-        try:
-            lat = float(cam.get("latitude", 0.0))
-            lon = float(cam.get("longitude", 0.0))
-        except (TypeError, ValueError):
-            LOGGER.debug("Skipping camera with invalid coordinates: %s", cam)
-            continue
-
-        name = str(cam.get("name", "")).strip()
-        if _name_is_excluded(name):
-            LOGGER.debug("Skipping %s due to name exclusion", name)
-            continue
-
-        area = str(cam.get("area", "")).strip()
-        if area and area.upper() != "MANHATTAN":
-            LOGGER.debug("Skipping %s because area=%s", name, area)
-            continue
-
-        records.append(
-            {
-                "id": cam.get("id"),
-                "name": name,
-                "latitude": lat,
-                "longitude": lon,
-                "area": area,
-                "source": cam,
-            }
-        )
-
-    if not records:
+    """Return cameras that fall within the derived corridor polygon.
+
+    Name exclusion, area filtering, and the point-in-polygon test all run as
+    whole-column operations; only the final survivors become geometries.
+    """
+
+    sources = list(cameras)
+    lats = np.fromiter(
+        (_coerce_coordinate(cam.get("latitude", 0.0)) for cam in sources), dtype=float, count=len(sources)
+    )
+    lons = np.fromiter(
+        (_coerce_coordinate(cam.get("longitude", 0.0)) for cam in sources), dtype=float, count=len(sources)
+    )
+    df = pd.DataFrame(
+        {
+            "id": [cam.get("id") for cam in sources],
+            "name": [str(cam.get("name", "")).strip() for cam in sources],
+            "latitude": lats,
+            "longitude": lons,
+            "area": [str(cam.get("area", "")).strip() for cam in sources],
+            "source": sources,
+        }
+    )
+
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    if not valid.all():
+        LOGGER.debug("Skipping %d cameras with invalid coordinates", int((~valid).sum()))
+    upper_names = df["name"].str.upper()
+    excluded = upper_names.str.contains(_EXCLUDED_NAME_RE, na=False).to_numpy()
+    upper_area = df["area"].str.upper()
+    wrong_area = ((df["area"] != "") & (upper_area != "MANHATTAN")).to_numpy()
+    df = df.loc[valid & ~excluded & ~wrong_area].reset_index(drop=True)
+
+    if df.empty:
         LOGGER.warning("No cameras available after initial validation")
         return pd.DataFrame(columns=["id", "name", "latitude", "longitude", "area", "geometry"])
 
-    df = pd.DataFrame.from_records(records)
-    geometry = [Point(lon, lat) for lon, lat in zip(df["longitude"], df["latitude"])]
-    gdf = gpd.GeoDataFrame(df, geometry=geometry, crs="EPSG:4326")
-
     polygon = corridor_bounds.polygon()
+    shapely.prepare(polygon)
     LOGGER.info("Filtering cameras with polygon bounds: %s", polygon.bounds)
-    mask = gdf.within(polygon) | gdf.touches(polygon)
-    filtered = gdf.loc[mask].copy()
+    # For points, intersects == within | touches.
+    mask = shapely.intersects_xy(polygon, df["longitude"].to_numpy(), df["latitude"].to_numpy())
+    inside = df.loc[mask]
+    filtered = gpd.GeoDataFrame(
+        inside,
+        geometry=gpd.points_from_xy(inside["longitude"], inside["latitude"]),
+        crs="EPSG:4326",
+    )
 
-    LOGGER.info("Selected %d cameras inside corridor (out of %d)", len(filtered), len(gdf))
+    LOGGER.info("Selected %d cameras inside corridor (out of %d)", len(filtered), len(df))
 
     filtered.sort_values("latitude", inplace=True)
     filtered.reset_index(drop=True, inplace=True)
@@ -0,0 +1,159 @@
+"""On-disk cache for derived DCM street geometry.
+
+Reading the citywide DCM shapefile, reprojecting it, and buffering/unioning the
+corridor segments dominates Voronoi regeneration time. The artifacts produced by
+those steps are stored here keyed by the shapefile checksum (and, for the
+walkable union, the corridor bounds and buffer width) so repeated runs skip the
+GIS preprocessing entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import geopandas as gpd
+import shapely
+from shapely.geometry import MultiPolygon, Polygon
+from shapely.ops import unary_union
+
+if TYPE_CHECKING:
+    from .filtering import CorridorBounds
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/cache/geometry")
+
+# Shapefile components whose contents define the dataset.
+_SHAPEFILE_PARTS = (".shp", ".shx", ".dbf", ".prj", ".cpg")
+
+_checksum_memo: dict[tuple[str, int, int], str] = {}
+
+
+def shapefile_checksum(path: Path) -> str:
+    """Return a SHA-256 over the shapefile and its sidecar files.
+
+    Results are memoised per process on (path, size, mtime) so the hash is
+    only recomputed when the file changes.
+    """
+
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    cached = _checksum_memo.get(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    for suffix in _SHAPEFILE_PARTS:
+        part = path.with_suffix(suffix)
+        if not part.exists():
+            continue
+        digest.update(suffix.encode())
+        with part.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+
+    checksum = digest.hexdigest()
+    _checksum_memo[memo_key] = checksum
+    return checksum
+
+
+def _read_manhattan_centerlines(dcm_path: Path) -> gpd.GeoDataFrame:
+    LOGGER.info("Loading DCM street centerlines: %s", dcm_path)
+    dcm = gpd.read_file(dcm_path)
+    if dcm.crs is None or dcm.crs.to_epsg() != 4326:
+        LOGGER.info("Reprojecting DCM to EPSG:4326")
+        dcm = dcm.to_crs(epsg=4326)
+    if "Borough" in dcm.columns:
+        dcm = dcm[dcm["Borough"].str.upper() == "MANHATTAN"].copy()
+    return dcm
+
+
+def load_manhattan_centerlines(
+    dcm_path: Path,
+    *,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
+) -> gpd.GeoDataFrame:
+    """Return Manhattan DCM centerlines in EPSG:4326, cached as GeoParquet.
+
+    Pass ``cache_dir=None`` to bypass the cache.
+    """
+
+    if cache_dir is None:
+        return _read_manhattan_centerlines(dcm_path)
+
+    checksum = shapefile_checksum(dcm_path)
+    cache_path = Path(cache_dir) / f"dcm_manhattan_{checksum[:16]}.parquet"
+    if cache_path.exists():
+        LOGGER.info("Using cached DCM centerlines %s", cache_path)
+        return gpd.read_parquet(cache_path)
+
+    dcm = _read_manhattan_centerlines(dcm_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    dcm.to_parquet(cache_path, index=False)
+    LOGGER.info("Cached DCM centerlines to %s", cache_path)
+    return dcm
+
+
+def _walkable_key(checksum: str, bounds: CorridorBounds, street_buffer_m: float) -> str:
+    payload = json.dumps(
+        {
+            "dcm": checksum,
+            "bounds": [
+                round(bounds.lon_min, 7),
+                round(bounds.lat_min, 7),
+                round(bounds.lon_max, 7),
+                round(bounds.lat_max, 7),
+            ],
+            "buffer_m": round(float(street_buffer_m), 3),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def load_walkable_area(
+    dcm_path: Path,
+    bounds: CorridorBounds,
+    street_buffer_m: float = 18.0,
+    *,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
+) -> Polygon | MultiPolygon:
+    """Return the buffered street union inside ``bounds``, cached as WKB."""
+
+    cache_path: Path | None = None
+    if cache_dir is not None:
+        key = _walkable_key(shapefile_checksum(dcm_path), bounds, street_buffer_m)
+        cache_path = Path(cache_dir) / f"walkable_{key}.wkb"
+        if cache_path.exists():
+            LOGGER.info("Using cached walkable area %s", cache_path)
+            return shapely.from_wkb(cache_path.read_bytes())
+
+    LOGGER.info("Building walkable area from DCM shapefile")
+    dcm = load_manhattan_centerlines(dcm_path, cache_dir=cache_dir)
+    corridor = dcm.cx[bounds.lon_min:bounds.lon_max, bounds.lat_min:bounds.lat_max]
+    if corridor.empty:
+        raise ValueError("No street centerlines found within corridor bounds")
+
+    metric = corridor.to_crs(epsg=3857)
+    union = unary_union(metric.buffer(street_buffer_m))
+    walkable = gpd.GeoSeries([union], crs="EPSG:3857").to_crs(epsg=4326).iloc[0]
+    LOGGER.info("Walkable area computed with buffer %.1fm", street_buffer_m)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(shapely.to_wkb(walkable))
+        LOGGER.info("Cached walkable area to %s", cache_path)
+    return walkable
+
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "load_manhattan_centerlines",
+    "load_walkable_area",
+    "shapefile_checksum",
+]
@@ -0,0 +1,46 @@
+"""Test corridor camera filtering against a fixed set of bounds."""
+
+from __future__ import annotations
+
+from pax.corridor.filtering import CorridorBounds, filter_cameras_to_corridor
+
+BOUNDS = CorridorBounds(
+    south_street=34,
+    north_street=66,
+    east_avenue="Lexington Avenue",
+    west_avenue="9 Avenue",
+    lat_min=40.75,
+    lat_max=40.77,
+    lon_min=-73.99,
+    lon_max=-73.97,
+    buffer=0.0,
+)
+
+
+def camera(camera_id: str, lat: object, lon: object, name: str = "", area: str = "Manhattan") -> dict:
+    return {"id": camera_id, "name": name, "latitude": lat, "longitude": lon, "area": area}
+
+
+def test_filter_keeps_corridor_cameras_in_latitude_order():
+    cameras = [
+        camera("north", 40.768, -73.98, "5 Ave @ 60 St"),
+        camera("south", "40.752", "-73.985", "7 Ave @ 36 St", area=""),
+        camera("edge", 40.75, -73.975, "Lexington Ave @ 34 St"),  # on the boundary
+        camera("outside", 40.74, -73.98, "Broadway @ 28 St"),
+        camera("fdr", 40.76, -73.98, "FDR Dr @ 49 St"),
+        camera("queens", 40.76, -73.98, "Queens Blvd", area="Queens"),
+        camera("bad", "n/a", -73.98),
+    ]
+    filtered = filter_cameras_to_corridor(cameras, BOUNDS)
+
+    assert filtered["id"].tolist() == ["edge", "south", "north"]
+    assert filtered["latitude"].tolist() == [40.75, 40.752, 40.768]
+    assert filtered.crs == "EPSG:4326"
+    assert filtered.geometry.iloc[1].coords[0] == (-73.985, 40.752)
+    assert filtered["source"].iloc[2] is cameras[0]
+
+
+def test_filter_with_no_valid_cameras_returns_empty_frame():
+    filtered = filter_cameras_to_corridor([camera("fdr", 40.76, -73.98, "FDR Dr")], BOUNDS)
+    assert filtered.empty
+    assert list(filtered.columns) == ["id", "name", "latitude", "longitude", "area", "geometry"]
@@ -11,6 +11,7 @@ import requests
 from requests.adapters import HTTPAdapter, Retry
 
 from ..config import PaxSettings
+from ..telemetry import counter, span
 
 LOGGER = logging.getLogger(__name__)
 
@@ -35,12 +36,14 @@ class CameraAPIClient:
         """Return camera metadata from NYCTMC API."""
 
         LOGGER.debug("Requesting camera metadata", extra={"url": self._settings.camera_api.base_url})
-        response = self._session.get(
-            self._settings.camera_api.base_url,
-            timeout=self._settings.camera_api.timeout_seconds,
-        )
-        response.raise_for_status()
-        cameras = response.json()
+        with span("pax_camera_api_list") as record:
+            response = self._session.get(
+                self._settings.camera_api.base_url,
+                timeout=self._settings.camera_api.timeout_seconds,
+            )
+            response.raise_for_status()
+            cameras = response.json()
+            record["attributes"]["cameras"] = len(cameras)
         
         # Filter to only online cameras
         online_cameras = [cam for cam in cameras if cam.get("isOnline") == "true"]
@@ -83,14 +86,18 @@ class CameraAPIClient:
         """Download the raw image bytes from a camera snapshot URL."""
 
         LOGGER.debug("Downloading image", extra={"url": url})
-        response = self._session.get(url, timeout=self._settings.camera_api.timeout_seconds)
-        response.raise_for_status()
+        with span("pax_image_download", url=url):
+            response = self._session.get(url, timeout=self._settings.camera_api.timeout_seconds)
+            response.raise_for_status()
 
-        content_type = response.headers.get("content-type", "")
-        if not content_type.startswith("image/"):
-            msg = f"Expected image content-type, received {content_type or 'unknown'}"
-            raise ValueError(msg)
+            content_type = response.headers.get("content-type", "")
+            if not content_type.startswith("image/"):
+                msg = f"Expected image content-type, received {content_type or 'unknown'}"
+                raise ValueError(msg)
 
+        counter("pax_image_download_bytes_total", "Bytes of camera images downloaded").inc(
+            len(response.content)
+        )
         return response.content
 
 
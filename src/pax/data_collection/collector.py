@@ -12,7 +12,19 @@ from typing import Iterable
 import re
 
 from ..config import PaxSettings
-from ..storage import GCSUploader, NullUploader, RemoteUploader
+from ..storage import (
+    BackgroundUploader,
+    BucketInventory,
+    GCSUploader,
+    LocalUploader,
+    NullUploader,
+    RemoteUploader,
+    UploadQueue,
+    image_key,
+)
+from ..storage.transfer import BlobInfo
+from ..storage.upload_queue import UploadItem
+from ..telemetry import REGISTRY, configure_telemetry, counter, span
 from .camera_client import CameraAPIClient
 from .schemas import CameraSnapshot, CameraSnapshotBatch, FeatureVector
 
@@ -26,18 +38,38 @@ class CameraDataCollector:
     settings: PaxSettings
     client: CameraAPIClient
     uploader: RemoteUploader
+    inventory: BucketInventory | None = None
+    upload_worker: BackgroundUploader | None = None
 
     @classmethod
     def create(cls, settings: PaxSettings | None = None) -> "CameraDataCollector":
         config = settings or PaxSettings()
         config.ensure_dirs()
+        configure_telemetry(
+            config.telemetry.jsonl_path,
+            config.telemetry.prometheus_port,
+            config.telemetry.prometheus_host,
+        )
         client = CameraAPIClient(config)
         uploader: RemoteUploader
         if config.remote.provider == "gcs" and config.remote.bucket:
             uploader = GCSUploader(bucket=config.remote.bucket, prefix=config.remote.prefix)
+        elif config.remote.provider == "local" and config.remote.local_root:
+            uploader = LocalUploader(root=config.remote.local_root, prefix=config.remote.prefix)
         else:
             uploader = NullUploader()
-        return cls(settings=config, client=client, uploader=uploader)
+        inventory = BucketInventory(config.remote.inventory_path) if config.remote.inventory_path else None
+        collector = cls(settings=config, client=client, uploader=uploader, inventory=inventory)
+        if config.remote.upload_mode == "queue" and not isinstance(uploader, NullUploader):
+            collector.upload_worker = BackgroundUploader(
+                UploadQueue(config.storage.root / "queue" / "uploads.sqlite"),
+                uploader,
+                workers=config.remote.upload_workers,
+                max_attempts=config.remote.upload_max_attempts,
+                rate_per_s=config.remote.upload_rate_per_s,
+                on_uploaded=collector._on_uploaded,
+            )
+        return collector
 
     def collect(
         self,
@@ -48,6 +80,23 @@ class CameraDataCollector:
     ) -> CameraSnapshotBatch:
         """Entry point for a single sampling sweep."""
 
+        try:
+            with span("pax_collection_sweep") as record:
+                batch = self._collect(
+                    camera_ids, download_images=download_images, max_cameras=max_cameras
+                )
+                record["attributes"]["snapshots"] = batch.count
+        finally:
+            REGISTRY.flush()
+        return batch
+
+    def _collect(
+        self,
+        camera_ids: Iterable[str] | None,
+        *,
+        download_images: bool,
+        max_cameras: int | None,
+    ) -> CameraSnapshotBatch:
         # Use Eastern time (New York)
         started_at = datetime.now(ZoneInfo("America/New_York"))
         if camera_ids is None:
@@ -59,12 +108,21 @@ class CameraDataCollector:
         if max_cameras is not None:
             camera_ids = list(camera_ids)[:max_cameras]
 
+        # Uploads left over from an interrupted run start draining alongside this sweep
+        if self.upload_worker is not None:
+            self.upload_worker.start()
+
         raw_snapshots = self.client.fetch_snapshots(camera_ids)
         snapshots = [self._parse_snapshot(s) for s in raw_snapshots]
         storage_records: list[dict[str, str | None]] = []
 
+        snapshot_counter = counter("pax_snapshots_collected_total", "Camera snapshots stored")
         for snapshot in snapshots:
             storage_records.append(self._store_snapshot(snapshot, download_images=download_images))
+            snapshot_counter.inc()
+
+        if self.upload_worker is not None:
+            self._await_uploads(storage_records)
 
         batch = CameraSnapshotBatch.from_snapshots(
             snapshots,
@@ -131,7 +189,8 @@ class CameraDataCollector:
                 image_dir.mkdir(parents=True, exist_ok=True)
                 image_path = image_dir / f"{timestamp_slug}.jpg"
                 image_path.write_bytes(image_bytes)
-                remote_uri = self._maybe_upload(image_path, camera_slug, timestamp_slug)
+                if self.upload_worker is None:
+                    remote_uri = self._maybe_upload(image_path, camera_slug, captured_at_et)
             except Exception as exc:  # pragma: no cover - network failures
                 LOGGER.warning(
                     "Failed to download image", extra={"camera_id": snapshot.camera_id, "error": str(exc)}
@@ -149,6 +208,11 @@ class CameraDataCollector:
         with metadata_path.open("w", encoding="utf-8") as file:
             json.dump(record, file, indent=2)
 
+        # Enqueue only once the metadata exists, so the upload hook can fill in its URI
+        if image_path is not None and self.upload_worker is not None:
+            remote_key = image_key(camera_slug, captured_at_et, self.settings.remote.key_layout)
+            self.upload_worker.queue.enqueue(image_path, remote_key, metadata_path)
+
         root = self.settings.storage.root
         return {
             "camera_id": snapshot.camera_id,
@@ -187,13 +251,51 @@ class CameraDataCollector:
         slug = re.sub(r"[^A-Za-z0-9_-]+", "-", value.strip())
         return slug or "unknown"
 
-    def _maybe_upload(self, image_path: Path, camera_slug: str, timestamp_slug: str) -> str | None:
-        remote_key = f"{camera_slug}/{timestamp_slug}.jpg"
+    def _await_uploads(self, storage_records: list[dict[str, str | None]]) -> None:
+        """Wait (bounded) for queued uploads and copy their URIs into the batch records."""
+
+        if self.upload_worker is None:
+            return
+        with span("pax_upload_drain") as record:
+            left = self.upload_worker.drain(timeout_s=self.settings.remote.upload_drain_seconds)
+            record["attributes"]["left_queued"] = left
+        root = self.settings.storage.root
+        uris = self.upload_worker.queue.remote_uris(
+            root / record["image_path"] for record in storage_records if record["image_path"]
+        )
+        for record in storage_records:
+            if record["image_path"]:
+                record["image_remote_uri"] = uris.get(str(root / record["image_path"]))
+
+    def _on_uploaded(self, item: UploadItem, remote_uri: str | None) -> None:
+        """Runs on an upload worker: fill in the snapshot's remote URI and inventory row."""
+
+        if remote_uri and item.metadata_path is not None and item.metadata_path.exists():
+            record = json.loads(item.metadata_path.read_text(encoding="utf-8"))
+            record["image_remote_uri"] = remote_uri
+            tmp_path = item.metadata_path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+            tmp_path.replace(item.metadata_path)
+        if remote_uri and self.inventory is not None:
+            self._record_inventory(item.remote_key, item.local_path)
+
+    def _record_inventory(self, remote_key: str, image_path: Path) -> None:
+        if self.inventory is None:
+            return
+        prefix = self.settings.remote.prefix.rstrip("/")
+        blob_name = f"{prefix}/{remote_key}" if prefix else remote_key
+        self.inventory.add([BlobInfo(name=blob_name, size=image_path.stat().st_size)])
+
+    def _maybe_upload(self, image_path: Path, camera_slug: str, captured_at_et: datetime) -> str | None:
+        remote_key = image_key(camera_slug, captured_at_et, self.settings.remote.key_layout)
         try:
-            return self.uploader.upload_file(image_path, remote_key)
+            remote_uri = self.uploader.upload_file(image_path, remote_key)
         except Exception as exc:  # pragma: no cover - remote failures
             LOGGER.warning("Remote upload failed", extra={"path": str(image_path), "error": str(exc)})
             return None
+        if remote_uri and self.inventory is not None:
+            self._record_inventory(remote_key, image_path)
+        return remote_uri
 
 
 __all__ = ["CameraDataCollector"]
@@ -1,7 +1,25 @@
-"""Route rendering utilities."""
+"""Route rendering utilities.
 
-from .definitions import RouteDefinition, ROUTES
-from .renderer import RouteRenderer
+Exports are imported on first access, so route definitions can be used
+without loading matplotlib.
+"""
 
-__all__ = ["RouteDefinition", "ROUTES", "RouteRenderer"]
+from typing import TYPE_CHECKING
 
+from pax._lazy import lazy_exports
+
+_EXPORTS = {
+    "RouteDefinition": ".definitions",
+    "ROUTES": ".definitions",
+    "MapCache": ".map_cache",
+    "RouteRenderer": ".renderer",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .definitions import RouteDefinition, ROUTES
+    from .map_cache import MapCache
+    from .renderer import RouteRenderer
+
+__all__ = ["MapCache", "RouteDefinition", "ROUTES", "RouteRenderer"]
@@ -99,8 +99,9 @@ def stress_along_route(points: List[RoutePoint], cameras: List[CameraRecord]) ->
         values.append(camera_stress[idx])
 
     arr = np.array(values, dtype=float)
-    if arr.ptp() > 0:
-        arr = (arr - arr.min()) / arr.ptp()
+    spread = np.ptp(arr)
+    if spread > 0:
+        arr = (arr - arr.min()) / spread
     else:
         arr = np.zeros_like(arr)
 
@@ -0,0 +1,157 @@
+"""On-disk cache for Google Static Maps basemaps and Directions polylines.
+
+Entries are keyed by the request parameters that determine the response
+(center, zoom, size, scale, map type, style for basemaps; origin, destination,
+waypoints for routes) and never by the API key, so a cache seeded on one
+machine renders the same figures offline on another.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from .maps import LatLon, RoutePoint
+
+LOGGER = logging.getLogger(__name__)
+
+# Request parameters that do not affect the returned image.
+_IGNORED_PARAMS = {"key", "signature"}
+
+
+def _digest(kind: str, payload: Mapping[str, Any]) -> str:
+    blob = json.dumps({"kind": kind, **payload}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()[:24]
+
+
+class MapCache:
+    """Content cache for basemap PNGs and route polylines."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.static_dir = self.cache_dir / "static_maps"
+        self.route_dir = self.cache_dir / "routes"
+
+    @staticmethod
+    def static_map_key(params: Mapping[str, Any]) -> str:
+        """Cache key for a Static Maps request (API key excluded)."""
+
+        normalized = {
+            name: str(value) for name, value in params.items() if name not in _IGNORED_PARAMS
+        }
+        return _digest("static_map", normalized)
+
+    @staticmethod
+    def route_key(origin: LatLon, destination: LatLon, waypoints: Sequence[LatLon]) -> str:
+        """Cache key for a walking Directions request."""
+
+        payload = {
+            "origin": [round(origin[0], 6), round(origin[1], 6)],
+            "destination": [round(destination[0], 6), round(destination[1], 6)],
+            "waypoints": [[round(lat, 6), round(lon, 6)] for lat, lon in waypoints],
+            "mode": "walking",
+        }
+        return _digest("route", payload)
+
+    def get_static_map(self, params: Mapping[str, Any]) -> bytes | None:
+        path = self.static_dir / f"{self.static_map_key(params)}.png"
+        if not path.exists():
+            return None
+        LOGGER.debug("Static map cache hit %s", path.name)
+        return path.read_bytes()
+
+    def put_static_map(self, params: Mapping[str, Any], content: bytes) -> Path:
+        key = self.static_map_key(params)
+        self.static_dir.mkdir(parents=True, exist_ok=True)
+        path = self.static_dir / f"{key}.png"
+        path.write_bytes(content)
+        meta = {name: value for name, value in params.items() if name not in _IGNORED_PARAMS}
+        (self.static_dir / f"{key}.json").write_text(json.dumps(meta, indent=2, default=str))
+        return path
+
+    def get_route(
+        self, origin: LatLon, destination: LatLon, waypoints: Sequence[LatLon]
+    ) -> list[RoutePoint] | None:
+        path = self.route_dir / f"{self.route_key(origin, destination, waypoints)}.json"
+        if not path.exists():
+            return None
+        LOGGER.debug("Route cache hit %s", path.name)
+        payload = json.loads(path.read_text())
+        return [RoutePoint(latitude=lat, longitude=lon, index=idx) for idx, (lat, lon) in enumerate(payload["points"])]
+
+    def put_route(
+        self,
+        origin: LatLon,
+        destination: LatLon,
+        waypoints: Sequence[LatLon],
+        points: Sequence[RoutePoint],
+    ) -> Path:
+        self.route_dir.mkdir(parents=True, exist_ok=True)
+        path = self.route_dir / f"{self.route_key(origin, destination, waypoints)}.json"
+        payload = {
+            "origin": list(origin),
+            "destination": list(destination),
+            "waypoints": [list(wp) for wp in waypoints],
+            "points": [[p.latitude, p.longitude] for p in points],
+        }
+        path.write_text(json.dumps(payload))
+        return path
+
+    def seed_from_bundle(self, bundle: Path, *, overwrite: bool = False) -> int:
+        """Copy entries from an offline bundle (directory or ``.zip``) into the cache.
+
+        A bundle has the same ``static_maps/`` and ``routes/`` layout as the
+        cache itself, e.g. one produced by :meth:`export_bundle`.
+        """
+
+        bundle = Path(bundle)
+        copied = 0
+        if bundle.is_dir():
+            for source in bundle.rglob("*"):
+                if not source.is_file():
+                    continue
+                target = self.cache_dir / source.relative_to(bundle)
+                if target.exists() and not overwrite:
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source, target)
+                copied += 1
+        elif zipfile.is_zipfile(bundle):
+            with zipfile.ZipFile(bundle) as archive:
+                for member in archive.infolist():
+                    if member.is_dir():
+                        continue
+                    relative = Path(member.filename)
+                    if relative.is_absolute() or ".." in relative.parts:
+                        LOGGER.warning("Skipping unsafe bundle entry %s", member.filename)
+                        continue
+                    target = self.cache_dir / relative
+                    if target.exists() and not overwrite:
+                        continue
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(archive.read(member))
+                    copied += 1
+        else:
+            raise ValueError(f"Unsupported map cache bundle: {bundle}")
+
+        LOGGER.info("Seeded %d map cache entries from %s", copied, bundle)
+        return copied
+
+    def export_bundle(self, output_path: Path) -> Path:
+        """Write the cache contents to a ``.zip`` bundle for offline machines."""
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_STORED) as archive:
+            for path in sorted(self.cache_dir.rglob("*")):
+                if path.is_file() and path != output_path:
+                    archive.write(path, path.relative_to(self.cache_dir).as_posix())
+        LOGGER.info("Exported map cache bundle to %s", output_path)
+        return output_path
+
+
+__all__ = ["MapCache"]
@@ -20,25 +20,49 @@ from dotenv import load_dotenv
 from ..config import PaxSettings
 from .costs import extract_camera_records, load_latest_snapshot_table, stress_along_route
 from .definitions import RouteDefinition, ROUTES
+from .map_cache import MapCache
 from .maps import RoutePoint, fetch_route
 
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class RouteFrame:
+    """Everything needed to redraw a rendered route without touching disk."""
+
+    lats: np.ndarray
+    lons: np.ndarray
+    colors: np.ndarray
+    background: Image.Image | None
+    extent: list[float] | None
+    view: tuple[float, float, float, float]
+    marker_radius: float
+
+
 @dataclass
 class RenderResult:
     route: RouteDefinition
     output_path: Path
     point_count: int
+    frame: RouteFrame | None = None
 
 
 class RouteRenderer:
-    def __init__(self, settings: PaxSettings | None = None) -> None:
+    def __init__(
+        self,
+        settings: PaxSettings | None = None,
+        *,
+        cache: MapCache | None = None,
+        offline: bool = False,
+    ) -> None:
         self.settings = settings or PaxSettings()
         self.settings.ensure_dirs()
 
-        load_dotenv(self.settings.model_config.env_file)
+        load_dotenv(self.settings.model_config.get("env_file"))
         self.api_key = os.getenv("GOOGLE_API_KEY")
+        self.cache = cache or MapCache(self.settings.storage.root / "cache" / "maps")
+        self.offline = offline
+        self._basemaps: dict[str, Image.Image] = {}
 
     def render_all(
         self,
@@ -57,19 +81,30 @@ class RouteRenderer:
             points = self._fetch_points(definition)
             stress = stress_along_route(points, cameras)
             path = output_dir / f"{definition.slug}_route.png"
-            self._render(definition, points, stress, path)
-            results.append(RenderResult(route=definition, output_path=path, point_count=len(points)))
+            frame = self._render(definition, points, stress, path)
+            results.append(
+                RenderResult(route=definition, output_path=path, point_count=len(points), frame=frame)
+            )
 
         composite = output_dir / "figure4_routes.png"
         self._render_composite(results, composite)
         return results
 
     def _fetch_points(self, route: RouteDefinition) -> list[RoutePoint]:
+        cached = self.cache.get_route(route.origin, route.destination, route.waypoints)
+        if cached is not None:
+            LOGGER.info("Using cached polyline for %s", route.title)
+            return cached
+
+        if self.offline:
+            raise RuntimeError(f"Route '{route.slug}' is not in the map cache and offline mode is on")
         api_key = self._read_api_key()
         if not api_key:
             raise RuntimeError("GOOGLE_API_KEY not set; unable to fetch routes")
         LOGGER.info("Fetching polyline for %s", route.title)
-        return fetch_route(route.origin, route.destination, route.waypoints, api_key=api_key)
+        points = fetch_route(route.origin, route.destination, route.waypoints, api_key=api_key)
+        self.cache.put_route(route.origin, route.destination, route.waypoints, points)
+        return points
 
     def _render(
         self,
@@ -77,7 +112,7 @@ class RouteRenderer:
         points: Sequence[RoutePoint],
         stress: Sequence[float],
         output_path: Path,
-    ) -> None:
+    ) -> RouteFrame:
         if not points:
             raise ValueError("No points to render")
 
@@ -99,18 +134,38 @@ class RouteRenderer:
             lon_span=view_lon_max - view_lon_min,
         )
 
+        frame = RouteFrame(
+            lats=lats,
+            lons=lons,
+            colors=colors,
+            background=background,
+            extent=extent,
+            view=(view_lon_min, view_lon_max, view_lat_min, view_lat_max),
+            marker_radius=max(lon_pad, lat_pad) * 0.25,
+        )
+
         fig, ax = plt.subplots(figsize=(4.2, 4.2), dpi=300)
-        if background is not None and extent is not None:
-            ax.imshow(background, extent=extent, aspect="auto", zorder=1)
+        self._draw_frame(ax, frame)
+        ax.set_title(route.title, fontsize=10)
+        fig.tight_layout()
+        fig.savefig(output_path, dpi=300, bbox_inches="tight")
+        plt.close(fig)
+        LOGGER.info("Saved %s (%d points)", output_path, len(points))
+        return frame
+
+    def _draw_frame(self, ax, frame: RouteFrame) -> None:
+        lats, lons = frame.lats, frame.lons
+        if frame.background is not None and frame.extent is not None:
+            ax.imshow(frame.background, extent=frame.extent, aspect="auto", zorder=1)
         else:
             ax.set_facecolor("#f5f6f7")
 
         segments = [
-            [(lons[i], lats[i]), (lons[i + 1], lats[i + 1])] for i in range(len(points) - 1)
+            [(lons[i], lats[i]), (lons[i + 1], lats[i + 1])] for i in range(len(lats) - 1)
         ]
         lc = LineCollection(
             segments,
-            colors=colors[:-1],
+            colors=frame.colors[:-1],
             linewidths=6,
             zorder=3,
             capstyle="round",
@@ -118,22 +173,17 @@ class RouteRenderer:
         )
         ax.add_collection(lc)
 
-        circle_radius = max(lon_pad, lat_pad) * 0.25
-        ax.add_patch(Circle((lons[0], lats[0]), circle_radius, color="#1abc9c", zorder=5))
-        ax.add_patch(Circle((lons[-1], lats[-1]), circle_radius, color="#e74c3c", zorder=5))
+        ax.add_patch(Circle((lons[0], lats[0]), frame.marker_radius, color="#1abc9c", zorder=5))
+        ax.add_patch(Circle((lons[-1], lats[-1]), frame.marker_radius, color="#e74c3c", zorder=5))
 
         ax.text(lons[0], lats[0], "GC", color="white", fontsize=8, ha="center", va="center", zorder=6)
         ax.text(lons[-1], lats[-1], "CH", color="white", fontsize=8, ha="center", va="center", zorder=6)
 
+        view_lon_min, view_lon_max, view_lat_min, view_lat_max = frame.view
         ax.set_xlim(view_lon_min, view_lon_max)
         ax.set_ylim(view_lat_min, view_lat_max)
         ax.set_xticks([])
         ax.set_yticks([])
-        ax.set_title(route.title, fontsize=10)
-        fig.tight_layout()
-        fig.savefig(output_path, dpi=300, bbox_inches="tight")
-        plt.close(fig)
-        LOGGER.info("Saved %s (%d points)", output_path, len(points))
 
     def _render_composite(self, results: Sequence[RenderResult], output_path: Path) -> None:
         fig, axes = plt.subplots(1, len(results), figsize=(12, 4), dpi=300)
@@ -141,9 +191,12 @@ class RouteRenderer:
             axes = [axes]
 
         for ax, result in zip(axes, results):
-            img = Image.open(result.output_path)
-            ax.imshow(img)
-            ax.axis("off")
+            if result.frame is not None:
+                # Redraw from the in-memory frame instead of re-decoding the PNG.
+                self._draw_frame(ax, result.frame)
+            else:
+                ax.imshow(Image.open(result.output_path))
+                ax.axis("off")
             ax.set_title(result.route.title, fontsize=10)
 
         fig.tight_layout()
@@ -158,10 +211,6 @@ class RouteRenderer:
         return cmap(arr)
 
     def _fetch_static_map(self, center: tuple[float, float], lat_span: float, lon_span: float):
-        api_key = self._read_api_key()
-        if not api_key:
-            return None, None
-
         zoom = self._estimate_zoom(max(lat_span, lon_span))
         params = {
             "center": f"{center[0]},{center[1]}",
@@ -170,18 +219,21 @@ class RouteRenderer:
             "scale": 2,
             "maptype": "roadmap",
             "style": "feature:poi|visibility:off",
-            "key": api_key,
         }
 
-        try:
-            response = requests.get("https://maps.googleapis.com/maps/api/staticmap", params=params, timeout=20)
-            response.raise_for_status()
-        except requests.RequestException as exc:  # pragma: no cover
-            LOGGER.warning("Failed to fetch static map: %s", exc)
-            return None, None
+        key = self.cache.static_map_key(params)
+        img = self._basemaps.get(key)
+        if img is None:
+            content = self.cache.get_static_map(params)
+            if content is None:
+                content = self._download_static_map(params)
+                if content is None:
+                    return None, None
+                self.cache.put_static_map(params, content)
+            img = Image.open(BytesIO(content))
+            img.load()
+            self._basemaps[key] = img
 
-        img = Image.open(BytesIO(response.content))
-        zoom = params["zoom"]
         meters_per_pixel = 156543.03392 * np.cos(center[0] * np.pi / 180) / (2 ** zoom)
         img_width, img_height = img.size
         lat_range = (img_height / 2) * meters_per_pixel / 111320
@@ -194,6 +246,26 @@ class RouteRenderer:
         ]
         return img, extent
 
+    def _download_static_map(self, params: dict[str, object]) -> bytes | None:
+        if self.offline:
+            LOGGER.info("Static map not cached and offline mode is on; rendering without basemap")
+            return None
+        api_key = self._read_api_key()
+        if not api_key:
+            return None
+
+        try:
+            response = requests.get(
+                "https://maps.googleapis.com/maps/api/staticmap",
+                params={**params, "key": api_key},
+                timeout=20,
+            )
+            response.raise_for_status()
+        except requests.RequestException as exc:  # pragma: no cover
+            LOGGER.warning("Failed to fetch static map: %s", exc)
+            return None
+        return response.content
+
     @staticmethod
     def _estimate_zoom(span: float) -> int:
         if span > 0.03:
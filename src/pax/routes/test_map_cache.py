@@ -0,0 +1,101 @@
+"""Test the basemap/polyline cache and the renderer's offline use of it."""
+
+from __future__ import annotations
+
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from pax.config import PaxSettings, StorageConfig
+from pax.routes import renderer as renderer_module
+from pax.routes.definitions import RouteDefinition
+from pax.routes.map_cache import MapCache
+from pax.routes.maps import RoutePoint
+
+ORIGIN = (40.7527, -73.9772)
+DESTINATION = (40.7736, -73.9566)
+WAYPOINTS = [(40.7614, -73.9776)]
+
+
+def _png(size=(4, 4)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _points():
+    return [
+        RoutePoint(latitude=lat, longitude=lon, index=idx)
+        for idx, (lat, lon) in enumerate([ORIGIN, *WAYPOINTS, DESTINATION])
+    ]
+
+
+def test_static_map_key_ignores_api_key(tmp_path):
+    cache = MapCache(tmp_path)
+    params = {"center": "40.75,-73.98", "zoom": 15, "size": "640x640"}
+
+    cache.put_static_map({**params, "key": "secret-a"}, b"png")
+
+    assert cache.get_static_map({**params, "key": "secret-b"}) == b"png"
+    assert cache.get_static_map({**params, "zoom": 16}) is None
+    metadata = next(cache.static_dir.glob("*.json")).read_text()
+    assert "secret-a" not in metadata
+
+
+def test_route_round_trips_and_bundle_seeds_another_cache(tmp_path):
+    cache = MapCache(tmp_path / "online")
+    cache.put_route(ORIGIN, DESTINATION, WAYPOINTS, _points())
+    cache.put_static_map({"center": "40.75,-73.98", "zoom": 15}, b"png")
+    assert cache.get_route(ORIGIN, DESTINATION, WAYPOINTS) == _points()
+    assert cache.get_route(ORIGIN, DESTINATION, []) is None
+
+    bundle = cache.export_bundle(tmp_path / "bundle.zip")
+    offline = MapCache(tmp_path / "offline")
+    assert offline.seed_from_bundle(bundle) == 3
+    assert offline.seed_from_bundle(bundle) == 0
+    assert offline.get_route(ORIGIN, DESTINATION, WAYPOINTS) == _points()
+    assert offline.get_static_map({"center": "40.75,-73.98", "zoom": 15}) == b"png"
+
+
+def _renderer(tmp_path, monkeypatch, offline):
+    def no_network(*args, **kwargs):
+        raise AssertionError("network access with a warm cache or in offline mode")
+
+    monkeypatch.setattr(renderer_module, "fetch_route", no_network)
+    monkeypatch.setattr(renderer_module.requests, "get", no_network)
+    settings = PaxSettings(storage=StorageConfig(root=tmp_path / "data"))
+    cache = MapCache(tmp_path / "maps")
+    return renderer_module.RouteRenderer(settings, cache=cache, offline=offline), cache
+
+
+def test_renderer_uses_cached_route_and_basemap_without_network(tmp_path, monkeypatch):
+    renderer, cache = _renderer(tmp_path, monkeypatch, offline=False)
+    route = RouteDefinition("test", "Test", ORIGIN, DESTINATION, WAYPOINTS)
+    cache.put_route(ORIGIN, DESTINATION, WAYPOINTS, _points())
+
+    assert renderer._fetch_points(route) == _points()
+
+    zoom = renderer._estimate_zoom(0.01)
+    params = {
+        "center": "40.76,-73.97",
+        "zoom": zoom,
+        "size": "640x640",
+        "scale": 2,
+        "maptype": "roadmap",
+        "style": "feature:poi|visibility:off",
+    }
+    cache.put_static_map(params, _png())
+    image, extent = renderer._fetch_static_map((40.76, -73.97), 0.01, 0.01)
+    assert image.size == (4, 4) and len(extent) == 4
+    again, _ = renderer._fetch_static_map((40.76, -73.97), 0.01, 0.01)
+    assert again is image
+
+
+def test_offline_renderer_reports_cache_misses(tmp_path, monkeypatch):
+    renderer, _ = _renderer(tmp_path, monkeypatch, offline=True)
+    route = RouteDefinition("test", "Test", ORIGIN, DESTINATION, WAYPOINTS)
+
+    with pytest.raises(RuntimeError, match="offline mode"):
+        renderer._fetch_points(route)
+    assert renderer._fetch_static_map((40.76, -73.97), 0.01, 0.01) == (None, None)
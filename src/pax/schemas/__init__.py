@@ -1,6 +1,6 @@
 """Schemas for empirical data structures."""
 
+from pax.schemas.feature_batch import FeatureBatch
 from pax.schemas.feature_vector import FeatureVector
 
-__all__ = ["FeatureVector"]
-
+__all__ = ["FeatureBatch", "FeatureVector"]
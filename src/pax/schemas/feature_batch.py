@@ -0,0 +1,345 @@
+"""Struct-of-arrays container for many feature vectors.
+
+``FeatureBatch`` holds N feature vectors as one typed NumPy column per field,
+using the same column names as the flattened Parquet layout written by
+``FeatureStorage``. Bulk pipelines build and validate a batch once instead of
+constructing (and flattening/unflattening) a nested Pydantic model per image.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from pax.schemas.feature_vector import FeatureVector, SpatialFeatures, TemporalFeatures, VisualComplexityFeatures
+from pax.schemas.validation import FLAT_COLUMN_DEFAULTS, FrameValidationResult, validate_feature_frame
+
+# (column, model group, model field, dtype) in flattened Parquet column order.
+FEATURE_COLUMNS: tuple[tuple[str, str, str, str], ...] = (
+    ("spatial_pedestrian_count", "spatial", "pedestrian_count", "int64"),
+    ("spatial_vehicle_count", "spatial", "vehicle_count", "int64"),
+    ("spatial_bicycle_count", "spatial", "bicycle_count", "int64"),
+    ("spatial_total_object_count", "spatial", "total_object_count", "int64"),
+    ("spatial_pedestrian_density", "spatial", "pedestrian_density", "float64"),
+    ("spatial_vehicle_density", "spatial", "vehicle_density", "float64"),
+    ("spatial_crowd_density", "spatial", "crowd_density", "float64"),
+    ("spatial_object_density", "spatial", "object_density", "float64"),
+    ("visual_scene_complexity", "visual_complexity", "scene_complexity", "float64"),
+    ("visual_noise", "visual_complexity", "visual_noise", "float64"),
+    ("visual_lighting_condition", "visual_complexity", "lighting_condition", "object"),
+    ("visual_lighting_brightness", "visual_complexity", "lighting_brightness", "float64"),
+    ("visual_weather_condition", "visual_complexity", "weather_condition", "object"),
+    ("visual_visibility_score", "visual_complexity", "visibility_score", "float64"),
+    ("visual_occlusion_score", "visual_complexity", "occlusion_score", "float64"),
+    ("temporal_timestamp", "temporal", "timestamp", "object"),
+    ("temporal_hour", "temporal", "hour", "int64"),
+    ("temporal_minute", "temporal", "minute", "int64"),
+    ("temporal_day_of_week", "temporal", "day_of_week", "int64"),
+    ("temporal_is_weekend", "temporal", "is_weekend", "bool"),
+    ("temporal_is_rush_hour", "temporal", "is_rush_hour", "bool"),
+    ("temporal_time_of_day_encoding", "temporal", "time_of_day_encoding", "float64"),
+    ("temporal_day_of_week_encoding", "temporal", "day_of_week_encoding", "float64"),
+)
+
+METADATA_COLUMNS = ("image_path", "camera_id", "zone_id", "extracted_at")
+
+_GROUP_MODELS = {
+    "spatial": SpatialFeatures,
+    "visual_complexity": VisualComplexityFeatures,
+    "temporal": TemporalFeatures,
+}
+
+
+def _get(item: FeatureVector | Mapping[str, Any], group: str, name: str) -> Any:
+    if isinstance(item, Mapping):
+        values = item[group]
+        if name in values:
+            return values[name]
+        field_info = _GROUP_MODELS[group].model_fields[name]
+        if field_info.is_required():
+            raise KeyError(f"{group}.{name}")
+        return field_info.get_default(call_default_factory=True)
+    return getattr(getattr(item, group), name)
+
+
+def _get_optional(item: FeatureVector | Mapping[str, Any], name: str) -> Any:
+    if isinstance(item, Mapping):
+        return item.get(name)
+    return getattr(item, name)
+
+
+def _to_datetime(value: Any) -> datetime:
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    raise ValueError(f"Unsupported timestamp value: {value!r}")
+
+
+def _numeric_array(column: str, values: Sequence[Any], dtype: str) -> np.ndarray:
+    """Convert a numeric column, rejecting what Pydantic would reject instead of coercing it."""
+    if any(v is None or isinstance(v, (str, bytes)) for v in values):
+        raise ValueError(f"{column} has non-numeric values")
+    raw = np.asarray(values).reshape(len(values))
+    if raw.dtype.kind not in "biuf":
+        raise ValueError(f"{column} has non-numeric values")
+    if dtype == "int64" and raw.dtype.kind == "f":
+        fractional = np.flatnonzero(raw != np.trunc(raw))
+        if len(fractional):
+            raise ValueError(f"{column} has non-integer values (first rows: {list(fractional[:5])})")
+    if dtype == "bool" and raw.dtype.kind != "b" and not np.isin(raw, (0, 1)).all():
+        raise ValueError(f"{column} has non-boolean values")
+    return raw.astype(dtype)
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    out = np.empty(len(values), dtype=object)
+    out[:] = list(values)
+    return out
+
+
+def _loads_column(values: pd.Series) -> np.ndarray:
+    """Decode a column of JSON strings (or nulls) with a single ``json.loads``."""
+    out = np.full(len(values), None, dtype=object)
+    present = values.notna().to_numpy()
+    if present.any():
+        out[np.flatnonzero(present)] = _object_array(json.loads("[" + ",".join(values[present]) + "]"))
+    return out
+
+
+@dataclass(slots=True)
+class FeatureBatch:
+    """N feature vectors stored column-wise.
+
+    ``columns`` maps each flattened column name in ``FEATURE_COLUMNS`` to a NumPy
+    array; optional fields are object arrays holding ``None`` where absent, with
+    CLIP embeddings stored as float64 arrays.
+    """
+
+    columns: dict[str, np.ndarray]
+    clip_embedding: np.ndarray
+    semantic_scores: np.ndarray
+    model_metadata: np.ndarray = field(repr=False)
+
+    def __post_init__(self) -> None:
+        lengths = {len(values) for values in self.columns.values()}
+        lengths |= {len(self.clip_embedding), len(self.semantic_scores), len(self.model_metadata)}
+        if len(lengths) > 1:
+            raise ValueError(f"FeatureBatch columns have mismatched lengths: {sorted(lengths)}")
+        missing = {column for column, *_ in FEATURE_COLUMNS} - set(self.columns)
+        if missing:
+            raise ValueError(f"FeatureBatch is missing columns: {sorted(missing)}")
+
+    def __len__(self) -> int:
+        return len(self.clip_embedding)
+
+    @classmethod
+    def from_feature_vectors(
+        cls,
+        vectors: Sequence[FeatureVector | Mapping[str, Any]],
+        validate: bool = True,
+    ) -> "FeatureBatch":
+        """
+        Build a batch from FeatureVector models and/or nested dictionaries.
+
+        Dictionaries are not run through Pydantic one by one; the whole batch is
+        checked against the schema constraints at once instead. Fields the schema
+        defaults may be left out, and counts must be whole numbers.
+
+        Args:
+            vectors: FeatureVector instances or dictionaries in FeatureVector layout
+            validate: If True, raise ValueError when any row violates the schema
+
+        Returns:
+            FeatureBatch with one row per input vector
+        """
+        try:
+            columns: dict[str, np.ndarray] = {}
+            for column, group, name, dtype in FEATURE_COLUMNS:
+                values = [_get(item, group, name) for item in vectors]
+                if column == "temporal_timestamp":
+                    columns[column] = _object_array([_to_datetime(v) for v in values])
+                elif dtype == "object":
+                    columns[column] = _object_array(values)
+                else:
+                    columns[column] = _numeric_array(column, values, dtype)
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            raise ValueError(f"Invalid feature vector input: {exc!r}") from exc
+
+        embeddings = [_get_optional(item, "clip_embedding") for item in vectors]
+        batch = cls(
+            columns=columns,
+            clip_embedding=_object_array(
+                [None if e is None else np.asarray(e, dtype=np.float64) for e in embeddings]
+            ),
+            semantic_scores=_object_array([_get_optional(item, "semantic_scores") for item in vectors]),
+            model_metadata=_object_array([_get_optional(item, "model_metadata") for item in vectors]),
+        )
+        if validate:
+            batch.check_schema()
+        return batch
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "FeatureBatch":
+        """
+        Build a batch from flattened rows (the ``features.parquet`` layout).
+
+        Args:
+            df: DataFrame with flattened feature columns
+
+        Returns:
+            FeatureBatch with one row per DataFrame row
+        """
+        columns: dict[str, np.ndarray] = {}
+        for column, _group, _name, dtype in FEATURE_COLUMNS:
+            if column == "temporal_timestamp":
+                values = df[column] if column in df.columns else pd.Series([None] * len(df))
+                columns[column] = _object_array([_to_datetime(v) for v in values])
+            elif column in df.columns:
+                columns[column] = df[column].to_numpy(dtype=dtype)
+            else:
+                columns[column] = np.full(len(df), FLAT_COLUMN_DEFAULTS[column], dtype=dtype)
+
+        def optional(column: str) -> np.ndarray:
+            if column not in df.columns:
+                return np.full(len(df), None, dtype=object)
+            return _loads_column(df[column])
+
+        embeddings = optional("clip_embedding")
+        for i in np.flatnonzero(embeddings != None):  # noqa: E711 - elementwise on object array
+            embeddings[i] = np.asarray(embeddings[i], dtype=np.float64)
+
+        return cls(
+            columns=columns,
+            clip_embedding=embeddings,
+            semantic_scores=optional("semantic_scores"),
+            model_metadata=optional("model_metadata"),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["FeatureBatch"]) -> "FeatureBatch":
+        """Concatenate batches row-wise."""
+        if not batches:
+            raise ValueError("No batches to concatenate")
+        return cls(
+            columns={
+                column: np.concatenate([batch.columns[column] for batch in batches])
+                for column, *_ in FEATURE_COLUMNS
+            },
+            clip_embedding=np.concatenate([batch.clip_embedding for batch in batches]),
+            semantic_scores=np.concatenate([batch.semantic_scores for batch in batches]),
+            model_metadata=np.concatenate([batch.model_metadata for batch in batches]),
+        )
+
+    def to_frame(
+        self,
+        metadata: Mapping[str, Sequence[Any] | Any] | None = None,
+        serialize: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Convert to flattened rows in the ``features.parquet`` layout.
+
+        Args:
+            metadata: Optional metadata columns (image_path, camera_id, ...), each a
+                sequence aligned with the batch or a scalar repeated for every row
+            serialize: If True, encode timestamps as ISO strings and optional fields
+                as JSON strings as stored on disk; otherwise keep decoded values
+
+        Returns:
+            DataFrame with one row per feature vector
+        """
+        data: dict[str, Any] = {}
+        for column in METADATA_COLUMNS:
+            value = (metadata or {}).get(column)
+            data[column] = list(value) if isinstance(value, (list, tuple, np.ndarray, pd.Series)) else [value] * len(self)
+
+        for column, *_ in FEATURE_COLUMNS:
+            values = self.columns[column]
+            if serialize and column == "temporal_timestamp":
+                values = [ts.isoformat() for ts in values]
+            data[column] = values
+
+        if serialize:
+            data["clip_embedding"] = [None if e is None else json.dumps(e.tolist()) for e in self.clip_embedding]
+            data["clip_embedding_dim"] = [None if e is None else len(e) for e in self.clip_embedding]
+            data["semantic_scores"] = [None if s is None else json.dumps(s) for s in self.semantic_scores]
+            data["model_metadata"] = [None if m is None else json.dumps(m) for m in self.model_metadata]
+        else:
+            data["clip_embedding"] = self.clip_embedding
+            data["clip_embedding_dim"] = [None if e is None else len(e) for e in self.clip_embedding]
+            data["semantic_scores"] = self.semantic_scores
+            data["model_metadata"] = self.model_metadata
+
+        return pd.DataFrame(data)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Convert to nested dictionaries in ``FeatureVector.model_dump()`` layout."""
+        columns = {column: self.columns[column].tolist() for column, *_ in FEATURE_COLUMNS}
+        embeddings = [None if e is None else e.tolist() for e in self.clip_embedding]
+        records = []
+        for i in range(len(self)):
+            record: dict[str, Any] = {group: {} for group in _GROUP_MODELS}
+            for column, group, name, _dtype in FEATURE_COLUMNS:
+                record[group][name] = columns[column][i]
+            record["clip_embedding"] = embeddings[i]
+            record["semantic_scores"] = self.semantic_scores[i]
+            record["model_metadata"] = self.model_metadata[i]
+            records.append(record)
+        return records
+
+    def to_feature_vectors(self) -> list[FeatureVector]:
+        """
+        Convert to FeatureVector models.
+
+        Rows are assumed valid (see ``check_schema``) and are constructed without
+        re-running Pydantic validation.
+
+        Returns:
+            List of FeatureVector instances
+        """
+        vectors = []
+        for record in self.to_records():
+            groups = {group: model.model_construct(**record[group]) for group, model in _GROUP_MODELS.items()}
+            vectors.append(
+                FeatureVector.model_construct(
+                    **groups,
+                    clip_embedding=record["clip_embedding"],
+                    semantic_scores=record["semantic_scores"],
+                    model_metadata=record["model_metadata"],
+                )
+            )
+        return vectors
+
+    def validate(self, strict: bool = False) -> FrameValidationResult:
+        """
+        Run schema and consistency checks over the whole batch.
+
+        Args:
+            strict: If True, treat warnings as errors
+
+        Returns:
+            FrameValidationResult with per-rule violating rows and counts
+        """
+        df = self.to_frame(serialize=False)
+        df["temporal_timestamp"] = [ts.isoformat() for ts in df["temporal_timestamp"]]
+        return validate_feature_frame(df, strict=strict)
+
+    def check_schema(self) -> None:
+        """Raise ValueError if any row violates the FeatureVector schema constraints."""
+        result = self.validate()
+        bad_rows = result.violations["schema"]
+        if len(bad_rows):
+            raise ValueError(
+                f"{len(bad_rows)} of {len(self)} feature vectors violate the schema "
+                f"(first rows: {list(bad_rows[:5])})"
+            )
+
+
+__all__ = ["FEATURE_COLUMNS", "METADATA_COLUMNS", "FeatureBatch"]
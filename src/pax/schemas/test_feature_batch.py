@@ -0,0 +1,96 @@
+"""Test FeatureBatch conversions against the Pydantic model and Parquet layout."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from pax.schemas.feature_batch import FeatureBatch
+from pax.schemas.feature_vector import FeatureVector
+from pax.schemas.test_validation import create_inconsistent_temporal_feature_vector, create_valid_feature_vector
+from pax.storage.feature_storage import FeatureStorage
+
+
+def make_vectors():
+    first = create_valid_feature_vector()
+    second = create_inconsistent_temporal_feature_vector().model_copy(
+        update={
+            "clip_embedding": list(np.linspace(-1.0, 1.0, 512)),
+            "semantic_scores": {"busy intersection": 0.31},
+            "model_metadata": {"yolo": "v8n"},
+        }
+    )
+    aware = first.temporal.model_copy(
+        update={"timestamp": datetime(2025, 11, 10, 14, 30, tzinfo=timezone(timedelta(hours=-5)))}
+    )
+    third = first.model_copy(update={"temporal": aware})
+    return [first, second, third]
+
+
+def test_round_trip_models_and_frame():
+    """Models -> batch -> Parquet rows -> batch -> models is lossless."""
+    vectors = make_vectors()
+    batch = FeatureBatch.from_feature_vectors(vectors)
+    assert len(batch) == 3
+
+    restored = FeatureBatch.from_frame(batch.to_frame())
+    assert [fv.model_dump() for fv in restored.to_feature_vectors()] == [fv.model_dump() for fv in vectors]
+    assert restored.to_records() == [fv.model_dump() for fv in vectors]
+
+
+def test_bulk_schema_validation():
+    """Dictionaries violating the schema are rejected for the whole batch."""
+    bad = create_valid_feature_vector().model_dump()
+    bad["spatial"]["crowd_density"] = 1.5
+    with pytest.raises(ValueError, match="violate the schema"):
+        FeatureBatch.from_feature_vectors([create_valid_feature_vector().model_dump(), bad])
+
+
+def test_storage_uses_batches(tmp_path):
+    """FeatureStorage saves and loads batches through the Parquet layout."""
+    vectors = make_vectors()
+    storage = FeatureStorage(tmp_path, format="both")
+    storage.save_feature_vectors_batch(vectors, [f"img_{i}.jpg" for i in range(3)], camera_ids=["a", "b", "c"])
+    storage.save_feature_vector(vectors[0], "img_3.jpg", camera_id="a")
+
+    # Dict loading keeps its original layout: ISO timestamps, unset optional fields absent.
+    expected = []
+    for fv in vectors + vectors[:1]:
+        record = fv.model_dump(exclude_none=True)
+        record["temporal"]["timestamp"] = fv.temporal.timestamp.isoformat()
+        expected.append({key: value for key, value in record.items() if value != {}})
+    loaded = storage.load_feature_vectors(format="parquet")
+    assert loaded == expected
+    assert "clip_embedding" not in loaded[0] and loaded[1]["clip_embedding"] == vectors[1].clip_embedding
+    assert len(storage.load_feature_batch(limit=2)) == 2
+
+
+def test_dict_input_fills_schema_defaults():
+    """Dictionaries may leave out fields the schema defaults, as with Pydantic."""
+    record = create_valid_feature_vector().model_dump()
+    del record["visual_complexity"]["weather_condition"]
+    batch = FeatureBatch.from_feature_vectors([record])
+    assert batch.columns["visual_weather_condition"].tolist() == ["unknown"]
+    assert batch.to_records()[0] == FeatureVector.model_validate(record).model_dump()
+
+
+@pytest.mark.parametrize(
+    ("group", "name", "value"),
+    [
+        ("spatial", "pedestrian_count", 2.7),
+        ("spatial", "vehicle_count", "three"),
+        ("spatial", "crowd_density", None),
+        ("temporal", "is_weekend", 0.5),
+    ],
+)
+def test_dict_input_rejects_values_pydantic_would(group, name, value):
+    """Fractional counts and non-numeric values are rejected, not truncated or coerced."""
+    record = create_valid_feature_vector().model_dump()
+    record[group][name] = value
+    with pytest.raises(ValidationError):
+        FeatureVector.model_validate(record)
+    with pytest.raises(ValueError, match="Invalid feature vector input"):
+        FeatureBatch.from_feature_vectors([record])
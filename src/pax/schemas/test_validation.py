@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import json
 from datetime import datetime
 
+import pandas as pd
+
 from pax.schemas.feature_vector import FeatureVector, SpatialFeatures, TemporalFeatures, VisualComplexityFeatures
 from pax.schemas.validation import (
     handle_missing_values,
+    validate_feature_frame,
     validate_feature_vector,
     validate_feature_vector_dict,
 )
@@ -252,6 +256,60 @@ def test_dict_validation():
     print("✓ PASSED: Dictionary validation works correctly\n")
 
 
+def flatten_feature_vector(feature_vector: FeatureVector) -> dict:
+    """Flatten a feature vector into the Parquet row layout used by FeatureStorage."""
+    row = {f"spatial_{key}": value for key, value in feature_vector.spatial.model_dump().items()}
+    visual = feature_vector.visual_complexity
+    row.update(
+        {
+            "visual_scene_complexity": visual.scene_complexity,
+            "visual_noise": visual.visual_noise,
+            "visual_lighting_condition": visual.lighting_condition,
+            "visual_lighting_brightness": visual.lighting_brightness,
+            "visual_weather_condition": visual.weather_condition,
+            "visual_visibility_score": visual.visibility_score,
+            "visual_occlusion_score": visual.occlusion_score,
+        }
+    )
+    temporal = feature_vector.temporal.model_dump()
+    temporal["timestamp"] = feature_vector.temporal.timestamp.isoformat()
+    row.update({f"temporal_{key}": value for key, value in temporal.items()})
+    row["clip_embedding"] = None
+    return row
+
+
+def test_frame_validation():
+    """Test columnar validation agrees with the per-row validator."""
+    print("=" * 70)
+    print("Test 6: Columnar Frame Validation")
+    print("=" * 70)
+
+    valid = create_valid_feature_vector()
+    undercounted = valid.model_copy(update={"spatial": valid.spatial.model_copy(update={"total_object_count": 5})})
+    vectors = [valid, create_inconsistent_temporal_feature_vector(), undercounted]
+    df = pd.DataFrame([flatten_feature_vector(fv) for fv in vectors])
+    df.loc[0, "clip_embedding"] = "[" + ",".join(["0.1"] * 511 + ["12.0"]) + "]"
+    df.loc[1, "clip_embedding"] = "[0.1, 0.2]"
+
+    result = validate_feature_frame(df)
+    print(result)
+
+    expected = []
+    for fv, embedding in zip(vectors, df["clip_embedding"]):
+        data = fv.model_dump()
+        data["clip_embedding"] = json.loads(embedding) if embedding else None
+        expected.append(validate_feature_vector_dict(data))
+
+    assert [not r.is_valid for r in expected] == result.invalid.tolist(), "Validity should match per-row validator"
+    per_row_warnings: dict[str, int] = {}
+    for r in expected:
+        for warning in r.warnings:
+            per_row_warnings[warning.field] = per_row_warnings.get(warning.field, 0) + 1
+    assert result.field_summary() == per_row_warnings, "Warning counts should match per-row validator"
+    assert list(result.violations["clip_embedding.dimension"]) == [1]
+    print("✓ PASSED: Columnar validation matches per-row validation\n")
+
+
 def main():
     """Run all validation tests."""
     print("\n" + "=" * 70)
@@ -264,6 +322,7 @@ def main():
         test_inconsistent_spatial()
         test_missing_values()
         test_dict_validation()
+        test_frame_validation()
 
         print("=" * 70)
         print("ALL TESTS PASSED")
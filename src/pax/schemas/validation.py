@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+import pandas as pd
 from pydantic import ValidationError
 
 from pax.schemas.feature_vector import FeatureVector, SpatialFeatures, TemporalFeatures, VisualComplexityFeatures
@@ -472,3 +475,315 @@ def handle_missing_values(data: dict[str, Any], defaults: dict[str, Any] | None
 
     return result
 
+
+
+# --- Columnar validation -----------------------------------------------------
+
+# Defaults for absent Parquet columns, matching the flattened-row reconstruction
+# used by the quality-check scripts before per-row validation.
+FLAT_COLUMN_DEFAULTS: dict[str, Any] = {
+    "spatial_pedestrian_count": 0,
+    "spatial_vehicle_count": 0,
+    "spatial_bicycle_count": 0,
+    "spatial_total_object_count": 0,
+    "spatial_pedestrian_density": 0.0,
+    "spatial_vehicle_density": 0.0,
+    "spatial_crowd_density": 0.0,
+    "spatial_object_density": 0.0,
+    "visual_scene_complexity": 0.0,
+    "visual_noise": 0.0,
+    "visual_lighting_condition": "unknown",
+    "visual_lighting_brightness": 0.5,
+    "visual_weather_condition": "unknown",
+    "visual_visibility_score": 1.0,
+    "visual_occlusion_score": 0.0,
+    "temporal_hour": 0,
+    "temporal_minute": 0,
+    "temporal_day_of_week": 1,
+    "temporal_is_weekend": False,
+    "temporal_is_rush_hour": False,
+    "temporal_time_of_day_encoding": 0.0,
+    "temporal_day_of_week_encoding": 0.0,
+}
+
+# Pydantic field constraints from ``FeatureVector`` as (column, lower, upper).
+_RANGE_CONSTRAINTS: tuple[tuple[str, float, float], ...] = (
+    ("spatial_pedestrian_count", 0, np.inf),
+    ("spatial_vehicle_count", 0, np.inf),
+    ("spatial_bicycle_count", 0, np.inf),
+    ("spatial_total_object_count", 0, np.inf),
+    ("spatial_pedestrian_density", 0.0, np.inf),
+    ("spatial_vehicle_density", 0.0, np.inf),
+    ("spatial_crowd_density", 0.0, 1.0),
+    ("spatial_object_density", 0.0, np.inf),
+    ("visual_scene_complexity", 0.0, 1.0),
+    ("visual_noise", 0.0, 1.0),
+    ("visual_lighting_brightness", 0.0, 1.0),
+    ("visual_visibility_score", 0.0, 1.0),
+    ("visual_occlusion_score", 0.0, 1.0),
+    ("temporal_hour", 0, 23),
+    ("temporal_minute", 0, 59),
+    ("temporal_day_of_week", 1, 7),
+    ("temporal_time_of_day_encoding", 0.0, 1.0),
+    ("temporal_day_of_week_encoding", 0.0, 1.0),
+)
+
+_LITERAL_CONSTRAINTS: dict[str, frozenset[str]] = {
+    "visual_lighting_condition": frozenset({"daylight", "twilight", "night", "artificial"}),
+    "visual_weather_condition": frozenset({"clear", "cloudy", "rainy", "foggy", "snowy", "unknown"}),
+}
+
+_INT_COLUMNS = frozenset(
+    {
+        "spatial_pedestrian_count",
+        "spatial_vehicle_count",
+        "spatial_bicycle_count",
+        "spatial_total_object_count",
+        "temporal_hour",
+        "temporal_minute",
+        "temporal_day_of_week",
+    }
+)
+
+# Rule name -> (warning field, severity). Field names match ValidationWarning.field
+# from the per-row validators so summaries line up.
+FRAME_RULES: dict[str, tuple[str, str]] = {
+    "schema": ("schema", "error"),
+    "temporal.hour": ("temporal.hour", "warning"),
+    "temporal.minute": ("temporal.minute", "warning"),
+    "temporal.day_of_week": ("temporal.day_of_week", "warning"),
+    "temporal.is_weekend": ("temporal.is_weekend", "warning"),
+    "temporal.is_rush_hour": ("temporal.is_rush_hour", "warning"),
+    "temporal.time_of_day_encoding": ("temporal.time_of_day_encoding", "warning"),
+    "temporal.day_of_week_encoding": ("temporal.day_of_week_encoding", "warning"),
+    "spatial.total_object_count": ("spatial.total_object_count", "error"),
+    "spatial.pedestrian_density": ("spatial.pedestrian_density", "warning"),
+    "spatial.vehicle_density": ("spatial.vehicle_density", "warning"),
+    "spatial.crowd_density": ("spatial.crowd_density", "error"),
+    "visual_complexity.night_brightness": ("visual_complexity.lighting_brightness", "warning"),
+    "visual_complexity.daylight_brightness": ("visual_complexity.lighting_brightness", "warning"),
+    "visual_complexity.visibility_score": ("visual_complexity.visibility_score", "warning"),
+    "visual_complexity.scene_complexity": ("visual_complexity.scene_complexity", "error"),
+    "clip_embedding.dimension": ("clip_embedding", "error"),
+    "clip_embedding.value_range": ("clip_embedding", "warning"),
+}
+
+
+class FrameValidationResult:
+    """Result of validating a flattened feature DataFrame column-wise.
+
+    ``violations`` maps each rule in ``FRAME_RULES`` to the index labels of the
+    rows that broke it; ``counts`` is the number of warnings the per-row
+    validator would emit for that rule (the embedding value-range rule emits one
+    per offending value). Rows failing ``schema`` are not checked further, as
+    Pydantic would reject them before any consistency check runs.
+    """
+
+    def __init__(
+        self,
+        index: pd.Index,
+        invalid: np.ndarray,
+        violations: dict[str, pd.Index],
+        counts: dict[str, int],
+    ):
+        self.index = index
+        self.invalid = invalid
+        self.violations = violations
+        self.counts = counts
+
+    @property
+    def total(self) -> int:
+        return len(self.index)
+
+    @property
+    def invalid_count(self) -> int:
+        return int(self.invalid.sum())
+
+    @property
+    def valid_count(self) -> int:
+        return self.total - self.invalid_count
+
+    @property
+    def invalid_rows(self) -> pd.Index:
+        return self.index[self.invalid]
+
+    def field_summary(self, severity: str = "warning") -> dict[str, int]:
+        """Aggregate warning counts by field for rules of the given severity."""
+        summary: dict[str, int] = {}
+        for rule, count in self.counts.items():
+            field, rule_severity = FRAME_RULES[rule]
+            if rule_severity == severity and count:
+                summary[field] = summary.get(field, 0) + count
+        return summary
+
+    def rules_for_row(self, label: Any) -> list[str]:
+        """Return the rules violated by a single row (for reporting samples)."""
+        return [rule for rule, rows in self.violations.items() if label in rows]
+
+    def __str__(self) -> str:
+        lines = [f"Validated {self.total} rows: {self.valid_count} valid, {self.invalid_count} invalid"]
+        lines.extend(
+            f"  - {rule} ({FRAME_RULES[rule][1]}): {count}" for rule, count in self.counts.items() if count
+        )
+        return "\n".join(lines)
+
+
+def _frame_column(df: pd.DataFrame, column: str) -> pd.Series:
+    if column in df.columns:
+        return df[column]
+    return pd.Series(FLAT_COLUMN_DEFAULTS[column], index=df.index)
+
+
+def _frame_timestamps(values: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return (valid, hour, minute, isoweekday) in each timestamp's own offset."""
+    try:
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+        valid = parsed.notna().to_numpy()
+        hour = parsed.dt.hour.to_numpy(dtype=float, na_value=np.nan)
+        minute = parsed.dt.minute.to_numpy(dtype=float, na_value=np.nan)
+        dow = parsed.dt.dayofweek.to_numpy(dtype=float, na_value=np.nan) + 1
+    except (TypeError, ValueError):
+        # Mixed UTC offsets cannot share a tz-aware column; fall back per element.
+        parsed = values.map(lambda v: pd.Timestamp(v) if pd.notna(v) else pd.NaT)
+        valid = parsed.notna().to_numpy()
+        hour = parsed.map(lambda t: t.hour if pd.notna(t) else np.nan).to_numpy(dtype=float)
+        minute = parsed.map(lambda t: t.minute if pd.notna(t) else np.nan).to_numpy(dtype=float)
+        dow = parsed.map(lambda t: t.isoweekday() if pd.notna(t) else np.nan).to_numpy(dtype=float)
+    return valid, hour, minute, dow
+
+
+def _frame_clip_checks(embeddings: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (schema_ok, bad_dimension, out_of_range_count) for JSON or decoded embeddings."""
+    n = len(embeddings)
+    schema_ok = np.ones(n, dtype=bool)
+    bad_dim = np.zeros(n, dtype=bool)
+    out_of_range = np.zeros(n, dtype=np.int64)
+
+    present = embeddings.notna().to_numpy()
+    if not present.any():
+        return schema_ok, bad_dim, out_of_range
+
+    values = embeddings[present]
+    positions = np.flatnonzero(present)
+    if values.map(lambda v: isinstance(v, str)).all():
+        # JSON null elements fail ``list[float]``; NaN literals pass and trip the range rule.
+        has_null = values.str.contains("null", regex=False).to_numpy()
+        schema_ok[positions[has_null]] = False
+        # Parse every embedding in a single json.loads call rather than one per row.
+        parsed = json.loads("[" + ",".join(values[~has_null]) + "]")
+        positions = positions[~has_null]
+    else:
+        # Already-decoded sequences (e.g. FeatureBatch columns).
+        parsed = list(values)
+    dims = np.fromiter((len(vec) for vec in parsed), dtype=np.int64, count=len(parsed))
+    bad_dim[positions] = ~np.isin(dims, (512, 768))
+
+    for dim in np.unique(dims):
+        members = np.flatnonzero(dims == dim)
+        matrix = np.asarray([parsed[i] for i in members], dtype=float).reshape(len(members), int(dim))
+        out_of_range[positions[members]] = (~((matrix >= -10.0) & (matrix <= 10.0))).sum(axis=1)
+
+    return schema_ok, bad_dim, out_of_range
+
+
+def validate_feature_frame(df: pd.DataFrame, strict: bool = False) -> FrameValidationResult:
+    """
+    Validate flattened feature rows (as stored in ``features.parquet``) in bulk.
+
+    Applies the same schema constraints and consistency rules as
+    ``validate_feature_vector_dict`` but over whole columns with NumPy masks,
+    so it scales to millions of rows.
+
+    Args:
+        df: DataFrame with the flattened ``spatial_*``/``visual_*``/``temporal_*`` columns
+        strict: If True, treat warnings as errors
+
+    Returns:
+        FrameValidationResult with per-rule violating rows and counts
+    """
+    n = len(df)
+    cols: dict[str, np.ndarray] = {}
+    schema_ok = np.ones(n, dtype=bool)
+
+    for column, lower, upper in _RANGE_CONSTRAINTS:
+        values = pd.to_numeric(_frame_column(df, column), errors="coerce").to_numpy(dtype=float)
+        if column in _INT_COLUMNS:
+            values = np.trunc(values)
+        cols[column] = values
+        schema_ok &= (values >= lower) & (values <= upper)  # NaN compares False
+
+    for column, allowed in _LITERAL_CONSTRAINTS.items():
+        values = _frame_column(df, column)
+        cols[column] = values.to_numpy(dtype=object)
+        schema_ok &= values.isin(allowed).to_numpy()
+
+    for column in ("temporal_is_weekend", "temporal_is_rush_hour"):
+        cols[column] = _frame_column(df, column).fillna(False).astype(bool).to_numpy()
+
+    if "temporal_timestamp" in df.columns:
+        ts_ok, ts_hour, ts_minute, ts_dow = _frame_timestamps(df["temporal_timestamp"])
+    else:
+        ts_ok = np.zeros(n, dtype=bool)
+        ts_hour = ts_minute = ts_dow = np.full(n, np.nan)
+    schema_ok &= ts_ok
+
+    if "clip_embedding" in df.columns:
+        clip_ok, bad_dim, out_of_range = _frame_clip_checks(df["clip_embedding"])
+        schema_ok &= clip_ok
+    else:
+        bad_dim = np.zeros(n, dtype=bool)
+        out_of_range = np.zeros(n, dtype=np.int64)
+
+    hour = cols["temporal_hour"]
+    minute = cols["temporal_minute"]
+    dow = cols["temporal_day_of_week"]
+    brightness = cols["visual_lighting_brightness"]
+    lighting = cols["visual_lighting_condition"]
+    weather = cols["visual_weather_condition"]
+
+    expected_rush = (dow <= 5) & np.isin(hour, (7, 8, 17, 18))
+    expected_total = (
+        cols["spatial_pedestrian_count"] + cols["spatial_vehicle_count"] + cols["spatial_bicycle_count"]
+    )
+
+    masks: dict[str, np.ndarray] = {
+        "temporal.hour": ts_hour != hour,
+        "temporal.minute": ts_minute != minute,
+        "temporal.day_of_week": ts_dow != dow,
+        "temporal.is_weekend": cols["temporal_is_weekend"] != np.isin(dow, (6, 7)),
+        "temporal.is_rush_hour": cols["temporal_is_rush_hour"] != expected_rush,
+        "temporal.time_of_day_encoding": np.abs(
+            cols["temporal_time_of_day_encoding"] - (hour * 60 + minute) / 1440.0
+        )
+        > 0.001,
+        "temporal.day_of_week_encoding": np.abs(cols["temporal_day_of_week_encoding"] - (dow - 1) / 7.0) > 0.001,
+        "spatial.total_object_count": cols["spatial_total_object_count"] < expected_total,
+        "spatial.pedestrian_density": cols["spatial_pedestrian_density"] > 10.0,
+        "spatial.vehicle_density": cols["spatial_vehicle_density"] > 5.0,
+        "spatial.crowd_density": cols["spatial_crowd_density"] > 1.0,
+        "visual_complexity.night_brightness": (lighting == "night") & (brightness > 0.3),
+        "visual_complexity.daylight_brightness": (lighting == "daylight") & (brightness < 0.5),
+        "visual_complexity.visibility_score": np.isin(weather, ("rainy", "foggy", "snowy"))
+        & (cols["visual_visibility_score"] > 0.8),
+        "visual_complexity.scene_complexity": (cols["visual_scene_complexity"] > 1.0)
+        | (cols["visual_scene_complexity"] < 0.0),
+        "clip_embedding.dimension": bad_dim,
+        "clip_embedding.value_range": out_of_range > 0,
+    }
+
+    schema_failed = ~schema_ok
+    invalid = schema_failed.copy()
+    violations: dict[str, pd.Index] = {"schema": df.index[schema_failed]}
+    counts: dict[str, int] = {"schema": int(schema_failed.sum())}
+
+    for rule, mask in masks.items():
+        mask = mask & schema_ok
+        violations[rule] = df.index[mask]
+        if rule == "clip_embedding.value_range":
+            counts[rule] = int(out_of_range[mask].sum())
+        else:
+            counts[rule] = int(mask.sum())
+        if strict or FRAME_RULES[rule][1] == "error":
+            invalid |= mask
+
+    return FrameValidationResult(index=df.index, invalid=invalid, violations=violations, counts=counts)
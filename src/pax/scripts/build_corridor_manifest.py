@@ -21,6 +21,8 @@ import yaml
 from shapely.geometry import Polygon
 from shapely.ops import unary_union
 
+from ..corridor.geometry_cache import load_manhattan_centerlines
+
 LOGGER = logging.getLogger(__name__)
 
 # Street naming variations to include inside the corridor
@@ -145,12 +147,6 @@ def load_cameras(path: Path) -> list[dict[str, Any]]:
     return cleaned
 
 
-def filter_manhattan(dcm: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    if "Borough" not in dcm.columns:
-        return dcm
-    return dcm[dcm["Borough"].str.lower() == "manhattan"].copy()
-
-
 def select_north_south(dcm: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     return dcm[dcm["Street_NM"].isin(NORTH_SOUTH_STREETS)].copy()
 
@@ -172,12 +168,9 @@ def build_corridor_polygon(
     street_buffer_m: float,
 ) -> Polygon:
     LOGGER.info("Reading DCM centerlines from %s", dcm_path)
-    dcm = gpd.read_file(dcm_path)
-
-    if dcm.crs is None:
-        raise ValueError("DCM shapefile lacks CRS information")
+    # Already filtered to Manhattan and reprojected to EPSG:4326 by the cache loader.
+    dcm = load_manhattan_centerlines(dcm_path)
 
-    dcm = filter_manhattan(dcm)
     LOGGER.info("Manhattan segments: %d", len(dcm))
 
     ns = select_north_south(dcm)
@@ -8,12 +8,13 @@ import json
 import logging
 import sys
 from collections import defaultdict
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
-
-from google.cloud import storage
+from typing import Iterable
 
 from ..config import PaxSettings
+from ..storage.inventory import BucketInventory
+from ..storage.transfer import BlobSource, GCSBlobSource, list_image_blobs, open_blob_source
 
 LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +29,34 @@ def build_parser() -> argparse.ArgumentParser:
         "--prefix",
         help="GCS prefix/folder (default: from settings or 'images')",
     )
+    parser.add_argument(
+        "--date",
+        dest="dates",
+        action="append",
+        type=date.fromisoformat,
+        help="Only check images captured on this date (YYYY-MM-DD); repeatable",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        help="Only check images from the last N days instead of scanning the whole prefix",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent listing requests",
+    )
+    parser.add_argument(
+        "--inventory",
+        type=Path,
+        help="Bucket inventory SQLite file (default: <storage root>/inventory/gcs_inventory.sqlite)",
+    )
+    parser.add_argument(
+        "--scan",
+        action="store_true",
+        help="List every blob under the prefix instead of querying the inventory (includes non-image files)",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -54,14 +83,27 @@ def parse_timestamp_from_path(blob_name: str) -> datetime | None:
     return None
 
 
-def check_bucket_status(bucket_name: str, prefix: str = "images") -> dict:
-    """Check GCS bucket status and return statistics."""
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    
-    LOGGER.info("Listing blobs in gs://%s/%s", bucket_name, prefix)
+def check_bucket_status(
+    bucket_name: str,
+    prefix: str = "images",
+    dates: Iterable[date] | None = None,
+    workers: int = 8,
+    source: BlobSource | None = None,
+) -> dict:
+    """Check GCS bucket status and return statistics.
+
+    With ``dates`` only those days' camera/date prefixes are listed (images
+    only); otherwise every blob under ``prefix`` is scanned.
+    """
+    source = source or GCSBlobSource(bucket_name)
     
-    blobs = list(bucket.list_blobs(prefix=prefix))
+    if dates is not None:
+        dates = sorted(set(dates))
+        LOGGER.info("Listing images in gs://%s/%s for %d day(s)", bucket_name, prefix, len(dates))
+        blobs = list_image_blobs(source, prefix, dates=dates, workers=workers)
+    else:
+        LOGGER.info("Listing blobs in gs://%s/%s", bucket_name, prefix)
+        blobs = list(source.list_blobs(prefix))
     LOGGER.info("Found %d total blobs", len(blobs))
     
     # Statistics
@@ -88,7 +130,8 @@ def check_bucket_status(bucket_name: str, prefix: str = "images") -> dict:
         total_images += 1
         total_size_bytes += blob.size or 0
         
-        # Extract camera ID from path: images/camera-id/timestamp.jpg
+        # Camera ID is the parent folder in both key layouts:
+        # images/camera-id/timestamp.jpg, images/date=.../hour=HH/camera-id/timestamp.jpg
         parts = blob.name.split("/")
         if len(parts) >= 3:
             camera_id = parts[-2]
@@ -142,6 +185,61 @@ def check_bucket_status(bucket_name: str, prefix: str = "images") -> dict:
     return status
 
 
+def check_inventory_status(
+    bucket_name: str,
+    prefix: str = "images",
+    inventory_path: Path | None = None,
+    workers: int = 8,
+    source: BlobSource | None = None,
+) -> dict:
+    """Return the same statistics as :func:`check_bucket_status` from the bucket inventory.
+
+    The inventory is refreshed incrementally first, so only days since the
+    last run are listed. It tracks images only, so ``file_types`` covers JPEGs.
+    """
+    with BucketInventory(inventory_path or PaxSettings().bucket_inventory_path()) as inventory:
+        inventory.refresh(source or GCSBlobSource(bucket_name), prefix, workers=workers)
+        totals = inventory.totals()
+        cameras = inventory.camera_stats()
+        camera_dates = inventory.camera_dates()
+    
+    dates_by_camera = camera_dates.groupby("camera_id")["capture_date"].apply(list).to_dict()
+    images_by_date = {day: int(count) for day, count in camera_dates.groupby("capture_date")["images"].sum().items()}
+    sorted_dates = sorted(images_by_date)
+    
+    camera_stats = {}
+    for row in cameras.itertuples(index=False):
+        camera_stats[row.camera_id] = {
+            "image_count": int(row.images),
+            "size_bytes": int(row.bytes),
+            "size_mb": round(row.bytes / (1024 * 1024), 2),
+            "dates_collected": dates_by_camera.get(row.camera_id, []),
+            "days_active": int(row.days_active),
+        }
+    
+    return {
+        "bucket": bucket_name,
+        "prefix": prefix,
+        "summary": {
+            "total_blobs": totals["images"],
+            "total_images": totals["images"],
+            "total_size_bytes": totals["bytes"],
+            "total_size_mb": round(totals["bytes"] / (1024 * 1024), 2),
+            "total_size_gb": round(totals["bytes"] / (1024 * 1024 * 1024), 2),
+            "unique_cameras": totals["cameras"],
+            "file_types": {"jpg": totals["images"]} if totals["images"] else {},
+        },
+        "date_range": {
+            "earliest": sorted_dates[0] if sorted_dates else None,
+            "latest": sorted_dates[-1] if sorted_dates else None,
+            "total_days": len(sorted_dates),
+        },
+        "images_by_date": images_by_date,
+        "cameras": camera_stats,
+        "checked_at": datetime.now().isoformat(),
+    }
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
@@ -150,8 +248,13 @@ def main(argv: list[str] | None = None) -> int:
     
     # Load settings
     settings = PaxSettings()
-    bucket_name = args.bucket or settings.remote.bucket or None
+    local_root = settings.remote.blob_store_root()
+    bucket_name = args.bucket or settings.remote.bucket or ("local" if local_root else None)
     prefix = args.prefix or settings.remote.prefix or "images"
+    dates = args.dates
+    if args.days:
+        today = datetime.now().date()
+        dates = (dates or []) + [today - timedelta(days=offset) for offset in range(args.days)]
     
     if not bucket_name:
         LOGGER.error("No bucket specified. Use --bucket or configure PAX_REMOTE_BUCKET")
@@ -159,7 +262,17 @@ def main(argv: list[str] | None = None) -> int:
         return 1
     
     try:
-        status = check_bucket_status(bucket_name, prefix)
+        source = open_blob_source(bucket_name, local_root)
+        if dates is not None or args.scan:
+            status = check_bucket_status(bucket_name, prefix, dates=dates, workers=args.workers, source=source)
+        else:
+            status = check_inventory_status(
+                bucket_name,
+                prefix,
+                inventory_path=args.inventory or settings.bucket_inventory_path(),
+                workers=args.workers,
+                source=source,
+            )
         
         if args.json:
             print(json.dumps(status, indent=2))
@@ -187,8 +300,8 @@ def main(argv: list[str] | None = None) -> int:
             
             if status['images_by_date']:
                 print(f"\nImages by Date (last 10 days):")
-                for date, count in list(sorted(status['images_by_date'].items()))[-10:]:
-                    print(f"  {date}: {count:,} images")
+                for day, count in list(sorted(status['images_by_date'].items()))[-10:]:
+                    print(f"  {day}: {count:,} images")
             
             if status['cameras']:
                 print(f"\nTop 10 Cameras by Image Count:")
@@ -11,10 +11,12 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from google.cloud import storage
-from shapely.geometry import Point, Polygon
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
 
 from ..config import PaxSettings
+from ..storage.transfer import BlobSource, GCSBlobSource, list_image_blobs, open_blob_source
 
 LOGGER = logging.getLogger(__name__)
 
@@ -69,19 +71,18 @@ def filter_cameras_in_zone(
     ])
     
     buffered_polygon = polygon.buffer(0.0003)  # ~33 meters
+    shapely.prepare(buffered_polygon)
     
-    filtered = []
-    for cam in cameras:
-        lat = cam.get("latitude")
-        lon = cam.get("longitude")
-        if lat is None or lon is None:
-            continue
-        
-        point = Point(lon, lat)
-        if buffered_polygon.intersects(point):
-            filtered.append(cam)
+    located = [
+        cam for cam in cameras if cam.get("latitude") is not None and cam.get("longitude") is not None
+    ]
+    if not located:
+        return []
     
-    return filtered
+    lons = np.array([float(cam["longitude"]) for cam in located])
+    lats = np.array([float(cam["latitude"]) for cam in located])
+    mask = shapely.intersects_xy(buffered_polygon, lons, lats)
+    return [cam for cam, keep in zip(located, mask) if keep]
 
 
 def check_zone_images_gcs(
@@ -89,8 +90,15 @@ def check_zone_images_gcs(
     prefix: str = "images",
     purple_zone: bool = True,
     red_zone: bool = True,
+    days: int | None = None,
+    workers: int = 8,
+    source: BlobSource | None = None,
 ) -> dict:
-    """Check GCS for images from cameras in specified zones."""
+    """Check GCS for images from cameras in specified zones.
+
+    Only the zone cameras' folders are listed (and, with ``days``, only the
+    last N days), rather than every blob under ``prefix``.
+    """
     from ..data_collection.camera_client import CameraAPIClient
     
     # Get all cameras from API
@@ -132,11 +140,20 @@ def check_zone_images_gcs(
     red_camera_ids = {cam.get("id") for cam in red_cameras if cam.get("id")}
     
     # Check GCS
-    gcs_client = storage.Client()
-    bucket = gcs_client.bucket(bucket_name)
+    source = source or GCSBlobSource(bucket_name)
+    dates = None
+    if days:
+        today = datetime.now().date()
+        dates = [today - timedelta(days=offset) for offset in range(days)]
     
-    LOGGER.info("Listing blobs in gs://%s/%s", bucket_name, prefix)
-    blobs = list(bucket.list_blobs(prefix=prefix))
+    LOGGER.info("Listing zone camera images in gs://%s/%s", bucket_name, prefix)
+    blobs = list_image_blobs(
+        source,
+        prefix,
+        dates=dates,
+        workers=workers,
+        cameras=purple_camera_ids | red_camera_ids,
+    )
     LOGGER.info("Found %d total blobs", len(blobs))
     
     # Track images by zone and date
@@ -152,7 +169,7 @@ def check_zone_images_gcs(
         if not blob.name.endswith((".jpg", ".jpeg")):
             continue
         
-        # Extract camera ID from path: images/camera-id/timestamp.jpg
+        # Camera ID is the parent folder in both key layouts
         parts = blob.name.split("/")
         if len(parts) < 3:
             continue
@@ -265,6 +282,17 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Check only red zone",
     )
+    parser.add_argument(
+        "--days",
+        type=int,
+        help="Only check the last N days instead of each camera's full history",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent listing requests",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -296,6 +324,9 @@ def main(argv: list[str] | None = None) -> int:
             prefix=args.prefix,
             purple_zone=purple_zone,
             red_zone=red_zone,
+            days=args.days,
+            workers=args.workers,
+            source=open_blob_source(bucket_name, settings.remote.blob_store_root()),
         )
         
         if "error" in result:
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Compare int8 quantized CLIP against fp32 on a sample of camera images.
+
+Reports how often the top scene label agrees, the cosine similarity of the
+image embeddings and the per-image latency of both models. The exit status
+is 1 when agreement or mean cosine falls below the given minimums, so the
+check can gate switching batch extraction to ``PAX_VISION`` ``clip_quantize``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import sys
+from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+def sample_images(paths: list[Path], sample: int, seed: int) -> list[Path]:
+    """Image files under ``paths`` (files or directories), sampled reproducibly."""
+    images: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            images.extend(p for p in sorted(path.rglob("*")) if p.suffix.lower() in IMAGE_SUFFIXES)
+        elif path.suffix.lower() in IMAGE_SUFFIXES:
+            images.append(path)
+    if len(images) > sample:
+        images = sorted(random.Random(seed).sample(images, sample))
+    return images
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "images",
+        nargs="+",
+        type=Path,
+        help="Image files or directories (searched recursively)",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=100,
+        help="Number of images to compare (default: 100)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Sampling seed",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["torch", "onnx"],
+        default="torch",
+        help="Backend for both models (default: torch)",
+    )
+    parser.add_argument(
+        "--model-name",
+        default="openai/clip-vit-base-patch32",
+        help="HuggingFace CLIP model",
+    )
+    parser.add_argument(
+        "--min-agreement",
+        type=float,
+        default=0.9,
+        help="Minimum top-scene agreement rate (default: 0.9)",
+    )
+    parser.add_argument(
+        "--min-cosine",
+        type=float,
+        default=0.98,
+        help="Minimum mean embedding cosine similarity (default: 0.98)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write the report as JSON to this file",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        help="Logging level",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s: %(message)s")
+
+    images = sample_images(args.images, args.sample, args.seed)
+    if not images:
+        parser.error("no images found")
+
+    from ..vision.clip import CLIPWrapper
+    from ..vision.quantization import compare_clip
+
+    reference = CLIPWrapper(args.model_name, backend=args.backend)
+    candidate = CLIPWrapper(args.model_name, backend=args.backend, quantize=True)
+    # Warm both models so one-off initialisation is not counted as latency.
+    reference.understand_scene(images[0])
+    candidate.understand_scene(images[0])
+    report = compare_clip(reference, candidate, images)
+
+    print(f"Images:              {report.images}")
+    print(f"Top-scene agreement: {report.top_scene_agreement:.1%}")
+    print(f"Embedding cosine:    mean {report.cosine_mean:.4f}  min {report.cosine_min:.4f}")
+    print(
+        f"Latency per image:   fp32 {report.reference_s_per_image * 1000:.1f} ms  "
+        f"int8 {report.candidate_s_per_image * 1000:.1f} ms  ({report.speedup or 0:.2f}x)"
+    )
+    for row in report.disagreements[:10]:
+        print(f"  {row['image_path']}: {row['reference']} -> {row['candidate']}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+        print(f"Wrote report to {args.output}")
+
+    passed = (
+        report.top_scene_agreement >= args.min_agreement and report.cosine_mean >= args.min_cosine
+    )
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -47,6 +47,11 @@ def build_parser() -> argparse.ArgumentParser:
         "--gcs-prefix",
         help="Override remote object prefix when uploading to GCS.",
     )
+    parser.add_argument(
+        "--local-bucket-root",
+        type=Path,
+        help="Upload into this directory instead of GCS (offline testing and benchmarks).",
+    )
     parser.add_argument(
         "--no-upload",
         action="store_true",
@@ -87,6 +92,11 @@ def main(argv: list[str] | None = None) -> int:
     settings = PaxSettings()
     if args.no_upload:
         settings.remote.provider = "none"
+    elif args.local_bucket_root:
+        settings.remote.provider = "local"
+        settings.remote.local_root = args.local_bucket_root
+        if args.gcs_prefix:
+            settings.remote.prefix = args.gcs_prefix
     elif args.gcs_bucket:
         settings.remote.provider = "gcs"
         settings.remote.bucket = args.gcs_bucket
@@ -7,14 +7,22 @@ import json
 import logging
 import sys
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any
 
-import yaml
-from google.cloud import storage
-
 from ..config import PaxSettings
+from ..storage.image_manifest import ImageManifest, open_image_manifest
+from ..storage.transfer import (
+    STATE_FILENAME,
+    BlobSource,
+    BulkDownloader,
+    GCSBlobSource,
+    blob_camera_id,
+    list_image_blobs,
+    open_blob_source,
+    parse_blob_timestamp,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -38,8 +46,27 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--manifest-path",
         type=Path,
-        default=Path("data/manifests/image_manifest.yaml"),
-        help="Path to save manifest YAML (default: data/manifests/image_manifest.yaml)",
+        default=Path("data/manifests/image_manifest"),
+        help="Manifest directory (default: data/manifests/image_manifest)",
+    )
+    parser.add_argument(
+        "--yaml",
+        dest="yaml_path",
+        type=Path,
+        help="Also export the manifest in the legacy image_manifest.yaml layout",
+    )
+    parser.add_argument(
+        "--date",
+        dest="dates",
+        action="append",
+        type=date.fromisoformat,
+        help="Only download images captured on this date (YYYY-MM-DD); repeatable",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Parallel download workers (default: 16)",
     )
     parser.add_argument(
         "--dry-run",
@@ -56,15 +83,9 @@ def build_parser() -> argparse.ArgumentParser:
 
 def parse_timestamp_from_path(blob_name: str) -> datetime | None:
     """Extract timestamp from blob path like: images/camera-id/YYYYMMDDTHHMMSS.jpg"""
-    try:
-        parts = blob_name.split("/")
-        if len(parts) >= 3:
-            filename = parts[-1]
-            timestamp_str = filename.replace(".jpg", "").replace(".jpeg", "")
-            return datetime.strptime(timestamp_str, "%Y%m%dT%H%M%S")
-    except Exception:
-        pass
-    return None
+    if blob_camera_id(blob_name) is None:
+        return None
+    return parse_blob_timestamp(blob_name)
 
 
 def download_images(
@@ -72,76 +93,66 @@ def download_images(
     prefix: str,
     output_dir: Path,
     dry_run: bool = False,
+    dates: list[date] | None = None,
+    workers: int = 16,
+    source: BlobSource | None = None,
 ) -> dict[str, Any]:
-    """Download images from GCS and organize by day."""
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    
+    """Download images from GCS in parallel and organize by day."""
+    source = source or GCSBlobSource(bucket_name)
+
     # Track all images
     camera_images: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    total_images = 0
-    downloaded = 0
-    
+    tasks = []
+
     LOGGER.info("Listing blobs in gs://%s/%s", bucket_name, prefix)
-    
-    blobs = list(bucket.list_blobs(prefix=prefix))
-    LOGGER.info("Found %d blobs", len(blobs))
-    
+    blobs = list_image_blobs(source, prefix, dates=dates, workers=workers)
+    total_images = len(blobs)
+
     for blob in blobs:
-        if not blob.name.endswith((".jpg", ".jpeg")):
-            continue
-        
-        total_images += 1
         timestamp = parse_timestamp_from_path(blob.name)
-        
         if not timestamp:
             LOGGER.warning("Could not parse timestamp from %s", blob.name)
             continue
-        
+
         # Extract camera ID from path: images/camera-id/timestamp.jpg
-        parts = blob.name.split("/")
-        if len(parts) < 3:
-            continue
-        
-        camera_id = parts[-2]
+        camera_id = blob_camera_id(blob.name)
         date_str = timestamp.strftime("%Y-%m-%d")
-        
-        # Create day directory
-        day_dir = output_dir / date_str
-        if not dry_run:
-            day_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Download path
-        local_path = day_dir / f"{camera_id}_{timestamp.strftime('%Y%m%dT%H%M%S')}.jpg"
-        
-        image_info = {
-            "camera_id": camera_id,
-            "timestamp": timestamp.isoformat(),
-            "date": date_str,
-            "gcs_path": blob.name,
-            "local_path": str(local_path.relative_to(output_dir.parent)) if not dry_run else None,
-            "size_bytes": blob.size,
-        }
-        
-        camera_images[camera_id].append(image_info)
-        
-        if not dry_run:
-            LOGGER.info("Downloading %s -> %s", blob.name, local_path)
-            blob.download_to_filename(local_path)
-            downloaded += 1
-        else:
+        local_path = output_dir / date_str / f"{camera_id}_{timestamp.strftime('%Y%m%dT%H%M%S')}.jpg"
+
+        camera_images[camera_id].append(
+            {
+                "camera_id": camera_id,
+                "timestamp": timestamp.isoformat(),
+                "date": date_str,
+                "gcs_path": blob.name,
+                "local_path": str(local_path.relative_to(output_dir.parent)) if not dry_run else None,
+                "size_bytes": blob.size,
+            }
+        )
+        tasks.append((blob, local_path))
+
+    downloaded = 0
+    failed: list[str] = []
+    if dry_run:
+        for blob, local_path in tasks[:20]:
             LOGGER.info("Would download %s -> %s", blob.name, local_path)
-    
+    else:
+        downloader = BulkDownloader(source, workers=workers, state_path=output_dir / STATE_FILENAME)
+        report = downloader.download(tasks)
+        downloaded = report.downloaded
+        failed = report.failed
+
     # Sort images by timestamp for each camera
     for camera_id in camera_images:
         camera_images[camera_id].sort(key=lambda x: x["timestamp"])
-    
-    LOGGER.info("Processed %d images (%d downloaded)", total_images, downloaded)
-    
+
+    LOGGER.info("Processed %d images (%d downloaded, %d failed)", total_images, downloaded, len(failed))
+
     return {
         "camera_images": dict(camera_images),
         "total_images": total_images,
         "downloaded": downloaded,
+        "failed": failed,
     }
 
 
@@ -149,111 +160,35 @@ def create_manifest(
     camera_images: dict[str, list[dict[str, Any]]],
     output_path: Path,
     bucket_name: str,
-) -> None:
-    """Create manifest YAML with camera stats and time ranges."""
-    
-    # Calculate stats per camera
-    cameras: dict[str, dict[str, Any]] = {}
-    all_dates = set()
-    
-    for camera_id, images in camera_images.items():
-        if not images:
-            continue
-        
-        timestamps = [datetime.fromisoformat(img["timestamp"]) for img in images]
-        earliest = min(timestamps)
-        latest = max(timestamps)
-        date_range = (latest - earliest).total_seconds() / 3600  # hours
-        
-        # Count images per day
-        images_by_date: dict[str, int] = defaultdict(int)
-        for img in images:
-            images_by_date[img["date"]] += 1
-            all_dates.add(img["date"])
-        
-        cameras[camera_id] = {
-            "camera_id": camera_id,
-            "total_images": len(images),
-            "time_range": {
-                "earliest": earliest.isoformat(),
-                "latest": latest.isoformat(),
-                "duration_hours": round(date_range, 2),
-                "duration_days": round(date_range / 24, 2),
-            },
-            "images_by_date": dict(sorted(images_by_date.items())),
-            "images": [
-                {
-                    "timestamp": img["timestamp"],
-                    "date": img["date"],
-                    "local_path": img.get("local_path"),
-                    "gcs_path": img["gcs_path"],
-                    "size_bytes": img["size_bytes"],
-                }
-                for img in images
-            ],
-        }
-    
-    # Calculate collection stats
-    sorted_dates = sorted(all_dates)
-    collection_start = sorted_dates[0] if sorted_dates else None
-    collection_end = sorted_dates[-1] if sorted_dates else None
-    
-    # Calculate percentage complete (assuming 30-min intervals over collection period)
-    # This is a rough estimate - you may want to adjust based on your requirements
-    completion_stats = {}
-    if collection_start and collection_end:
-        start_dt = datetime.fromisoformat(collection_start)
-        end_dt = datetime.fromisoformat(collection_end)
-        total_hours = (end_dt - start_dt).total_seconds() / 3600 + 24  # include last day
-        expected_images_per_camera = int(total_hours * 2)  # 2 per hour = 30-min intervals
-        
-        for camera_id, cam_data in cameras.items():
-            actual = cam_data["total_images"]
-            expected = expected_images_per_camera
-            pct_complete = round((actual / expected * 100) if expected > 0 else 0, 2)
-            completion_stats[camera_id] = {
-                "actual_images": actual,
-                "expected_images": expected,
-                "percentage_complete": pct_complete,
+    yaml_path: Path | None = None,
+) -> ImageManifest:
+    """Append downloaded images to the columnar manifest, optionally exporting YAML."""
+    manifest = open_image_manifest(output_path)
+    manifest.append(
+        (
+            {
+                "camera_id": camera_id,
+                "timestamp": img["timestamp"],
+                "date": img["date"],
+                "local_path": img.get("local_path"),
+                "gcs_path": img["gcs_path"],
+                "size_bytes": img["size_bytes"],
             }
-    
-    manifest = {
-        "metadata": {
-            "bucket": bucket_name,
-            "collection_period": {
-                "start_date": collection_start,
-                "end_date": collection_end,
-                "total_days": len(all_dates),
-            },
-            "total_cameras": len(cameras),
-            "total_images": sum(cam["total_images"] for cam in cameras.values()),
-            "generated_at": datetime.now().isoformat(),
-        },
-        "collection_stats": {
-            "date_range": {
-                "earliest": collection_start,
-                "latest": collection_end,
-            },
-            "dates_collected": sorted_dates,
-            "images_per_date": {
-                date: sum(
-                    cam.get("images_by_date", {}).get(date, 0)
-                    for cam in cameras.values()
-                )
-                for date in sorted_dates
-            },
-        },
-        "cameras": cameras,
-        "completion_stats": completion_stats,
-    }
-    
-    # Write YAML
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        yaml.dump(manifest, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
-    
-    LOGGER.info("Manifest written to %s", output_path)
-    LOGGER.info("Summary: %d cameras, %d total images", len(cameras), manifest["metadata"]["total_images"])
+            for camera_id, images in camera_images.items()
+            for img in images
+        ),
+        metadata={"bucket": bucket_name},
+    )
+    if yaml_path is not None:
+        manifest.export_yaml(yaml_path)
+
+    LOGGER.info("Manifest written to %s", manifest.root)
+    LOGGER.info(
+        "Summary: %d cameras, %d total images",
+        manifest.metadata["total_cameras"],
+        manifest.metadata["total_images"],
+    )
+    return manifest
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -264,7 +199,8 @@ def main(argv: list[str] | None = None) -> int:
     
     # Load settings
     settings = PaxSettings()
-    bucket_name = args.bucket or settings.remote.bucket
+    local_root = settings.remote.blob_store_root()
+    bucket_name = args.bucket or settings.remote.bucket or ("local" if local_root else None)
     prefix = args.prefix or settings.remote.prefix or "images"
     
     if not bucket_name:
@@ -278,6 +214,9 @@ def main(argv: list[str] | None = None) -> int:
         prefix=prefix,
         output_dir=args.output_dir,
         dry_run=args.dry_run,
+        dates=args.dates,
+        workers=args.workers,
+        source=open_blob_source(bucket_name, local_root),
     )
     
     if args.dry_run:
@@ -286,16 +225,17 @@ def main(argv: list[str] | None = None) -> int:
     
     # Create manifest
     LOGGER.info("Creating manifest...")
-    create_manifest(
+    manifest = create_manifest(
         camera_images=result["camera_images"],
         output_path=args.manifest_path,
         bucket_name=bucket_name,
+        yaml_path=args.yaml_path,
     )
     
     print(f"\nDownload complete!")
     print(f"  Images downloaded: {result['downloaded']}")
     print(f"  Output directory: {args.output_dir}")
-    print(f"  Manifest: {args.manifest_path}")
+    print(f"  Manifest: {manifest.root}")
     
     return 0
 
@@ -7,15 +7,14 @@ import json
 import logging
 import smtplib
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
 from typing import Any
 
-from google.cloud import storage
-
 from ..config import PaxSettings
+from ..storage.transfer import BlobSource, GCSBlobSource, open_blob_source
 
 LOGGER = logging.getLogger(__name__)
 
@@ -68,29 +67,29 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def list_recent_files(bucket_name: str, prefix: str, hours: int = 6) -> list[dict[str, Any]]:
+def list_recent_files(
+    bucket_name: str,
+    prefix: str,
+    hours: int = 6,
+    source: BlobSource | None = None,
+) -> list[dict[str, Any]]:
     """List files uploaded in the last N hours."""
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
+    source = source or GCSBlobSource(bucket_name)
     
-    cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+    cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
     recent_files = []
     
-    for blob in bucket.list_blobs(prefix=prefix):
+    for blob in source.list_blobs(prefix):
         # Get file creation time (timeCreated is in UTC)
         created = blob.time_created
         
         if created and created >= cutoff_time:
             # Generate download URL (signed URL, valid for 7 days)
-            download_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(days=7),
-                method="GET"
-            )
+            download_url = source.signed_url(blob.name, timedelta(days=7))
             
             recent_files.append({
                 "name": blob.name,
-                "size_mb": blob.size / (1024 * 1024),
+                "size_mb": (blob.size or 0) / (1024 * 1024),
                 "created": created.isoformat(),
                 "download_url": download_url,
             })
@@ -190,7 +189,12 @@ def main(argv: list[str] | None = None) -> int:
     # List recent files
     LOGGER.info("Listing files from gs://%s/%s (last %d hours)", bucket_name, prefix, args.hours)
     try:
-        files = list_recent_files(bucket_name, prefix, args.hours)
+        files = list_recent_files(
+            bucket_name,
+            prefix,
+            args.hours,
+            source=open_blob_source(bucket_name, settings.remote.blob_store_root()),
+        )
         LOGGER.info("Found %d files uploaded in the last %d hours", len(files), args.hours)
     except Exception as e:
         LOGGER.exception("Failed to list files from GCS")
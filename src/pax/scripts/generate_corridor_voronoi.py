@@ -14,10 +14,23 @@ import yaml
 from dataclasses import asdict
 
 from ..corridor import derive_corridor_bounds
-from ..voronoi import generate_corridor_voronoi
+from ..corridor.geometry_cache import DEFAULT_CACHE_DIR
+from ..voronoi import CorridorVoronoiResult, generate_corridor_voronoi
+from ..voronoi.incremental import VersionedZoneSet
 
 LOGGER = logging.getLogger(__name__)
 
+# Options that shape the zones when a zone set is first built. An existing zone
+# set keeps its bounds and walkable area, so these cannot change on update.
+BUILD_DEFAULTS = {
+    "dcm_shapefile": Path("data/shapefiles/dcm/DCM_StreetCenterLine.shp"),
+    "street_buffer_m": 18.0,
+    "south_street": 34,
+    "north_street": 66,
+    "east_avenue": "Lexington Avenue",
+    "west_avenue": "9 Avenue",
+}
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -30,8 +43,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--dcm-shapefile",
         type=Path,
-        default=Path("data/shapefiles/dcm/DCM_StreetCenterLine.shp"),
-        help="Street centerline shapefile",
+        help=f"Street centerline shapefile (default: {BUILD_DEFAULTS['dcm_shapefile']})",
     )
     parser.add_argument(
         "--output-dir",
@@ -42,32 +54,47 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--street-buffer-m",
         type=float,
-        default=18.0,
-        help="Street buffer in meters when clipping to walkable area",
+        help="Street buffer in meters when clipping to walkable area (default: 18)",
+    )
+    parser.add_argument(
+        "--geometry-cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for cached DCM centerlines and walkable-area geometry",
+    )
+    parser.add_argument(
+        "--no-geometry-cache",
+        action="store_true",
+        help="Rebuild DCM geometry from the shapefile instead of using the cache",
+    )
+    parser.add_argument(
+        "--zone-set-dir",
+        type=Path,
+        help=(
+            "Versioned zone set directory. If it already holds a zone set, only zones "
+            "affected by cameras added/removed since the last run are recomputed; the "
+            "corridor and DCM options are then fixed by the zone set and may not be given."
+        ),
     )
     parser.add_argument(
         "--south-street",
         type=int,
-        default=34,
-        help="Corridor south street number",
+        help="Corridor south street number (default: 34)",
     )
     parser.add_argument(
         "--north-street",
         type=int,
-        default=66,
-        help="Corridor north street number",
+        help="Corridor north street number (default: 66)",
     )
     parser.add_argument(
         "--east-avenue",
         type=str,
-        default="Lexington Avenue",
-        help="Corridor east boundary avenue name",
+        help="Corridor east boundary avenue name (default: Lexington Avenue)",
     )
     parser.add_argument(
         "--west-avenue",
         type=str,
-        default="9 Avenue",
-        help="Corridor west boundary avenue name",
+        help="Corridor west boundary avenue name (default: 9 Avenue)",
     )
     parser.add_argument(
         "--log-level",
@@ -112,24 +139,67 @@ def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    updating = args.zone_set_dir is not None and (args.zone_set_dir / "zone_set.json").exists()
+    given = [name for name in BUILD_DEFAULTS if getattr(args, name) is not None]
+    if updating and given:
+        options = ", ".join("--" + name.replace("_", "-") for name in given)
+        parser.error(
+            f"{options} cannot change the existing zone set in {args.zone_set_dir}; "
+            "drop them to update it, or use a new --zone-set-dir to rebuild"
+        )
+    for name, default in BUILD_DEFAULTS.items():
+        if getattr(args, name) is None:
+            setattr(args, name, default)
+
     coloredlogs.install(level=args.log_level.upper(), fmt="%(levelname)s %(message)s")
 
     cameras = load_manifest(args.manifest)
-
-    bounds = derive_corridor_bounds(
-        args.dcm_shapefile,
-        south_street=args.south_street,
-        north_street=args.north_street,
-        east_avenue=args.east_avenue,
-        west_avenue=args.west_avenue,
-    )
-
-    result = generate_corridor_voronoi(
-        cameras,
-        bounds,
-        dcm_path=args.dcm_shapefile,
-        street_buffer_m=args.street_buffer_m,
-    )
+    cache_dir = None if args.no_geometry_cache else args.geometry_cache_dir
+
+    if updating:
+        zone_set = VersionedZoneSet.load(args.zone_set_dir)
+        update = zone_set.update(cameras)
+        LOGGER.info(
+            "Zone set v%d: %d added, %d removed, %d zones recomputed",
+            update.version,
+            len(update.added),
+            len(update.removed),
+            len(update.recomputed),
+        )
+        zone_set.save(args.zone_set_dir)
+        result = CorridorVoronoiResult(
+            zones=zone_set.zones, walkable_area=zone_set.walkable_area, bounds=zone_set.bounds
+        )
+    else:
+        bounds = derive_corridor_bounds(
+            args.dcm_shapefile,
+            south_street=args.south_street,
+            north_street=args.north_street,
+            east_avenue=args.east_avenue,
+            west_avenue=args.west_avenue,
+            cache_dir=cache_dir,
+        )
+
+        if args.zone_set_dir:
+            zone_set = VersionedZoneSet.from_dcm(
+                cameras,
+                bounds,
+                dcm_path=args.dcm_shapefile,
+                street_buffer_m=args.street_buffer_m,
+                cache_dir=cache_dir,
+            )
+            zone_set.save(args.zone_set_dir)
+            result = CorridorVoronoiResult(
+                zones=zone_set.zones, walkable_area=zone_set.walkable_area, bounds=bounds
+            )
+        else:
+            result = generate_corridor_voronoi(
+                cameras,
+                bounds,
+                dcm_path=args.dcm_shapefile,
+                street_buffer_m=args.street_buffer_m,
+                cache_dir=cache_dir,
+            )
 
     export_outputs(result, args.output_dir)
 
@@ -11,52 +11,48 @@ import argparse
 import json
 import logging
 import sys
-from collections import defaultdict
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from pathlib import Path
 
-from google.cloud import storage
-
 from ..config import PaxSettings
+from ..storage.inventory import BucketInventory
+from ..storage.transfer import BlobSource, GCSBlobSource, open_blob_source
 
 LOGGER = logging.getLogger(__name__)
 
 
-def parse_timestamp_from_path(blob_name: str) -> datetime | None:
-    """Extract timestamp from blob path like: images/camera-id/YYYYMMDDTHHMMSS.jpg
-    
-    Note: Despite collector code converting to ET, the actual filenames appear to be in UTC
-    (based on GCS blob creation times). We parse as UTC and convert to ET for consistency.
-    """
-    try:
-        parts = blob_name.split("/")
-        if len(parts) >= 3:
-            filename = parts[-1]
-            timestamp_str = filename.replace(".jpg", "").replace(".jpeg", "")
-            # Parse as UTC (what's actually stored based on blob creation times)
-            naive_dt = datetime.strptime(timestamp_str, "%Y%m%dT%H%M%S")
-            utc_dt = naive_dt.replace(tzinfo=ZoneInfo("UTC"))
-            # Convert to Eastern time for display/consistency
-            return utc_dt.astimezone(ZoneInfo("America/New_York"))
-    except Exception:
-        pass
-    return None
-
-
 def generate_gcs_stats(
     bucket_name: str,
     prefix: str = "images",
     manifest_path: Path | None = None,
+    days: int | None = None,
+    workers: int = 8,
+    inventory_path: Path | None = None,
+    full_refresh: bool = False,
+    source: BlobSource | None = None,
 ) -> dict:
-    """Generate statistics from GCS bucket."""
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    
-    LOGGER.info("Listing blobs in gs://%s/%s", bucket_name, prefix)
-    blobs = list(bucket.list_blobs(prefix=prefix))
-    LOGGER.info("Found %d total blobs", len(blobs))
-    
+    """Generate statistics from GCS bucket.
+
+    Stats are queries against a persisted bucket inventory that is refreshed
+    incrementally (only days since the last refresh are listed). With ``days``
+    the stats cover only the last N Eastern days.
+    """
+    source = source or GCSBlobSource(bucket_name)
+    et_tz = ZoneInfo("America/New_York")
+    
+    inventory_path = inventory_path or PaxSettings().bucket_inventory_path()
+    with BucketInventory(inventory_path) as inventory:
+        inventory.refresh(source, prefix, workers=workers, full=full_refresh)
+        window_start = None
+        if days:
+            window_start = datetime.now(et_tz).date() - timedelta(days=days - 1)
+        # Despite the collector converting to ET, filenames appear to be in UTC (based on
+        # blob creation times), so an Eastern day starts in the previous filename date.
+        since = window_start - timedelta(days=1) if window_start else None
+        hourly = inventory.hourly_counts(since=since, by_camera=True)
+        latest = inventory.latest()
+    LOGGER.info("Inventory holds %d camera-hours", len(hourly))
     # Load numbered manifest if available
     camera_manifest = {}
     if manifest_path and manifest_path.exists():
@@ -71,53 +67,38 @@ def generate_gcs_stats(
                 }
         LOGGER.info("Loaded %d cameras from manifest", len(camera_manifest))
     
-    # Process images
+    # Roll filename hours up to Eastern dates
+    hourly["date"] = [
+        datetime.strptime(hour, "%Y-%m-%dT%H").replace(tzinfo=ZoneInfo("UTC")).astimezone(et_tz).strftime("%Y-%m-%d")
+        for hour in hourly["hour"]
+    ]
+    if window_start is not None:
+        hourly = hourly[hourly["date"] >= window_start.isoformat()]
+    
+    images_by_date = {day: int(count) for day, count in hourly.groupby("date")["images"].sum().items()}
+    total_images = int(hourly["images"].sum())
+    
+    def to_et(naive: str) -> str:
+        return datetime.fromisoformat(naive).replace(tzinfo=ZoneInfo("UTC")).astimezone(et_tz).isoformat()
+    
     camera_counts: dict[str, dict] = {}
-    total_images = 0
+    per_camera = hourly.groupby("camera_id").agg(
+        count=("images", "sum"), first=("first_capture", "min"), last=("last_capture", "max")
+    )
+    for camera_id, row in per_camera.iterrows():
+        camera_counts[camera_id] = {
+            "count": int(row["count"]),
+            "lastCapture": to_et(row["last"]),
+            "firstCapture": to_et(row["first"]),
+        }
+    
     latest_capture = None
     latest_camera_id = None
     latest_image_path = None
-    images_by_date: dict[str, int] = defaultdict(int)
-    
-    for blob in blobs:
-        if not blob.name.endswith((".jpg", ".jpeg")):
-            continue
-        
-        total_images += 1
-        
-        # Extract camera ID and timestamp
-        parts = blob.name.split("/")
-        if len(parts) >= 3:
-            camera_id = parts[-2]
-            timestamp = parse_timestamp_from_path(blob.name)
-            
-            if timestamp:
-                # Use Eastern time for date grouping
-                timestamp_et = timestamp.astimezone(ZoneInfo("America/New_York")) if timestamp.tzinfo else timestamp.replace(tzinfo=ZoneInfo("America/New_York"))
-                date_str = timestamp_et.strftime("%Y-%m-%d")
-                images_by_date[date_str] += 1
-                
-                if camera_id not in camera_counts:
-                    camera_counts[camera_id] = {
-                        "count": 0,
-                        "lastCapture": None,
-                        "firstCapture": None,
-                    }
-                
-                camera_counts[camera_id]["count"] += 1
-                
-                capture_str = timestamp_et.isoformat()
-                if not camera_counts[camera_id]["lastCapture"] or capture_str > camera_counts[camera_id]["lastCapture"]:
-                    camera_counts[camera_id]["lastCapture"] = capture_str
-                
-                if not camera_counts[camera_id]["firstCapture"] or capture_str < camera_counts[camera_id]["firstCapture"]:
-                    camera_counts[camera_id]["firstCapture"] = capture_str
-                
-                # Track latest overall
-                if not latest_capture or capture_str > latest_capture:
-                    latest_capture = capture_str
-                    latest_camera_id = camera_id
-                    latest_image_path = blob.name
+    if latest is not None and (window_start is None or to_et(latest["captured_at"])[:10] >= window_start.isoformat()):
+        latest_capture = to_et(latest["captured_at"])
+        latest_camera_id = latest["camera_id"]
+        latest_image_path = latest["name"]
     
     # Get camera names from manifest
     active_cameras = len(camera_manifest) if camera_manifest else len(camera_counts)
@@ -144,13 +125,8 @@ def generate_gcs_stats(
     latest_image_url = None
     if latest_image_path:
         try:
-            blob = bucket.blob(latest_image_path)
             # Try to generate signed URL (requires service account credentials)
-            latest_image_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(days=7),
-                method="GET"
-            )
+            latest_image_url = source.signed_url(latest_image_path, timedelta(days=7))
             LOGGER.debug("Generated signed URL for latest image")
         except Exception as e:
             LOGGER.warning("Failed to generate signed URL for latest image: %s", e)
@@ -202,6 +178,27 @@ def main(argv: list[str] | None = None) -> int:
         type=Path,
         help="Path to numbered camera manifest (default: data/manifests/corridor_cameras_numbered.json)",
     )
+    parser.add_argument(
+        "--days",
+        type=int,
+        help="Only report the last N days",
+    )
+    parser.add_argument(
+        "--inventory",
+        type=Path,
+        help="Bucket inventory SQLite file (default: <storage root>/inventory/gcs_inventory.sqlite)",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Re-list the whole prefix instead of refreshing the inventory incrementally",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent listing requests",
+    )
     parser.add_argument(
         "--output",
         type=Path,
@@ -227,6 +224,11 @@ def main(argv: list[str] | None = None) -> int:
             bucket_name=bucket_name,
             prefix=args.prefix,
             manifest_path=manifest_path if manifest_path.exists() else None,
+            days=args.days,
+            workers=args.workers,
+            inventory_path=args.inventory or settings.bucket_inventory_path(),
+            full_refresh=args.full_refresh,
+            source=open_blob_source(bucket_name, settings.remote.blob_store_root()),
         )
         
         # Write stats
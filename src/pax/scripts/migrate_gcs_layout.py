@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Copy camera-layout image blobs into the date-partitioned key layout.
+
+Images at ``<prefix>/<camera>/YYYYMMDDTHHMMSS.jpg`` are copied (server-side)
+to ``<prefix>/date=YYYY-MM-DD/hour=HH/<camera>/YYYYMMDDTHHMMSS.jpg``. Re-runs
+skip images that already have a date-layout copy. Switch the collector's
+``remote.key_layout`` setting to ``date`` once the backfill is done.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+from ..config import PaxSettings
+from ..storage.migration import migrate_to_date_layout
+from ..storage.transfer import open_blob_source
+
+LOGGER = logging.getLogger(__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--bucket",
+        help="GCS bucket name (default: from settings)",
+    )
+    parser.add_argument(
+        "--prefix",
+        default="images",
+        help="GCS prefix (default: images)",
+    )
+    parser.add_argument(
+        "--local-root",
+        type=Path,
+        help="Migrate a local mirror of the bucket instead of GCS",
+    )
+    parser.add_argument(
+        "--date",
+        dest="dates",
+        action="append",
+        type=date.fromisoformat,
+        help="Only migrate images captured on this date (YYYY-MM-DD); repeatable",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Concurrent copy requests",
+    )
+    parser.add_argument(
+        "--delete-source",
+        action="store_true",
+        help="Delete each camera-layout original after it has been copied",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report what would be copied",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        help="Logging level",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s: %(message)s")
+
+    settings = PaxSettings()
+    bucket_name = args.bucket or settings.remote.bucket or "pax-nyc-images"
+    source = open_blob_source(bucket_name, args.local_root or settings.remote.blob_store_root())
+
+    report = migrate_to_date_layout(
+        source,
+        args.prefix,
+        dates=args.dates,
+        workers=args.workers,
+        delete_source=args.delete_source,
+        dry_run=args.dry_run,
+    )
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-"""Organize local images by day and create comprehensive manifest YAML."""
+"""Organize local images by day and create a comprehensive image manifest."""
 
 from __future__ import annotations
 
@@ -12,9 +12,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 from ..config import PaxSettings
+from ..storage.image_manifest import ImageManifest, open_image_manifest
 
 LOGGER = logging.getLogger(__name__)
 
@@ -40,8 +39,14 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--manifest-path",
         type=Path,
-        default=Path("data/manifests/image_manifest.yaml"),
-        help="Path to save manifest YAML (default: data/manifests/image_manifest.yaml)",
+        default=Path("data/manifests/image_manifest"),
+        help="Manifest directory (default: data/manifests/image_manifest)",
+    )
+    parser.add_argument(
+        "--yaml",
+        dest="yaml_path",
+        type=Path,
+        help="Also export the manifest in the legacy image_manifest.yaml layout",
     )
     parser.add_argument(
         "--copy",
@@ -179,115 +184,38 @@ def create_manifest(
     camera_images: dict[str, list[dict[str, Any]]],
     output_path: Path,
     metadata_dir: Path | None = None,
-) -> None:
-    """Create comprehensive manifest YAML."""
-    
-    # Calculate stats per camera
-    cameras: dict[str, dict[str, Any]] = {}
-    all_dates = set()
-    
-    for camera_id, images in camera_images.items():
-        if not images:
-            continue
-        
-        timestamps = [datetime.fromisoformat(img["timestamp"]) for img in images]
-        earliest = min(timestamps)
-        latest = max(timestamps)
-        date_range_hours = (latest - earliest).total_seconds() / 3600
-        
-        # Count images per day
-        images_by_date: dict[str, int] = defaultdict(int)
-        for img in images:
-            images_by_date[img["date"]] += 1
-            all_dates.add(img["date"])
-        
-        cameras[camera_id] = {
-            "camera_id": camera_id,
-            "total_images": len(images),
-            "time_range": {
-                "earliest": earliest.isoformat(),
-                "latest": latest.isoformat(),
-                "duration_hours": round(date_range_hours, 2),
-                "duration_days": round(date_range_hours / 24, 2),
-            },
-            "images_by_date": dict(sorted(images_by_date.items())),
-            "images": [
-                {
-                    "timestamp": img["timestamp"],
-                    "timestamp_str": img["timestamp_str"],
-                    "date": img["date"],
-                    "local_path": img["dest_path"],
-                    "source_path": img.get("source_path"),
-                    "image_url": img.get("image_url", ""),
-                    "captured_at": img.get("captured_at", img["timestamp"]),
-                    "size_bytes": img["size_bytes"],
-                }
-                for img in images
-            ],
-        }
-    
-    # Calculate collection stats
-    sorted_dates = sorted(all_dates)
-    collection_start = sorted_dates[0] if sorted_dates else None
-    collection_end = sorted_dates[-1] if sorted_dates else None
-    
-    # Calculate percentage complete
-    # Assuming 30-min intervals (2 per hour) over collection period
-    completion_stats = {}
-    if collection_start and collection_end:
-        start_dt = datetime.fromisoformat(collection_start)
-        end_dt = datetime.fromisoformat(collection_end)
-        # Add 1 day to include the end date fully
-        total_hours = ((end_dt - start_dt).days + 1) * 24
-        expected_images_per_camera = int(total_hours * 2)  # 2 per hour = 30-min intervals
-        
-        for camera_id, cam_data in cameras.items():
-            actual = cam_data["total_images"]
-            expected = expected_images_per_camera
-            pct_complete = round((actual / expected * 100) if expected > 0 else 0, 2)
-            completion_stats[camera_id] = {
-                "actual_images": actual,
-                "expected_images": expected,
-                "percentage_complete": pct_complete,
+    yaml_path: Path | None = None,
+) -> ImageManifest:
+    """Append organized images to the columnar manifest, optionally exporting YAML."""
+    manifest = open_image_manifest(output_path)
+    manifest.append(
+        (
+            {
+                "camera_id": camera_id,
+                "timestamp": img["timestamp"],
+                "timestamp_str": img["timestamp_str"],
+                "date": img["date"],
+                "local_path": img["dest_path"],
+                "source_path": img.get("source_path"),
+                "image_url": img.get("image_url", ""),
+                "captured_at": img.get("captured_at", img["timestamp"]),
+                "size_bytes": img["size_bytes"],
             }
-    
-    manifest = {
-        "metadata": {
-            "collection_period": {
-                "start_date": collection_start,
-                "end_date": collection_end,
-                "total_days": len(all_dates),
-            },
-            "total_cameras": len(cameras),
-            "total_images": sum(cam["total_images"] for cam in cameras.values()),
-            "generated_at": datetime.now().isoformat(),
-            "note": "Manifest designed for easy visualization with Python scripts",
-        },
-        "collection_stats": {
-            "date_range": {
-                "earliest": collection_start,
-                "latest": collection_end,
-            },
-            "dates_collected": sorted_dates,
-            "images_per_date": {
-                date: sum(
-                    cam.get("images_by_date", {}).get(date, 0)
-                    for cam in cameras.values()
-                )
-                for date in sorted_dates
-            },
-        },
-        "cameras": cameras,
-        "completion_stats": completion_stats,
-    }
-    
-    # Write YAML
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        yaml.dump(manifest, f, default_flow_style=False, sort_keys=False, allow_unicode=True, indent=2)
-    
-    LOGGER.info("Manifest written to %s", output_path)
-    LOGGER.info("Summary: %d cameras, %d total images", len(cameras), manifest["metadata"]["total_images"])
+            for camera_id, images in camera_images.items()
+            for img in images
+        ),
+        metadata={"note": "Manifest designed for easy visualization with Python scripts"},
+    )
+    if yaml_path is not None:
+        manifest.export_yaml(yaml_path)
+
+    LOGGER.info("Manifest written to %s", manifest.root)
+    LOGGER.info(
+        "Summary: %d cameras, %d total images",
+        manifest.metadata["total_cameras"],
+        manifest.metadata["total_images"],
+    )
+    return manifest
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -325,16 +253,17 @@ def main(argv: list[str] | None = None) -> int:
     
     # Create manifest
     LOGGER.info("Creating manifest...")
-    create_manifest(
+    manifest = create_manifest(
         camera_images=result["camera_images"],
         output_path=args.manifest_path,
         metadata_dir=metadata_dir,
+        yaml_path=args.yaml_path,
     )
     
     print(f"\nOrganization complete!")
     print(f"  Images organized: {result['organized']}")
     print(f"  Output directory: {args.output_dir}")
-    print(f"  Manifest: {args.manifest_path}")
+    print(f"  Manifest: {manifest.root}")
     
     return 0
 
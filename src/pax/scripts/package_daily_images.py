@@ -1,47 +1,108 @@
 #!/usr/bin/env python3
 """Package all images from a 24-hour period (midnight to midnight) into archives.
 
-Creates daily archives organized by date, ready for download.
+Creates daily archives organized by date, ready for download. Images are
+fetched in parallel into a bounded buffer and streamed straight into the
+archive; JPEGs are stored as-is since compression gains nothing on them. With
+``--shards`` the day is split by camera into several archives written
+concurrently.
 """
 
 from __future__ import annotations
 
 import argparse
+import io
 import json
 import logging
 import sys
 import tarfile
 import zipfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from pathlib import Path
 
-from google.cloud import storage
-
 from ..config import PaxSettings
+from ..storage.transfer import (
+    BlobInfo,
+    BlobSource,
+    BulkDownloader,
+    GCSBlobSource,
+    blob_camera_id,
+    list_image_blobs,
+    open_blob_source,
+    parse_blob_timestamp,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+ARCHIVE_FORMATS = ("zip", "tar", "tar.gz")
+
 
 def parse_timestamp_from_path(blob_name: str) -> datetime | None:
     """Extract timestamp from blob path like: images/camera-id/YYYYMMDDTHHMMSS.jpg
     Assumes timestamps are in Eastern time (America/New_York).
     """
-    try:
-        parts = blob_name.split("/")
-        if len(parts) >= 3:
-            filename = parts[-1]
-            timestamp_str = filename.replace(".jpg", "").replace(".jpeg", "")
-            # Parse as naive datetime, then assume Eastern time
-            naive_dt = datetime.strptime(timestamp_str, "%Y%m%dT%H%M%S")
-            # Assume Eastern time (for new files) or UTC (for old files)
-            # Try Eastern first, fallback to UTC for backward compatibility
-            et_tz = ZoneInfo("America/New_York")
-            return naive_dt.replace(tzinfo=et_tz)
-    except Exception:
-        pass
-    return None
+    if blob_camera_id(blob_name) is None:
+        return None
+    naive_dt = parse_blob_timestamp(blob_name)
+    if naive_dt is None:
+        return None
+    # Filenames are written in Eastern time
+    return naive_dt.replace(tzinfo=ZoneInfo("America/New_York"))
+
+
+def shard_by_camera(daily_images: dict[str, list[BlobInfo]], shards: int) -> list[dict[str, list[BlobInfo]]]:
+    """Split cameras into ``shards`` groups with roughly equal image counts.
+
+    Each camera lands in exactly one shard, so a shard is a self-contained
+    ``<date>/<camera>/`` subtree of the full archive.
+    """
+    groups: list[dict[str, list[BlobInfo]]] = [{} for _ in range(max(1, min(shards, len(daily_images))))]
+    totals = [0] * len(groups)
+    for camera_id, blobs in sorted(daily_images.items(), key=lambda item: (-len(item[1]), item[0])):
+        smallest = totals.index(min(totals))
+        groups[smallest][camera_id] = blobs
+        totals[smallest] += len(blobs)
+    return [dict(sorted(group.items())) for group in groups]
+
+
+def write_archive(
+    archive_path: Path,
+    images: dict[str, list[BlobInfo]],
+    target_date: str,
+    downloader: BulkDownloader,
+    format: str = "zip",
+) -> int:
+    """Stream one camera group's images into ``archive_path``; return the image count."""
+    ordered = [blob for _, cam_blobs in sorted(images.items()) for blob in cam_blobs]
+    contents = downloader.iter_bytes(ordered)
+    written = 0
+
+    if format == "zip":
+        # allowZip64 for full-day archives over 4 GiB; JPEG is stored, not deflated.
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for blob, image_data in contents:
+                # Store in archive with camera_id/date structure
+                archive_path_internal = f"{target_date}/{blob_camera_id(blob.name)}/{Path(blob.name).name}"
+                info = zipfile.ZipInfo(archive_path_internal)
+                if blob.time_created:
+                    info.date_time = blob.time_created.timetuple()[:6]
+                zf.writestr(info, image_data, compress_type=zipfile.ZIP_STORED)
+                written += 1
+                LOGGER.debug("Added %s", archive_path_internal)
+    else:  # tar / tar.gz
+        with tarfile.open(archive_path, "w:gz" if format == "tar.gz" else "w") as tf:
+            for blob, image_data in contents:
+                archive_path_internal = f"{target_date}/{blob_camera_id(blob.name)}/{Path(blob.name).name}"
+                tarinfo = tarfile.TarInfo(name=archive_path_internal)
+                tarinfo.size = len(image_data)
+                tarinfo.mtime = blob.time_created.timestamp() if blob.time_created else 0
+                tf.addfile(tarinfo, fileobj=io.BytesIO(image_data))
+                written += 1
+                LOGGER.debug("Added %s", archive_path_internal)
+    return written
 
 
 def package_daily_images(
@@ -50,6 +111,9 @@ def package_daily_images(
     target_date: str | None = None,
     output_dir: Path | None = None,
     format: str = "zip",
+    workers: int = 16,
+    source: BlobSource | None = None,
+    shards: int = 1,
 ) -> Path:
     """Package all images from a specific date (midnight to midnight Eastern time).
     
@@ -58,11 +122,17 @@ def package_daily_images(
         prefix: GCS prefix (e.g., "images")
         target_date: Date in YYYY-MM-DD format (default: yesterday)
         output_dir: Directory to save package (default: data/packages)
-        format: Archive format ("zip" or "tar.gz")
+        format: Archive format ("zip", "tar" or "tar.gz")
+        workers: Parallel listing/download workers (shared across shards)
+        source: Bucket to read from (default: the GCS bucket ``bucket_name``)
+        shards: Number of archives to split the day into, by camera
     
     Returns:
-        Path to created archive file
+        Path to created archive file, or to the manifest listing the shard
+        archives when ``shards > 1``
     """
+    if format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported archive format: {format}")
     if target_date is None:
         # Default to yesterday (Eastern time)
         yesterday = datetime.now(ZoneInfo("America/New_York")) - timedelta(days=1)
@@ -77,35 +147,23 @@ def package_daily_images(
     LOGGER.info("Packaging images from %s (Eastern time)", target_date)
     LOGGER.info("Time range: %s to %s", date_start.isoformat(), date_end.isoformat())
     
-    # Connect to GCS
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    
-    # Find all images from target date
-    blobs = list(bucket.list_blobs(prefix=prefix))
-    daily_images: dict[str, list[storage.Blob]] = defaultdict(list)
+    source = source or GCSBlobSource(bucket_name)
+
+    # Only list the camera/date prefixes for the target date
+    blobs = list_image_blobs(source, prefix, dates=[date_start.date()], workers=workers)
+    daily_images: dict[str, list[BlobInfo]] = defaultdict(list)
     total_images = 0
-    
+
     for blob in blobs:
-        if not blob.name.endswith((".jpg", ".jpeg")):
-            continue
-        
         timestamp = parse_timestamp_from_path(blob.name)
         if not timestamp:
             continue
-        
-        # Convert timestamp to Eastern time for comparison
-        timestamp_et = timestamp.astimezone(ZoneInfo("America/New_York"))
-        
+
         # Check if within date range (midnight to midnight Eastern time)
-        if date_start <= timestamp_et < date_end:
-            # Extract camera ID from path
-            parts = blob.name.split("/")
-            if len(parts) >= 3:
-                camera_id = parts[-2]
-                daily_images[camera_id].append(blob)
-                total_images += 1
-    
+        if date_start <= timestamp < date_end:
+            daily_images[blob_camera_id(blob.name)].append(blob)
+            total_images += 1
+
     if total_images == 0:
         LOGGER.warning("No images found for date %s", target_date)
         return None
@@ -117,40 +175,36 @@ def package_daily_images(
         output_dir = Path("data/packages")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Create archive
-    archive_name = f"pax-images-{target_date}.{format}"
-    archive_path = output_dir / archive_name
+    # Create archive(s)
+    groups = shard_by_camera(daily_images, shards)
+    if len(groups) == 1:
+        archive_paths = [output_dir / f"pax-images-{target_date}.{format}"]
+    else:
+        archive_paths = [
+            output_dir / f"pax-images-{target_date}-part{idx:02d}-of-{len(groups):02d}.{format}"
+            for idx in range(1, len(groups) + 1)
+        ]
     
-    LOGGER.info("Creating archive: %s", archive_path)
+    # Each shard streams from its own bounded prefetch; workers are split between them
+    downloader = BulkDownloader(source, workers=max(1, workers // len(groups)))
+    started = datetime.now()
     
-    if format == "zip":
-        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for camera_id, blobs in sorted(daily_images.items()):
-                for blob in sorted(blobs, key=lambda b: b.name):
-                    # Download blob content
-                    image_data = blob.download_as_bytes()
-                    # Store in archive with camera_id/date structure
-                    archive_path_internal = f"{target_date}/{camera_id}/{Path(blob.name).name}"
-                    zf.writestr(archive_path_internal, image_data)
-                    LOGGER.debug("Added %s", archive_path_internal)
-    else:  # tar.gz
-        import gzip
-        with tarfile.open(archive_path, "w:gz") as tf:
-            for camera_id, blobs in sorted(daily_images.items()):
-                for blob in sorted(blobs, key=lambda b: b.name):
-                    # Download blob content
-                    image_data = blob.download_as_bytes()
-                    # Create tarinfo
-                    archive_path_internal = f"{target_date}/{camera_id}/{Path(blob.name).name}"
-                    tarinfo = tarfile.TarInfo(name=archive_path_internal)
-                    tarinfo.size = len(image_data)
-                    tarinfo.mtime = blob.time_created.timestamp() if blob.time_created else 0
-                    # Add to archive
-                    tf.addfile(tarinfo, fileobj=__import__("io").BytesIO(image_data))
-                    LOGGER.debug("Added %s", archive_path_internal)
-    
-    archive_size_mb = archive_path.stat().st_size / (1024 * 1024)
-    LOGGER.info("Created archive: %s (%.2f MB)", archive_path, archive_size_mb)
+    def _write(path: Path, group: dict[str, list[BlobInfo]]) -> int:
+        LOGGER.info("Creating archive: %s (%d cameras)", path, len(group))
+        return write_archive(path, group, target_date, downloader, format=format)
+    
+    with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        written = list(pool.map(_write, archive_paths, groups))
+    
+    elapsed = (datetime.now() - started).total_seconds()
+    total_bytes = sum(path.stat().st_size for path in archive_paths)
+    LOGGER.info(
+        "Created %d archive(s) with %d images (%.2f MB) in %.1fs",
+        len(archive_paths),
+        sum(written),
+        total_bytes / (1024 * 1024),
+        elapsed,
+    )
     
     # Create manifest
     manifest = {
@@ -158,8 +212,17 @@ def package_daily_images(
         "total_images": total_images,
         "cameras": len(daily_images),
         "images_per_camera": {cam_id: len(blobs) for cam_id, blobs in daily_images.items()},
-        "archive_path": str(archive_path),
-        "archive_size_bytes": archive_path.stat().st_size,
+        "archive_path": str(archive_paths[0]),
+        "archive_size_bytes": total_bytes,
+        "archives": [
+            {
+                "path": str(path),
+                "images": count,
+                "cameras": sorted(group),
+                "size_bytes": path.stat().st_size,
+            }
+            for path, count, group in zip(archive_paths, written, groups)
+        ],
         "created_at": datetime.now(ZoneInfo("America/New_York")).isoformat(),
     }
     
@@ -169,7 +232,7 @@ def package_daily_images(
     
     LOGGER.info("Created manifest: %s", manifest_path)
     
-    return archive_path
+    return archive_paths[0] if len(archive_paths) == 1 else manifest_path
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -194,9 +257,21 @@ def main(argv: list[str] | None = None) -> int:
     )
     parser.add_argument(
         "--format",
-        choices=["zip", "tar.gz"],
+        choices=ARCHIVE_FORMATS,
         default="zip",
-        help="Archive format (default: zip)",
+        help="Archive format (default: zip; JPEGs are stored uncompressed)",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Split the day into N archives by camera, written concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Parallel download workers (default: 16)",
     )
     parser.add_argument(
         "--log-level",
@@ -217,9 +292,17 @@ def main(argv: list[str] | None = None) -> int:
             target_date=args.date,
             output_dir=args.output_dir,
             format=args.format,
+            workers=args.workers,
+            shards=args.shards,
+            source=open_blob_source(bucket_name, settings.remote.blob_store_root()),
         )
         
-        if archive_path:
+        if archive_path and archive_path.suffix == ".json":
+            manifest = json.loads(archive_path.read_text())
+            print(f"\n✅ Created {len(manifest['archives'])} archives, manifest: {archive_path}")
+            print(f"   Size: {manifest['archive_size_bytes'] / (1024*1024):.2f} MB")
+            return 0
+        elif archive_path:
             print(f"\n✅ Created archive: {archive_path}")
             print(f"   Size: {archive_path.stat().st_size / (1024*1024):.2f} MB")
             return 0
@@ -8,7 +8,7 @@ import sys
 from pathlib import Path
 
 from ..config import PaxSettings
-from ..routes import RouteRenderer
+from ..routes import MapCache, RouteRenderer
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -23,6 +23,26 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Override data warehouse root (default: data/warehouse/snapshots)",
     )
+    parser.add_argument(
+        "--map-cache-dir",
+        type=Path,
+        help="Basemap/route cache directory (default: <storage root>/cache/maps)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Render only from the map cache; never call Google Maps APIs",
+    )
+    parser.add_argument(
+        "--seed-map-bundle",
+        type=Path,
+        help="Directory or .zip of cached basemaps/routes to load before rendering",
+    )
+    parser.add_argument(
+        "--export-map-bundle",
+        type=Path,
+        help="Write the map cache to this .zip after rendering",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -38,9 +58,16 @@ def main(argv: list[str] | None = None) -> int:
     logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s: %(message)s")
 
     settings = PaxSettings()
-    renderer = RouteRenderer(settings)
+    cache = MapCache(args.map_cache_dir or settings.storage.root / "cache" / "maps")
+    if args.seed_map_bundle:
+        cache.seed_from_bundle(args.seed_map_bundle)
+
+    renderer = RouteRenderer(settings, cache=cache, offline=args.offline)
     results = renderer.render_all(output_dir=args.output_dir, warehouse_root=args.warehouse_root)
 
+    if args.export_map_bundle:
+        cache.export_bundle(args.export_map_bundle)
+
     for result in results:
         print(f"Rendered {result.route.title} → {result.output_path} ({result.point_count} pts)")
     return 0
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Run the pax benchmark suite and record the timings as JSON.
+
+Results are written to ``<output-dir>/<commit>.json``. Pass ``--compare`` with
+an earlier results file to print per-benchmark ratios; the exit status is 1
+when any shared benchmark got slower than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from ..benchmarks.harness import compare_runs, load_run, run_benchmarks, save_run
+
+LOGGER = logging.getLogger(__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        default=["*"],
+        help="Benchmark name patterns, e.g. 'storage.*' (default: all)",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Only run each benchmark at its smallest size",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Timed runs per benchmark and size",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Untimed runs before timing",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("benchmarks/results"),
+        help="Directory for results files (default: benchmarks/results)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write results to this file instead of <output-dir>/<commit>.json",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Earlier results file to compare against",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Slowdown ratio reported as a regression (default: 1.2)",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        help="Logging level",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s: %(message)s")
+    if logging.getLogger().level > logging.DEBUG:
+        # Keep per-call library logging out of the progress output
+        logging.getLogger("pax").setLevel(logging.WARNING)
+        logging.getLogger("pax.benchmarks").setLevel(args.log_level.upper())
+
+    run = run_benchmarks(args.benchmarks, quick=args.quick, repeats=args.repeats, warmup=args.warmup)
+    output = args.output or args.output_dir / f"{(run['commit'] or 'uncommitted')[:12]}.json"
+    save_run(run, output)
+    print(f"Wrote {len(run['results'])} results to {output}")
+
+    rates = [result for result in run["results"] if result.get("items_per_s")]
+    if rates:
+        print(f"\n{'throughput':45s} {'items/s':>10s}")
+        for result in rates:
+            print(f"{result['key']:45s} {result['items_per_s']:10.1f}")
+
+    failed = [result["key"] for result in run["results"] if result["error"]]
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+
+    if args.compare is None:
+        return 1 if failed else 0
+
+    rows = compare_runs(load_run(args.compare), run, threshold=args.threshold)
+    print(f"\n{'benchmark':45s} {'baseline':>10s} {'current':>10s} {'ratio':>7s}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['key']:45s} {row['baseline_s']:10.4f} {row['current_s']:10.4f} "
+            f"{row['ratio']:7.2f}{flag}"
+        )
+    return 1 if failed or any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,7 @@ from typing import Any
 import yaml
 
 from ..config import PaxSettings
+from ..telemetry import PROMETHEUS_CONTENT_TYPE, render_prometheus
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +26,8 @@ class StatsAPIHandler(BaseHTTPRequestHandler):
             self.serve_stats()
         elif self.path == "/api/manifest":
             self.serve_manifest()
+        elif self.path == "/metrics":
+            self.serve_metrics()
         elif self.path.startswith("/api/images/"):
             self.serve_image()
         elif self.path == "/" or self.path == "/index.html":
@@ -42,6 +45,15 @@ class StatsAPIHandler(BaseHTTPRequestHandler):
             LOGGER.exception("Error computing stats")
             self.send_error(500, str(e))
 
+    def serve_metrics(self) -> None:
+        """Serve this process's metrics in the Prometheus text format."""
+        content = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
     def serve_manifest(self) -> None:
         """Serve camera manifest as JSON."""
         try:
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Suggest per-camera regions of interest from accumulated YOLO detections.
+
+Runs YOLOv8n over a sample of each camera's images from the image manifest,
+builds a heatmap of where pedestrians and cyclists (optionally vehicles)
+appear, and writes an ROI covering most of that heat to the ROI file stored
+next to the numbered camera manifest. Hand-edited ROIs (``source: manual``)
+are kept unless ``--overwrite`` is given. Review the suggestions with
+``--preview-dir`` before pointing ``PAX_VISION`` ``roi_path`` at the file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import sys
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..storage.image_manifest import open_image_manifest
+from ..vision.detections import BICYCLE_CLASS_ID, PERSON_CLASS_ID, VEHICLE_CLASS_IDS
+from ..vision.roi import DEFAULT_ROI_PATH, crop_to_roi, load_rois, save_rois, suggest_roi
+
+LOGGER = logging.getLogger(__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=Path("data/manifests/image_manifest"),
+        help="Image manifest (default: data/manifests/image_manifest)",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path("data"),
+        help="Directory manifest local paths are relative to (default: data)",
+    )
+    parser.add_argument(
+        "--cameras-manifest",
+        type=Path,
+        default=Path("data/manifests/corridor_cameras_numbered.json"),
+        help="Numbered camera manifest, for camera numbers and selection",
+    )
+    parser.add_argument(
+        "--camera",
+        action="append",
+        dest="cameras",
+        help="Only this camera ID (repeatable; default: all cameras in the manifest)",
+    )
+    parser.add_argument(
+        "--images-per-camera",
+        type=int,
+        default=200,
+        help="Images sampled per camera (default: 200)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Sampling seed",
+    )
+    parser.add_argument(
+        "--conf",
+        type=float,
+        default=0.25,
+        help="YOLO confidence threshold (default: 0.25)",
+    )
+    parser.add_argument(
+        "--include-vehicles",
+        action="store_true",
+        help="Count vehicle detections towards the heatmap",
+    )
+    parser.add_argument(
+        "--grid",
+        type=int,
+        default=32,
+        help="Heatmap cells per side (default: 32)",
+    )
+    parser.add_argument(
+        "--coverage",
+        type=float,
+        default=0.95,
+        help="Share of detection heat the ROI must cover (default: 0.95)",
+    )
+    parser.add_argument(
+        "--min-detections",
+        type=int,
+        default=20,
+        help="Skip cameras with fewer detections (default: 20)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_ROI_PATH,
+        help=f"ROI file to update (default: {DEFAULT_ROI_PATH})",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Replace manual ROIs too",
+    )
+    parser.add_argument(
+        "--preview-dir",
+        type=Path,
+        help="Write one masked sample image per camera here",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        help="Logging level",
+    )
+    return parser
+
+
+def load_camera_numbers(path: Path) -> dict[str, int | None]:
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {camera["id"]: camera.get("number") for camera in data.get("cameras", [])}
+
+
+def collect_boxes(
+    detector: Any, image_paths: list[Path], class_ids: set[int], conf: float
+) -> np.ndarray:
+    """Normalised xyxy boxes of detections in ``class_ids`` across ``image_paths``."""
+    from PIL import Image
+
+    boxes = []
+    for image_path in image_paths:
+        try:
+            with Image.open(image_path) as image:
+                width, height = image.size
+            detections = detector.detect(image_path, conf_threshold=conf)["detections"]
+        except Exception as exc:
+            LOGGER.warning("Skipping %s: %s", image_path, exc)
+            continue
+        for detection in detections:
+            if detection["class_id"] in class_ids:
+                x1, y1, x2, y2 = detection["bbox"]
+                boxes.append([x1 / width, y1 / height, x2 / width, y2 / height])
+    return np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s: %(message)s")
+
+    numbers = load_camera_numbers(args.cameras_manifest)
+    cameras = args.cameras or sorted(numbers) or None
+    images = open_image_manifest(args.manifest).images(
+        cameras=cameras, columns=["camera_id", "local_path"]
+    )
+    if images.empty:
+        parser.error(f"no images in {args.manifest}")
+
+    class_ids = {PERSON_CLASS_ID, BICYCLE_CLASS_ID}
+    if args.include_vehicles:
+        class_ids |= VEHICLE_CLASS_IDS
+
+    from ..vision.registry import get_model
+
+    detector = get_model("yolov8n")
+    rois = load_rois(args.output) if args.output.exists() else {}
+    rng = random.Random(args.seed)
+    suggested = kept = 0
+    for camera_id, group in images.groupby("camera_id", sort=True):
+        existing = rois.get(camera_id)
+        if existing is not None and existing.source == "manual" and not args.overwrite:
+            kept += 1
+            continue
+        paths = [
+            path if path.is_absolute() else args.data_dir / path
+            for path in map(Path, group["local_path"].dropna())
+        ]
+        paths = [path for path in paths if path.exists()]
+        if len(paths) > args.images_per_camera:
+            paths = rng.sample(paths, args.images_per_camera)
+        boxes = collect_boxes(detector, paths, class_ids, args.conf)
+        roi = suggest_roi(
+            camera_id,
+            boxes,
+            grid=args.grid,
+            coverage=args.coverage,
+            min_boxes=args.min_detections,
+        )
+        if roi is None:
+            LOGGER.info("%s: %d detections, too few for an ROI", camera_id, len(boxes))
+            continue
+        roi.number = numbers.get(camera_id)
+        rois[camera_id] = roi
+        suggested += 1
+        LOGGER.info(
+            "%s: ROI covers %.0f%% of the frame (%d detections from %d images)",
+            camera_id,
+            roi.area_fraction() * 100,
+            len(boxes),
+            len(paths),
+        )
+        if args.preview_dir is not None and paths:
+            args.preview_dir.mkdir(parents=True, exist_ok=True)
+            preview = crop_to_roi(paths[0], roi).image
+            preview.save(args.preview_dir / f"{roi.number or camera_id}_{camera_id}.jpg")
+
+    save_rois(
+        rois,
+        args.output,
+        metadata={"grid": args.grid, "coverage": args.coverage, "classes": sorted(class_ids)},
+    )
+    print(f"Suggested {suggested} ROIs and kept {kept} manual ROIs in {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
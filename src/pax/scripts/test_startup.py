@@ -0,0 +1,59 @@
+"""Import-time budget for the collector CLI and the light package entry points."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Wall-clock budget for `python -m pax.scripts.collect_manifest --help`; the
+# interpreter alone takes ~50 ms and the CLI ~400 ms with lazy imports, while
+# eager geopandas/google-cloud-storage imports pushed it past 0.8 s.
+BUDGET_S = float(os.environ.get("PAX_IMPORT_BUDGET_S", "1.0"))
+
+HEAVY_MODULES = (
+    "geopandas",
+    "google.cloud.storage",
+    "matplotlib",
+    "pandas",
+    "pyarrow",
+    "torch",
+    "transformers",
+    "ultralytics",
+)
+
+SRC = Path(__file__).resolve().parents[2]
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    pythonpath = os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": pythonpath}
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True, timeout=60
+    )
+
+
+def test_collect_manifest_help_within_budget():
+    timings = []
+    for _ in range(3):
+        started = time.perf_counter()
+        _python("-m", "pax.scripts.collect_manifest", "--help")
+        timings.append(time.perf_counter() - started)
+    assert min(timings) < BUDGET_S, f"--help took {min(timings):.2f}s (budget {BUDGET_S}s)"
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["pax.scripts.collect_manifest", "pax.scripts.stats_api", "pax.storage", "pax.vision"],
+)
+def test_entry_points_skip_heavy_dependencies(module):
+    code = (
+        f"import sys, {module}\n"
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = _python("-c", code).stdout.split()
+    assert loaded == [], f"importing {module} loaded {loaded}"
@@ -20,6 +20,8 @@ import geopandas as gpd
 import numpy as np
 from shapely.geometry import Point
 
+from ..voronoi.locator import ZoneLocator
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -131,6 +133,7 @@ def calculate_weighted_stress(
     camera_stress: dict[str, float],
     neighbor_weight: float = 0.5,
     second_order_weight: float = 0.25,
+    locator: ZoneLocator | None = None,
 ) -> dict[str, Any]:
     """Calculate weighted stress score for an intersection point.
     
@@ -141,20 +144,25 @@ def calculate_weighted_stress(
         camera_stress: Dictionary mapping camera_id -> stress_score
         neighbor_weight: Weight for adjacent neighbors
         second_order_weight: Weight for second-order neighbors
+        locator: Optional ZoneLocator built from ``zones_gdf``; avoids a full
+            ``contains`` scan per point when scoring many points
     
     Returns:
         Dictionary with stress score and zone information
     """
     # Find containing zone
-    containing = zones_gdf[zones_gdf.geometry.contains(point)]
-    
-    if len(containing) == 0:
-        # Find nearest zone
-        distances = zones_gdf.geometry.distance(point)
-        nearest_idx = distances.idxmin()
-        containing = zones_gdf.loc[[nearest_idx]]
-    
-    zone = containing.iloc[0]
+    if locator is not None:
+        zone = zones_gdf.iloc[locator.locate(point.x, point.y)]
+    else:
+        containing = zones_gdf[zones_gdf.geometry.contains(point)]
+
+        if len(containing) == 0:
+            # Find nearest zone
+            distances = zones_gdf.geometry.distance(point)
+            nearest_idx = distances.idxmin()
+            containing = zones_gdf.loc[[nearest_idx]]
+
+        zone = containing.iloc[0]
     zone_idx = int(zone['index'])
     camera_id = zone['camera_id']
     
@@ -232,6 +240,7 @@ def main(argv: list[str] | None = None) -> int:
     
     # Find neighbors
     neighbors = find_neighbors(zones_gdf)
+    locator = ZoneLocator.from_geodataframe(zones_gdf)
     
     # Load camera stress scores (if provided)
     camera_stress = {}
@@ -261,6 +270,7 @@ def main(argv: list[str] | None = None) -> int:
             camera_stress,
             args.neighbor_weight,
             args.second_order_weight,
+            locator=locator,
         )
         results.append(result)
     
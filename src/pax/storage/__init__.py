@@ -1,18 +1,95 @@
-"""Storage integrations for features and remote uploads."""
+"""Storage integrations for features and remote uploads.
 
-from .feature_query import FeatureQuery, aggregate_statistics, get_features_by_camera, get_features_by_time_range, get_features_by_zone
-from .feature_storage import FeatureStorage
-from .uploader import GCSUploader, NullUploader, RemoteUploader
+Exports are imported on first access so that, for example, the collector's
+upload path does not load geopandas (feature queries) or pyarrow.
+"""
+
+from typing import TYPE_CHECKING
+
+from pax._lazy import lazy_exports
+
+_EXPORTS = {
+    "FeatureQuery": ".feature_query",
+    "aggregate_statistics": ".feature_query",
+    "get_features_by_camera": ".feature_query",
+    "get_features_by_time_range": ".feature_query",
+    "get_features_by_zone": ".feature_query",
+    "FeatureStorage": ".feature_storage",
+    "ImageManifest": ".image_manifest",
+    "open_image_manifest": ".image_manifest",
+    "resolve_image_manifest": ".image_manifest",
+    "BucketInventory": ".inventory",
+    "image_key": ".layout",
+    "migrate_to_date_layout": ".migration",
+    "BlobSource": ".transfer",
+    "BulkDownloader": ".transfer",
+    "GCSBlobSource": ".transfer",
+    "LocalBlobSource": ".transfer",
+    "TransferReport": ".transfer",
+    "list_image_blobs": ".transfer",
+    "open_blob_source": ".transfer",
+    "BackgroundUploader": ".upload_queue",
+    "UploadQueue": ".upload_queue",
+    "BlobStoreUploader": ".uploader",
+    "GCSUploader": ".uploader",
+    "LocalUploader": ".uploader",
+    "NullUploader": ".uploader",
+    "RemoteUploader": ".uploader",
+    "Lease": ".work_queue",
+    "LeaseHeartbeat": ".work_queue",
+    "WorkQueue": ".work_queue",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .feature_query import FeatureQuery, aggregate_statistics, get_features_by_camera, get_features_by_time_range, get_features_by_zone
+    from .feature_storage import FeatureStorage
+    from .image_manifest import ImageManifest, open_image_manifest, resolve_image_manifest
+    from .inventory import BucketInventory
+    from .layout import image_key
+    from .migration import migrate_to_date_layout
+    from .transfer import (
+        BlobSource,
+        BulkDownloader,
+        GCSBlobSource,
+        LocalBlobSource,
+        TransferReport,
+        list_image_blobs,
+        open_blob_source,
+    )
+    from .upload_queue import BackgroundUploader, UploadQueue
+    from .uploader import BlobStoreUploader, GCSUploader, LocalUploader, NullUploader, RemoteUploader
+    from .work_queue import Lease, LeaseHeartbeat, WorkQueue
 
 __all__ = [
     "RemoteUploader",
     "NullUploader",
     "GCSUploader",
+    "LocalUploader",
+    "BlobStoreUploader",
+    "BackgroundUploader",
+    "UploadQueue",
+    "WorkQueue",
+    "Lease",
+    "LeaseHeartbeat",
     "FeatureStorage",
     "FeatureQuery",
     "get_features_by_camera",
     "get_features_by_time_range",
     "get_features_by_zone",
     "aggregate_statistics",
+    "BlobSource",
+    "BulkDownloader",
+    "GCSBlobSource",
+    "LocalBlobSource",
+    "TransferReport",
+    "list_image_blobs",
+    "open_blob_source",
+    "BucketInventory",
+    "ImageManifest",
+    "open_image_manifest",
+    "resolve_image_manifest",
+    "image_key",
+    "migrate_to_date_layout",
 ]
-
@@ -0,0 +1,433 @@
+"""Columnar image manifest with camera/date indexes.
+
+``image_manifest.yaml`` listed every image of every camera as nested YAML, so
+each reader paid a full ``yaml.safe_load`` that grew with the archive. The
+columnar manifest is a directory::
+
+    image_manifest/
+        summary.json                # header: totals, per-camera and per-date counts
+        images/part-000000.parquet  # one row per image, sorted by camera and time
+        images/part-000001.parquet  # ... one part per append
+
+``summary.json`` carries everything the old YAML had except the per-image
+lists (collection period, ``images_per_date``, per-camera ``total_images``,
+``time_range`` and ``images_by_date``, completion stats), so count-only
+readers never open the Parquet files. Image rows are read on demand with
+camera/date filters pushed down to Parquet. ``to_legacy_dict`` and
+``export_yaml`` still produce the YAML layout when it is needed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import yaml
+
+LOGGER = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+SUMMARY_FILENAME = "summary.json"
+IMAGES_DIRNAME = "images"
+
+# Rows arrive at 30-minute sampling; completion stats compare against this.
+EXPECTED_IMAGES_PER_HOUR = 2
+
+IMAGE_SCHEMA = pa.schema(
+    [
+        ("camera_id", pa.string()),
+        ("timestamp", pa.string()),
+        ("date", pa.string()),
+        ("local_path", pa.string()),
+        ("gcs_path", pa.string()),
+        ("source_path", pa.string()),
+        ("image_url", pa.string()),
+        ("captured_at", pa.string()),
+        ("timestamp_str", pa.string()),
+        ("size_bytes", pa.int64()),
+    ]
+)
+IMAGE_COLUMNS = tuple(IMAGE_SCHEMA.names)
+
+
+def _image_frame(records: Iterable[Mapping[str, Any]] | pd.DataFrame) -> pd.DataFrame:
+    df = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+    for column in IMAGE_COLUMNS:
+        if column not in df.columns:
+            df[column] = None
+    df = df[list(IMAGE_COLUMNS)]
+    if df.empty:
+        return df
+    df["camera_id"] = df["camera_id"].astype(str)
+    df["timestamp"] = df["timestamp"].astype(str)
+    missing_date = df["date"].isna()
+    df.loc[missing_date, "date"] = df.loc[missing_date, "timestamp"].str.slice(0, 10)
+    df["size_bytes"] = pd.to_numeric(df["size_bytes"], errors="coerce").fillna(0).astype("int64")
+    return df
+
+
+def _empty_summary() -> dict[str, Any]:
+    return {
+        "format_version": FORMAT_VERSION,
+        "metadata": {},
+        "collection_stats": {},
+        "cameras": {},
+        "completion_stats": {},
+        "parts": [],
+    }
+
+
+class ImageManifest:
+    """Appendable Parquet image manifest with a JSON summary header."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._summary: dict[str, Any] | None = None
+
+    @property
+    def summary_path(self) -> Path:
+        return self.root / SUMMARY_FILENAME
+
+    @property
+    def images_dir(self) -> Path:
+        return self.root / IMAGES_DIRNAME
+
+    def exists(self) -> bool:
+        return self.summary_path.exists()
+
+    @property
+    def summary(self) -> dict[str, Any]:
+        """The header, in the old YAML layout minus the per-image lists."""
+        if self._summary is None:
+            if self.exists():
+                self._summary = json.loads(self.summary_path.read_text(encoding="utf-8"))
+            else:
+                self._summary = _empty_summary()
+        return self._summary
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        return self.summary["metadata"]
+
+    @property
+    def cameras(self) -> dict[str, dict[str, Any]]:
+        """Per camera: ``total_images``, ``time_range`` and ``images_by_date``."""
+        return self.summary["cameras"]
+
+    def camera_counts(self) -> dict[str, int]:
+        return {camera_id: data["total_images"] for camera_id, data in self.cameras.items()}
+
+    def images_per_date(self) -> dict[str, int]:
+        return self.summary["collection_stats"].get("images_per_date", {})
+
+    # Writing -------------------------------------------------------------
+
+    def _existing_keys(self) -> set[tuple[str, str]]:
+        if not self.summary["parts"]:
+            return set()
+        table = self._dataset().to_table(columns=["camera_id", "timestamp"])
+        return set(
+            zip(table.column("camera_id").to_pylist(), table.column("timestamp").to_pylist())
+        )
+
+    def append(
+        self,
+        records: Iterable[Mapping[str, Any]] | pd.DataFrame,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> int:
+        """
+        Add image rows, skipping images (camera, timestamp) already present.
+
+        Args:
+            records: Image dicts or a DataFrame with any of ``IMAGE_COLUMNS``;
+                ``camera_id`` and ``timestamp`` are required.
+            metadata: Extra header fields (e.g. ``bucket``) merged into ``metadata``.
+
+        Returns:
+            Number of rows written.
+        """
+        df = _image_frame(records)
+        if not df.empty:
+            df = df.drop_duplicates(subset=["camera_id", "timestamp"], keep="last")
+            existing = self._existing_keys()
+            if existing:
+                keys = pd.Series(list(zip(df["camera_id"], df["timestamp"])), index=df.index)
+                df = df[~keys.isin(existing)]
+            df = df.sort_values(["camera_id", "timestamp"], ignore_index=True)
+
+        summary = self.summary
+        if not df.empty:
+            self.images_dir.mkdir(parents=True, exist_ok=True)
+            part = f"part-{len(summary['parts']):06d}.parquet"
+            table = pa.Table.from_pandas(df, schema=IMAGE_SCHEMA, preserve_index=False)
+            pq.write_table(table, self.images_dir / part)
+            summary["parts"].append(part)
+            self._merge_counts(df)
+        summary["metadata"].update(metadata or {})
+        self._refresh_derived()
+        self._write_summary()
+        LOGGER.info("Appended %d images to manifest %s", len(df), self.root)
+        return len(df)
+
+    def _merge_counts(self, df: pd.DataFrame) -> None:
+        cameras = self.summary["cameras"]
+        grouped = df.groupby("camera_id")
+        by_date = df.groupby(["camera_id", "date"]).size()
+        for camera_id, group in grouped:
+            entry = cameras.setdefault(
+                camera_id,
+                {
+                    "camera_id": camera_id,
+                    "total_images": 0,
+                    "time_range": {},
+                    "images_by_date": {},
+                },
+            )
+            entry["total_images"] += len(group)
+            earliest, latest = group["timestamp"].min(), group["timestamp"].max()
+            time_range = entry["time_range"]
+            time_range["earliest"] = min(filter(None, (time_range.get("earliest"), earliest)))
+            time_range["latest"] = max(filter(None, (time_range.get("latest"), latest)))
+            counts = entry["images_by_date"]
+            for day, count in by_date.loc[camera_id].items():
+                counts[day] = counts.get(day, 0) + int(count)
+            entry["images_by_date"] = dict(sorted(counts.items()))
+
+    def _refresh_derived(self) -> None:
+        """Recompute durations, collection stats and completion from the counts."""
+        summary = self.summary
+        cameras = summary["cameras"] = dict(sorted(summary["cameras"].items()))
+        images_per_date: dict[str, int] = defaultdict(int)
+        for entry in cameras.values():
+            time_range = entry["time_range"]
+            hours = (
+                datetime.fromisoformat(time_range["latest"])
+                - datetime.fromisoformat(time_range["earliest"])
+            ).total_seconds() / 3600
+            time_range["duration_hours"] = round(hours, 2)
+            time_range["duration_days"] = round(hours / 24, 2)
+            for day, count in entry["images_by_date"].items():
+                images_per_date[day] += count
+
+        dates = sorted(images_per_date)
+        start, end = (dates[0], dates[-1]) if dates else (None, None)
+        summary["metadata"].update(
+            {
+                "format_version": FORMAT_VERSION,
+                "collection_period": {
+                    "start_date": start,
+                    "end_date": end,
+                    "total_days": len(dates),
+                },
+                "total_cameras": len(cameras),
+                "total_images": sum(entry["total_images"] for entry in cameras.values()),
+                "generated_at": datetime.now().isoformat(),
+            }
+        )
+        summary["collection_stats"] = {
+            "date_range": {"earliest": start, "latest": end},
+            "dates_collected": dates,
+            "images_per_date": {day: images_per_date[day] for day in dates},
+        }
+        completion: dict[str, dict[str, Any]] = {}
+        if start and end:
+            days = (date.fromisoformat(end) - date.fromisoformat(start)).days + 1
+            expected = days * 24 * EXPECTED_IMAGES_PER_HOUR
+            for camera_id, entry in cameras.items():
+                actual = entry["total_images"]
+                completion[camera_id] = {
+                    "actual_images": actual,
+                    "expected_images": expected,
+                    "percentage_complete": round(actual / expected * 100 if expected else 0, 2),
+                }
+        summary["completion_stats"] = completion
+
+    def _write_summary(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.summary_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self.summary, indent=2), encoding="utf-8")
+        tmp_path.replace(self.summary_path)
+
+    def compact(self) -> None:
+        """Rewrite all parts as a single sorted part."""
+        if len(self.summary["parts"]) <= 1:
+            return
+        table = self._dataset().to_table()
+        table = table.sort_by([("camera_id", "ascending"), ("timestamp", "ascending")])
+        tmp_path = self.images_dir / "compacted.parquet.tmp"
+        pq.write_table(table, tmp_path)
+        for part in self.summary["parts"]:
+            (self.images_dir / part).unlink(missing_ok=True)
+        tmp_path.replace(self.images_dir / "part-000000.parquet")
+        self.summary["parts"] = ["part-000000.parquet"]
+        self._write_summary()
+
+    # Reading -------------------------------------------------------------
+
+    def _dataset(self) -> ds.Dataset:
+        return ds.dataset(
+            [str(self.images_dir / part) for part in self.summary["parts"]],
+            schema=IMAGE_SCHEMA,
+            format="parquet",
+        )
+
+    def images(
+        self,
+        cameras: Sequence[str] | None = None,
+        dates: Sequence[str | date] | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Image rows, sorted by camera then timestamp.
+
+        Args:
+            cameras: Only these camera IDs.
+            dates: Only these capture dates (``YYYY-MM-DD`` or ``date``).
+            columns: Subset of ``IMAGE_COLUMNS`` to read.
+
+        Returns:
+            DataFrame with one row per image.
+        """
+        columns = list(columns or IMAGE_COLUMNS)
+        if not self.summary["parts"]:
+            return pd.DataFrame(columns=columns)
+        expression = None
+        if cameras is not None:
+            expression = ds.field("camera_id").isin([str(camera) for camera in cameras])
+        if dates is not None:
+            day_filter = ds.field("date").isin([str(day) for day in dates])
+            expression = day_filter if expression is None else expression & day_filter
+        read_columns = list(dict.fromkeys([*columns, "camera_id", "timestamp"]))
+        df = self._dataset().to_table(columns=read_columns, filter=expression).to_pandas()
+        df = df.sort_values(["camera_id", "timestamp"], ignore_index=True)
+        return df[columns]
+
+    def camera_images(
+        self, cameras: Sequence[str] | None = None, columns: Sequence[str] | None = None
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Image dicts grouped by camera (the old YAML ``cameras.<id>.images`` lists)."""
+        columns = list(columns or IMAGE_COLUMNS)
+        df = self.images(cameras=cameras, columns=list(dict.fromkeys(["camera_id", *columns])))
+        df = df.astype(object).where(df.notna(), None)
+        return {
+            camera_id: group[columns].to_dict("records")
+            for camera_id, group in df.groupby("camera_id", sort=True)
+        }
+
+    def to_legacy_dict(self) -> dict[str, Any]:
+        """The full manifest in the ``image_manifest.yaml`` layout."""
+        summary = self.summary
+        columns = [column for column in IMAGE_COLUMNS if column != "camera_id"]
+        images = self.camera_images(columns=columns)
+        cameras = {}
+        for camera_id, entry in summary["cameras"].items():
+            rows = [
+                {key: value for key, value in row.items() if value is not None}
+                for row in images.get(camera_id, [])
+            ]
+            cameras[camera_id] = {**entry, "images": rows}
+        metadata = {
+            key: value for key, value in summary["metadata"].items() if key != "format_version"
+        }
+        return {
+            "metadata": metadata,
+            "collection_stats": summary["collection_stats"],
+            "cameras": cameras,
+            "completion_stats": summary["completion_stats"],
+        }
+
+    def export_yaml(self, path: Path) -> Path:
+        """Write the manifest as ``image_manifest.yaml`` for tools that still need YAML."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as file:
+            yaml.dump(
+                self.to_legacy_dict(),
+                file,
+                default_flow_style=False,
+                sort_keys=False,
+                allow_unicode=True,
+            )
+        LOGGER.info("Exported manifest YAML to %s", path)
+        return path
+
+    @classmethod
+    def from_yaml(cls, yaml_path: Path, root: Path) -> "ImageManifest":
+        """Convert an ``image_manifest.yaml`` into a columnar manifest at ``root``."""
+        with yaml_path.open() as file:
+            legacy = yaml.safe_load(file) or {}
+        rows = [
+            {"camera_id": camera_id, **image}
+            for camera_id, camera in (legacy.get("cameras") or {}).items()
+            for image in camera.get("images") or []
+        ]
+        manifest = cls(root)
+        extra = {
+            key: value
+            for key, value in (legacy.get("metadata") or {}).items()
+            if key not in {"collection_period", "total_cameras", "total_images", "generated_at"}
+        }
+        manifest.append(rows, metadata=extra)
+        return manifest
+
+
+def resolve_image_manifest(path: Path) -> Path:
+    """
+    Manifest path to open, falling back to the legacy YAML of a missing directory.
+
+    A checkout that still only has ``.../image_manifest.yaml`` keeps working
+    when pointed at ``.../image_manifest``: the YAML path is returned, and
+    ``open_image_manifest`` converts it.
+
+    Args:
+        path: Manifest directory or legacy YAML file.
+
+    Returns:
+        ``path``, or its sibling ``.yaml`` when only that exists.
+    """
+    path = Path(path)
+    if path.suffix.lower() in {".yaml", ".yml"} or path.exists():
+        return path
+    legacy = path.with_name(f"{path.name}.yaml")
+    return legacy if legacy.exists() else path
+
+
+def open_image_manifest(path: Path) -> ImageManifest:
+    """
+    Open a columnar manifest, accepting the legacy ``image_manifest.yaml`` path.
+
+    Given ``.../image_manifest.yaml``, the sibling directory ``.../image_manifest``
+    is used; if it is missing or older than the YAML file, the YAML is
+    converted into it once. A missing directory whose sibling YAML exists is
+    treated the same way.
+
+    Args:
+        path: Manifest directory or legacy YAML file.
+
+    Returns:
+        ImageManifest (which may be empty if neither exists).
+    """
+    path = resolve_image_manifest(path)
+    if path.suffix.lower() not in {".yaml", ".yml"}:
+        return ImageManifest(path)
+    manifest = ImageManifest(path.with_suffix(""))
+    if path.exists() and (
+        not manifest.exists() or manifest.summary_path.stat().st_mtime < path.stat().st_mtime
+    ):
+        LOGGER.info("Converting %s to columnar manifest %s", path, manifest.root)
+        if manifest.exists():
+            for part in manifest.summary["parts"]:
+                (manifest.images_dir / part).unlink(missing_ok=True)
+            manifest.summary_path.unlink()
+        manifest = ImageManifest.from_yaml(path, manifest.root)
+    return manifest
+
+
+__all__ = ["IMAGE_COLUMNS", "ImageManifest", "open_image_manifest", "resolve_image_manifest"]
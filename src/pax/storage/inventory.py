@@ -0,0 +1,259 @@
+"""Persistent, incrementally refreshed inventory of collected image blobs.
+
+Dashboard and status scripts used to re-list the whole bucket on every run.
+``BucketInventory`` keeps one SQLite row per image (key, size, camera, capture
+timestamp from the filename) and remembers, per bucket and prefix, a
+high-water mark: the latest capture date already indexed. A refresh only lists
+the days from that mark up to today, and the collector can add rows as it
+uploads, so statistics become SQL aggregates over a small local table. Rows of
+the listed days (or of everything, for a full refresh) whose blob is gone from
+the bucket are dropped; deletions on older days are only noticed by a full
+refresh.
+
+Rows are keyed by ``(camera_id, captured_at)`` rather than the object name, so
+an image copied into the date-partitioned layout replaces its old row instead
+of being counted twice.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from pax.storage.transfer import BlobInfo, BlobSource, blob_camera_id, list_image_blobs, parse_blob_timestamp
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    camera_id TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    capture_date TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER,
+    source TEXT,
+    PRIMARY KEY (camera_id, captured_at)
+);
+CREATE INDEX IF NOT EXISTS blobs_capture_date ON blobs (capture_date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class BucketInventory:
+    """SQLite table of image blobs with an incremental refresh."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The collector records uploads from its background upload workers.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(blobs)")}
+        if "source" not in columns:
+            # Inventories written before rows recorded where they were listed from.
+            with self._conn:
+                self._conn.execute("ALTER TABLE blobs ADD COLUMN source TEXT")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "BucketInventory":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @staticmethod
+    def _source_key(source: BlobSource, prefix: str) -> str:
+        return f"{source.name}/{prefix.rstrip('/')}"
+
+    @classmethod
+    def _mark_key(cls, source: BlobSource, prefix: str) -> str:
+        return f"high_water_mark:{cls._source_key(source, prefix)}"
+
+    def high_water_mark(self, source: BlobSource, prefix: str) -> date | None:
+        """Latest capture date indexed for ``source``/``prefix``, if any."""
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (self._mark_key(source, prefix),)
+        ).fetchone()
+        return date.fromisoformat(row[0]) if row else None
+
+    def add(self, blobs: Iterable[BlobInfo], source_key: str | None = None) -> int:
+        """
+        Insert or replace rows for image blobs.
+
+        Args:
+            blobs: Listed or just-uploaded blobs; non-image keys are ignored.
+            source_key: ``<bucket>/<prefix>`` the blobs were listed from; rows
+                added without one (collector uploads) are claimed by the next
+                refresh that lists them.
+
+        Returns:
+            Number of rows written.
+        """
+        rows = []
+        for blob in blobs:
+            camera_id = blob_camera_id(blob.name)
+            captured_at = parse_blob_timestamp(blob.name)
+            if camera_id is None or captured_at is None:
+                continue
+            rows.append(
+                (
+                    camera_id,
+                    captured_at.isoformat(),
+                    captured_at.date().isoformat(),
+                    blob.name,
+                    blob.size,
+                    source_key,
+                )
+            )
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO blobs (camera_id, captured_at, capture_date, name, size, source) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def _drop_missing(
+        self, source_key: str, prefix: str, listed: Iterable[str], days: list[date] | None
+    ) -> int:
+        """Delete rows of ``source_key`` (within ``days``) whose blob was not listed."""
+        prefix = f"{prefix.rstrip('/')}/"
+        where = "(source = ? OR source IS NULL) AND substr(name, 1, ?) = ?"
+        params: list = [source_key, len(prefix), prefix]
+        if days is not None:
+            where += f" AND capture_date IN ({', '.join('?' * len(days))})"
+            params.extend(day.isoformat() for day in days)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS listed (name TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM listed")
+            self._conn.executemany("INSERT OR IGNORE INTO listed (name) VALUES (?)", ((n,) for n in listed))
+            return self._conn.execute(
+                f"DELETE FROM blobs WHERE {where} AND name NOT IN (SELECT name FROM listed)", params
+            ).rowcount
+
+    def refresh(
+        self,
+        source: BlobSource,
+        prefix: str,
+        workers: int = 8,
+        full: bool = False,
+        today: date | None = None,
+    ) -> int:
+        """
+        Bring the inventory up to date with the bucket.
+
+        The first refresh (or ``full=True``) lists everything under ``prefix``.
+        Later refreshes list only the days from the day before the high-water
+        mark through tomorrow, which also picks up late uploads near midnight.
+        Rows for the listed days whose blobs no longer exist are deleted.
+
+        Args:
+            source: Bucket to list.
+            prefix: Top-level image prefix (e.g. ``images``).
+            workers: Concurrent listing requests.
+            full: Ignore the high-water mark and re-list everything.
+            today: Override the current date (for tests and backfills).
+
+        Returns:
+            Number of rows written.
+        """
+        started = time.perf_counter()
+        source_key = self._source_key(source, prefix)
+        mark = None if full else self.high_water_mark(source, prefix)
+        days = None
+        if mark is None:
+            blobs = list_image_blobs(source, prefix, workers=workers)
+        else:
+            today = today or datetime.now().date()
+            start = mark - timedelta(days=1)
+            days = [start + timedelta(days=offset) for offset in range((today - start).days + 2)]
+            blobs = list_image_blobs(source, prefix, dates=days, workers=workers)
+
+        written = self.add(blobs, source_key)
+        deleted = self._drop_missing(source_key, prefix, (blob.name for blob in blobs), days)
+        captured = (parse_blob_timestamp(blob.name) for blob in blobs)
+        latest = max((ts.date() for ts in captured if ts is not None), default=None)
+        if latest is not None and (mark is None or latest > mark):
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    (self._mark_key(source, prefix), latest.isoformat()),
+                )
+        LOGGER.info(
+            "Inventory refresh wrote %d rows and dropped %d (%s) in %.1fs",
+            written,
+            deleted,
+            "full listing" if mark is None else f"since {mark.isoformat()}",
+            time.perf_counter() - started,
+        )
+        return written
+
+    def _query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        # pandas is only needed for reporting; the collector just appends rows.
+        import pandas as pd
+
+        return pd.read_sql_query(sql, self._conn, params=params)
+
+    def totals(self) -> dict[str, int]:
+        """Image count, byte total, and number of cameras."""
+        images, size, cameras = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COUNT(DISTINCT camera_id) FROM blobs"
+        ).fetchone()
+        return {"images": images, "bytes": size, "cameras": cameras}
+
+    def camera_stats(self) -> pd.DataFrame:
+        """Per-camera ``images``, ``bytes``, ``first_capture``, ``last_capture``, ``days_active``."""
+        return self._query(
+            "SELECT camera_id, COUNT(*) AS images, COALESCE(SUM(size), 0) AS bytes, "
+            "MIN(captured_at) AS first_capture, MAX(captured_at) AS last_capture, "
+            "COUNT(DISTINCT capture_date) AS days_active "
+            "FROM blobs GROUP BY camera_id ORDER BY camera_id"
+        )
+
+    def camera_dates(self) -> pd.DataFrame:
+        """Image counts per ``(camera_id, capture_date)``."""
+        return self._query(
+            "SELECT camera_id, capture_date, COUNT(*) AS images "
+            "FROM blobs GROUP BY camera_id, capture_date ORDER BY camera_id, capture_date"
+        )
+
+    def hourly_counts(self, since: date | None = None, by_camera: bool = False) -> pd.DataFrame:
+        """
+        Image counts per filename hour (``YYYY-MM-DDTHH``), for timezone-aware rollups.
+
+        Columns are ``hour``, ``images``, ``bytes``, ``first_capture`` and
+        ``last_capture``, plus ``camera_id`` when ``by_camera`` is set.
+        """
+        where, params = ("WHERE capture_date >= ?", (since.isoformat(),)) if since else ("", ())
+        keys = "camera_id, hour" if by_camera else "hour"
+        return self._query(
+            f"SELECT {'camera_id, ' if by_camera else ''}substr(captured_at, 1, 13) AS hour, "
+            "COUNT(*) AS images, COALESCE(SUM(size), 0) AS bytes, "
+            "MIN(captured_at) AS first_capture, MAX(captured_at) AS last_capture "
+            f"FROM blobs {where} GROUP BY {keys} ORDER BY {keys}",
+            params,
+        )
+
+    def latest(self) -> dict[str, str] | None:
+        """The most recent image: ``name``, ``camera_id`` and naive ``captured_at``."""
+        row = self._conn.execute(
+            "SELECT name, camera_id, captured_at FROM blobs ORDER BY captured_at DESC LIMIT 1"
+        ).fetchone()
+        return dict(zip(("name", "camera_id", "captured_at"), row)) if row else None
+
+
+__all__ = ["BucketInventory"]
@@ -0,0 +1,96 @@
+"""Object key layouts for collected camera images.
+
+``camera`` (the original layout) keys images as ``<camera>/<timestamp>.jpg``;
+``date`` keys them as ``date=YYYY-MM-DD/hour=HH/<camera>/<timestamp>.jpg`` so a
+listing for one day or hour only touches that partition. The camera id is the
+parent folder of the image in both layouts, and dates/hours are the Eastern
+capture time encoded in the filename.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from pathlib import PurePath
+from typing import Literal
+
+KeyLayout = Literal["camera", "date"]
+
+DATE_PARTITION_KEY = "date="
+HOUR_PARTITION_KEY = "hour="
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S"
+
+
+def date_partition(day: date, hour: int | None = None) -> str:
+    """Return the ``date=YYYY-MM-DD/`` (or ``.../hour=HH/``) partition for a day."""
+    partition = f"{DATE_PARTITION_KEY}{day:%Y-%m-%d}/"
+    if hour is not None:
+        partition += f"{HOUR_PARTITION_KEY}{hour:02d}/"
+    return partition
+
+
+def image_key(camera_slug: str, captured_at: datetime, layout: KeyLayout = "camera") -> str:
+    """
+    Build the object key (relative to the bucket prefix) for one image.
+
+    Args:
+        camera_slug: Slugified camera id.
+        captured_at: Capture time in the timezone used for filenames (Eastern).
+        layout: ``camera`` or ``date``.
+
+    Returns:
+        Key such as ``<camera>/20251110T083000.jpg``.
+    """
+    filename = f"{captured_at.strftime(TIMESTAMP_FORMAT)}.jpg"
+    if layout == "camera":
+        return f"{camera_slug}/{filename}"
+    if layout == "date":
+        return f"{date_partition(captured_at.date(), captured_at.hour)}{camera_slug}/{filename}"
+    raise ValueError(f"Unknown key layout: {layout}")
+
+
+def is_date_partitioned(name: str, prefix: str) -> bool:
+    """Return True if blob ``name`` under ``prefix`` uses the date layout."""
+    relative = name[len(prefix.rstrip("/")) + 1 :] if prefix else name
+    return relative.startswith(DATE_PARTITION_KEY)
+
+
+def camera_id_from_path(image_path: str | PurePath) -> str | None:
+    """
+    Camera id of a local image, from its file name or folder.
+
+    Supports ``YYYY-MM-DD/<camera>_<timestamp>.jpg``,
+    ``images/<camera>/<timestamp>.jpg`` and ``<camera>/<timestamp>.jpg``.
+    Returns None if the path matches none of them.
+    """
+    image_path = PurePath(image_path)
+    parts = image_path.parts
+    filename = image_path.stem
+
+    # YYYY-MM-DD/camera-id_timestamp.jpg
+    if len(parts) >= 2 and "_" in filename:
+        return filename.split("_")[0]
+
+    # images/camera-id/timestamp.jpg
+    if "images" in parts:
+        idx = parts.index("images")
+        if idx + 1 < len(parts):
+            return parts[idx + 1]
+
+    # camera-id/timestamp.jpg, skipping date directories (YYYY-MM-DD)
+    if len(parts) >= 2:
+        parent = parts[-2]
+        if not parent.replace("-", "").isdigit():
+            return parent
+
+    return None
+
+
+__all__ = [
+    "DATE_PARTITION_KEY",
+    "HOUR_PARTITION_KEY",
+    "KeyLayout",
+    "camera_id_from_path",
+    "date_partition",
+    "image_key",
+    "is_date_partitioned",
+]
@@ -0,0 +1,135 @@
+"""Move camera-layout image blobs into the date-partitioned layout.
+
+Copies are server-side and run on a thread pool. Objects already present at
+their date-layout key are skipped, so the migration can be re-run (or resumed
+after an interruption) and can proceed a few days at a time.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable
+
+from pax.storage.layout import image_key, is_date_partitioned
+from pax.storage.transfer import BlobSource, blob_camera_id, list_image_blobs, parse_blob_timestamp
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class MigrationReport:
+    """Outcome of a key layout migration."""
+
+    total: int = 0
+    copied: int = 0
+    skipped: int = 0
+    deleted: int = 0
+    unparsed: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.copied} copied, {self.skipped} already migrated, {self.deleted} originals deleted, "
+            f"{len(self.unparsed)} unparsed, {len(self.failed)} failed of {self.total} "
+            f"in {self.elapsed_s:.1f}s"
+        )
+
+
+def plan_date_layout(
+    source: BlobSource,
+    prefix: str,
+    dates: Iterable[date] | None = None,
+    workers: int = 8,
+) -> tuple[list[tuple[str, str]], MigrationReport]:
+    """
+    Work out which camera-layout blobs still need a date-layout copy.
+
+    Returns:
+        ``(old_name, new_name)`` pairs and a report with ``total``, ``skipped``
+        and ``unparsed`` filled in.
+    """
+    prefix = prefix.rstrip("/")
+    blobs = list_image_blobs(source, prefix, dates=dates, workers=workers, unique=False)
+    existing = {b.name for b in blobs if is_date_partitioned(b.name, prefix)}
+    report = MigrationReport()
+    moves: list[tuple[str, str]] = []
+    for blob in blobs:
+        if is_date_partitioned(blob.name, prefix):
+            continue
+        report.total += 1
+        captured_at = parse_blob_timestamp(blob.name)
+        camera_id = blob_camera_id(blob.name)
+        if captured_at is None or camera_id is None:
+            report.unparsed.append(blob.name)
+            continue
+        new_name = f"{prefix}/{image_key(camera_id, captured_at, 'date')}"
+        if new_name in existing:
+            report.skipped += 1
+            continue
+        moves.append((blob.name, new_name))
+    return moves, report
+
+
+def migrate_to_date_layout(
+    source: BlobSource,
+    prefix: str,
+    dates: Iterable[date] | None = None,
+    workers: int = 16,
+    delete_source: bool = False,
+    dry_run: bool = False,
+) -> MigrationReport:
+    """
+    Copy camera-layout images under ``prefix`` to their date-layout keys.
+
+    Args:
+        source: Bucket to migrate in place.
+        prefix: Top-level image prefix (e.g. ``images``).
+        dates: Capture dates to migrate; None migrates everything.
+        workers: Concurrent copy requests.
+        delete_source: Delete each original after its copy succeeds.
+        dry_run: Only plan and log the moves.
+
+    Returns:
+        MigrationReport with counts and failures.
+    """
+    started = time.perf_counter()
+    moves, report = plan_date_layout(source, prefix, dates=dates, workers=min(workers, 8))
+    if report.unparsed:
+        LOGGER.warning("Skipping %d blobs without a camera/timestamp key", len(report.unparsed))
+    LOGGER.info("%d blobs to migrate, %d already migrated", len(moves), report.skipped)
+
+    if dry_run:
+        for old_name, new_name in moves[:10]:
+            LOGGER.info("Would copy %s -> %s", old_name, new_name)
+        report.elapsed_s = time.perf_counter() - started
+        return report
+
+    def _move(old_name: str, new_name: str) -> bool:
+        source.copy_blob(old_name, new_name)
+        if delete_source:
+            source.delete_blob(old_name)
+        return delete_source
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(_move, old, new): old for old, new in moves}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                report.deleted += int(future.result())
+                report.copied += 1
+            except Exception as exc:  # noqa: BLE001 - keep going, report at the end
+                LOGGER.warning("Failed to migrate %s: %s", futures[future], exc)
+                report.failed.append(futures[future])
+            if done % 500 == 0:
+                LOGGER.info("[%d/%d] blobs migrated", done, len(moves))
+
+    report.elapsed_s = time.perf_counter() - started
+    LOGGER.info("Migration complete: %s", report.summary())
+    return report
+
+
+__all__ = ["MigrationReport", "migrate_to_date_layout", "plan_date_layout"]
@@ -0,0 +1,71 @@
+"""Test the columnar image manifest against the legacy YAML layout."""
+
+from __future__ import annotations
+
+import yaml
+
+from pax.storage.image_manifest import ImageManifest, open_image_manifest, resolve_image_manifest
+
+
+def _images(camera_id, day, hours):
+    return [
+        {
+            "camera_id": camera_id,
+            "timestamp": f"{day}T{hour:02d}:00:00",
+            "local_path": f"images/{camera_id}/{day}_{hour:02d}.jpg",
+            "size_bytes": 20_000,
+        }
+        for hour in hours
+    ]
+
+
+def test_append_dedupes_and_indexes(tmp_path):
+    manifest = ImageManifest(tmp_path / "image_manifest")
+    assert manifest.append(_images("cam-a", "2025-11-10", range(3)), metadata={"bucket": "b"}) == 3
+    rows = _images("cam-a", "2025-11-10", range(2, 4)) + _images("cam-b", "2025-11-11", [8])
+    assert manifest.append(rows) == 2
+
+    reopened = ImageManifest(tmp_path / "image_manifest")
+    assert reopened.metadata["total_images"] == 5
+    assert reopened.metadata["bucket"] == "b"
+    assert reopened.camera_counts() == {"cam-a": 4, "cam-b": 1}
+    assert reopened.images_per_date() == {"2025-11-10": 4, "2025-11-11": 1}
+    assert reopened.cameras["cam-a"]["time_range"]["duration_hours"] == 3.0
+
+    df = reopened.images(dates=["2025-11-11"], columns=["camera_id", "local_path"])
+    assert df.to_dict("records") == [
+        {"camera_id": "cam-b", "local_path": "images/cam-b/2025-11-11_08.jpg"}
+    ]
+
+    reopened.compact()
+    assert reopened.summary["parts"] == ["part-000000.parquet"]
+    assert len(reopened.images(cameras=["cam-a"])) == 4
+
+
+def test_yaml_round_trip(tmp_path):
+    manifest = ImageManifest(tmp_path / "built")
+    manifest.append(_images("cam-a", "2025-11-10", range(2)) + _images("cam-b", "2025-11-10", [5]))
+    yaml_path = manifest.export_yaml(tmp_path / "image_manifest.yaml")
+
+    legacy = yaml.safe_load(yaml_path.read_text())
+    assert legacy["metadata"]["total_images"] == 3
+    assert legacy["cameras"]["cam-a"]["images"][1]["local_path"] == "images/cam-a/2025-11-10_01.jpg"
+
+    converted = open_image_manifest(yaml_path)
+    assert converted.root == tmp_path / "image_manifest"
+    assert converted.camera_counts() == {"cam-a": 2, "cam-b": 1}
+    assert converted.to_legacy_dict()["cameras"] == legacy["cameras"]
+
+
+def test_directory_path_falls_back_to_legacy_yaml(tmp_path):
+    built = ImageManifest(tmp_path / "built")
+    built.append(_images("cam-a", "2025-11-10", range(2)))
+    yaml_path = built.export_yaml(tmp_path / "image_manifest.yaml")
+    directory = tmp_path / "image_manifest"
+
+    assert resolve_image_manifest(directory) == yaml_path
+    assert resolve_image_manifest(tmp_path / "other") == tmp_path / "other"
+
+    converted = open_image_manifest(directory)
+    assert converted.root == directory and converted.camera_counts() == {"cam-a": 2}
+    assert resolve_image_manifest(directory) == directory
@@ -0,0 +1,143 @@
+"""Test bulk transfers against a filesystem-backed fake bucket."""
+
+from __future__ import annotations
+
+import json
+import zipfile
+from datetime import date, datetime
+from pathlib import Path
+
+from pax.scripts.package_daily_images import package_daily_images
+from pax.storage.inventory import BucketInventory
+from pax.storage.layout import image_key
+from pax.storage.migration import migrate_to_date_layout
+from pax.storage.transfer import STATE_FILENAME, BlobInfo, BulkDownloader, LocalBlobSource, file_crc32c, list_image_blobs
+from pax.storage.uploader import LocalUploader
+
+
+def make_bucket(root: Path, checksums: bool = False) -> LocalBlobSource:
+    for camera in ("cam-a", "cam-b"):
+        for stamp in ("20251109T235900", "20251110T120000", "20251110T123000", "20251111T000100"):
+            path = root / "images" / camera / f"{stamp}.jpg"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(f"{camera}-{stamp}".encode() * 50)
+    (root / "images" / "cam-a" / "notes.txt").write_text("not an image")
+    return LocalBlobSource(root, checksums=checksums)
+
+
+def test_date_scoped_listing(tmp_path):
+    source = make_bucket(tmp_path / "bucket")
+    blobs = list_image_blobs(source, "images", dates=[date(2025, 11, 10)], workers=2)
+    assert [b.name for b in blobs] == [
+        "images/cam-a/20251110T120000.jpg",
+        "images/cam-a/20251110T123000.jpg",
+        "images/cam-b/20251110T120000.jpg",
+        "images/cam-b/20251110T123000.jpg",
+    ]
+    assert len(list_image_blobs(source, "images")) == 8
+
+
+def test_resumable_verified_download(tmp_path):
+    source = make_bucket(tmp_path / "bucket", checksums=True)
+    out = tmp_path / "out"
+    tasks = [(blob, out / blob.name) for blob in list_image_blobs(source, "images")]
+
+    # A truncated leftover from an interrupted run is re-fetched.
+    partial = tasks[0][1]
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes(b"trunc")
+
+    downloader = BulkDownloader(source, workers=4, state_path=out / STATE_FILENAME)
+    report = downloader.download(tasks)
+    assert (report.downloaded, report.skipped, report.failed) == (8, 0, [])
+    assert all(dest.read_bytes() == (source.root / blob.name).read_bytes() for blob, dest in tasks)
+    assert not list(out.rglob("*.part"))
+
+    again = BulkDownloader(source, workers=4, state_path=out / STATE_FILENAME).download(tasks)
+    assert (again.downloaded, again.skipped) == (0, 8)
+
+
+def test_package_daily_images_from_fake_bucket(tmp_path):
+    source = make_bucket(tmp_path / "bucket")
+    archive = package_daily_images("local", "images", "2025-11-10", tmp_path / "pkg", source=source, workers=2)
+    with zipfile.ZipFile(archive) as zf:
+        assert sorted(zf.namelist()) == [
+            "2025-11-10/cam-a/20251110T120000.jpg",
+            "2025-11-10/cam-a/20251110T123000.jpg",
+            "2025-11-10/cam-b/20251110T120000.jpg",
+            "2025-11-10/cam-b/20251110T123000.jpg",
+        ]
+        assert {info.compress_type for info in zf.infolist()} == {zipfile.ZIP_STORED}
+
+    manifest = package_daily_images(
+        "local", "images", "2025-11-10", tmp_path / "sharded", source=source, workers=2, shards=2
+    )
+    archives = json.loads(manifest.read_text())["archives"]
+    assert [entry["cameras"] for entry in archives] == [["cam-a"], ["cam-b"]]
+    assert sum(len(zipfile.ZipFile(entry["path"]).namelist()) for entry in archives) == 4
+
+
+def test_date_layout_listing_and_migration(tmp_path):
+    source = make_bucket(tmp_path / "bucket")
+    report = migrate_to_date_layout(source, "images", dates=[date(2025, 11, 10)], workers=2)
+    assert (report.copied, report.failed) == (4, [])
+    assert (source.root / "images/date=2025-11-10/hour=12/cam-a/20251110T123000.jpg").exists()
+    assert migrate_to_date_layout(source, "images", dates=[date(2025, 11, 10)]).copied == 0
+
+    # Both copies exist mid-migration; listings report each image once, from the partition.
+    blobs = list_image_blobs(source, "images", dates=[date(2025, 11, 10)], hours=[12], cameras=["cam-b"])
+    assert [b.name for b in blobs] == [
+        "images/date=2025-11-10/hour=12/cam-b/20251110T120000.jpg",
+        "images/date=2025-11-10/hour=12/cam-b/20251110T123000.jpg",
+    ]
+    assert len(list_image_blobs(source, "images")) == 8
+    assert image_key("cam-a", datetime(2025, 11, 10, 7, 30), "date") == "date=2025-11-10/hour=07/cam-a/20251110T073000.jpg"
+
+
+def test_incremental_inventory(tmp_path):
+    source = make_bucket(tmp_path / "bucket")
+    with BucketInventory(tmp_path / "inventory.sqlite") as inventory:
+        assert inventory.refresh(source, "images") == 8
+        assert inventory.high_water_mark(source, "images") == date(2025, 11, 11)
+
+        new = source.root / "images/cam-c/20251112T080000.jpg"
+        new.parent.mkdir(parents=True)
+        new.write_bytes(b"x" * 10)
+        # Only 2025-11-10 .. 2025-11-13 are re-listed; 2025-11-09 is not.
+        assert inventory.refresh(source, "images", today=date(2025, 11, 12)) == 7
+
+        # An upload recorded under the date layout replaces, not duplicates, its row.
+        inventory.add([BlobInfo(name="images/date=2025-11-12/hour=08/cam-c/20251112T080000.jpg", size=10)])
+        assert inventory.totals() == {"images": 9, "bytes": 10 + 8 * 1050, "cameras": 3}
+        stats = inventory.camera_stats().set_index("camera_id")
+        assert stats.loc["cam-a", "days_active"] == 3
+        assert inventory.latest()["name"].endswith("date=2025-11-12/hour=08/cam-c/20251112T080000.jpg")
+        assert inventory.hourly_counts(since=date(2025, 11, 11))["images"].sum() == 3
+
+        # Deletions are reconciled for the re-listed days; each prefix keeps its own mark.
+        (source.root / "images/cam-b/20251111T000100.jpg").unlink()
+        inventory.refresh(source, "images", today=date(2025, 11, 12))
+        assert inventory.totals()["images"] == 8
+        assert inventory.refresh(source, "thumbnails") == 0
+        assert inventory.high_water_mark(source, "thumbnails") is None
+
+
+def test_local_uploader_round_trip(tmp_path):
+    files = []
+    for idx in range(3):
+        path = tmp_path / "src" / f"{idx}.jpg"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(bytes([idx]) * 100)
+        files.append((path, f"cam-a/2025111{idx}T080000.jpg"))
+
+    uploader = LocalUploader(tmp_path / "bucket", prefix="images", workers=2)
+    uris = uploader.upload_files(files)
+    assert uris[0] == (tmp_path / "bucket/images/cam-a/20251110T080000.jpg").as_uri()
+
+    store = uploader.store
+    info = store.stat("images/cam-a/20251112T080000.jpg")
+    assert (info.size, info.crc32c) == (100, file_crc32c(files[2][0]))
+    assert store.stat("images/cam-a/missing.jpg") is None
+    listed = list_image_blobs(store, "images")
+    # Listing a local bucket does not read the files; stat does.
+    assert len(listed) == 3 and {blob.crc32c for blob in listed} == {None}
@@ -0,0 +1,67 @@
+"""Test the durable upload queue against a local fake bucket."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from pax.storage.upload_queue import BackgroundUploader, UploadQueue
+from pax.storage.uploader import LocalUploader
+
+
+class FlakyUploader(LocalUploader):
+    """Fails the first upload of every key."""
+
+    def __init__(self, root: Path) -> None:
+        super().__init__(root, prefix="images")
+        self.seen: set[str] = set()
+
+    def upload_file(self, local_path: Path, remote_key: str) -> str:
+        if remote_key not in self.seen:
+            self.seen.add(remote_key)
+            raise ConnectionError("transient")
+        return super().upload_file(local_path, remote_key)
+
+
+def test_queue_retries_and_survives_restart(tmp_path):
+    images = []
+    for idx in range(4):
+        path = tmp_path / "raw" / f"{idx}.jpg"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"jpeg" * 10)
+        images.append(path)
+
+    queue = UploadQueue(tmp_path / "queue.sqlite", lease_s=0.2)
+    for idx, path in enumerate(images):
+        queue.enqueue(path, f"cam-a/2025111{idx}T080000.jpg")
+    # Simulate a process killed while an upload was in flight.
+    in_flight = queue.claim()
+    queue.close()
+
+    # While the lease is live, another process sharing the queue leaves the item alone.
+    queue = UploadQueue(tmp_path / "queue.sqlite", lease_s=0.2)
+    assert queue.counts() == {"pending": 3, "in_progress": 1}
+    claimed = {queue.claim().remote_key for _ in range(3)}
+    assert len(claimed) == 3 and in_flight.remote_key not in claimed
+    assert queue.claim() is None
+    queue.close()
+
+    time.sleep(0.3)
+    queue = UploadQueue(tmp_path / "queue.sqlite")
+
+    uploaded = []
+    worker = BackgroundUploader(
+        queue,
+        FlakyUploader(tmp_path / "bucket"),
+        workers=2,
+        backoff_s=0.01,
+        on_uploaded=lambda item, uri: uploaded.append(item.remote_key),
+        poll_interval_s=0.01,
+    )
+    assert worker.drain(timeout_s=10) == 0
+    worker.stop()
+
+    assert queue.counts() == {"done": 4}
+    assert sorted(uploaded) == [f"cam-a/2025111{idx}T080000.jpg" for idx in range(4)]
+    uris = queue.remote_uris(images)
+    assert uris[str(images[0])] == (tmp_path / "bucket/images/cam-a/20251110T080000.jpg").as_uri()
@@ -0,0 +1,61 @@
+"""Test shard leases, heartbeats and reclaiming in the work queue."""
+
+from __future__ import annotations
+
+import time
+
+from pax.storage.work_queue import LeaseHeartbeat, WorkQueue
+
+
+def test_expired_lease_is_reclaimed_and_stale_worker_cannot_complete(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    assert queue.enqueue([f"cam-a/{idx}.jpg" for idx in range(5)], shard_size=2) == 3
+    # Rerunning the coordinator only shards items it has not seen.
+    assert queue.enqueue([f"cam-a/{idx}.jpg" for idx in range(7)], shard_size=2) == 1
+
+    stale = queue.claim("node-a", lease_s=0.05)
+    assert stale.items == ("cam-a/0.jpg", "cam-a/1.jpg") and stale.name == "shard-000001"
+    time.sleep(0.1)
+
+    # A second process on another node sees the same file.
+    other = WorkQueue(tmp_path / "queue.sqlite")
+    claimed = [other.claim("node-b", lease_s=30) for _ in range(4)]
+    # Pending shards go first, then the expired lease.
+    assert [lease.shard_id for lease in claimed] == [2, 3, 4, 1]
+    assert claimed[-1].attempts == 2
+    assert other.claim("node-b", lease_s=30) is None
+
+    assert not queue.heartbeat(stale, lease_s=30)
+    assert not queue.complete(stale, tmp_path / "a.json")
+    for lease in claimed:
+        assert other.complete(lease, tmp_path / f"{lease.name}.json")
+
+    assert queue.counts() == {"done": 4} and queue.outstanding() == 0
+    assert [path.name for path in queue.fragments()][0] == "shard-000001.json"
+    other.close()
+    queue.close()
+
+
+def test_heartbeat_keeps_lease_and_repeated_failures_give_up(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=2)
+    queue.enqueue(["a.jpg", "b.jpg"], shard_size=1)
+
+    lease = queue.claim("node-a", lease_s=0.2)
+    with LeaseHeartbeat(queue, lease, lease_s=0.2, interval_s=0.05) as heartbeat:
+        time.sleep(0.4)
+        assert queue.claim("node-b", lease_s=0.2).items == ("b.jpg",)
+        assert queue.claim("node-b", lease_s=0.2) is None
+    assert not heartbeat.lost.is_set()
+
+    assert queue.fail(lease, "boom")
+    retry = queue.claim("node-b", lease_s=30)
+    assert retry.items == ("a.jpg",) and retry.attempts == 2
+    assert not queue.fail(retry, "boom again")
+    assert queue.counts() == {"failed": 1, "leased": 1}
+    assert queue.failures() == [("shard-000001", "boom again")]
+
+    assert queue.requeue_failed() == 1
+    again = queue.claim("node-c", lease_s=30)
+    assert again.items == ("a.jpg",) and again.attempts == 1
+    assert queue.failures() == []
+    queue.close()
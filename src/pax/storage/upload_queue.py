@@ -0,0 +1,295 @@
+"""Durable upload queue drained by background workers.
+
+The collector writes each image to disk and enqueues it instead of uploading
+inline, so remote latency no longer stretches a sweep. Queue entries live in
+a SQLite file next to the collected data: if the process is killed mid-sweep,
+the next run picks up whatever was still pending. Claimed uploads are held
+under a lease, so an upload left in flight by a dead process is claimed again
+once its lease expires, while one a live process (another collector sharing
+the queue) is still working on is left alone. Failed uploads are retried with
+exponential backoff up to ``max_attempts``.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from pax.storage.uploader import RemoteUploader
+from pax.telemetry import counter
+
+LOGGER = logging.getLogger(__name__)
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    local_path TEXT NOT NULL,
+    remote_key TEXT NOT NULL UNIQUE,
+    metadata_path TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    remote_uri TEXT,
+    last_error TEXT,
+    enqueued_at REAL NOT NULL,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS uploads_status ON uploads (status, next_attempt_at);
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class UploadItem:
+    """One queued upload."""
+
+    id: int
+    local_path: Path
+    remote_key: str
+    metadata_path: Path | None
+    attempts: int
+
+
+class UploadQueue:
+    """SQLite-backed FIFO of ``(local_path, remote_key)`` uploads."""
+
+    def __init__(self, path: Path, lease_s: float = 300.0) -> None:
+        """
+        Args:
+            path: Queue file.
+            lease_s: How long a claimed upload is reserved for its worker; keep
+                it above the slowest expected upload.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_s = lease_s
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(uploads)")}
+            if "lease_expires_at" not in columns:
+                # Queues written before leases; their in-flight rows count as expired.
+                self._conn.execute("ALTER TABLE uploads ADD COLUMN lease_expires_at REAL")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(self, local_path: Path, remote_key: str, metadata_path: Path | None = None) -> None:
+        """Add an upload; re-enqueueing a key resets it to pending."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO uploads (local_path, remote_key, metadata_path, enqueued_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (remote_key) DO UPDATE SET local_path = excluded.local_path, "
+                "metadata_path = excluded.metadata_path, status = 'pending', attempts = 0, next_attempt_at = 0",
+                (str(local_path), remote_key, str(metadata_path) if metadata_path else None, time.time()),
+            )
+
+    def claim(self) -> UploadItem | None:
+        """
+        Take the oldest due pending item and lease it for ``lease_s`` seconds.
+
+        An in-progress item whose lease has expired (its worker died) is
+        claimed like a pending one.
+        """
+        due = "(status = ? AND next_attempt_at <= ?) OR (status = ? AND COALESCE(lease_expires_at, 0) < ?)"
+        with self._lock, self._conn:
+            now = time.time()
+            params = (PENDING, now, IN_PROGRESS, now)
+            row = self._conn.execute(
+                "SELECT id, local_path, remote_key, metadata_path, attempts, status FROM uploads "
+                f"WHERE {due} ORDER BY id LIMIT 1",
+                params,
+            ).fetchone()
+            if row is None:
+                return None
+            # Another process may have claimed the row since the SELECT.
+            claimed = self._conn.execute(
+                f"UPDATE uploads SET status = ?, lease_expires_at = ? WHERE id = ? AND ({due})",
+                (IN_PROGRESS, now + self.lease_s, row[0], *params),
+            ).rowcount
+        if not claimed:
+            return None
+        if row[5] == IN_PROGRESS:
+            LOGGER.info("Reclaimed interrupted upload of %s", row[2])
+        return UploadItem(
+            id=row[0],
+            local_path=Path(row[1]),
+            remote_key=row[2],
+            metadata_path=Path(row[3]) if row[3] else None,
+            attempts=row[4],
+        )
+
+    def complete(self, item: UploadItem, remote_uri: str | None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE uploads SET status = ?, remote_uri = ?, attempts = attempts + 1, last_error = NULL "
+                "WHERE id = ?",
+                (DONE, remote_uri, item.id),
+            )
+
+    def retry(self, item: UploadItem, error: str, delay_s: float, max_attempts: int) -> bool:
+        """Record a failure; return True if the item will be retried."""
+        attempts = item.attempts + 1
+        status = PENDING if attempts < max_attempts else FAILED
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE uploads SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (status, attempts, time.time() + delay_s, error, item.id),
+            )
+        return status == PENDING
+
+    def outstanding(self) -> int:
+        """Number of items still pending or in flight (including ones backing off)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM uploads WHERE status IN (?, ?)", (PENDING, IN_PROGRESS)
+            ).fetchone()[0]
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM uploads GROUP BY status").fetchall()
+        return dict(rows)
+
+    def remote_uris(self, local_paths: Iterable[Path]) -> dict[str, str]:
+        """Map uploaded local paths (as strings) to their remote URIs."""
+        paths = [str(path) for path in local_paths]
+        if not paths:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT local_path, remote_uri FROM uploads WHERE status = ? AND local_path IN "
+                f"({', '.join('?' * len(paths))})",
+                (DONE, *paths),
+            ).fetchall()
+        return {path: uri for path, uri in rows if uri}
+
+    def prune(self, older_than_s: float = 7 * 24 * 3600) -> int:
+        """Drop completed entries older than ``older_than_s`` seconds."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM uploads WHERE status = ? AND enqueued_at < ?", (DONE, time.time() - older_than_s)
+            ).rowcount
+
+
+class _RateLimiter:
+    """Space out calls so no more than ``rate_per_s`` start per second."""
+
+    def __init__(self, rate_per_s: float | None) -> None:
+        self._interval = 1.0 / rate_per_s if rate_per_s else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class BackgroundUploader:
+    """Worker threads that drain an ``UploadQueue`` into a ``RemoteUploader``."""
+
+    def __init__(
+        self,
+        queue: UploadQueue,
+        uploader: RemoteUploader,
+        workers: int = 4,
+        max_attempts: int = 5,
+        backoff_s: float = 2.0,
+        rate_per_s: float | None = None,
+        on_uploaded: Callable[[UploadItem, str | None], None] | None = None,
+        poll_interval_s: float = 0.2,
+    ) -> None:
+        self.queue = queue
+        self.uploader = uploader
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self.on_uploaded = on_uploaded
+        self.poll_interval_s = poll_interval_s
+        self._limiter = _RateLimiter(rate_per_s)
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"pax-upload-{idx}", daemon=True)
+            for idx in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        LOGGER.debug("Started %d upload workers (%d queued)", self.workers, self.queue.outstanding())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            item = self.queue.claim()
+            if item is None:
+                self._stop.wait(self.poll_interval_s)
+                continue
+            self._limiter.acquire()
+            self.process(item)
+
+    def process(self, item: UploadItem) -> bool:
+        """Upload one claimed item; return True on success."""
+        try:
+            remote_uri = self.uploader.upload_file(item.local_path, item.remote_key)
+        except Exception as exc:  # noqa: BLE001 - retried with backoff
+            delay = self.backoff_s * (2**item.attempts)
+            if self.queue.retry(item, str(exc), delay, self.max_attempts):
+                counter("pax_upload_retries_total", "Queued uploads scheduled for retry").inc()
+                LOGGER.warning("Upload of %s failed, retrying in %.0fs: %s", item.remote_key, delay, exc)
+            else:
+                counter("pax_upload_abandoned_total", "Queued uploads that ran out of attempts").inc()
+                LOGGER.error("Giving up on %s after %d attempts: %s", item.remote_key, item.attempts + 1, exc)
+            return False
+        self.queue.complete(item, remote_uri)
+        counter("pax_uploads_completed_total", "Queued uploads completed").inc()
+        if self.on_uploaded is not None:
+            try:
+                self.on_uploaded(item, remote_uri)
+            except Exception as exc:  # noqa: BLE001 - the upload itself succeeded
+                LOGGER.warning("Post-upload hook failed for %s: %s", item.remote_key, exc)
+        return True
+
+    def drain(self, timeout_s: float | None = None) -> int:
+        """Block until the queue is empty or ``timeout_s`` elapses; return items left."""
+        if not self.running:
+            self.start()
+        deadline = time.monotonic() + timeout_s if timeout_s is not None else None
+        remaining = self.queue.outstanding()
+        while remaining and (deadline is None or time.monotonic() < deadline):
+            time.sleep(self.poll_interval_s)
+            remaining = self.queue.outstanding()
+        if remaining:
+            LOGGER.warning("%d uploads still queued; they will resume on the next run", remaining)
+        return remaining
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+__all__ = ["BackgroundUploader", "UploadItem", "UploadQueue"]
@@ -5,9 +5,10 @@ from __future__ import annotations
 import logging
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Protocol
+from typing import Sequence
 
-from google.cloud import storage
+from pax.storage.transfer import BlobSource, GCSBlobSource, LocalBlobSource
+from pax.telemetry import counter, span
 
 LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +20,11 @@ class RemoteUploader(ABC):
     def upload_file(self, local_path: Path, remote_key: str) -> str | None:
         """Upload the file and return a URI if available."""
 
+    def upload_files(self, items: Sequence[tuple[Path, str]]) -> list[str | None]:
+        """Upload ``(local_path, remote_key)`` pairs and return their URIs in order."""
+
+        return [self.upload_file(local_path, remote_key) for local_path, remote_key in items]
+
 
 class NullUploader(RemoteUploader):
     """No-op uploader used when remote storage is disabled."""
@@ -27,18 +33,50 @@ class NullUploader(RemoteUploader):
         return None
 
 
-class GCSUploader(RemoteUploader):
-    """Upload artifacts to Google Cloud Storage."""
+class BlobStoreUploader(RemoteUploader):
+    """Upload artifacts under ``prefix`` in any ``BlobSource``."""
 
-    def __init__(self, bucket: str, prefix: str = "pax") -> None:
-        self._client = storage.Client()
-        self._bucket = self._client.bucket(bucket)
+    def __init__(self, store: BlobSource, prefix: str = "pax", workers: int = 8) -> None:
+        self.store = store
         self._prefix = prefix.rstrip("/")
+        self._workers = workers
+
+    def _blob_path(self, remote_key: str) -> str:
+        return f"{self._prefix}/{remote_key}" if self._prefix else remote_key
 
     def upload_file(self, local_path: Path, remote_key: str) -> str:
-        blob_path = f"{self._prefix}/{remote_key}" if self._prefix else remote_key
-        blob = self._bucket.blob(blob_path)
-        LOGGER.debug("Uploading %s to gs://%s/%s", local_path, self._bucket.name, blob_path)
-        blob.upload_from_filename(local_path)
-        return f"gs://{self._bucket.name}/{blob_path}"
+        blob_path = self._blob_path(remote_key)
+        LOGGER.debug("Uploading %s to %s/%s", local_path, self.store.name, blob_path)
+        with span("pax_upload", {"store": type(self.store).__name__}, key=blob_path):
+            uri = self.store.upload_file(local_path, blob_path)
+        counter("pax_upload_bytes_total", "Bytes uploaded to remote storage").inc(
+            Path(local_path).stat().st_size
+        )
+        return uri
+
+    def upload_files(self, items: Sequence[tuple[Path, str]]) -> list[str | None]:
+        pairs = [(local_path, self._blob_path(remote_key)) for local_path, remote_key in items]
+        LOGGER.debug("Uploading %d files to %s/%s", len(pairs), self.store.name, self._prefix)
+        with span("pax_upload_batch", {"store": type(self.store).__name__}, files=len(pairs)):
+            uris = list(self.store.upload_many(pairs, workers=self._workers))
+        counter("pax_upload_bytes_total", "Bytes uploaded to remote storage").inc(
+            sum(Path(local_path).stat().st_size for local_path, _ in pairs)
+        )
+        return uris
+
+
+class GCSUploader(BlobStoreUploader):
+    """Upload artifacts to Google Cloud Storage."""
+
+    def __init__(self, bucket: str, prefix: str = "pax", workers: int = 8) -> None:
+        super().__init__(GCSBlobSource(bucket), prefix=prefix, workers=workers)
+
+
+class LocalUploader(BlobStoreUploader):
+    """Upload artifacts into a local directory laid out like the bucket."""
+
+    def __init__(self, root: Path, prefix: str = "pax", workers: int = 8) -> None:
+        super().__init__(LocalBlobSource(root), prefix=prefix, workers=workers)
+
 
+__all__ = ["BlobStoreUploader", "GCSUploader", "LocalUploader", "NullUploader", "RemoteUploader"]
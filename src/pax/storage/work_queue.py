@@ -0,0 +1,308 @@
+"""Leased work queue for spreading a job across processes and machines.
+
+A coordinator splits a list of items (image paths) into fixed-size shards and
+enqueues them. Any number of workers, on any node that sees the queue file,
+claim one shard at a time under a lease, heartbeat while they work, and mark
+the shard done with the path of the result fragment they wrote. A lease that
+is not renewed before it expires (worker killed, node lost) goes back to
+whoever claims next; a shard whose leases keep expiring or failing is given
+up after ``max_attempts`` so one poison shard cannot stall the job.
+
+The queue is a single SQLite file, which is the local stand-in for a real
+work queue: every state change runs in an ``IMMEDIATE`` transaction, so
+claims stay exclusive across processes and across hosts that share the file
+over a filesystem with working POSIX locks. Items already enqueued are
+remembered, so the coordinator can be rerun as new images arrive and only
+the new ones are sharded.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from pax.telemetry import counter
+
+LOGGER = logging.getLogger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    items TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    fragment TEXT,
+    last_error TEXT,
+    enqueued_at REAL NOT NULL,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS shards_status ON shards (status, lease_expires_at);
+CREATE TABLE IF NOT EXISTS shard_items (
+    item TEXT PRIMARY KEY,
+    shard_id INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class Lease:
+    """A shard claimed by one worker."""
+
+    shard_id: int
+    items: tuple[str, ...]
+    worker: str
+    attempts: int
+
+    @property
+    def name(self) -> str:
+        """Stable shard name, used for result fragment files."""
+        return f"shard-{self.shard_id:06d}"
+
+
+class WorkQueue:
+    """SQLite-backed queue of item shards handed out under expiring leases."""
+
+    def __init__(self, path: Path, max_attempts: int = 3, busy_timeout_s: float = 60.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=busy_timeout_s, isolation_level=None, check_same_thread=False
+        )
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Serialise a read-modify-write against every other process using the file."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, items: Iterable[str], shard_size: int) -> int:
+        """
+        Shard items not yet in the queue, keeping their order.
+
+        Args:
+            items: Work items, e.g. image paths. Order is kept within and
+                across shards, so sort them first if neighbours belong together.
+            shard_size: Items per shard.
+
+        Returns:
+            Number of shards added.
+        """
+        items = list(dict.fromkeys(str(item) for item in items))
+        if not items:
+            return 0
+        added = 0
+        with self._write() as conn:
+            known = set()
+            for start in range(0, len(items), 500):
+                batch = items[start : start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                query = f"SELECT item FROM shard_items WHERE item IN ({placeholders})"
+                known.update(row[0] for row in conn.execute(query, batch))
+            new = [item for item in items if item not in known]
+            now = time.time()
+            for start in range(0, len(new), shard_size):
+                shard = new[start : start + shard_size]
+                shard_id = conn.execute(
+                    "INSERT INTO shards (items, size, enqueued_at) VALUES (?, ?, ?)",
+                    (json.dumps(shard), len(shard), now),
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO shard_items (item, shard_id) VALUES (?, ?)",
+                    [(item, shard_id) for item in shard],
+                )
+                added += 1
+        if len(items) > len(new):
+            LOGGER.info("%d of %d items were already queued", len(items) - len(new), len(items))
+        return added
+
+    def claim(self, worker: str, lease_s: float) -> Lease | None:
+        """
+        Lease the oldest available shard to ``worker`` for ``lease_s`` seconds.
+
+        Pending shards come first; after them, shards whose lease has expired
+        are reclaimed. An expired shard that has used up ``max_attempts`` is
+        marked failed instead of being handed out again.
+        """
+        with self._write() as conn:
+            now = time.time()
+            exhausted = conn.execute(
+                "UPDATE shards SET status = ?, last_error = 'lease expired', worker = NULL "
+                "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                (FAILED, LEASED, now, self.max_attempts),
+            ).rowcount
+            row = conn.execute(
+                "SELECT id, items, attempts, status FROM shards "
+                "WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY status = ? DESC, id LIMIT 1",
+                (PENDING, LEASED, now, PENDING),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE shards SET status = ?, worker = ?, lease_expires_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (LEASED, worker, now + lease_s, row[0]),
+                )
+        if exhausted:
+            counter("pax_shards_failed_total", "Shards given up after repeated failures").inc(
+                exhausted
+            )
+            LOGGER.error("Gave up on %d shards whose leases kept expiring", exhausted)
+        if row is None:
+            return None
+        if row[3] == LEASED:
+            counter(
+                "pax_leases_reclaimed_total", "Expired shard leases handed to a new worker"
+            ).inc()
+            LOGGER.warning("Reclaimed expired lease on shard %d (attempt %d)", row[0], row[2] + 1)
+        counter("pax_leases_claimed_total", "Shard leases claimed by workers").inc()
+        return Lease(
+            shard_id=row[0], items=tuple(json.loads(row[1])), worker=worker, attempts=row[2] + 1
+        )
+
+    def heartbeat(self, lease: Lease, lease_s: float) -> bool:
+        """Extend a lease; False if the worker no longer holds it."""
+        with self._write() as conn:
+            return bool(
+                conn.execute(
+                    "UPDATE shards SET lease_expires_at = ? "
+                    "WHERE id = ? AND status = ? AND worker = ?",
+                    (time.time() + lease_s, lease.shard_id, LEASED, lease.worker),
+                ).rowcount
+            )
+
+    def complete(self, lease: Lease, fragment: str | Path) -> bool:
+        """Mark a leased shard done with its result fragment; False if the lease was lost."""
+        with self._write() as conn:
+            updated = conn.execute(
+                "UPDATE shards SET status = ?, fragment = ?, completed_at = ?, last_error = NULL "
+                "WHERE id = ? AND status = ? AND worker = ?",
+                (DONE, str(fragment), time.time(), lease.shard_id, LEASED, lease.worker),
+            ).rowcount
+        if updated:
+            counter("pax_leases_completed_total", "Shard leases completed").inc()
+        return bool(updated)
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        """Give a shard back after an error; return True if it will be retried."""
+        status = PENDING if lease.attempts < self.max_attempts else FAILED
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE shards SET status = ?, worker = NULL, lease_expires_at = NULL, "
+                "last_error = ? "
+                "WHERE id = ? AND status = ? AND worker = ?",
+                (status, error, lease.shard_id, LEASED, lease.worker),
+            )
+        if status == FAILED:
+            counter("pax_shards_failed_total", "Shards given up after repeated failures").inc()
+        return status == PENDING
+
+    def outstanding(self) -> int:
+        """Number of shards still pending or leased (including expired leases)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM shards WHERE status IN (?, ?)", (PENDING, LEASED)
+            ).fetchone()[0]
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM shards GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def failures(self) -> list[tuple[str, str | None]]:
+        """(shard name, last error) of every shard given up on, in shard order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, last_error FROM shards WHERE status = ? ORDER BY id", (FAILED,)
+            ).fetchall()
+        return [(f"shard-{shard_id:06d}", error) for shard_id, error in rows]
+
+    def requeue_failed(self) -> int:
+        """Give failed shards a fresh set of attempts; returns how many were requeued."""
+        with self._write() as conn:
+            requeued = conn.execute(
+                "UPDATE shards SET status = ?, attempts = 0, worker = NULL, "
+                "lease_expires_at = NULL WHERE status = ?",
+                (PENDING, FAILED),
+            ).rowcount
+        if requeued:
+            LOGGER.info("Requeued %d failed shards", requeued)
+        return requeued
+
+    def fragments(self) -> list[Path]:
+        """Result fragments of completed shards, in shard order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fragment FROM shards WHERE status = ? ORDER BY id", (DONE,)
+            ).fetchall()
+        return [Path(row[0]) for row in rows]
+
+
+class LeaseHeartbeat:
+    """Background thread renewing a lease every ``interval_s`` until stopped.
+
+    ``lost`` is set when a renewal finds the lease gone (it expired and
+    another worker reclaimed it); the owner should then drop its results.
+    """
+
+    def __init__(self, queue: WorkQueue, lease: Lease, lease_s: float, interval_s: float) -> None:
+        self.queue = queue
+        self.lease = lease
+        self.lease_s = lease_s
+        self.interval_s = interval_s
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"pax-heartbeat-{lease.shard_id}", daemon=True
+        )
+
+    def __enter__(self) -> LeaseHeartbeat:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                alive = self.queue.heartbeat(self.lease, self.lease_s)
+            except sqlite3.Error as exc:
+                LOGGER.warning("Heartbeat for %s failed: %s", self.lease.name, exc)
+                continue
+            if not alive:
+                LOGGER.warning("Lost the lease on %s", self.lease.name)
+                self.lost.set()
+                return
+
+
+__all__ = ["Lease", "LeaseHeartbeat", "WorkQueue"]
@@ -0,0 +1,37 @@
+"""Metrics and tracing for collection, extraction and storage."""
+
+from pax.telemetry.exporters import (
+    PROMETHEUS_CONTENT_TYPE,
+    JSONLSink,
+    MetricsServer,
+    configure_telemetry,
+    read_events,
+    render_prometheus,
+    summarize_spans,
+)
+from pax.telemetry.metrics import (
+    REGISTRY,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    counter,
+    histogram,
+    span,
+)
+
+__all__ = [
+    "PROMETHEUS_CONTENT_TYPE",
+    "REGISTRY",
+    "Counter",
+    "Histogram",
+    "JSONLSink",
+    "MetricsRegistry",
+    "MetricsServer",
+    "configure_telemetry",
+    "counter",
+    "histogram",
+    "read_events",
+    "render_prometheus",
+    "span",
+    "summarize_spans",
+]
@@ -0,0 +1,215 @@
+"""Export ``MetricsRegistry`` contents as Prometheus text and JSONL files."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+from pax.telemetry.metrics import REGISTRY, Counter, LabelKey, MetricsRegistry
+
+LOGGER = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus(registry: MetricsRegistry = REGISTRY) -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in registry.metrics():
+        if metric.help:
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        if isinstance(metric, Counter):
+            for key, value in sorted(metric.samples().items()):
+                lines.append(f"{metric.name}{_format_labels(key)} {_format_value(value)}")
+            continue
+        for key, (counts, total) in sorted(metric.samples().items()):
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, math.inf), counts):
+                cumulative += count
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{metric.name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{metric.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{metric.name}_count{_format_labels(key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+class JSONLSink:
+    """Append span events and snapshots to a JSON-lines file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, JSONLSink) and other.path == self.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+
+def read_events(path: Path, event_type: str | None = None) -> Iterator[dict[str, Any]]:
+    """Yield events from a JSONL metrics file, skipping partial lines."""
+    path = Path(path)
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event_type is None or event.get("type") == event_type:
+                yield event
+
+
+def summarize_spans(path: Path, name: str, last: int | None = None) -> dict[str, float]:
+    """
+    Throughput summary for one span name from a JSONL metrics file.
+
+    Args:
+        path: Metrics file written by ``JSONLSink``.
+        name: Span name, e.g. ``pax_feature_extraction``.
+        last: Only consider the most recent ``last`` spans.
+
+    Returns:
+        ``count``, ``errors``, ``mean_s`` (seconds per span) and ``rate_per_s``
+        (spans per wall-clock second between the first start and last end),
+        or an empty dict if there are no matching spans.
+    """
+    spans = [event for event in read_events(path, "span") if event.get("name") == name]
+    if last:
+        spans = spans[-last:]
+    if not spans:
+        return {}
+    durations = [event["duration_s"] for event in spans]
+    wall = max(event["start"] + event["duration_s"] for event in spans) - min(
+        event["start"] for event in spans
+    )
+    return {
+        "count": len(spans),
+        "errors": sum(1 for event in spans if event.get("status") == "error"),
+        "mean_s": sum(durations) / len(durations),
+        "rate_per_s": len(spans) / wall if wall > 0 else 0.0,
+    }
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus(self.registry).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        LOGGER.debug("metrics endpoint: " + format, *args)
+
+
+class MetricsServer:
+    """Background HTTP server exposing ``/metrics`` for Prometheus to scrape."""
+
+    def __init__(
+        self, port: int = 9464, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+    ) -> None:
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="pax-metrics", daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        LOGGER.info("Serving metrics on http://%s:%d/metrics", *self._server.server_address[:2])
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+_server_lock = threading.Lock()
+_server: MetricsServer | None = None
+
+
+def configure_telemetry(
+    jsonl_path: Path | None = None,
+    prometheus_port: int | None = None,
+    prometheus_host: str = "127.0.0.1",
+    registry: MetricsRegistry = REGISTRY,
+) -> MetricsServer | None:
+    """
+    Attach the configured exporters to ``registry``; safe to call repeatedly.
+
+    Args:
+        jsonl_path: Append span events and snapshots to this file.
+        prometheus_port: Serve ``/metrics`` on this port (0 picks a free port).
+        prometheus_host: Interface for the metrics endpoint.
+        registry: Registry to export (the process-wide one by default).
+
+    Returns:
+        The running metrics server, if one was requested.
+    """
+    global _server
+
+    if jsonl_path is not None:
+        registry.add_sink(JSONLSink(jsonl_path))
+    if prometheus_port is None:
+        return _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = MetricsServer(prometheus_port, prometheus_host, registry).start()
+            except OSError as exc:
+                LOGGER.warning("Could not serve metrics on port %d: %s", prometheus_port, exc)
+        return _server
+
+
+__all__ = [
+    "PROMETHEUS_CONTENT_TYPE",
+    "JSONLSink",
+    "MetricsServer",
+    "configure_telemetry",
+    "read_events",
+    "render_prometheus",
+    "summarize_spans",
+]
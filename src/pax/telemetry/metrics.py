@@ -0,0 +1,317 @@
+"""In-process counters, histograms and timing spans.
+
+Collection and extraction code records what it does through a
+``MetricsRegistry`` instead of relying on tqdm output in log files. Metrics
+are cheap, thread-safe, in-memory aggregates; finished spans and periodic
+snapshots are handed to whatever sinks are attached (see
+``pax.telemetry.exporters``), so nothing is written unless a sink is
+configured.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Mapping
+
+LOGGER = logging.getLogger(__name__)
+
+# Upper bounds (seconds) for latency histograms: API calls through ~4 s model inference.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelKey = tuple[tuple[str, str], ...]
+Sink = Callable[[dict[str, Any]], None]
+
+_current_span: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "pax_current_span", default=None
+)
+
+
+def _label_key(labels: Mapping[str, object] | None) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+
+class Counter:
+    """Monotonic counter, one value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = "") -> None:
+        self.name = name
+        self.help = help
+        self._values: dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} cannot decrease")
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def drain(self) -> dict[LabelKey, float]:
+        """Take the samples and reset them to zero."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, samples: Mapping[LabelKey, float]) -> None:
+        """Add samples drained from another counter."""
+        with self._lock:
+            for key, value in samples.items():
+                self._values[key] = self._values.get(key, 0.0) + value
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics), one series per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str = "", buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: dict[LabelKey, tuple[list[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._series[key] = (counts, total + value)
+
+    def count(self, **labels: object) -> int:
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+        return sum(series[0]) if series else 0
+
+    def sum(self, **labels: object) -> float:
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+        return series[1] if series else 0.0
+
+    def samples(self) -> dict[LabelKey, tuple[list[int], float]]:
+        """Per label set: (non-cumulative bucket counts ending with +Inf, sum)."""
+        with self._lock:
+            return {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+
+    def drain(self) -> dict[LabelKey, tuple[list[int], float]]:
+        """Take the samples (as ``samples()``) and reset them."""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, samples: Mapping[LabelKey, tuple[list[int], float]]) -> None:
+        """Add samples drained from a histogram with the same buckets."""
+        with self._lock:
+            for key, (counts, total) in samples.items():
+                if len(counts) != len(self.buckets) + 1:
+                    raise ValueError(f"Histogram {self.name} has different buckets")
+                current, current_total = self._series.get(key, ([0] * len(counts), 0.0))
+                self._series[key] = (
+                    [a + b for a, b in zip(current, counts)],
+                    current_total + total,
+                )
+
+
+class MetricsRegistry:
+    """Named metrics plus the sinks that receive span events and snapshots."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._sinks: list[Sink] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(
+        self, name: str, factory: Callable[[], Counter | Histogram]
+    ) -> Counter | Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+        return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        metric = self._get_or_create(name, lambda: Counter(name, help))
+        if not isinstance(metric, Counter):
+            raise TypeError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def histogram(
+        self, name: str, help: str = "", buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = self._get_or_create(name, lambda: Histogram(name, help, buckets))
+        if not isinstance(metric, Histogram):
+            raise TypeError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def metrics(self) -> list[Counter | Histogram]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def add_sink(self, sink: Sink) -> None:
+        with self._lock:
+            if sink not in self._sinks:
+                self._sinks.append(sink)
+
+    def remove_sink(self, sink: Sink) -> None:
+        with self._lock:
+            if sink in self._sinks:
+                self._sinks.remove(sink)
+
+    def emit(self, event: dict[str, Any]) -> None:
+        """Hand an event to every sink; a failing sink never breaks the caller."""
+        with self._lock:
+            sinks = list(self._sinks)
+        for sink in sinks:
+            try:
+                sink(event)
+            except Exception as exc:  # noqa: BLE001 - telemetry must not break the pipeline
+                LOGGER.warning("Metrics sink %r failed: %s", sink, exc)
+
+    @contextmanager
+    def span(
+        self, name: str, labels: Mapping[str, object] | None = None, **attributes: object
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Time a block of work.
+
+        Records ``<name>_seconds`` (histogram) and, if the block raises,
+        ``<name>_errors_total`` (counter), both with ``labels``. The finished
+        span, including free-form ``attributes`` (camera IDs, paths, ...) and
+        its parent span within the same thread, is emitted to the sinks.
+
+        Args:
+            name: Metric-safe span name, e.g. ``pax_image_download``.
+            labels: Low-cardinality labels shared by the metrics.
+            **attributes: Per-span details kept out of the metric labels.
+
+        Yields:
+            The span record; callers may add to ``span["attributes"]``.
+        """
+        parent = _current_span.get()
+        record: dict[str, Any] = {
+            "type": "span",
+            "name": name,
+            "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": parent["span_id"] if parent else None,
+            "start": time.time(),
+            "labels": {key: str(value) for key, value in (labels or {}).items()},
+            "attributes": dict(attributes),
+        }
+        token = _current_span.set(record)
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield record
+        except BaseException as exc:
+            status = "error"
+            record["error"] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            _current_span.reset(token)
+            span_labels = record["labels"]
+            self.histogram(f"{name}_seconds", f"Duration of {name} spans").observe(
+                duration, **span_labels
+            )
+            if status == "error":
+                self.counter(f"{name}_errors_total", f"Failed {name} spans").inc(**span_labels)
+            record["duration_s"] = duration
+            record["status"] = status
+            self.emit(record)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current value of every metric as plain JSON-serialisable data."""
+        data: dict[str, Any] = {}
+        for metric in self.metrics():
+            series = []
+            if isinstance(metric, Counter):
+                for key, value in metric.samples().items():
+                    series.append({"labels": dict(key), "value": value})
+            else:
+                for key, (counts, total) in metric.samples().items():
+                    series.append({"labels": dict(key), "count": sum(counts), "sum": total})
+            data[metric.name] = {"type": metric.kind, "series": series}
+        return data
+
+    def drain(self) -> dict[str, Any]:
+        """
+        Take every metric's samples and reset them.
+
+        The result is picklable, so a worker process can send what it recorded
+        since the last drain to the parent, which folds it in with ``merge``.
+        Drained values are gone from this registry, so nothing is counted twice.
+        """
+        state: dict[str, Any] = {}
+        for metric in self.metrics():
+            samples = metric.drain()
+            if samples:
+                buckets = metric.buckets if isinstance(metric, Histogram) else None
+                state[metric.name] = (metric.kind, metric.help, buckets, samples)
+        return state
+
+    def merge(self, state: Mapping[str, Any]) -> None:
+        """Add metrics drained from another registry (see ``drain``)."""
+        for name, (kind, help, buckets, samples) in state.items():
+            if kind == Counter.kind:
+                self.counter(name, help).merge(samples)
+            else:
+                self.histogram(name, help, buckets).merge(samples)
+
+    def flush(self) -> None:
+        """Emit a snapshot event (e.g. at the end of a sweep)."""
+        self.emit({"type": "snapshot", "time": time.time(), "metrics": self.snapshot()})
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, help: str = "") -> Counter:
+    """Counter from the process-wide registry."""
+    return REGISTRY.counter(name, help)
+
+
+def histogram(
+    name: str, help: str = "", buckets: tuple[float, ...] = DEFAULT_BUCKETS
+) -> Histogram:
+    """Histogram from the process-wide registry."""
+    return REGISTRY.histogram(name, help, buckets)
+
+
+def span(name: str, labels: Mapping[str, object] | None = None, **attributes: object):
+    """Span on the process-wide registry (see ``MetricsRegistry.span``)."""
+    return REGISTRY.span(name, labels, **attributes)
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "REGISTRY",
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "counter",
+    "histogram",
+    "span",
+]
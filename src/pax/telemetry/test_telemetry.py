@@ -0,0 +1,90 @@
+"""Test metrics recording and the Prometheus/JSONL exporters."""
+
+from __future__ import annotations
+
+import pickle
+import urllib.request
+
+import pytest
+
+from pax.telemetry import (
+    JSONLSink,
+    MetricsRegistry,
+    MetricsServer,
+    read_events,
+    render_prometheus,
+    summarize_spans,
+)
+
+
+def test_spans_feed_histograms_and_jsonl(tmp_path):
+    registry = MetricsRegistry()
+    metrics_file = tmp_path / "metrics.jsonl"
+    registry.add_sink(JSONLSink(metrics_file))
+
+    with registry.span("pax_feature_extraction", image_path="a.jpg") as outer:
+        with registry.span("pax_model_inference", {"model": "yolov8n"}):
+            pass
+    with pytest.raises(RuntimeError):
+        with registry.span("pax_model_inference", {"model": "clip"}):
+            raise RuntimeError("cuda out of memory")
+    registry.counter("pax_images_extracted_total", "Images extracted").inc(2)
+    registry.flush()
+
+    inference = registry.histogram("pax_model_inference_seconds")
+    assert inference.count(model="yolov8n") == 1
+    assert inference.count(model="clip") == 1
+    assert registry.counter("pax_model_inference_errors_total").value(model="clip") == 1
+
+    spans = list(read_events(metrics_file, "span"))
+    assert [span["name"] for span in spans] == [
+        "pax_model_inference",
+        "pax_feature_extraction",
+        "pax_model_inference",
+    ]
+    assert spans[0]["parent_id"] == outer["span_id"]
+    assert spans[0]["trace_id"] == outer["trace_id"]
+    assert spans[1]["attributes"] == {"image_path": "a.jpg"}
+    assert spans[2]["status"] == "error"
+    snapshot = next(read_events(metrics_file, "snapshot"))
+    assert snapshot["metrics"]["pax_images_extracted_total"]["series"] == [
+        {"labels": {}, "value": 2.0}
+    ]
+
+    summary = summarize_spans(metrics_file, "pax_model_inference")
+    assert summary["count"] == 2
+    assert summary["errors"] == 1
+
+    text = render_prometheus(registry)
+    assert "# TYPE pax_model_inference_seconds histogram" in text
+    assert 'pax_model_inference_seconds_bucket{model="yolov8n",le="+Inf"} 1' in text
+    assert 'pax_model_inference_seconds_count{model="clip"} 1' in text
+    assert "pax_images_extracted_total 2" in text
+
+
+def test_metrics_endpoint(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("pax_uploads_completed_total").inc()
+    server = MetricsServer(port=0, registry=registry).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.stop()
+    assert "pax_uploads_completed_total 1" in body
+
+
+def test_drained_worker_metrics_merge_into_parent():
+    parent, worker = MetricsRegistry(), MetricsRegistry()
+    parent.counter("pax_images_extracted_total").inc()
+    for _ in range(2):
+        worker.counter("pax_images_extracted_total").inc()
+        with worker.span("pax_feature_extraction"):
+            pass
+        parent.merge(pickle.loads(pickle.dumps(worker.drain())))
+
+    assert worker.counter("pax_images_extracted_total").value() == 0
+    assert worker.drain() == {}
+    assert parent.counter("pax_images_extracted_total").value() == 3
+    assert parent.histogram("pax_feature_extraction_seconds").count() == 2
+    assert "pax_feature_extraction_seconds_count 2" in render_prometheus(parent)
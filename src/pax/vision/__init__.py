@@ -1,9 +1,48 @@
-"""Vision models for object detection and feature extraction."""
+"""Vision models for object detection and feature extraction.
 
-from pax.vision.clip import CLIPWrapper, understand_scene
-from pax.vision.detectron2 import Detectron2Wrapper, segment_instances
-from pax.vision.extractor import FeatureExtractor, extract_features
-from pax.vision.yolov8n import YOLOv8nDetector, detect_objects
+Exports are imported on first access: ``import pax.vision`` (or
+``from pax.vision.registry import get_model``) does not load torch,
+transformers or ultralytics until a model class is actually used.
+"""
+
+from typing import TYPE_CHECKING
+
+from pax._lazy import lazy_exports
+
+_EXPORTS = {
+    "YOLOv8nDetector": "pax.vision.yolov8n",
+    "detect_objects": "pax.vision.yolov8n",
+    "Detectron2Wrapper": "pax.vision.detectron2",
+    "segment_instances": "pax.vision.detectron2",
+    "CLIPWrapper": "pax.vision.clip",
+    "understand_scene": "pax.vision.clip",
+    "FeatureExtractor": "pax.vision.extractor",
+    "extract_features": "pax.vision.extractor",
+    "OnnxRuntimeOptions": "pax.vision.onnx_backend",
+    "CascadePolicy": "pax.vision.cascade",
+    "ModelRule": "pax.vision.cascade",
+    "CameraROI": "pax.vision.roi",
+    "load_rois": "pax.vision.roi",
+    "decode_image": "pax.vision.imaging",
+    "load_image": "pax.vision.imaging",
+    "ModelRegistry": "pax.vision.registry",
+    "configure_models": "pax.vision.registry",
+    "get_model": "pax.vision.registry",
+    "warm_up": "pax.vision.registry",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from pax.vision.cascade import CascadePolicy, ModelRule
+    from pax.vision.clip import CLIPWrapper, understand_scene
+    from pax.vision.detectron2 import Detectron2Wrapper, segment_instances
+    from pax.vision.extractor import FeatureExtractor, extract_features
+    from pax.vision.imaging import decode_image, load_image
+    from pax.vision.onnx_backend import OnnxRuntimeOptions
+    from pax.vision.registry import ModelRegistry, configure_models, get_model, warm_up
+    from pax.vision.roi import CameraROI, load_rois
+    from pax.vision.yolov8n import YOLOv8nDetector, detect_objects
 
 __all__ = [
     "YOLOv8nDetector",
@@ -14,5 +53,15 @@ __all__ = [
     "understand_scene",
     "FeatureExtractor",
     "extract_features",
+    "OnnxRuntimeOptions",
+    "CascadePolicy",
+    "ModelRule",
+    "CameraROI",
+    "load_rois",
+    "decode_image",
+    "load_image",
+    "ModelRegistry",
+    "configure_models",
+    "get_model",
+    "warm_up",
 ]
-
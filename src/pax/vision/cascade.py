@@ -0,0 +1,218 @@
+"""Cascaded model execution for ``FeatureExtractor``.
+
+YOLOv8n is cheap and runs on every frame. Detectron2 (the slowest model) and
+CLIP only run when their ``ModelRule`` says the frame is worth it:
+
+* ``min_pedestrians``: YOLO counted at least this many pedestrians;
+* ``min_change``: YOLO's pedestrian + vehicle + bike counts moved by at least
+  this much since the previous frame from the same camera;
+* ``refresh_every``: the model has not run on this camera for this many frames.
+
+The first frame from each camera always runs every model, so there is a last
+known value to fall back on. A skipped Detectron2 result takes its counts
+from the current YOLO detections and its area and density from the last run
+on that camera; a skipped CLIP result repeats the last run. Filled results
+carry ``"filled_from"``, and the extractor records each decision under
+``features["cascade"]``.
+
+Decisions are counted in ``pax_cascade_decisions_total`` and summarised by
+``Cascade.stats()``. State lives on the extractor (one per worker process), so
+change detection assumes each camera's frames arrive at a worker in time order.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from pax.telemetry import counter
+
+LOGGER = logging.getLogger(__name__)
+
+SKIPPED = "skipped"
+CASCADE_MODELS = ("detectron2", "clip")
+
+
+def _count_change(current: dict[str, Any], previous: dict[str, Any]) -> int:
+    return sum(
+        abs(current.get(key, 0) - previous.get(key, 0))
+        for key in ("pedestrian_count", "vehicle_count", "bike_count")
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ModelRule:
+    """When to run a gated model; it runs if any configured condition holds."""
+
+    min_pedestrians: int | None = None
+    min_change: int | None = None
+    refresh_every: int | None = None
+
+    def reason(
+        self, yolo: dict[str, Any], previous: dict[str, Any] | None, frames_since_run: int
+    ) -> str | None:
+        """
+        The condition that triggers a run, or ``None`` to skip.
+
+        Args:
+            yolo: YOLO counts for this frame.
+            previous: YOLO counts for the camera's previous frame.
+            frames_since_run: Frames skipped on this camera since the model last ran.
+        """
+        if self.min_pedestrians is not None:
+            if yolo.get("pedestrian_count", 0) >= self.min_pedestrians:
+                return "pedestrians"
+        if self.min_change is not None and previous is not None:
+            if _count_change(yolo, previous) >= self.min_change:
+                return "changed"
+        if self.refresh_every is not None and frames_since_run + 1 >= self.refresh_every:
+            return "refresh"
+        return None
+
+    def describe(self) -> str:
+        conditions = [
+            f"pedestrians>={self.min_pedestrians}" if self.min_pedestrians is not None else "",
+            f"change>={self.min_change}" if self.min_change is not None else "",
+            f"every {self.refresh_every} frames" if self.refresh_every is not None else "",
+        ]
+        return " or ".join(filter(None, conditions)) or "first frame only"
+
+
+@dataclass(frozen=True, slots=True)
+class CascadePolicy:
+    """Rules gating Detectron2 and CLIP on YOLO's output; ``None`` runs a model every frame."""
+
+    detectron2: ModelRule | None = field(
+        default_factory=lambda: ModelRule(min_pedestrians=1, refresh_every=20)
+    )
+    clip: ModelRule | None = field(
+        default_factory=lambda: ModelRule(min_change=3, refresh_every=10)
+    )
+
+    def rule(self, model: str) -> ModelRule | None:
+        return getattr(self, model)
+
+    def describe(self) -> str:
+        return "; ".join(
+            f"{model}: {rule.describe() if rule else 'always'}"
+            for model, rule in ((model, self.rule(model)) for model in CASCADE_MODELS)
+        )
+
+
+@dataclass(slots=True)
+class _CameraState:
+    yolo: dict[str, Any] | None = None
+    frames_since_run: dict[str, int] = field(default_factory=dict)
+    last: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+class Cascade:
+    """Per-camera cascade state and decision accounting for one extractor."""
+
+    def __init__(self, policy: CascadePolicy) -> None:
+        self.policy = policy
+        self._cameras: dict[str, _CameraState] = {}
+        self._decisions: Counter[tuple[str, str]] = Counter()
+        self._lock = threading.Lock()
+
+    def plan(
+        self, camera: str, yolo: dict[str, Any] | None, models: Sequence[str] = CASCADE_MODELS
+    ) -> dict[str, str]:
+        """
+        Decide which gated models run on this frame.
+
+        Args:
+            camera: Camera ID (or another per-stream key).
+            yolo: This frame's YOLO counts; ``None`` when YOLO failed, which
+                runs every model.
+            models: The gated models the extractor has enabled.
+
+        Returns:
+            Model name to the triggering reason, or ``"skipped"``.
+        """
+        decisions = {}
+        with self._lock:
+            state = self._cameras.setdefault(camera, _CameraState())
+            for model in models:
+                rule = self.policy.rule(model)
+                if rule is None:
+                    reason: str | None = "always"
+                elif not yolo:
+                    reason = "no_yolo"
+                elif model not in state.last:
+                    reason = "first_frame"
+                else:
+                    reason = rule.reason(yolo, state.yolo, state.frames_since_run.get(model, 0))
+                decisions[model] = reason or SKIPPED
+                self._decisions[model, decisions[model]] += 1
+            if yolo:
+                state.yolo = yolo
+        decision_counter = counter(
+            "pax_cascade_decisions_total", "Cascade run/skip decisions for gated models"
+        )
+        for model, decision in decisions.items():
+            decision_counter.inc(model=model, decision=decision)
+        return decisions
+
+    def record(self, camera: str, model: str, output: dict[str, Any]) -> None:
+        """Remember a model's output on ``camera`` as its last known value."""
+        with self._lock:
+            state = self._cameras.setdefault(camera, _CameraState())
+            state.last[model] = output
+            state.frames_since_run[model] = 0
+
+    def fill(self, camera: str, model: str, yolo: dict[str, Any]) -> dict[str, Any]:
+        """Stand-in output for a skipped model, flagged with ``filled_from``."""
+        with self._lock:
+            state = self._cameras.setdefault(camera, _CameraState())
+            state.frames_since_run[model] = state.frames_since_run.get(model, 0) + 1
+            filled = dict(state.last.get(model, {}))
+        if model == "detectron2":
+            filled.update(
+                pedestrian_count=yolo.get("pedestrian_count", 0),
+                vehicle_count=yolo.get("vehicle_count", 0),
+                bike_count=yolo.get("bike_count", 0),
+                total_instances=yolo.get("total_detections", 0),
+                filled_from="yolo+last",
+            )
+        else:
+            filled["filled_from"] = "last"
+        return filled
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per model: frames run and skipped, skip rate and run reasons."""
+        with self._lock:
+            decisions = dict(self._decisions)
+        stats = {}
+        for model in CASCADE_MODELS:
+            reasons = {
+                decision: count
+                for (name, decision), count in decisions.items()
+                if name == model and decision != SKIPPED
+            }
+            skipped = decisions.get((model, SKIPPED), 0)
+            total = skipped + sum(reasons.values())
+            stats[model] = {
+                "run": total - skipped,
+                "skipped": skipped,
+                "skip_rate": skipped / total if total else 0.0,
+                "reasons": reasons,
+            }
+        return stats
+
+    def log_stats(self) -> None:
+        for model, stat in self.stats().items():
+            LOGGER.info(
+                "Cascade %s: ran %d, skipped %d (%.0f%%), reasons %s",
+                model,
+                stat["run"],
+                stat["skipped"],
+                stat["skip_rate"] * 100,
+                stat["reasons"],
+            )
+
+
+__all__ = ["Cascade", "CascadePolicy", "ModelRule"]
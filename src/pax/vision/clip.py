@@ -4,12 +4,18 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
+import numpy as np
 import torch
 from PIL import Image
 from transformers import CLIPModel, CLIPProcessor
 
+from pax.vision.imaging import load_image
+from pax.vision.onnx_backend import OnnxCLIP, OnnxRuntimeOptions
+from pax.vision.quantization import load_quantized_clip
+from pax.vision.registry import get_model
+
 LOGGER = logging.getLogger(__name__)
 
 # Common scene labels for urban traffic scenes
@@ -39,6 +45,9 @@ class CLIPWrapper:
         self,
         model_name: str = "openai/clip-vit-base-patch32",
         scene_labels: list[str] | None = None,
+        backend: Literal["torch", "onnx"] = "torch",
+        onnx_options: OnnxRuntimeOptions | None = None,
+        quantize: bool = False,
     ) -> None:
         """
         Initialize CLIP model.
@@ -46,12 +55,48 @@ class CLIPWrapper:
         Args:
             model_name: HuggingFace model identifier for CLIP model.
             scene_labels: Custom list of scene labels to use. If None, uses default urban scene labels.
+            backend: ``"torch"`` runs the HuggingFace model; ``"onnx"`` exports the
+                image and text towers to ONNX once and runs them on ONNX Runtime (CPU).
+            onnx_options: Thread tuning and export cache for the ONNX backend.
+            quantize: Run int8 dynamically quantized linear layers on CPU (cached
+                on disk after the first load). Faster, slightly less accurate;
+                see ``pax.vision.quantization.compare_clip``.
         """
         self.model_name = model_name
         self.scene_labels = scene_labels or DEFAULT_SCENE_LABELS
+        self.backend = backend
+        self.quantize = quantize
 
-        LOGGER.info("Loading CLIP model: %s", model_name)
+        LOGGER.info(
+            "Loading CLIP model: %s (%s%s)", model_name, backend, ", int8" if quantize else ""
+        )
         self.processor = CLIPProcessor.from_pretrained(model_name)
+        # Frames are decoded at the smallest JPEG DCT scale that still covers
+        # the processor's resize target, instead of at full resolution.
+        size = self.processor.image_processor.size
+        self.input_size = size.get("shortest_edge") or max(size["height"], size["width"])
+        if backend == "onnx":
+            # The PyTorch weights are only loaded if the graphs still need exporting.
+            self.model = None
+            self.onnx: OnnxCLIP | None = OnnxCLIP(
+                model_name,
+                self.processor,
+                onnx_options or OnnxRuntimeOptions(),
+                lambda: CLIPModel.from_pretrained(model_name).eval(),
+                quantize=quantize,
+            )
+            self.device = "cpu"
+            LOGGER.info("CLIP model loaded on ONNX Runtime")
+            return
+
+        self.onnx = None
+        if quantize:
+            # Quantized kernels only run on CPU.
+            self.model = load_quantized_clip(model_name)
+            self.device = "cpu"
+            LOGGER.info("CLIP model loaded with int8 linear layers on CPU")
+            return
+
         self.model = CLIPModel.from_pretrained(model_name)
         self.model.eval()  # Set to evaluation mode
 
@@ -83,22 +128,10 @@ class CLIPWrapper:
             raise FileNotFoundError(f"Image not found: {image_path}")
 
         # Load and process image
-        image = Image.open(image_path).convert("RGB")
+        image = load_image(image_path, min_size=self.input_size)
         labels = custom_labels or self.scene_labels
 
-        # Process inputs
-        inputs = self.processor(
-            text=labels, images=image, return_tensors="pt", padding=True
-        ).to(self.device)
-
-        # Run inference
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits_per_image = outputs.logits_per_image
-            probs = logits_per_image.softmax(dim=1)
-
-        # Extract results
-        scores = probs[0].cpu().numpy()
+        scores, image_features = self._scores_and_embeds(image, labels)
         label_scores = dict(zip(labels, scores.tolist()))
 
         # Get top scene
@@ -106,8 +139,7 @@ class CLIPWrapper:
         top_scene = labels[top_idx]
         top_confidence = float(scores[top_idx])
 
-        # Get image embedding (semantic features)
-        image_features = outputs.image_embeds[0].cpu().numpy()
+        # Image embedding (semantic features)
         semantic_features = image_features.tolist()
 
         # Create scene labels list with scores
@@ -126,6 +158,24 @@ class CLIPWrapper:
             "all_scores": label_scores,
         }
 
+    def _scores_and_embeds(
+        self, image: Image.Image, labels: list[str]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Label probabilities and the normalised image embedding for one image."""
+        if self.onnx is not None:
+            return self.onnx.understand(image, labels)
+
+        # Process inputs
+        inputs = self.processor(
+            text=labels, images=image, return_tensors="pt", padding=True
+        ).to(self.device)
+
+        # Run inference
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            probs = outputs.logits_per_image.softmax(dim=1)
+        return probs[0].cpu().numpy(), outputs.image_embeds[0].cpu().numpy()
+
     def extract_features(self, image_path: str | Path) -> list[float]:
         """
         Extract raw CLIP embedding features from an image.
@@ -141,7 +191,9 @@ class CLIPWrapper:
             raise FileNotFoundError(f"Image not found: {image_path}")
 
         # Load and process image
-        image = Image.open(image_path).convert("RGB")
+        image = load_image(image_path, min_size=self.input_size)
+        if self.onnx is not None:
+            return self.onnx.image_features(image).tolist()
         inputs = self.processor(images=image, return_tensors="pt").to(self.device)
 
         # Extract features
@@ -192,6 +244,8 @@ def understand_scene(
     """
     Convenience function to analyze scene in a single image.
 
+    Uses the process-wide CLIP model from the model registry.
+
     Args:
         image_path: Path to the image file.
         custom_labels: Optional custom labels to use.
@@ -199,6 +253,6 @@ def understand_scene(
     Returns:
         Dictionary with scene understanding results.
     """
-    clip_wrapper = CLIPWrapper()
+    clip_wrapper = get_model("clip")
     return clip_wrapper.understand_scene(image_path, custom_labels=custom_labels)
 
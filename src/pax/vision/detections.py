@@ -0,0 +1,51 @@
+"""COCO class IDs and counting shared by the YOLOv8n and Detectron2 wrappers."""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping
+
+# COCO class IDs for relevant objects
+PERSON_CLASS_ID = 0
+BICYCLE_CLASS_ID = 1
+CAR_CLASS_ID = 2
+MOTORCYCLE_CLASS_ID = 3
+BUS_CLASS_ID = 5
+TRUCK_CLASS_ID = 7
+
+# Vehicle class IDs (car, motorcycle, bus, truck)
+VEHICLE_CLASS_IDS = {CAR_CLASS_ID, MOTORCYCLE_CLASS_ID, BUS_CLASS_ID, TRUCK_CLASS_ID}
+
+
+def count_detections(detections: Iterable[Mapping[str, Any]]) -> dict[str, int]:
+    """Pedestrian, vehicle and bike counts of detections carrying a COCO ``class_id``."""
+    pedestrian_count = 0
+    vehicle_count = 0
+    bike_count = 0
+    total = 0
+    for detection in detections:
+        total += 1
+        class_id = detection["class_id"]
+        if class_id == PERSON_CLASS_ID:
+            pedestrian_count += 1
+        elif class_id == BICYCLE_CLASS_ID:
+            bike_count += 1
+        elif class_id in VEHICLE_CLASS_IDS:
+            vehicle_count += 1
+    return {
+        "pedestrian_count": pedestrian_count,
+        "vehicle_count": vehicle_count,
+        "bike_count": bike_count,
+        "total_detections": total,
+    }
+
+
+__all__ = [
+    "BICYCLE_CLASS_ID",
+    "BUS_CLASS_ID",
+    "CAR_CLASS_ID",
+    "MOTORCYCLE_CLASS_ID",
+    "PERSON_CLASS_ID",
+    "TRUCK_CLASS_ID",
+    "VEHICLE_CLASS_IDS",
+    "count_detections",
+]
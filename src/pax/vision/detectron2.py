@@ -4,18 +4,125 @@ This module provides a wrapper that invokes Detectron2 through a separate
 Python 3.12 environment, since Detectron2 is not compatible with Python 3.14.
 The actual Detectron2 processing happens in scripts/detectron2_runner.py
 which runs in venv_detectron2 (Python 3.12).
+
+The runner can answer in three formats. ``json`` carries every instance with
+its boundary polygon. ``summary`` carries only the aggregate counts, which is
+all ``FeatureExtractor`` keeps. ``npz`` carries flat float32 boxes and
+run-length encoded masks. That payload is wrapped in ``CompactInstances``,
+which builds instance dicts only when they are accessed and decodes masks
+only through ``decode_mask``. The cost of moving and parsing a result then no
+longer grows with mask pixel counts.
 """
 
 from __future__ import annotations
 
+import io
 import json
 import logging
 import subprocess
+import tempfile
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from pax.vision.detections import PERSON_CLASS_ID, count_detections
+from pax.vision.registry import get_model
+from pax.vision.roi import CameraROI, crop_to_roi, roi_detections
+
 LOGGER = logging.getLogger(__name__)
 
+OUTPUT_FORMATS = ("json", "summary", "npz")
+
+
+def decode_mask(rle: dict[str, Any]) -> np.ndarray:
+    """
+    Decode a ``mask_rle`` entry of a compact instance into a boolean mask.
+
+    Runs alternate background and foreground, starting with background, over
+    the row-major flattened mask of ``rle["size"]`` (height, width).
+    """
+    counts = np.asarray(rle["counts"], dtype=np.int64)
+    values = np.zeros(len(counts), dtype=bool)
+    values[1::2] = True
+    return np.repeat(values, counts).reshape(rle["size"])
+
+
+class CompactInstances(Sequence):
+    """
+    Instances of an ``npz`` runner payload, exposed as a sequence of instance dicts.
+
+    Arrays are read from the archive on first use and each dict is built when
+    it is first accessed. Dicts carry the same keys as the ``json`` format.
+    The exception is the mask: instead of pixels there is a ``mask_rle`` entry
+    holding ``size`` and ``counts`` (a view into the payload), which
+    ``decode_mask`` turns into pixels.
+    """
+
+    def __init__(self, archive: Any, summary: dict[str, Any]) -> None:
+        self._archive = archive
+        self._arrays: dict[str, np.ndarray] = {}
+        self._items: dict[int, dict[str, Any]] = {}
+        self._length = int(summary["total_instances"])
+        self._class_names: list[str] = summary.get("class_names", [])
+        width, height = summary["image_size"]
+        self._pixels = width * height
+
+    def _array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = self._archive[name]
+        return self._arrays[name]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("instance index out of range")
+        if index not in self._items:
+            self._items[index] = self._build(index)
+        return self._items[index]
+
+    def _build(self, index: int) -> dict[str, Any]:
+        class_id = int(self._array("class_ids")[index])
+        mask_area = float(self._array("mask_areas")[index])
+        rle_offsets = self._array("rle_offsets")
+        boundary_offsets = self._array("boundary_offsets")
+        boundary = self._array("boundary_points")[
+            boundary_offsets[index] : boundary_offsets[index + 1]
+        ]
+        return {
+            "class_id": class_id,
+            "class_name": (
+                self._class_names[class_id]
+                if class_id < len(self._class_names)
+                else f"class_{class_id}"
+            ),
+            "confidence": float(self._array("scores")[index]),
+            "bbox": self._array("boxes")[index].tolist(),
+            "mask_area": mask_area,
+            "mask_area_normalized": mask_area / self._pixels if self._pixels > 0 else 0.0,
+            "boundary_points": boundary.tolist(),
+            "has_mask": True,
+            "mask_rle": {
+                "size": tuple(int(v) for v in self._array("mask_shape")),
+                "counts": self._array("rle_counts")[rle_offsets[index] : rle_offsets[index + 1]],
+            },
+        }
+
+
+def load_compact(payload: bytes) -> dict[str, Any]:
+    """Parse an ``npz`` runner payload into a result dict with lazy ``instances``."""
+    archive = np.load(io.BytesIO(payload), allow_pickle=False)
+    summary = json.loads(archive["summary"].tobytes().decode("utf-8"))
+    summary["instances"] = CompactInstances(archive, summary)
+    return summary
+
 
 class Detectron2Wrapper:
     """
@@ -26,7 +133,12 @@ class Detectron2Wrapper:
     subprocess running scripts/detectron2_runner.py.
     """
 
-    def __init__(self, venv_path: Path | None = None, runner_script: Path | None = None) -> None:
+    def __init__(
+        self,
+        venv_path: Path | None = None,
+        runner_script: Path | None = None,
+        output: str = "json",
+    ) -> None:
         """
         Initialize Detectron2 wrapper.
 
@@ -35,7 +147,11 @@ class Detectron2Wrapper:
                       Defaults to project_root/venv_detectron2
             runner_script: Path to the detectron2_runner.py script.
                           Defaults to project_root/scripts/detectron2_runner.py
+            output: Default runner output format (``json``, ``summary`` or ``npz``).
         """
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"output must be one of {OUTPUT_FORMATS}, got {output!r}")
+        self.output = output
         # Find project root (assuming this file is in src/pax/vision/)
         project_root = Path(__file__).parent.parent.parent.parent
         self.venv_path = venv_path or (project_root / "venv_detectron2")
@@ -60,7 +176,11 @@ class Detectron2Wrapper:
         )
 
     def segment(
-        self, image_path: str | Path, conf_threshold: float = 0.5
+        self,
+        image_path: str | Path,
+        conf_threshold: float = 0.5,
+        roi: CameraROI | None = None,
+        output: str | None = None,
     ) -> dict[str, Any]:
         """
         Perform instance segmentation on an image.
@@ -68,10 +188,18 @@ class Detectron2Wrapper:
         Args:
             image_path: Path to the image file.
             conf_threshold: Confidence threshold for detections (default: 0.5).
+            roi: Camera region of interest. The runner sees the frame cropped
+                and masked to it, and only instances standing inside it are
+                counted. Areas and density are then relative to the crop, and
+                so are ``mask_rle`` masks.
+            output: Runner output format, overriding the wrapper's default.
+                With an ROI, ``summary`` is upgraded to ``npz`` because
+                instance boxes are needed to filter by the ROI.
 
         Returns:
             Dictionary with:
-                - instances: List of instance dictionaries with masks, boundaries, area
+                - instances: Instance dictionaries with boundaries and areas (a
+                  list, or ``CompactInstances`` with ``npz``; absent with ``summary``)
                 - pedestrian_count: Number of detected pedestrians
                 - vehicle_count: Number of detected vehicles
                 - bike_count: Number of detected bicycles
@@ -81,7 +209,43 @@ class Detectron2Wrapper:
         image_path = Path(image_path)
         if not image_path.exists():
             raise FileNotFoundError(f"Image not found: {image_path}")
+        output = output or self.output
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"output must be one of {OUTPUT_FORMATS}, got {output!r}")
+        if roi is None:
+            return self._run(image_path, conf_threshold, output)
 
+        crop = crop_to_roi(image_path, roi)
+        with tempfile.TemporaryDirectory(prefix="pax-roi-") as tmp_dir:
+            crop_path = Path(tmp_dir) / f"{image_path.stem}.png"
+            crop.image.save(crop_path)
+            result = self._run(
+                crop_path, conf_threshold, "npz" if output == "summary" else output
+            )
+        instances = roi_detections(result.get("instances", []), crop)
+        counts = count_detections(instances)
+        # Density and coverage as in the runner's ``summarize``, over kept instances only.
+        areas = [instance["mask_area_normalized"] for instance in instances]
+        pedestrian_area = sum(
+            area
+            for instance, area in zip(instances, areas)
+            if instance["class_id"] == PERSON_CLASS_ID
+        )
+        result.update(
+            instances=instances,
+            pedestrian_count=counts["pedestrian_count"],
+            vehicle_count=counts["vehicle_count"],
+            bike_count=counts["bike_count"],
+            crowd_density=(
+                counts["pedestrian_count"] / pedestrian_area if pedestrian_area > 0 else 0.0
+            ),
+            total_area_covered=float(sum(areas)),
+            total_instances=counts["total_detections"],
+        )
+        return result
+
+    def _run(self, image_path: Path, conf_threshold: float, output: str) -> dict[str, Any]:
+        """Run the Detectron2 runner subprocess on one image file."""
         # Invoke Detectron2 through subprocess
         try:
             result = subprocess.run(
@@ -90,13 +254,16 @@ class Detectron2Wrapper:
                     str(self.runner_script),
                     str(image_path),
                     str(conf_threshold),
+                    "--output",
+                    output,
                 ],
                 capture_output=True,
-                text=True,
                 check=True,
                 timeout=300,  # 5 minute timeout
             )
 
+            if output == "npz":
+                return load_compact(result.stdout)
             # Parse JSON output
             output_data = json.loads(result.stdout)
             return output_data
@@ -105,23 +272,25 @@ class Detectron2Wrapper:
             LOGGER.error("Detectron2 processing timed out for %s", image_path)
             raise RuntimeError(f"Detectron2 processing timed out for {image_path}")
         except subprocess.CalledProcessError as e:
-            LOGGER.error(
-                "Detectron2 processing failed for %s: %s", image_path, e.stderr
-            )
+            stderr = e.stderr.decode("utf-8", errors="replace")
+            LOGGER.error("Detectron2 processing failed for %s: %s", image_path, stderr)
             # Try to parse error output as JSON
             try:
                 error_data = json.loads(e.stdout)
                 if "error" in error_data:
                     raise RuntimeError(f"Detectron2 error: {error_data['error']}")
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 pass
-            raise RuntimeError(f"Detectron2 processing failed: {e.stderr}")
-        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Detectron2 processing failed: {stderr}")
+        except (json.JSONDecodeError, ValueError, KeyError) as e:
             LOGGER.error("Failed to parse Detectron2 output: %s", e)
             raise RuntimeError(f"Failed to parse Detectron2 output: {e}")
 
     def segment_batch(
-        self, image_paths: list[str | Path], conf_threshold: float = 0.5
+        self,
+        image_paths: list[str | Path],
+        conf_threshold: float = 0.5,
+        output: str | None = None,
     ) -> list[dict[str, Any]]:
         """
         Perform instance segmentation on multiple images.
@@ -129,6 +298,7 @@ class Detectron2Wrapper:
         Args:
             image_paths: List of paths to image files.
             conf_threshold: Confidence threshold for detections.
+            output: Runner output format, overriding the wrapper's default.
 
         Returns:
             List of segmentation dictionaries, one per image.
@@ -136,7 +306,7 @@ class Detectron2Wrapper:
         results = []
         for image_path in image_paths:
             try:
-                result = self.segment(image_path, conf_threshold=conf_threshold)
+                result = self.segment(image_path, conf_threshold=conf_threshold, output=output)
                 result["image_path"] = str(image_path)
                 results.append(result)
             except Exception as exc:
@@ -161,6 +331,8 @@ def segment_instances(image_path: str | Path, conf_threshold: float = 0.5) -> di
     """
     Convenience function to perform instance segmentation on a single image.
 
+    Uses the process-wide wrapper from the model registry.
+
     Args:
         image_path: Path to the image file.
         conf_threshold: Confidence threshold for detections.
@@ -168,5 +340,5 @@ def segment_instances(image_path: str | Path, conf_threshold: float = 0.5) -> di
     Returns:
         Dictionary with segmentation results.
     """
-    segmenter = Detectron2Wrapper()
+    segmenter = get_model("detectron2")
     return segmenter.segment(image_path, conf_threshold=conf_threshold)
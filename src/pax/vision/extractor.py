@@ -4,14 +4,29 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal, Mapping
 
-from pax.vision.clip import CLIPWrapper
-from pax.vision.detectron2 import Detectron2Wrapper
-from pax.vision.yolov8n import YOLOv8nDetector
+from pax.storage.layout import camera_id_from_path
+from pax.telemetry import counter, span
+from pax.vision.cascade import SKIPPED, Cascade, CascadePolicy
+from pax.vision.onnx_backend import OnnxRuntimeOptions
+from pax.vision.registry import REGISTRY, ModelRegistry, get_model
+from pax.vision.roi import CameraROI, load_rois
 
 LOGGER = logging.getLogger(__name__)
 
+Backend = Literal["torch", "onnx"]
+
+
+def _backend_config(backend: Backend, onnx_options: OnnxRuntimeOptions | None) -> dict[str, Any]:
+    """Registry config for a backend; the torch default shares the plain registry entry."""
+    if backend == "torch":
+        return {}
+    config: dict[str, Any] = {"backend": backend}
+    if onnx_options is not None:
+        config["onnx_options"] = onnx_options
+    return config
+
 
 class FeatureExtractor:
     """Unified feature extraction combining all vision models."""
@@ -23,17 +38,40 @@ class FeatureExtractor:
         use_clip: bool = True,
         yolo_conf_threshold: float = 0.25,
         detectron2_conf_threshold: float = 0.5,
+        registry: ModelRegistry | None = None,
+        yolo_backend: Backend = "torch",
+        clip_backend: Backend = "torch",
+        onnx_options: OnnxRuntimeOptions | None = None,
+        clip_quantize: bool = False,
+        cascade: CascadePolicy | None = None,
+        rois: Mapping[str, CameraROI] | str | Path | None = None,
     ) -> None:
         """
         Initialize feature extractor with specified models.
 
+        Models come from the model registry, so extractors created in the same
+        process share one copy of each model's weights.
+
         Args:
             use_yolo: Whether to use YOLOv8n for object detection.
             use_detectron2: Whether to use Detectron2 for instance segmentation.
             use_clip: Whether to use CLIP for scene understanding.
             yolo_conf_threshold: Confidence threshold for YOLOv8n.
             detectron2_conf_threshold: Confidence threshold for Detectron2.
+            registry: Model registry to load from (default: the process-wide one).
+            yolo_backend: ``"torch"`` or ``"onnx"`` (ONNX Runtime on CPU) for YOLOv8n.
+            clip_backend: ``"torch"`` or ``"onnx"`` for CLIP.
+            onnx_options: Thread tuning and export cache for ONNX backends.
+                A model configured for ONNX that fails to load (export or
+                session creation) raises instead of being disabled.
+            clip_quantize: Use int8 dynamically quantized CLIP (CPU only).
+            cascade: Run Detectron2 and CLIP only on frames the policy selects
+                from YOLO's output (default: every model on every frame).
+            rois: Per-camera regions of interest (or a ROI file path). YOLO and
+                Detectron2 see frames cropped to the camera's ROI and only
+                count detections inside it; CLIP still sees the whole frame.
         """
+        registry = registry or REGISTRY
         self.use_yolo = use_yolo
         self.use_detectron2 = use_detectron2
         self.use_clip = use_clip
@@ -45,45 +83,79 @@ class FeatureExtractor:
         # Initialize models
         if use_yolo:
             try:
-                self.yolo_detector = YOLOv8nDetector()
+                self.yolo_detector = registry.get(
+                    "yolov8n", **_backend_config(yolo_backend, onnx_options)
+                )
                 LOGGER.info("YOLOv8n detector initialized")
             except Exception as e:
+                if yolo_backend == "onnx":
+                    # An explicitly requested backend must not silently turn into "no YOLO".
+                    raise
                 LOGGER.warning("Failed to initialize YOLOv8n: %s", e)
                 self.use_yolo = False
 
         if use_detectron2:
             try:
-                self.detectron2_wrapper = Detectron2Wrapper()
+                self.detectron2_wrapper = registry.get("detectron2")
                 LOGGER.info("Detectron2 wrapper initialized")
             except Exception as e:
                 LOGGER.warning("Failed to initialize Detectron2: %s", e)
                 self.use_detectron2 = False
 
         if use_clip:
+            clip_config = _backend_config(clip_backend, onnx_options)
+            if clip_quantize:
+                clip_config["quantize"] = True
             try:
-                self.clip_wrapper = CLIPWrapper()
+                self.clip_wrapper = registry.get("clip", **clip_config)
                 LOGGER.info("CLIP wrapper initialized")
             except Exception as e:
+                if clip_backend == "onnx":
+                    raise
                 LOGGER.warning("Failed to initialize CLIP: %s", e)
                 self.use_clip = False
 
         self.yolo_conf_threshold = yolo_conf_threshold
         self.detectron2_conf_threshold = detectron2_conf_threshold
 
-    def extract(self, image_path: str | Path) -> dict[str, Any]:
+        self.cascade = Cascade(cascade) if cascade is not None else None
+        if self.cascade is not None:
+            LOGGER.info("Cascade policy: %s", cascade.describe())
+
+        self.rois: dict[str, CameraROI] = (
+            load_rois(rois) if isinstance(rois, (str, Path)) else dict(rois or {})
+        )
+        if self.rois:
+            LOGGER.info("Using regions of interest for %d cameras", len(self.rois))
+
+    def extract(self, image_path: str | Path, camera_id: str | None = None) -> dict[str, Any]:
         """
         Extract all features from an image.
 
         Args:
             image_path: Path to the image file.
+            camera_id: Camera the frame came from, which keys the cascade's
+                last-frame state and the region of interest (default: parsed
+                from the path like the collectors name files, see
+                ``camera_id_from_path``, else the image's directory).
 
         Returns:
             Dictionary containing all extracted features from all models.
+            With a cascade, ``cascade`` maps each gated model to the reason
+            it ran or ``"skipped"``.
         """
         image_path = Path(image_path)
         if not image_path.exists():
             raise FileNotFoundError(f"Image not found: {image_path}")
 
+        with span("pax_feature_extraction", image_path=str(image_path)) as record:
+            camera = camera_id or camera_id_from_path(image_path) or str(image_path.parent)
+            features = self._extract(image_path, camera)
+            record["attributes"]["errors"] = len(features["errors"])
+        counter("pax_images_extracted_total", "Images run through the feature extractor").inc()
+        return features
+
+    def _extract(self, image_path: Path, camera: str) -> dict[str, Any]:
         features = {
             "image_path": str(image_path),
             "yolo": {},
@@ -91,13 +163,15 @@ class FeatureExtractor:
             "clip": {},
             "errors": [],
         }
+        roi = self.rois.get(camera)
 
         # Extract YOLOv8n features
         if self.use_yolo and self.yolo_detector:
             try:
-                yolo_result = self.yolo_detector.detect(
-                    image_path, conf_threshold=self.yolo_conf_threshold
-                )
+                with span("pax_model_inference", {"model": "yolov8n"}):
+                    yolo_result = self.yolo_detector.detect(
+                        image_path, conf_threshold=self.yolo_conf_threshold, roi=roi
+                    )
                 features["yolo"] = {
                     "pedestrian_count": yolo_result["pedestrian_count"],
                     "vehicle_count": yolo_result["vehicle_count"],
@@ -108,12 +182,32 @@ class FeatureExtractor:
                 LOGGER.warning("YOLOv8n extraction failed for %s: %s", image_path, e)
                 features["errors"].append(f"YOLOv8n: {str(e)}")
 
+        decisions: dict[str, str] = {}
+        if self.cascade is not None:
+            gated = [
+                model
+                for model, enabled in (
+                    ("detectron2", self.use_detectron2 and self.detectron2_wrapper),
+                    ("clip", self.use_clip and self.clip_wrapper),
+                )
+                if enabled
+            ]
+            decisions = self.cascade.plan(camera, features["yolo"] or None, gated)
+            features["cascade"] = decisions
+
         # Extract Detectron2 features
-        if self.use_detectron2 and self.detectron2_wrapper:
+        if decisions.get("detectron2") == SKIPPED:
+            features["detectron2"] = self.cascade.fill(camera, "detectron2", features["yolo"])
+        elif self.use_detectron2 and self.detectron2_wrapper:
             try:
-                detectron2_result = self.detectron2_wrapper.segment(
-                    image_path, conf_threshold=self.detectron2_conf_threshold
-                )
+                with span("pax_model_inference", {"model": "detectron2"}):
+                    # Only the aggregates are kept, so skip per-instance output.
+                    detectron2_result = self.detectron2_wrapper.segment(
+                        image_path,
+                        conf_threshold=self.detectron2_conf_threshold,
+                        roi=roi,
+                        output="summary",
+                    )
                 features["detectron2"] = {
                     "pedestrian_count": detectron2_result["pedestrian_count"],
                     "vehicle_count": detectron2_result["vehicle_count"],
@@ -122,20 +216,27 @@ class FeatureExtractor:
                     "total_area_covered": detectron2_result["total_area_covered"],
                     "total_instances": detectron2_result["total_instances"],
                 }
+                if self.cascade is not None:
+                    self.cascade.record(camera, "detectron2", features["detectron2"])
             except Exception as e:
                 LOGGER.warning("Detectron2 extraction failed for %s: %s", image_path, e)
                 features["errors"].append(f"Detectron2: {str(e)}")
 
         # Extract CLIP features
-        if self.use_clip and self.clip_wrapper:
+        if decisions.get("clip") == SKIPPED:
+            features["clip"] = self.cascade.fill(camera, "clip", features["yolo"])
+        elif self.use_clip and self.clip_wrapper:
             try:
-                clip_result = self.clip_wrapper.understand_scene(image_path)
+                with span("pax_model_inference", {"model": "clip"}):
+                    clip_result = self.clip_wrapper.understand_scene(image_path)
                 features["clip"] = {
                     "top_scene": clip_result["top_scene"],
                     "top_confidence": clip_result["top_confidence"],
                     "semantic_features": clip_result["semantic_features"],
                     "scene_labels": clip_result["scene_labels"][:5],  # Top 5 scenes
                 }
+                if self.cascade is not None:
+                    self.cascade.record(camera, "clip", features["clip"])
             except Exception as e:
                 LOGGER.warning("CLIP extraction failed for %s: %s", image_path, e)
                 features["errors"].append(f"CLIP: {str(e)}")
@@ -143,14 +244,18 @@ class FeatureExtractor:
         return features
 
     def extract_batch(
-        self, image_paths: list[str | Path], show_progress: bool = True
+        self,
+        image_paths: list[str | Path],
+        show_progress: bool = True,
+        camera_ids: list[str | None] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Extract features from multiple images.
 
         Args:
-            image_paths: List of paths to image files.
+            image_paths: List of paths to image files, in capture order per camera.
             show_progress: Whether to show progress bar.
+            camera_ids: Camera of each image, for the cascade's per-camera state.
 
         Returns:
             List of feature dictionaries, one per image.
@@ -160,9 +265,10 @@ class FeatureExtractor:
         results = []
         iterator = tqdm(image_paths, desc="Extracting features") if show_progress else image_paths
 
-        for image_path in iterator:
+        cameras = camera_ids or [None] * len(image_paths)
+        for image_path, camera_id in zip(iterator, cameras):
             try:
-                result = self.extract(image_path)
+                result = self.extract(image_path, camera_id=camera_id)
                 results.append(result)
             except Exception as e:
                 LOGGER.error("Failed to extract features from %s: %s", image_path, e)
@@ -176,6 +282,8 @@ class FeatureExtractor:
                     }
                 )
 
+        if self.cascade is not None:
+            self.cascade.log_stats()
         return results
 
 
@@ -183,12 +291,14 @@ def extract_features(image_path: str | Path) -> dict[str, Any]:
     """
     Convenience function to extract all features from a single image.
 
+    Uses the process-wide extractor from the model registry.
+
     Args:
         image_path: Path to the image file.
 
     Returns:
         Dictionary containing all extracted features.
     """
-    extractor = FeatureExtractor()
+    extractor = get_model("extractor")
     return extractor.extract(image_path)
 
@@ -0,0 +1,94 @@
+"""Cheap reduced-resolution image decoding.
+
+A JPEG can be decoded at 1/2, 1/4 or 1/8 scale straight from its DCT
+coefficients, which skips most of the inverse DCT and upsampling work and is
+several times faster than decoding the full frame and resizing it. PIL exposes
+this as ``Image.draft``. ``decode_image`` asks for the smallest DCT scale that
+is still at least ``min_size`` (or the given ``reduce`` factor), so consumers
+that only need a small image (brightness statistics, CLIP's 224 px input,
+thumbnails) never pay for the full decode. Other formats decode at full size.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image
+
+
+@dataclass(slots=True)
+class DecodedImage:
+    """A decoded image and the size of the file it came from."""
+
+    image: Image.Image
+    original_size: tuple[int, int]
+
+    @property
+    def scale(self) -> float:
+        """Original width over decoded width (1, 2, 4 or 8 for JPEGs)."""
+        return self.original_size[0] / self.image.width
+
+
+def decode_image(
+    path: str | Path,
+    min_size: tuple[int, int] | int | None = None,
+    reduce: int = 1,
+    mode: str = "RGB",
+) -> DecodedImage:
+    """
+    Decode an image, at reduced resolution when the format allows it.
+
+    Args:
+        path: Image file.
+        min_size: Smallest acceptable ``(width, height)`` (an int applies to
+            both); the decoder picks the largest reduction that stays at or
+            above it.
+        reduce: Target reduction factor (1, 2, 4 or 8) when ``min_size`` is
+            not given.
+        mode: Pixel mode to convert to.
+
+    Returns:
+        The loaded image and the file's full size.
+    """
+    with Image.open(path) as image:
+        width, height = image.size
+        if min_size is None and reduce > 1:
+            min_size = (math.ceil(width / reduce), math.ceil(height / reduce))
+        if min_size is not None and image.format == "JPEG":
+            if isinstance(min_size, int):
+                min_size = (min_size, min_size)
+            image.draft(mode, min_size)
+        decoded = image.convert(mode) if image.mode != mode else image.copy()
+    return DecodedImage(decoded, (width, height))
+
+
+def load_image(
+    path: str | Path, min_size: tuple[int, int] | int | None = None, mode: str = "RGB"
+) -> Image.Image:
+    """``decode_image(...).image``: the image at the smallest size covering ``min_size``."""
+    return decode_image(path, min_size=min_size, mode=mode).image
+
+
+def make_thumbnail(
+    path: str | Path,
+    output: str | Path,
+    max_size: tuple[int, int] = (320, 240),
+    quality: int = 85,
+) -> Path:
+    """
+    Write a JPEG thumbnail fitting ``max_size``, decoding no more than needed.
+
+    Returns:
+        The thumbnail path.
+    """
+    image = load_image(path, min_size=max_size)
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    image.save(output, "JPEG", quality=quality)
+    return output
+
+
+__all__ = ["DecodedImage", "decode_image", "load_image", "make_thumbnail"]
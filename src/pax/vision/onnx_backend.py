@@ -0,0 +1,444 @@
+"""ONNX Runtime CPU backend for YOLOv8n and CLIP.
+
+Extraction hosts are CPU-only, where eager PyTorch leaves a lot on the table.
+This backend exports each model to ONNX once, caches the graph under
+``OnnxRuntimeOptions.cache_dir`` and runs it with ONNX Runtime with full
+graph optimisation and explicit intra/inter-op thread counts.
+
+* YOLOv8n is exported with ultralytics (static 640x640 input). Letterboxing,
+  confidence filtering and class-aware NMS are re-implemented in numpy to
+  match ultralytics' ``predict`` defaults, so detections agree with the
+  PyTorch path.
+* CLIP is exported as two graphs, the image tower (``pixel_values`` ->
+  ``image_embeds``) and the text tower (``input_ids``/``attention_mask`` ->
+  ``text_embeds``). Text embeddings of a label set are computed once and
+  reused across images. With ``quantize=True`` both graphs are dynamically
+  quantized to int8 (``MatMul``/``Gemm`` weights) and cached next to the
+  fp32 export.
+
+``onnxruntime`` (and ``onnx`` for exporting) are optional; they are imported
+only when an ONNX session is created.
+
+Exports are serialised across processes with a lock file next to the cached
+graph and written through per-process temporary files, so pool workers
+starting on a cold cache wait for one export instead of racing each other.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Literal, Sequence
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when the export recipe changes so stale cached graphs are not reused.
+EXPORT_VERSION = 1
+OPSET = 17
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "pax" / "onnx"
+
+# ultralytics predict() defaults
+YOLO_IMAGE_SIZE = 640
+YOLO_IOU_THRESHOLD = 0.7
+YOLO_MAX_DETECTIONS = 300
+_YOLO_CLASS_OFFSET = 7680  # ultralytics max_wh: separates classes for batched NMS
+_LETTERBOX_COLOR = 114
+
+Optimization = Literal["disable", "basic", "extended", "all"]
+
+
+@dataclass(frozen=True, slots=True)
+class OnnxRuntimeOptions:
+    """Session tuning and export cache location. Hashable, so usable as registry config."""
+
+    intra_op_threads: int | None = None
+    inter_op_threads: int | None = None
+    optimization: Optimization = "all"
+    parallel_execution: bool = False
+    cache_dir: Path = field(default=DEFAULT_CACHE_DIR)
+
+
+def cache_path(options: OnnxRuntimeOptions, stem: str, *identity: object) -> Path:
+    """Cached graph path for ``stem``, keyed on everything that changes the export."""
+    digest = hashlib.sha1(
+        json.dumps([EXPORT_VERSION, OPSET, *map(str, identity)]).encode("utf-8")
+    ).hexdigest()[:12]
+    return Path(options.cache_dir) / f"{stem}-{digest}.onnx"
+
+
+def create_session(path: Path, options: OnnxRuntimeOptions) -> Any:
+    """Create a CPU ``onnxruntime.InferenceSession`` with the configured tuning."""
+    import onnxruntime as ort
+
+    levels = {
+        "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }
+    session_options = ort.SessionOptions()
+    session_options.graph_optimization_level = levels[options.optimization]
+    if options.intra_op_threads is not None:
+        session_options.intra_op_num_threads = options.intra_op_threads
+    if options.inter_op_threads is not None:
+        session_options.inter_op_num_threads = options.inter_op_threads
+    session_options.execution_mode = (
+        ort.ExecutionMode.ORT_PARALLEL
+        if options.parallel_execution
+        else ort.ExecutionMode.ORT_SEQUENTIAL
+    )
+    return ort.InferenceSession(
+        str(path), sess_options=session_options, providers=["CPUExecutionProvider"]
+    )
+
+
+@contextmanager
+def _export_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on ``<path>.lock`` so only one process exports ``path``."""
+    try:
+        import fcntl
+    except ImportError:  # not POSIX: exports are not serialised
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.with_name(f"{path.name}.lock").open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _cached_export(path: Path, export: Callable[[Path], None]) -> Path:
+    """Run ``export`` into ``path`` unless it is already cached; writes are atomic."""
+    if path.exists():
+        return path
+    with _export_lock(path):
+        # Another process may have finished the export while this one waited.
+        if path.exists():
+            return path
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")
+        LOGGER.info("Exporting %s", path.name)
+        try:
+            export(tmp_path)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    return path
+
+
+# YOLOv8n --------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class Letterbox:
+    """Scale and padding applied by ``letterbox``, needed to map boxes back."""
+
+    ratio: float
+    pad_x: int
+    pad_y: int
+    height: int
+    width: int
+
+
+def letterbox(image: np.ndarray, size: int = YOLO_IMAGE_SIZE) -> tuple[np.ndarray, Letterbox]:
+    """
+    Resize an HxWx3 uint8 image to fit ``size`` x ``size`` and pad the rest.
+
+    Mirrors ``ultralytics.data.augment.LetterBox`` with ``auto=False``.
+
+    Returns:
+        ``(1, 3, size, size)`` float32 tensor in [0, 1] and the applied transform.
+    """
+    import cv2
+
+    height, width = image.shape[:2]
+    ratio = min(size / height, size / width)
+    new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+    pad_x, pad_y = (size - new_w) / 2, (size - new_h) / 2
+    if (new_w, new_h) != (width, height):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    image = cv2.copyMakeBorder(
+        image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(_LETTERBOX_COLOR,) * 3
+    )
+    tensor = np.ascontiguousarray(image.transpose(2, 0, 1)[None], dtype=np.float32) / 255.0
+    return tensor, Letterbox(ratio, left, top, height, width)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy non-maximum suppression on ``(N, 4)`` xyxy boxes; returns kept indices."""
+    order = scores.argsort()[::-1]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        x1 = np.maximum(boxes[best, 0], boxes[rest, 0])
+        y1 = np.maximum(boxes[best, 1], boxes[rest, 1])
+        x2 = np.minimum(boxes[best, 2], boxes[rest, 2])
+        y2 = np.minimum(boxes[best, 3], boxes[rest, 3])
+        inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        iou = inter / (areas[best] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def yolo_postprocess(
+    output: np.ndarray,
+    transform: Letterbox,
+    conf_threshold: float,
+    iou_threshold: float = YOLO_IOU_THRESHOLD,
+    max_detections: int = YOLO_MAX_DETECTIONS,
+) -> list[tuple[int, float, list[float]]]:
+    """
+    Decode a YOLOv8 ``(1, 4 + classes, anchors)`` output into detections.
+
+    Returns:
+        ``(class_id, confidence, [x1, y1, x2, y2])`` in original image pixels,
+        highest confidence first.
+    """
+    predictions = output[0].T
+    class_scores = predictions[:, 4:]
+    class_ids = class_scores.argmax(axis=1)
+    confidences = class_scores[np.arange(len(class_ids)), class_ids]
+    mask = confidences > conf_threshold
+    if not mask.any():
+        return []
+    xywh, class_ids, confidences = predictions[mask, :4], class_ids[mask], confidences[mask]
+    boxes = np.empty_like(xywh)
+    boxes[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+    boxes[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+
+    keep = nms(boxes + class_ids[:, None] * _YOLO_CLASS_OFFSET, confidences, iou_threshold)
+    keep = keep[:max_detections]
+    boxes, class_ids, confidences = boxes[keep], class_ids[keep], confidences[keep]
+
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - transform.pad_x) / transform.ratio
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - transform.pad_y) / transform.ratio
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, transform.width)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, transform.height)
+    return [
+        (int(class_id), float(confidence), box.tolist())
+        for class_id, confidence, box in zip(class_ids, confidences, boxes)
+    ]
+
+
+class OnnxYOLO:
+    """YOLOv8 detector running an exported graph on ONNX Runtime."""
+
+    def __init__(self, model_path: str, options: OnnxRuntimeOptions) -> None:
+        self.options = options
+        self.path = cache_path(options, Path(model_path).stem, model_path, YOLO_IMAGE_SIZE)
+        names_path = self.path.with_suffix(".json")
+        _cached_export(self.path, lambda target: self._export(model_path, target, names_path))
+        self.names: dict[int, str] = {
+            int(key): value for key, value in json.loads(names_path.read_text()).items()
+        }
+        self.session = create_session(self.path, options)
+        self.input_name = self.session.get_inputs()[0].name
+
+    @staticmethod
+    def _export(model_path: str, target: Path, names_path: Path) -> None:
+        from ultralytics import YOLO
+
+        model = YOLO(model_path)
+        exported = model.export(
+            format="onnx", imgsz=YOLO_IMAGE_SIZE, opset=OPSET, dynamic=False, simplify=False
+        )
+        Path(exported).replace(target)
+        names_path.write_text(json.dumps({str(k): v for k, v in model.names.items()}))
+
+    def detect(
+        self, image: str | Path | np.ndarray, conf_threshold: float
+    ) -> list[tuple[int, float, list[float]]]:
+        """Detect on an image file or an HxWx3 RGB uint8 array."""
+        if not isinstance(image, np.ndarray):
+            import cv2
+
+            bgr = cv2.imread(str(image))
+            if bgr is None:
+                raise ValueError(f"Could not read image: {image}")
+            image = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        tensor, transform = letterbox(image)
+        (output,) = self.session.run(None, {self.input_name: tensor})
+        return yolo_postprocess(output, transform, conf_threshold)
+
+
+# CLIP -------------------------------------------------------------------------
+
+
+def quantize_graph(path: Path) -> Path:
+    """Int8 dynamic quantization of a cached graph's MatMul/Gemm weights, cached beside it."""
+
+    def quantize(target: Path) -> None:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(
+            str(path),
+            str(target),
+            op_types_to_quantize=["MatMul", "Gemm"],
+            weight_type=QuantType.QInt8,
+        )
+
+    return _cached_export(path.with_name(f"{path.stem}-int8.onnx"), quantize)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+class OnnxCLIP:
+    """CLIP image and text towers running on ONNX Runtime."""
+
+    def __init__(
+        self,
+        model_name: str,
+        processor: Any,
+        options: OnnxRuntimeOptions,
+        load_torch_model: Callable[[], Any],
+        quantize: bool = False,
+    ) -> None:
+        """
+        Args:
+            model_name: HuggingFace model identifier (part of the cache key).
+            processor: The model's ``CLIPProcessor``, used for tokenising and
+                image preprocessing with numpy outputs.
+            options: Session tuning and cache location.
+            load_torch_model: Loads the PyTorch ``CLIPModel``; only called when
+                the graphs are not cached yet.
+            quantize: Run int8 dynamically quantized copies of the graphs.
+        """
+        self.processor = processor
+        stem = model_name.replace("/", "--")
+        image_path = cache_path(options, f"{stem}-image", model_name)
+        text_path = cache_path(options, f"{stem}-text", model_name)
+        meta_path = image_path.with_suffix(".json")
+        if not meta_path.exists():
+            with _export_lock(meta_path):
+                if not meta_path.exists():
+                    model = load_torch_model()
+                    _cached_export(image_path, lambda target: self._export_image(model, target))
+                    _cached_export(text_path, lambda target: self._export_text(model, target))
+                    # Written last and atomically: its presence means both graphs are cached.
+                    tmp_path = meta_path.with_name(f"{meta_path.stem}.{os.getpid()}.tmp.json")
+                    tmp_path.write_text(
+                        json.dumps({"logit_scale": float(model.logit_scale.exp())})
+                    )
+                    tmp_path.replace(meta_path)
+        self.logit_scale = json.loads(meta_path.read_text())["logit_scale"]
+        if quantize:
+            image_path, text_path = quantize_graph(image_path), quantize_graph(text_path)
+        self.image_session = create_session(image_path, options)
+        self.text_session = create_session(text_path, options)
+        self._text_cache: dict[tuple[str, ...], np.ndarray] = {}
+
+    def _export_image(self, model: Any, target: Path) -> None:
+        import torch
+
+        class ImageTower(torch.nn.Module):
+            def __init__(self) -> None:
+                super().__init__()
+                self.model = model
+
+            def forward(self, pixel_values: torch.Tensor) -> torch.Tensor:
+                return self.model.get_image_features(pixel_values=pixel_values)
+
+        size = self.processor.image_processor.crop_size
+        dummy = torch.zeros(1, 3, size["height"], size["width"])
+        torch.onnx.export(
+            ImageTower().eval(),
+            (dummy,),
+            str(target),
+            input_names=["pixel_values"],
+            output_names=["image_embeds"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}},
+            opset_version=OPSET,
+        )
+
+    def _export_text(self, model: Any, target: Path) -> None:
+        import torch
+
+        class TextTower(torch.nn.Module):
+            def __init__(self) -> None:
+                super().__init__()
+                self.model = model
+
+            def forward(
+                self, input_ids: torch.Tensor, attention_mask: torch.Tensor
+            ) -> torch.Tensor:
+                return self.model.get_text_features(
+                    input_ids=input_ids, attention_mask=attention_mask
+                )
+
+        tokens = self.processor.tokenizer(["a photo"], return_tensors="pt", padding=True)
+        axes = {0: "batch", 1: "sequence"}
+        torch.onnx.export(
+            TextTower().eval(),
+            (tokens["input_ids"], tokens["attention_mask"]),
+            str(target),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["text_embeds"],
+            dynamic_axes={"input_ids": axes, "attention_mask": axes, "text_embeds": {0: "batch"}},
+            opset_version=OPSET,
+        )
+
+    def image_features(self, image: Any) -> np.ndarray:
+        """Unnormalised image embedding (``CLIPModel.get_image_features``) for one image."""
+        pixels = self.processor(images=image, return_tensors="np")["pixel_values"]
+        (features,) = self.image_session.run(None, {"pixel_values": pixels.astype(np.float32)})
+        return features[0]
+
+    def text_embeds(self, labels: Sequence[str]) -> np.ndarray:
+        """Normalised text embeddings for ``labels``, cached per label set."""
+        key = tuple(labels)
+        cached = self._text_cache.get(key)
+        if cached is None:
+            tokens = self.processor.tokenizer(list(labels), return_tensors="np", padding=True)
+            (features,) = self.text_session.run(
+                None,
+                {
+                    "input_ids": tokens["input_ids"].astype(np.int64),
+                    "attention_mask": tokens["attention_mask"].astype(np.int64),
+                },
+            )
+            cached = self._text_cache[key] = _normalize(features)
+        return cached
+
+    def understand(self, image: Any, labels: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Label probabilities and the normalised image embedding, as ``CLIPModel`` returns.
+
+        Returns:
+            ``(probabilities over labels, image_embeds)``.
+        """
+        image_embeds = _normalize(self.image_features(image))
+        logits = self.logit_scale * self.text_embeds(labels) @ image_embeds
+        return _softmax(logits), image_embeds
+
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "OnnxCLIP",
+    "OnnxRuntimeOptions",
+    "OnnxYOLO",
+    "create_session",
+    "letterbox",
+    "nms",
+    "quantize_graph",
+    "yolo_postprocess",
+]
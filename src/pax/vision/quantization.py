@@ -0,0 +1,174 @@
+"""INT8 dynamic quantization for CLIP and an fp32 parity check.
+
+CLIP ViT-B/32 is the slowest model per image on CPU after YOLO, and almost
+all of its time goes to ``nn.Linear`` layers. Dynamic quantization stores
+those weights as int8 and quantizes activations on the fly, which cuts
+latency substantially for a small loss in accuracy. No calibration data is
+needed.
+
+The quantized weights are cached on disk, so later loads build the model from
+its config and read the int8 state dict instead of loading and converting the
+fp32 checkpoint. ``compare_clip`` measures what the speedup costs: how often
+the top scene label agrees with fp32, and the cosine similarity of the
+image embeddings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when the quantization recipe changes so stale cached weights are not reused.
+QUANTIZATION_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "pax" / "int8"
+
+
+def quantize_linear(model: Any) -> Any:
+    """Dynamically quantize every ``nn.Linear`` in ``model`` to int8 (CPU only)."""
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def quantized_path(model_name: str, cache_dir: Path | None = None) -> Path:
+    """Cached int8 state dict path, keyed on the model and the torch version."""
+    import torch
+
+    digest = hashlib.sha1(
+        json.dumps([QUANTIZATION_VERSION, model_name, torch.__version__]).encode("utf-8")
+    ).hexdigest()[:12]
+    stem = model_name.replace("/", "--")
+    return Path(cache_dir or DEFAULT_CACHE_DIR) / f"{stem}-int8-{digest}.pt"
+
+
+def load_quantized_clip(model_name: str, cache_dir: Path | None = None) -> Any:
+    """
+    Load an int8 ``CLIPModel``, quantizing and caching it on first use.
+
+    Args:
+        model_name: HuggingFace model identifier.
+        cache_dir: Where quantized weights are kept (default: ``~/.cache/pax/int8``).
+
+    Returns:
+        The quantized model in eval mode, on CPU.
+    """
+    import torch
+    from transformers import CLIPConfig, CLIPModel
+
+    from .onnx_backend import _cached_export
+
+    path = quantized_path(model_name, cache_dir)
+    built: list[Any] = []
+
+    def quantize(target: Path) -> None:
+        model = quantize_linear(CLIPModel.from_pretrained(model_name).eval())
+        torch.save(model.state_dict(), target)
+        built.append(model)
+
+    # Serialised across processes: workers starting on a cold cache wait for
+    # the first one to write the weights instead of all quantizing at once.
+    _cached_export(path, quantize)
+    if built:
+        LOGGER.info("Quantized CLIP to int8 and cached it at %s", path)
+        return built[0]
+
+    model = quantize_linear(CLIPModel(CLIPConfig.from_pretrained(model_name)).eval())
+    model.load_state_dict(torch.load(path, map_location="cpu", weights_only=True))
+    LOGGER.info("Loaded quantized CLIP weights from %s", path)
+    return model
+
+
+@dataclass(slots=True)
+class ParityReport:
+    """Agreement and latency of a candidate CLIP wrapper against a reference."""
+
+    images: int = 0
+    top_scene_agreement: float = 0.0
+    cosine_mean: float = 0.0
+    cosine_min: float = 0.0
+    reference_s_per_image: float = 0.0
+    candidate_s_per_image: float = 0.0
+    disagreements: list[dict[str, str]] = field(default_factory=list)
+
+    @property
+    def speedup(self) -> float | None:
+        if not self.candidate_s_per_image:
+            return None
+        return self.reference_s_per_image / self.candidate_s_per_image
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["speedup"] = self.speedup
+        return data
+
+
+def _cosine(a: Any, b: Any) -> float:
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-12))
+
+
+def compare_clip(reference: Any, candidate: Any, image_paths: Iterable[Path]) -> ParityReport:
+    """
+    Run ``understand_scene`` with both wrappers on each image and compare.
+
+    Args:
+        reference: The fp32 ``CLIPWrapper``.
+        candidate: The wrapper under test (e.g. ``CLIPWrapper(quantize=True)``).
+        image_paths: Sample images.
+
+    Returns:
+        Top-scene agreement rate, embedding cosine similarity (mean and
+        minimum) and mean latency per image for each wrapper.
+    """
+    report = ParityReport()
+    cosines = []
+    agreed = 0
+    reference_s = candidate_s = 0.0
+    for image_path in image_paths:
+        started = time.perf_counter()
+        expected = reference.understand_scene(image_path)
+        reference_s += time.perf_counter() - started
+        started = time.perf_counter()
+        actual = candidate.understand_scene(image_path)
+        candidate_s += time.perf_counter() - started
+
+        cosines.append(_cosine(actual["semantic_features"], expected["semantic_features"]))
+        if actual["top_scene"] == expected["top_scene"]:
+            agreed += 1
+        else:
+            report.disagreements.append(
+                {
+                    "image_path": str(image_path),
+                    "reference": expected["top_scene"],
+                    "candidate": actual["top_scene"],
+                }
+            )
+
+    if cosines:
+        report.images = len(cosines)
+        report.top_scene_agreement = agreed / len(cosines)
+        report.cosine_mean = float(np.mean(cosines))
+        report.cosine_min = float(np.min(cosines))
+        report.reference_s_per_image = reference_s / len(cosines)
+        report.candidate_s_per_image = candidate_s / len(cosines)
+    return report
+
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "ParityReport",
+    "compare_clip",
+    "load_quantized_clip",
+    "quantize_linear",
+    "quantized_path",
+]
@@ -0,0 +1,350 @@
+"""Process-wide registry of loaded vision models.
+
+Constructing ``YOLOv8nDetector``, ``CLIPWrapper`` or ``FeatureExtractor``
+loads weights from disk (and moves them to the GPU), which costs seconds per
+call. The registry loads each model once per process, keyed by model name and
+constructor config, and hands the same instance to every caller::
+
+    detector = get_model("yolov8n")
+    clip = get_model("clip", model_name="openai/clip-vit-base-patch32")
+
+Loading is thread-safe: concurrent requests for the same model wait for a
+single load, while different models load in parallel. When ``max_models`` or
+``max_bytes`` is set, the least recently used models are evicted. An evicted
+model stays alive as long as a caller still holds a reference to it.
+
+A model whose loader fetches other models from the same registry (the
+``extractor`` gets ``yolov8n``, ``clip`` and ``detectron2``) is a composite:
+its weights are accounted to those components, which are pinned while the
+composite is loaded, since evicting them would free nothing.
+
+Loaders are registered as ``"module:attribute"`` strings so that importing
+this module does not import torch or ultralytics.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Iterable, Mapping
+
+from pax.telemetry import counter, span
+
+LOGGER = logging.getLogger(__name__)
+
+Loader = Callable[..., Any]
+ModelKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+DEFAULT_LOADERS: dict[str, str] = {
+    "yolov8n": "pax.vision.yolov8n:YOLOv8nDetector",
+    "clip": "pax.vision.clip:CLIPWrapper",
+    "detectron2": "pax.vision.detectron2:Detectron2Wrapper",
+    "extractor": "pax.vision.extractor:FeatureExtractor",
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a config value (lists become tuples, dicts sorted tuples)."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(item) for item in value))
+    return value
+
+
+def model_key(name: str, config: Mapping[str, Any] | None = None) -> ModelKey:
+    return name, _freeze(config or {})
+
+
+def model_nbytes(model: Any) -> int:
+    """
+    Bytes held by torch parameters and buffers of ``model`` and its attributes.
+
+    Wrappers keep the torch module one attribute down (``detector.model``), so
+    the object and its direct attributes are inspected. Models without torch
+    tensors (the Detectron2 subprocess wrapper) report 0.
+    """
+    candidates = [model]
+    try:
+        candidates.extend(vars(model).values())
+    except TypeError:
+        pass
+    seen: set[int] = set()
+    total = 0
+    for candidate in candidates:
+        parameters = getattr(candidate, "parameters", None)
+        buffers = getattr(candidate, "buffers", None)
+        if not callable(parameters):
+            continue
+        try:
+            tensors = chain(parameters(), buffers() if callable(buffers) else ())
+            for tensor in tensors:
+                if id(tensor) in seen:
+                    continue
+                seen.add(id(tensor))
+                total += tensor.numel() * tensor.element_size()
+        except Exception as exc:  # noqa: BLE001 - accounting must never break loading
+            LOGGER.debug("Could not size %r: %s", candidate, exc)
+    return total
+
+
+@dataclass(slots=True)
+class ModelEntry:
+    """A loaded model and its accounting."""
+
+    name: str
+    config: tuple[tuple[str, Any], ...]
+    model: Any
+    nbytes: int
+    load_seconds: float
+    hits: int = 0
+    # Registry models fetched while loading this one; they hold its weights.
+    components: tuple[ModelKey, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "config": dict(self.config),
+            "nbytes": self.nbytes,
+            "load_seconds": round(self.load_seconds, 3),
+            "hits": self.hits,
+            "components": [name for name, _ in self.components],
+        }
+
+
+class ModelRegistry:
+    """Thread-safe, lazily loading LRU cache of model instances."""
+
+    def __init__(
+        self,
+        loaders: Mapping[str, str | Loader] | None = None,
+        max_models: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        """
+        Args:
+            loaders: Model name to loader (callable or ``"module:attribute"``);
+                defaults to the pax vision models.
+            max_models: Evict least recently used models beyond this count.
+            max_bytes: Evict least recently used models beyond this many bytes.
+        """
+        self._loaders: dict[str, str | Loader] = dict(
+            DEFAULT_LOADERS if loaders is None else loaders
+        )
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[ModelKey, ModelEntry] = OrderedDict()
+        self._load_locks: dict[ModelKey, threading.Lock] = {}
+        # Components fetched so far by loads in progress, and this thread's loads.
+        self._loading_components: dict[ModelKey, set[ModelKey]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: str | Loader) -> None:
+        """Add or replace the loader for ``name``."""
+        with self._lock:
+            self._loaders[name] = loader
+
+    def configure(self, max_models: int | None = None, max_bytes: int | None = None) -> None:
+        """Change the eviction limits and evict immediately if now over them."""
+        with self._lock:
+            self.max_models = max_models
+            self.max_bytes = max_bytes
+            self._enforce_limits(keep=None)
+
+    def _resolve(self, name: str) -> Loader:
+        try:
+            loader = self._loaders[name]
+        except KeyError:
+            known = ", ".join(sorted(self._loaders))
+            raise KeyError(f"Unknown model {name!r}; registered: {known}") from None
+        if isinstance(loader, str):
+            module_name, _, attribute = loader.partition(":")
+            loader = getattr(importlib.import_module(module_name), attribute)
+        return loader
+
+    def get(self, name: str, **config: Any) -> Any:
+        """
+        Return the loaded model for ``name`` and ``config``, loading it on first use.
+
+        Args:
+            name: Registered model name (``yolov8n``, ``clip``, ``detectron2``, ``extractor``).
+            **config: Constructor keyword arguments; each distinct config is a
+                separate cached instance.
+
+        Returns:
+            The shared model instance.
+        """
+        key = model_key(name, config)
+        loading: list[ModelKey] = self._local.__dict__.setdefault("loading", [])
+        with self._lock:
+            if loading:
+                # Fetched by a loader in this thread: a component of that model.
+                self._loading_components[loading[-1]].add(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    # Another thread finished loading while we waited.
+                    self._entries.move_to_end(key)
+                    entry.hits += 1
+                    return entry.model
+                self._loading_components[key] = set()
+            loading.append(key)
+            try:
+                loader = self._resolve(name)
+                started = time.perf_counter()
+                with span("pax_model_load", {"model": name}):
+                    model = loader(**config)
+            except BaseException:
+                with self._lock:
+                    self._load_locks.pop(key, None)
+                    self._loading_components.pop(key, None)
+                raise
+            finally:
+                loading.pop()
+            with self._lock:
+                components = tuple(self._loading_components.pop(key))
+            # A composite's weights belong to its components; count them once, there.
+            entry = ModelEntry(
+                name,
+                key[1],
+                model,
+                0 if components else model_nbytes(model),
+                time.perf_counter() - started,
+                components=components,
+            )
+            counter("pax_model_loads_total", "Vision models loaded into the registry").inc(
+                model=name
+            )
+            LOGGER.info(
+                "Loaded model %s%s in %.1fs (%.1f MB)",
+                name,
+                f" {dict(config)}" if config else "",
+                entry.load_seconds,
+                entry.nbytes / 1e6,
+            )
+            with self._lock:
+                self._entries[key] = entry
+                self._load_locks.pop(key, None)
+                self._enforce_limits(keep=key)
+        return model
+
+    def _pinned(self) -> set[ModelKey]:
+        """Components of loaded composites and of loads in progress (lock held)."""
+        pinned = set(chain.from_iterable(self._loading_components.values()))
+        for entry in self._entries.values():
+            pinned.update(entry.components)
+        return pinned
+
+    def _enforce_limits(self, keep: ModelKey | None) -> None:
+        """Evict least recently used entries until within limits (lock held)."""
+        while True:
+            over_count = self.max_models is not None and len(self._entries) > self.max_models
+            over_bytes = self.max_bytes is not None and self.total_bytes() > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            pinned = self._pinned()
+            oldest = next(
+                (key for key in self._entries if key != keep and key not in pinned), None
+            )
+            if oldest is None:
+                break
+            evicted = self._entries.pop(oldest)
+            counter("pax_model_evictions_total", "Vision models evicted from the registry").inc(
+                model=evicted.name
+            )
+            LOGGER.info("Evicted model %s (%.1f MB)", evicted.name, evicted.nbytes / 1e6)
+
+    def warm_up(self, models: Iterable[str | tuple[str, Mapping[str, Any]]]) -> list[Any]:
+        """
+        Load models ahead of the first request.
+
+        Args:
+            models: Model names, or ``(name, config)`` pairs.
+
+        Returns:
+            The loaded instances, in order.
+        """
+        loaded = []
+        for model in models:
+            name, config = (model, {}) if isinstance(model, str) else model
+            loaded.append(self.get(name, **config))
+        return loaded
+
+    def evict(self, name: str, **config: Any) -> bool:
+        """
+        Drop one cached model. Returns whether it was dropped.
+
+        A component of a loaded composite stays until the composite is evicted.
+        """
+        key = model_key(name, config)
+        with self._lock:
+            if key in self._pinned():
+                LOGGER.info("Not evicting %s: a loaded composite model uses it", name)
+                return False
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def is_loaded(self, name: str, **config: Any) -> bool:
+        with self._lock:
+            return model_key(name, config) in self._entries
+
+    def total_bytes(self) -> int:
+        """Bytes of all loaded models; composites add nothing beyond their components."""
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Loaded models, least recently used first, with size, load time and hits."""
+        with self._lock:
+            return [entry.to_dict() for entry in self._entries.values()]
+
+
+REGISTRY = ModelRegistry()
+
+
+def get_model(name: str, **config: Any) -> Any:
+    """``REGISTRY.get`` for the process-wide registry."""
+    return REGISTRY.get(name, **config)
+
+
+def warm_up(models: Iterable[str | tuple[str, Mapping[str, Any]]]) -> list[Any]:
+    """``REGISTRY.warm_up`` for the process-wide registry."""
+    return REGISTRY.warm_up(models)
+
+
+def configure_models(
+    max_models: int | None = None, max_memory_mb: float | None = None
+) -> ModelRegistry:
+    """Apply eviction limits (e.g. ``PaxSettings.vision``) to the process-wide registry."""
+    max_bytes = int(max_memory_mb * 1e6) if max_memory_mb is not None else None
+    REGISTRY.configure(max_models=max_models, max_bytes=max_bytes)
+    return REGISTRY
+
+
+__all__ = [
+    "REGISTRY",
+    "ModelEntry",
+    "ModelRegistry",
+    "configure_models",
+    "get_model",
+    "model_nbytes",
+    "warm_up",
+]
@@ -0,0 +1,261 @@
+"""Per-camera regions of interest for detection.
+
+Most of a traffic camera frame is sky, facades or roadway that never holds a
+pedestrian. A ``CameraROI`` is a set of polygons in normalised image
+coordinates ((0, 0) top left, (1, 1) bottom right), so one definition holds
+whatever resolution the camera serves. ROIs are stored as JSON next to the
+numbered camera manifest (``data/manifests/corridor_camera_rois.json``) and
+keyed by camera ID.
+
+Before detection the frame is cropped to the ROI's bounding box and pixels
+outside the polygons are filled with grey (``crop_to_roi``). Detections are
+mapped back to full-frame pixels and kept only when their foot point (bottom
+centre of the box) lies inside the ROI (``roi_detections``). ``suggest_roi``
+proposes an ROI from a heatmap of past detection boxes.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import shapely
+from PIL import Image, ImageDraw
+from shapely.geometry import MultiPolygon, Polygon, box
+from shapely.ops import unary_union
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_ROI_PATH = Path("data/manifests/corridor_camera_rois.json")
+
+ROI_FILL = 114  # the grey YOLO letterboxes with, so masked pixels look like padding
+
+Point = tuple[float, float]
+
+
+@dataclass(slots=True)
+class CameraROI:
+    """Region of interest of one camera as normalised image-space polygons."""
+
+    camera_id: str
+    polygons: list[list[Point]]
+    number: int | None = None
+    source: str = "manual"
+
+    def pixel_geometry(self, width: int, height: int) -> Polygon | MultiPolygon:
+        return unary_union(
+            [Polygon([(x * width, y * height) for x, y in polygon]) for polygon in self.polygons]
+        )
+
+    def crop_box(self, width: int, height: int) -> tuple[int, int, int, int]:
+        """``(left, top, right, bottom)`` pixel box enclosing the ROI, within the frame."""
+        left, top, right, bottom = self.pixel_geometry(width, height).bounds
+        return (
+            max(0, math.floor(left)),
+            max(0, math.floor(top)),
+            min(width, math.ceil(right)),
+            min(height, math.ceil(bottom)),
+        )
+
+    def area_fraction(self) -> float:
+        """Share of the frame inside the ROI."""
+        return float(self.pixel_geometry(1, 1).intersection(box(0, 0, 1, 1)).area)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "number": self.number,
+            "source": self.source,
+            "polygons": [[list(point) for point in polygon] for polygon in self.polygons],
+        }
+
+    @classmethod
+    def from_dict(cls, camera_id: str, data: Mapping[str, Any]) -> CameraROI:
+        return cls(
+            camera_id=camera_id,
+            polygons=[[(float(x), float(y)) for x, y in polygon] for polygon in data["polygons"]],
+            number=data.get("number"),
+            source=data.get("source", "manual"),
+        )
+
+
+@dataclass(slots=True)
+class ROICrop:
+    """A frame cropped and masked to an ROI, with what is needed to map boxes back."""
+
+    image: Image.Image
+    left: int
+    top: int
+    width: int
+    height: int
+    geometry: Polygon | MultiPolygon = field(repr=False)
+
+    def model_size(self, base: int, stride: int = 32) -> int:
+        """
+        Square inference size that keeps the full frame's scale for the crop.
+
+        Detectors resize the longest side of their input to ``base``. Running
+        the crop at the same scale as the full frame needs a proportionally
+        smaller input, rounded up to the model stride.
+        """
+        scale = base / max(self.width, self.height)
+        longest = max(self.image.size) * scale
+        return min(base, max(stride, math.ceil(longest / stride) * stride))
+
+
+def crop_to_roi(image: str | Path | Image.Image, roi: CameraROI) -> ROICrop:
+    """Crop ``image`` to the ROI's bounding box and grey out pixels outside its polygons."""
+    if not isinstance(image, Image.Image):
+        # The crop is a new, fully loaded image, so the file can be closed on return.
+        with Image.open(image) as opened:
+            return crop_to_roi(opened, roi)
+    image = image.convert("RGB")
+    width, height = image.size
+    left, top, right, bottom = roi.crop_box(width, height)
+    cropped = image.crop((left, top, right, bottom))
+
+    mask = Image.new("L", cropped.size, 0)
+    draw = ImageDraw.Draw(mask)
+    for polygon in roi.polygons:
+        draw.polygon([(x * width - left, y * height - top) for x, y in polygon], fill=255)
+    background = Image.new("RGB", cropped.size, (ROI_FILL,) * 3)
+    return ROICrop(
+        Image.composite(cropped, background, mask),
+        left,
+        top,
+        width,
+        height,
+        roi.pixel_geometry(width, height),
+    )
+
+
+def roi_detections(detections: Iterable[dict[str, Any]], crop: ROICrop) -> list[dict[str, Any]]:
+    """
+    Map detections on a crop back to the full frame and drop those outside the ROI.
+
+    ``bbox`` (xyxy) and, when present, ``boundary_points`` are shifted by the
+    crop offset in place. A detection is kept when the bottom centre of its
+    box, where the object meets the ground, lies inside the ROI.
+    """
+    detections = list(detections)
+    if not detections:
+        return []
+    for detection in detections:
+        x1, y1, x2, y2 = detection["bbox"]
+        detection["bbox"] = [x1 + crop.left, y1 + crop.top, x2 + crop.left, y2 + crop.top]
+        if detection.get("boundary_points"):
+            detection["boundary_points"] = [
+                [x + crop.left, y + crop.top] for x, y in detection["boundary_points"]
+            ]
+    boxes = np.array([detection["bbox"] for detection in detections], dtype=np.float64)
+    inside = shapely.intersects_xy(crop.geometry, (boxes[:, 0] + boxes[:, 2]) / 2, boxes[:, 3])
+    return [detection for detection, keep in zip(detections, inside) if keep]
+
+
+def suggest_roi(
+    camera_id: str,
+    boxes: np.ndarray | Iterable[Iterable[float]],
+    grid: int = 32,
+    coverage: float = 0.95,
+    convex: bool = True,
+    min_boxes: int = 20,
+) -> CameraROI | None:
+    """
+    Propose an ROI covering where detections accumulate.
+
+    Every box adds heat to the grid cells it overlaps. The hottest cells
+    holding ``coverage`` of the total heat are merged, grown by one cell and,
+    with ``convex``, replaced by their convex hull.
+
+    Args:
+        camera_id: Camera the boxes came from.
+        boxes: ``(N, 4)`` normalised xyxy detection boxes.
+        grid: Heatmap cells per side.
+        coverage: Share of detection heat the ROI must contain.
+        convex: Return the convex hull instead of the cell outline.
+        min_boxes: Below this many boxes no ROI is suggested.
+
+    Returns:
+        A ``CameraROI`` with ``source="heatmap"``, or ``None`` without enough data.
+    """
+    boxes = np.clip(np.asarray(boxes, dtype=np.float64).reshape(-1, 4), 0.0, 1.0)
+    if len(boxes) < min_boxes:
+        return None
+
+    heat = np.zeros((grid, grid))
+    cols0 = np.floor(boxes[:, 0] * grid).astype(int).clip(0, grid - 1)
+    rows0 = np.floor(boxes[:, 1] * grid).astype(int).clip(0, grid - 1)
+    cols1 = np.maximum(np.ceil(boxes[:, 2] * grid).astype(int), cols0 + 1).clip(1, grid)
+    rows1 = np.maximum(np.ceil(boxes[:, 3] * grid).astype(int), rows0 + 1).clip(1, grid)
+    for row0, row1, col0, col1 in zip(rows0, rows1, cols0, cols1):
+        heat[row0:row1, col0:col1] += 1
+
+    order = np.argsort(heat, axis=None, kind="stable")[::-1]
+    cumulative = np.cumsum(heat.ravel()[order])
+    selected = order[: int(np.searchsorted(cumulative, coverage * cumulative[-1])) + 1]
+    rows, cols = np.unravel_index(selected, heat.shape)
+    cell = 1.0 / grid
+    cells = [
+        box(col * cell, row * cell, (col + 1) * cell, (row + 1) * cell)
+        for row, col in zip(rows, cols)
+    ]
+    region = unary_union(cells).buffer(cell, join_style="mitre")
+    if convex:
+        region = region.convex_hull
+    region = region.intersection(box(0, 0, 1, 1)).simplify(cell / 2)
+
+    parts = region.geoms if isinstance(region, MultiPolygon) else [region]
+    polygons = [
+        [(round(x, 4), round(y, 4)) for x, y in part.exterior.coords[:-1]]
+        for part in parts
+        if not part.is_empty
+    ]
+    return CameraROI(camera_id, polygons, source="heatmap") if polygons else None
+
+
+def load_rois(path: str | Path = DEFAULT_ROI_PATH) -> dict[str, CameraROI]:
+    """Camera ID to ROI, from a file written by ``save_rois``."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {
+        camera_id: CameraROI.from_dict(camera_id, entry)
+        for camera_id, entry in data.get("cameras", {}).items()
+    }
+
+
+def save_rois(
+    rois: Mapping[str, CameraROI] | Iterable[CameraROI],
+    path: str | Path = DEFAULT_ROI_PATH,
+    metadata: Mapping[str, Any] | None = None,
+) -> Path:
+    """Write ROIs as JSON, sorted by camera number then ID."""
+    entries = list(rois.values()) if isinstance(rois, Mapping) else list(rois)
+    entries.sort(key=lambda roi: (roi.number is None, roi.number or 0, roi.camera_id))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "metadata": {
+            "coordinates": "normalized xy, origin top left",
+            "generated_at": datetime.now().isoformat(),
+            **(metadata or {}),
+        },
+        "cameras": {roi.camera_id: roi.to_dict() for roi in entries},
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return path
+
+
+__all__ = [
+    "DEFAULT_ROI_PATH",
+    "CameraROI",
+    "ROICrop",
+    "crop_to_roi",
+    "load_rois",
+    "roi_detections",
+    "save_rois",
+    "suggest_roi",
+]
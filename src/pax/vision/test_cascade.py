@@ -0,0 +1,98 @@
+"""Test cascaded execution in the feature extractor with stand-in models."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from pax.vision.cascade import CascadePolicy, ModelRule
+from pax.vision.extractor import FeatureExtractor
+from pax.vision.registry import ModelRegistry
+
+# Pedestrians YOLO sees in each frame, by file name.
+PEDESTRIANS = {"f0.jpg": 0, "f1.jpg": 0, "f2.jpg": 2, "f3.jpg": 0, "f4.jpg": 0}
+
+
+class FakeYOLO:
+    def detect(self, image_path: Path, conf_threshold: float, roi=None) -> dict:
+        pedestrians = PEDESTRIANS[Path(image_path).name]
+        return {
+            "pedestrian_count": pedestrians,
+            "vehicle_count": 1,
+            "bike_count": 0,
+            "total_detections": pedestrians + 1,
+        }
+
+
+class FakeDetectron2:
+    calls = 0
+
+    def segment(self, image_path: Path, conf_threshold: float, roi=None, output=None) -> dict:
+        FakeDetectron2.calls += 1
+        pedestrians = PEDESTRIANS[Path(image_path).name]
+        return {
+            "pedestrian_count": pedestrians,
+            "vehicle_count": 1,
+            "bike_count": 0,
+            "crowd_density": 0.1 * pedestrians,
+            "total_area_covered": 0.2,
+            "total_instances": pedestrians + 1,
+        }
+
+
+class FakeCLIP:
+    calls = 0
+
+    def understand_scene(self, image_path: Path) -> dict:
+        FakeCLIP.calls += 1
+        return {
+            "top_scene": "quiet street",
+            "top_confidence": 0.8,
+            "semantic_features": [0.0, 1.0],
+            "scene_labels": [{"label": "quiet street", "score": 0.8}],
+        }
+
+
+def test_cascade_skips_and_fills_expensive_models(tmp_path):
+    FakeDetectron2.calls = FakeCLIP.calls = 0
+    registry = ModelRegistry({"yolov8n": FakeYOLO, "detectron2": FakeDetectron2, "clip": FakeCLIP})
+    policy = CascadePolicy(detectron2=ModelRule(min_pedestrians=1), clip=ModelRule(refresh_every=3))
+    extractor = FeatureExtractor(registry=registry, cascade=policy)
+    paths = []
+    for name in PEDESTRIANS:
+        paths.append(tmp_path / name)
+        paths[-1].touch()
+
+    results = extractor.extract_batch(paths, show_progress=False, camera_ids=["cam"] * 5)
+
+    decisions = [(r["cascade"]["detectron2"], r["cascade"]["clip"]) for r in results]
+    assert decisions == [
+        ("first_frame", "first_frame"),
+        ("skipped", "skipped"),
+        ("pedestrians", "skipped"),
+        ("skipped", "refresh"),
+        ("skipped", "skipped"),
+    ]
+    assert FakeDetectron2.calls == 2 and FakeCLIP.calls == 2
+
+    # Skipped Detectron2 takes counts from YOLO and density from its last run.
+    filled = results[3]["detectron2"]
+    assert filled["filled_from"] == "yolo+last"
+    assert filled["pedestrian_count"] == 0 and filled["crowd_density"] == 0.2
+    assert results[1]["clip"]["top_scene"] == "quiet street"
+    assert "filled_from" not in results[2]["detectron2"]
+
+    stats = extractor.cascade.stats()
+    assert stats["detectron2"]["skip_rate"] == 0.6
+    assert stats["clip"]["reasons"] == {"first_frame": 1, "refresh": 1}
+
+
+def test_rules_and_policy_description():
+    rule = ModelRule(min_change=2, refresh_every=5)
+    quiet = {"pedestrian_count": 0, "vehicle_count": 1}
+    busy = {"pedestrian_count": 2, "vehicle_count": 2}
+    assert rule.reason(busy, quiet, frames_since_run=0) == "changed"
+    assert rule.reason(quiet, quiet, frames_since_run=3) is None
+    assert rule.reason(quiet, quiet, frames_since_run=4) == "refresh"
+    assert CascadePolicy(clip=None).describe() == (
+        "detectron2: pedestrians>=1 or every 20 frames; clip: always"
+    )
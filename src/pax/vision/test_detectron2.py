@@ -0,0 +1,125 @@
+"""Test the Detectron2 wrapper's compact and summary runner outputs with a stand-in runner."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from pax.vision.detectron2 import CompactInstances, Detectron2Wrapper, decode_mask
+from pax.vision.roi import CameraROI
+
+SCRIPTS = Path(__file__).resolve().parents[3] / "scripts"
+
+# Writes the runner's npz layout for two fixed masks with the runner's own RLE
+# encoder; stands in for detectron2_runner.py.
+FAKE_RUNNER = '''
+import io, json, sys
+import numpy as np
+
+sys.path.insert(0, SCRIPTS)
+from detectron2_rle import rle_encode
+
+masks = np.zeros((2, 6, 8), dtype=bool)
+masks[0, 1:4, 2:5] = True
+masks[1, 0, :] = True
+masks[1, 5, 7] = True
+
+summary = {
+    "pedestrian_count": 1, "vehicle_count": 1, "bike_count": 0, "crowd_density": 5.3,
+    "total_area_covered": 0.39, "total_instances": 2,
+}
+if sys.argv[-1] == "summary":
+    print(json.dumps(summary))
+    sys.exit()
+summary.update(image_size=[8, 6], class_names=["person", "bicycle", "car"])
+rles = [rle_encode(mask) for mask in masks]
+buffer = io.BytesIO()
+np.savez(
+    buffer,
+    summary=np.frombuffer(json.dumps(summary).encode(), dtype=np.uint8),
+    class_ids=np.array([0, 2], dtype=np.int16),
+    scores=np.array([0.9, 0.7], dtype=np.float32),
+    boxes=np.array([[2, 1, 5, 4], [0, 0, 8, 6]], dtype=np.float32),
+    mask_areas=masks.sum(axis=(1, 2)).astype(np.float32),
+    mask_shape=np.array([6, 8], dtype=np.int32),
+    rle_counts=np.concatenate(rles),
+    rle_offsets=np.cumsum([0] + [len(r) for r in rles]),
+    boundary_points=np.array([[2, 1], [2, 3], [4, 3], [4, 1]], dtype=np.float32),
+    boundary_offsets=np.array([0, 4, 4]),
+)
+sys.stdout.buffer.write(buffer.getvalue())
+'''
+
+
+def _wrapper(tmp_path, output):
+    python = tmp_path / "venv" / "bin" / "python"
+    python.parent.mkdir(parents=True)
+    python.symlink_to(sys.executable)
+    runner = tmp_path / "runner.py"
+    runner.write_text(FAKE_RUNNER.replace("SCRIPTS", repr(str(SCRIPTS))))
+    image = tmp_path / "frame.png"
+    Image.new("RGB", (8, 6)).save(image)
+    return Detectron2Wrapper(tmp_path / "venv", runner, output=output), image
+
+
+def test_npz_output_decodes_instances_lazily(tmp_path):
+    wrapper, image = _wrapper(tmp_path, "npz")
+    result = wrapper.segment(image)
+
+    instances = result["instances"]
+    assert isinstance(instances, CompactInstances) and len(instances) == 2
+    assert result["pedestrian_count"] == 1 and result["total_instances"] == 2
+
+    person, car = instances
+    assert person["class_name"] == "person" and car["class_name"] == "car"
+    assert person["bbox"] == [2.0, 1.0, 5.0, 4.0]
+    assert person["boundary_points"] == [[2, 1], [2, 3], [4, 3], [4, 1]]
+    assert car["boundary_points"] == [] and car["mask_area_normalized"] == 9 / 48
+
+    expected = np.zeros((6, 8), dtype=bool)
+    expected[0, :] = True
+    expected[5, 7] = True
+    assert np.array_equal(decode_mask(car["mask_rle"]), expected)
+    assert decode_mask(person["mask_rle"]).sum() == 9
+
+
+def test_summary_output_has_counts_only(tmp_path):
+    wrapper, image = _wrapper(tmp_path, "json")
+    result = wrapper.segment(image, output="summary")
+    assert "instances" not in result
+    assert result["vehicle_count"] == 1 and result["crowd_density"] == 5.3
+
+
+def test_roi_drops_pedestrian_from_counts_density_and_coverage(tmp_path):
+    wrapper, image = _wrapper(tmp_path, "npz")
+    # The person stands at (3.5, 4) of the 8x6 frame, the car at (4, 6): only the car is inside.
+    roi = CameraROI("cam-1", [[(0, 0), (0.3, 0), (0.3, 0.9), (1, 0.9), (1, 1), (0, 1)]])
+    result = wrapper.segment(image, roi=roi, output="summary")
+
+    assert [instance["class_name"] for instance in result["instances"]] == ["car"]
+    assert result["pedestrian_count"] == 0 and result["vehicle_count"] == 1
+    assert result["total_instances"] == 1
+    assert result["crowd_density"] == 0.0
+    assert result["total_area_covered"] == 9 / 48
+
+
+def test_runner_rle_round_trips_through_decode_mask():
+    spec = importlib.util.spec_from_file_location("detectron2_rle", SCRIPTS / "detectron2_rle.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    rng = np.random.default_rng(0)
+    masks = [
+        rng.random((6, 8)) > 0.5,
+        np.ones((3, 4), dtype=bool),
+        np.zeros((3, 4), dtype=bool),
+        np.eye(5, dtype=bool),
+    ]
+    for mask in masks:
+        counts = module.rle_encode(mask)
+        assert counts.dtype == np.uint32
+        assert np.array_equal(decode_mask({"size": mask.shape, "counts": counts}), mask)
@@ -0,0 +1,40 @@
+"""Test reduced-resolution decoding and thumbnails."""
+
+from __future__ import annotations
+
+from PIL import Image
+
+from pax.vision.imaging import decode_image, load_image, make_thumbnail
+
+
+def _jpeg(tmp_path, size=(800, 600), color=(90, 140, 200)):
+    path = tmp_path / "frame.jpg"
+    Image.new("RGB", size, color).save(path, "JPEG", quality=95)
+    return path
+
+
+def test_decode_picks_smallest_dct_scale_covering_min_size(tmp_path):
+    path = _jpeg(tmp_path)
+
+    decoded = decode_image(path, min_size=224)
+    assert decoded.image.size == (400, 300)
+    assert decoded.original_size == (800, 600) and decoded.scale == 2
+
+    reduced = decode_image(path, reduce=8)
+    assert reduced.image.size == (100, 75) and reduced.image.mode == "RGB"
+    assert abs(reduced.image.getpixel((50, 37))[2] - 200) <= 3
+
+    assert load_image(path).size == (800, 600)
+
+
+def test_non_jpeg_decodes_at_full_size(tmp_path):
+    path = tmp_path / "frame.png"
+    Image.new("L", (64, 48), 10).save(path)
+    decoded = decode_image(path, reduce=8)
+    assert decoded.image.size == (64, 48) and decoded.image.mode == "RGB"
+
+
+def test_make_thumbnail_fits_max_size(tmp_path):
+    output = make_thumbnail(_jpeg(tmp_path), tmp_path / "thumbs" / "frame.jpg")
+    with Image.open(output) as thumbnail:
+        assert thumbnail.size == (320, 240)
@@ -0,0 +1,127 @@
+"""Test ONNX Runtime post-processing and parity with the PyTorch backends."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from pax.benchmarks.synthetic import synthetic_frames
+from pax.config import VisionSettings
+from pax.vision.onnx_backend import (
+    Letterbox,
+    OnnxRuntimeOptions,
+    _cached_export,
+    nms,
+    yolo_postprocess,
+)
+
+
+def _yolo_output(rows: list[tuple[float, float, float, float, int, float]], classes: int = 3):
+    """A ``(1, 4 + classes, anchors)`` tensor from ``(cx, cy, w, h, class_id, score)`` rows."""
+    output = np.zeros((1, 4 + classes, len(rows)), dtype=np.float32)
+    for anchor, (cx, cy, w, h, class_id, score) in enumerate(rows):
+        output[0, :4, anchor] = cx, cy, w, h
+        output[0, 4 + class_id, anchor] = score
+    return output
+
+
+def test_nms_keeps_best_of_overlapping_boxes():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [50, 50, 60, 60]], dtype=np.float32)
+    scores = np.array([0.6, 0.9, 0.5], dtype=np.float32)
+    assert nms(boxes, scores, 0.5).tolist() == [1, 2]
+    assert nms(boxes, scores, 0.9).tolist() == [1, 0, 2]
+
+
+def test_concurrent_cold_cache_exports_once(tmp_path):
+    target = tmp_path / "model-abc.onnx"
+    calls = []
+
+    def export(path):
+        calls.append(path)
+        time.sleep(0.05)
+        path.write_bytes(b"graph")
+
+    threads = [
+        threading.Thread(target=_cached_export, args=(target, export)) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and target.read_bytes() == b"graph"
+    assert not list(tmp_path.glob("*.tmp.onnx"))
+
+
+def test_onnx_threads_are_shared_between_workers(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    settings = VisionSettings(yolo_backend="onnx")
+    assert settings.extractor_config(workers=4)["onnx_options"].intra_op_threads == 2
+    assert settings.extractor_config()["onnx_options"].intra_op_threads is None
+    pinned = VisionSettings(yolo_backend="onnx", onnx_intra_op_threads=3)
+    assert pinned.extractor_config(workers=4)["onnx_options"].intra_op_threads == 3
+
+
+def test_yolo_postprocess_filters_suppresses_and_rescales():
+    output = _yolo_output(
+        [
+            (100, 100, 20, 20, 2, 0.9),
+            (101, 101, 20, 20, 2, 0.8),  # suppressed by the first box
+            (101, 101, 20, 20, 0, 0.7),  # same place, other class: kept
+            (300, 300, 20, 20, 1, 0.1),  # below the threshold
+        ]
+    )
+    # A 1280x960 image letterboxed to 640: ratio 0.5, 80 px of padding top and bottom.
+    transform = Letterbox(ratio=0.5, pad_x=0, pad_y=80, height=960, width=1280)
+    detections = yolo_postprocess(output, transform, conf_threshold=0.25)
+
+    assert [(class_id, round(conf, 2)) for class_id, conf, _ in detections] == [(2, 0.9), (0, 0.7)]
+    assert np.allclose(detections[0][2], [180, 20, 220, 60])
+    assert yolo_postprocess(output, transform, conf_threshold=0.95) == []
+
+
+@pytest.fixture(scope="module")
+def frames(tmp_path_factory):
+    return synthetic_frames(tmp_path_factory.mktemp("frames"), 4)
+
+
+def test_yolo_onnx_matches_torch(frames, tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    pytest.importorskip("ultralytics")
+    from pax.vision.yolov8n import YOLOv8nDetector
+
+    torch_detector = YOLOv8nDetector()
+    onnx_detector = YOLOv8nDetector(
+        backend="onnx", onnx_options=OnnxRuntimeOptions(cache_dir=tmp_path)
+    )
+    for frame in frames:
+        expected = torch_detector._predict(frame, 0.25)
+        actual = onnx_detector._predict(frame, 0.25)
+        assert [d["class_id"] for d in actual] == [d["class_id"] for d in expected]
+        for got, want in zip(actual, expected):
+            assert got["confidence"] == pytest.approx(want["confidence"], abs=1e-3)
+            assert np.allclose(got["bbox"], want["bbox"], atol=1.0)
+
+
+def test_clip_onnx_matches_torch(frames, tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    pytest.importorskip("transformers")
+    from pax.vision.clip import CLIPWrapper
+
+    torch_clip = CLIPWrapper()
+    onnx_clip = CLIPWrapper(backend="onnx", onnx_options=OnnxRuntimeOptions(cache_dir=tmp_path))
+    for frame in frames:
+        expected = torch_clip.understand_scene(frame)
+        actual = onnx_clip.understand_scene(frame)
+        assert np.allclose(
+            list(actual["all_scores"].values()), list(expected["all_scores"].values()), atol=1e-4
+        )
+        got = np.asarray(actual["semantic_features"])
+        want = np.asarray(expected["semantic_features"])
+        cosine = got @ want / (np.linalg.norm(got) * np.linalg.norm(want))
+        assert cosine > 0.999
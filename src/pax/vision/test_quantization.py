@@ -0,0 +1,50 @@
+"""Test the CLIP parity report and, when torch is installed, int8 quantization."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pax.benchmarks.synthetic import synthetic_frames
+from pax.vision.quantization import compare_clip
+
+
+class FakeCLIP:
+    def __init__(self, scenes: dict[str, str], embedding: list[float]) -> None:
+        self.scenes = scenes
+        self.embedding = embedding
+
+    def understand_scene(self, image_path: Path) -> dict:
+        return {"top_scene": self.scenes[str(image_path)], "semantic_features": self.embedding}
+
+
+def test_compare_clip_reports_agreement_and_cosine():
+    reference = FakeCLIP({"a.jpg": "busy street", "b.jpg": "sidewalk"}, [1.0, 0.0])
+    candidate = FakeCLIP({"a.jpg": "busy street", "b.jpg": "crosswalk"}, [1.0, 1.0])
+    report = compare_clip(reference, candidate, [Path("a.jpg"), Path("b.jpg")])
+
+    assert report.images == 2
+    assert report.top_scene_agreement == 0.5
+    assert report.cosine_mean == pytest.approx(2**-0.5)
+    assert report.disagreements == [
+        {"image_path": "b.jpg", "reference": "sidewalk", "candidate": "crosswalk"}
+    ]
+    assert set(report.to_dict()) >= {"speedup", "cosine_min", "candidate_s_per_image"}
+    assert compare_clip(reference, candidate, []).images == 0
+
+
+def test_quantized_clip_stays_close_to_fp32(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from pax.vision import quantization
+    from pax.vision.clip import CLIPWrapper
+
+    monkeypatch.setattr(quantization, "DEFAULT_CACHE_DIR", tmp_path)
+    frames = synthetic_frames(tmp_path / "frames", 4)
+    report = compare_clip(CLIPWrapper(), CLIPWrapper(quantize=True), frames)
+    assert report.cosine_mean > 0.95
+    # The second load reads the cached int8 weights instead of re-quantizing.
+    assert list(tmp_path.glob("*-int8-*.pt"))
+    assert not list(tmp_path.glob("*.tmp*"))
+    assert compare_clip(CLIPWrapper(), CLIPWrapper(quantize=True), frames[:1]).cosine_min > 0.95
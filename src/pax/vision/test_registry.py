@@ -0,0 +1,89 @@
+"""Test the model registry with stand-in loaders."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pax.vision.registry import ModelRegistry
+
+
+class FakeModel:
+    loads = 0
+
+    def __init__(self, size: int = 1) -> None:
+        FakeModel.loads += 1
+        time.sleep(0.05)
+        self.size = size
+
+
+def test_loads_once_per_config_across_threads():
+    FakeModel.loads = 0
+    registry = ModelRegistry({"fake": FakeModel})
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("fake", size=2)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakeModel.loads == 1
+    assert all(model is results[0] for model in results)
+    assert registry.get("fake", size=3) is not results[0]
+    assert FakeModel.loads == 2
+    assert registry.stats()[0]["hits"] == 7
+
+
+def test_lru_eviction_and_warm_up():
+    registry = ModelRegistry({"fake": FakeModel}, max_models=2)
+    first, second = registry.warm_up([("fake", {"size": 1}), ("fake", {"size": 2})])
+    registry.get("fake", size=1)  # size=2 is now least recently used
+    registry.get("fake", size=3)
+
+    assert registry.is_loaded("fake", size=1)
+    assert not registry.is_loaded("fake", size=2)
+    assert registry.get("fake", size=1) is first
+
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+class FakeTensor:
+    def numel(self) -> int:
+        return 100
+
+    def element_size(self) -> int:
+        return 1
+
+
+class FakeWeights:
+    def __init__(self, tag: str) -> None:
+        self.tensor = FakeTensor()
+
+    def parameters(self):
+        return [self.tensor]
+
+
+def test_composite_pins_components_and_is_not_counted_twice():
+    registry = ModelRegistry({"weights": FakeWeights}, max_bytes=250)
+    registry.register(
+        "composite",
+        lambda: [registry.get("weights", tag="a"), registry.get("weights", tag="b")],
+    )
+    registry.get("composite")
+
+    assert registry.total_bytes() == 200
+    assert registry.stats()[-1]["components"] == ["weights", "weights"]
+    assert not registry.evict("weights", tag="a")
+
+    # Over budget: the composite goes first, which unpins its least recently used component.
+    registry.get("weights", tag="c")
+    assert not registry.is_loaded("composite")
+    assert not registry.is_loaded("weights", tag="a")
+    assert registry.is_loaded("weights", tag="b") and registry.is_loaded("weights", tag="c")
+    assert registry.total_bytes() == 200
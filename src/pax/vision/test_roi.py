@@ -0,0 +1,71 @@
+"""Test ROI cropping, detection filtering and heatmap suggestions."""
+
+from __future__ import annotations
+
+import numpy as np
+from PIL import Image
+
+from pax.vision.extractor import FeatureExtractor
+from pax.vision.registry import ModelRegistry
+from pax.vision.roi import CameraROI, crop_to_roi, load_rois, roi_detections, save_rois, suggest_roi
+
+# Lower-left triangle of the frame's bottom half.
+ROI = CameraROI("cam-1", [[(0.0, 0.5), (0.5, 1.0), (0.0, 1.0)]], number=7)
+
+
+def test_crop_masks_outside_and_maps_detections_back():
+    frame = Image.new("RGB", (200, 100), (255, 0, 0))
+    crop = crop_to_roi(frame, ROI)
+
+    assert (crop.left, crop.top, crop.image.size) == (0, 50, (100, 50))
+    pixels = np.asarray(crop.image)
+    assert tuple(pixels[45, 5]) == (255, 0, 0)  # inside the triangle
+    assert tuple(pixels[5, 90]) == (114, 114, 114)  # masked
+    assert crop.model_size(640) == 320
+
+    detections = [
+        {"class_id": 0, "bbox": [5, 20, 15, 45]},  # feet at (10, 95): inside
+        {"class_id": 0, "bbox": [80, 0, 90, 10]},  # feet at (85, 60): outside
+    ]
+    kept = roi_detections(detections, crop)
+    assert [d["bbox"] for d in kept] == [[5, 70, 15, 95]]
+
+
+def test_suggest_roi_covers_detection_hotspot():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0.1, 0.4, 200)
+    y = rng.uniform(0.6, 0.85, 200)
+    boxes = np.column_stack([x, y, x + 0.03, y + 0.1])
+    roi = suggest_roi("cam-1", boxes)
+
+    assert roi is not None and roi.source == "heatmap"
+    assert 0.05 < roi.area_fraction() < 0.4
+    left, top, right, bottom = roi.crop_box(100, 100)
+    assert left <= 10 and top <= 60 and right >= 43 and bottom >= 95
+    assert suggest_roi("cam-1", boxes[:5]) is None
+
+
+def test_rois_round_trip(tmp_path):
+    path = save_rois([ROI], tmp_path / "rois.json")
+    assert load_rois(path) == {"cam-1": ROI}
+
+
+def test_extractor_keys_rois_by_camera_parsed_from_path(tmp_path):
+    seen = []
+
+    class RecordingYOLO:
+        def detect(self, image_path, conf_threshold, roi=None):
+            seen.append(roi)
+            return {"pedestrian_count": 0, "vehicle_count": 0, "bike_count": 0}
+
+    registry = ModelRegistry({"yolov8n": RecordingYOLO})
+    extractor = FeatureExtractor(
+        registry=registry, use_detectron2=False, use_clip=False, rois={"cam-1": ROI}
+    )
+    frame = tmp_path / "2025-11-10" / "cam-1_20251110T083000.jpg"
+    frame.parent.mkdir()
+    Image.new("RGB", (20, 10)).save(frame)
+
+    extractor.extract(frame)
+    extractor.extract(frame, camera_id="cam-2")
+    assert seen == [ROI, None]
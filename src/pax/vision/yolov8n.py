@@ -4,46 +4,114 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
+import numpy as np
+from PIL import Image
 from ultralytics import YOLO
 
-LOGGER = logging.getLogger(__name__)
-
-# COCO class IDs for relevant objects
-PERSON_CLASS_ID = 0
-BICYCLE_CLASS_ID = 1
-CAR_CLASS_ID = 2
-MOTORCYCLE_CLASS_ID = 3
-BUS_CLASS_ID = 5
-TRUCK_CLASS_ID = 7
+from pax.vision.detections import (  # noqa: F401 - class IDs re-exported for callers
+    BICYCLE_CLASS_ID,
+    BUS_CLASS_ID,
+    CAR_CLASS_ID,
+    MOTORCYCLE_CLASS_ID,
+    PERSON_CLASS_ID,
+    TRUCK_CLASS_ID,
+    VEHICLE_CLASS_IDS,
+    count_detections,
+)
+from pax.vision.onnx_backend import YOLO_IMAGE_SIZE, OnnxRuntimeOptions, OnnxYOLO
+from pax.vision.registry import get_model
+from pax.vision.roi import CameraROI, crop_to_roi, roi_detections
 
-# Vehicle class IDs (car, motorcycle, bus, truck)
-VEHICLE_CLASS_IDS = {CAR_CLASS_ID, MOTORCYCLE_CLASS_ID, BUS_CLASS_ID, TRUCK_CLASS_ID}
+LOGGER = logging.getLogger(__name__)
 
 
 class YOLOv8nDetector:
     """YOLOv8n object detector wrapper for traffic scene analysis."""
 
-    def __init__(self, model_path: str | None = None) -> None:
+    def __init__(
+        self,
+        model_path: str | None = None,
+        backend: Literal["torch", "onnx"] = "torch",
+        onnx_options: OnnxRuntimeOptions | None = None,
+    ) -> None:
         """
         Initialize YOLOv8n detector.
 
         Args:
             model_path: Optional path to custom model weights. If None, uses pretrained YOLOv8n.
+            backend: ``"torch"`` runs ultralytics directly; ``"onnx"`` exports the
+                weights to ONNX once and runs them on ONNX Runtime (CPU).
+            onnx_options: Thread tuning and export cache for the ONNX backend.
         """
         if model_path is None:
             model_path = "yolov8n.pt"
-        self.model = YOLO(model_path)
-        LOGGER.info("Initialized YOLOv8n detector with model: %s", model_path)
+        self.backend = backend
+        self.model: YOLO | None = None
+        self.onnx: OnnxYOLO | None = None
+        if backend == "onnx":
+            self.onnx = OnnxYOLO(model_path, onnx_options or OnnxRuntimeOptions())
+        else:
+            self.model = YOLO(model_path)
+        LOGGER.info("Initialized YOLOv8n detector with model: %s (%s)", model_path, backend)
+
+    def _predict(
+        self, source: Path | Image.Image, conf_threshold: float, imgsz: int = YOLO_IMAGE_SIZE
+    ) -> list[dict[str, Any]]:
+        """
+        Detections as ``class_id``, ``class_name``, ``confidence`` and xyxy ``bbox``.
 
-    def detect(self, image_path: str | Path, conf_threshold: float = 0.25) -> dict[str, Any]:
+        ``imgsz`` only applies to the torch backend; exported graphs have a
+        fixed 640x640 input.
+        """
+        if self.onnx is not None:
+            image = source if isinstance(source, Path) else np.asarray(source.convert("RGB"))
+            return [
+                {
+                    "class_id": class_id,
+                    "class_name": self.onnx.names[class_id],
+                    "confidence": confidence,
+                    "bbox": bbox,
+                }
+                for class_id, confidence, bbox in self.onnx.detect(image, conf_threshold)
+            ]
+
+        if isinstance(source, Path):
+            source = str(source)
+        results = self.model(source, conf=conf_threshold, imgsz=imgsz, verbose=False)
+        detections = []
+        if results and len(results) > 0:
+            result = results[0]
+            boxes = result.boxes
+            if boxes is not None:
+                for box in boxes:
+                    class_id = int(box.cls[0])
+                    detections.append(
+                        {
+                            "class_id": class_id,
+                            "class_name": result.names[class_id],
+                            "confidence": float(box.conf[0]),
+                            "bbox": box.xyxy[0].cpu().tolist(),
+                        }
+                    )
+        return detections
+
+    def detect(
+        self,
+        image_path: str | Path,
+        conf_threshold: float = 0.25,
+        roi: CameraROI | None = None,
+    ) -> dict[str, Any]:
         """
         Detect objects in an image and return counts.
 
         Args:
             image_path: Path to the image file.
             conf_threshold: Confidence threshold for detections (default: 0.25).
+            roi: Camera region of interest. The frame is cropped and masked to
+                it (and, on the torch backend, run at a proportionally smaller
+                input size); only detections standing inside it are kept.
 
         Returns:
             Dictionary with:
@@ -57,46 +125,15 @@ class YOLOv8nDetector:
         if not image_path.exists():
             raise FileNotFoundError(f"Image not found: {image_path}")
 
-        results = self.model(str(image_path), conf=conf_threshold, verbose=False)
-
-        pedestrian_count = 0
-        vehicle_count = 0
-        bike_count = 0
-        detections = []
-
-        if results and len(results) > 0:
-            result = results[0]
-            boxes = result.boxes
+        if roi is None:
+            detections = self._predict(image_path, conf_threshold)
+        else:
+            crop = crop_to_roi(image_path, roi)
+            detections = roi_detections(
+                self._predict(crop.image, conf_threshold, crop.model_size(YOLO_IMAGE_SIZE)), crop
+            )
 
-            if boxes is not None:
-                for box in boxes:
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    bbox = box.xyxy[0].cpu().tolist()
-
-                    detection = {
-                        "class_id": class_id,
-                        "class_name": result.names[class_id],
-                        "confidence": confidence,
-                        "bbox": bbox,
-                    }
-                    detections.append(detection)
-
-                    # Count objects
-                    if class_id == PERSON_CLASS_ID:
-                        pedestrian_count += 1
-                    elif class_id == BICYCLE_CLASS_ID:
-                        bike_count += 1
-                    elif class_id in VEHICLE_CLASS_IDS:
-                        vehicle_count += 1
-
-        return {
-            "pedestrian_count": pedestrian_count,
-            "vehicle_count": vehicle_count,
-            "bike_count": bike_count,
-            "total_detections": len(detections),
-            "detections": detections,
-        }
+        return {**count_detections(detections), "detections": detections}
 
     def detect_batch(
         self, image_paths: list[str | Path], conf_threshold: float = 0.25
@@ -137,6 +174,8 @@ def detect_objects(image_path: str | Path, conf_threshold: float = 0.25) -> dict
     """
     Convenience function to detect objects in a single image.
 
+    Uses the process-wide detector from the model registry.
+
     Args:
         image_path: Path to the image file.
         conf_threshold: Confidence threshold for detections.
@@ -144,6 +183,6 @@ def detect_objects(image_path: str | Path, conf_threshold: float = 0.25) -> dict
     Returns:
         Dictionary with detection counts and details.
     """
-    detector = YOLOv8nDetector()
+    detector = get_model("yolov8n")
     return detector.detect(image_path, conf_threshold=conf_threshold)
 
@@ -1,5 +1,32 @@
-"""Voronoi zone utilities for the corridor."""
+"""Voronoi zone utilities for the corridor.
 
-from .generator import CorridorVoronoiResult, generate_corridor_voronoi
+Exports are imported on first access, so importing the package does not load
+geopandas.
+"""
 
-__all__ = ["CorridorVoronoiResult", "generate_corridor_voronoi"]
+from typing import TYPE_CHECKING
+
+from pax._lazy import lazy_exports
+
+_EXPORTS = {
+    "CorridorVoronoiResult": ".generator",
+    "generate_corridor_voronoi": ".generator",
+    "VersionedZoneSet": ".incremental",
+    "ZoneUpdate": ".incremental",
+    "ZoneLocator": ".locator",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .generator import CorridorVoronoiResult, generate_corridor_voronoi
+    from .incremental import VersionedZoneSet, ZoneUpdate
+    from .locator import ZoneLocator
+
+__all__ = [
+    "CorridorVoronoiResult",
+    "VersionedZoneSet",
+    "ZoneLocator",
+    "ZoneUpdate",
+    "generate_corridor_voronoi",
+]
@@ -10,9 +10,9 @@ import geopandas as gpd
 import numpy as np
 from scipy.spatial import Voronoi
 from shapely.geometry import MultiPolygon, Point, Polygon
-from shapely.ops import unary_union
 
 from ..corridor import CorridorBounds
+from ..corridor.geometry_cache import DEFAULT_CACHE_DIR, load_walkable_area
 
 LOGGER = logging.getLogger(__name__)
 
@@ -30,25 +30,9 @@ def _build_walkable_area(
     dcm_path: Path,
     bounds: CorridorBounds,
     street_buffer_m: float = 18.0,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
 ) -> Polygon | MultiPolygon:
-    LOGGER.info("Building walkable area from DCM shapefile")
-    dcm = gpd.read_file(dcm_path)
-    if dcm.crs is None or dcm.crs.to_epsg() != 4326:
-        dcm = dcm.to_crs(epsg=4326)
-    if "Borough" in dcm.columns:
-        dcm = dcm[dcm["Borough"].str.upper() == "MANHATTAN"].copy()
-
-    corridor = dcm.cx[bounds.lon_min:bounds.lon_max, bounds.lat_min:bounds.lat_max]
-    if corridor.empty:
-        raise ValueError("No street centerlines found within corridor bounds")
-
-    metric = corridor.to_crs(epsg=3857)
-    buffered = metric.buffer(street_buffer_m)
-    union = unary_union(buffered)
-    geoseries = gpd.GeoSeries([union], crs="EPSG:3857").to_crs(epsg=4326)
-    walkable = geoseries.iloc[0]
-    LOGGER.info("Walkable area computed with buffer %.1fm", street_buffer_m)
-    return walkable
+    return load_walkable_area(dcm_path, bounds, street_buffer_m, cache_dir=cache_dir)
 
 
 def _voronoi_polygon(vor: Voronoi, index: int, clip_polygon: Polygon) -> Polygon:
@@ -76,13 +60,66 @@ def _fallback_polygon(point: Point, clip_polygon: Polygon, meters: float = 60.0)
     return clipped
 
 
+def _zone_polygon(
+    vor: Voronoi,
+    index: int,
+    clip_polygon: Polygon,
+    walkable_area: Polygon | MultiPolygon,
+    label: object = None,
+) -> Polygon:
+    """Clip the Voronoi cell of ``vor.points[index]`` to the corridor street network."""
+
+    point = Point(vor.points[index])
+    polygon = _voronoi_polygon(vor, index, clip_polygon)
+    if polygon.is_empty:
+        LOGGER.debug("Camera %s has infinite region; using fallback", label)
+        polygon = _fallback_polygon(point, clip_polygon)
+
+    clipped = polygon.intersection(walkable_area)
+    if clipped.is_empty:
+        clipped = polygon
+    if isinstance(clipped, MultiPolygon):
+        clipped = max(clipped.geoms, key=lambda geom: geom.area)
+
+    if clipped.is_empty:
+        clipped = _fallback_polygon(point, clip_polygon, meters=25.0)
+    return clipped
+
+
+def _zone_record(row) -> dict[str, object]:
+    return {
+        "camera_id": row["id"],
+        "camera_name": row["name"],
+        "latitude": row["latitude"],
+        "longitude": row["longitude"],
+        "area": row.get("area", ""),
+        "priority": row.get("priority", ""),
+    }
+
+
+def _finalize_zones(zones: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Attach the derived area/vertex columns to a zones frame."""
+
+    zones["zone_area_m2"] = zones.to_crs(epsg=3857).area
+    zones["num_vertices"] = zones.geometry.apply(lambda geom: len(geom.exterior.coords) if isinstance(geom, Polygon) else 0)
+    zones["coordinates_lonlat"] = zones.geometry.apply(
+        lambda geom: [list(coord) for coord in geom.exterior.coords]
+    )
+    return zones
+
+
 def generate_corridor_voronoi(
     cameras: gpd.GeoDataFrame,
     bounds: CorridorBounds,
     dcm_path: Path,
     street_buffer_m: float = 18.0,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
 ) -> CorridorVoronoiResult:
-    """Compute Voronoi zones and clip them to the street network."""
+    """Compute Voronoi zones and clip them to the street network.
+
+    The walkable area is read from ``cache_dir`` when available; pass ``None``
+    to rebuild it from the shapefile.
+    """
 
     if cameras.empty:
         raise ValueError("No cameras provided for Voronoi computation")
@@ -94,45 +131,20 @@ def generate_corridor_voronoi(
     vor = Voronoi(points)
 
     clip_polygon = bounds.polygon()
-    walkable_area = _build_walkable_area(dcm_path, bounds, street_buffer_m=street_buffer_m)
+    walkable_area = _build_walkable_area(
+        dcm_path, bounds, street_buffer_m=street_buffer_m, cache_dir=cache_dir
+    )
 
     geometries = []
     records = []
 
     for idx, row in cameras_sorted.iterrows():
-        point = Point(points[idx])
-        polygon = _voronoi_polygon(vor, idx, clip_polygon)
-        if polygon.is_empty:
-            LOGGER.debug("Camera %s has infinite region; using fallback", row["name"])
-            polygon = _fallback_polygon(point, clip_polygon)
-
-        clipped = polygon.intersection(walkable_area)
-        if clipped.is_empty:
-            clipped = polygon
-        if isinstance(clipped, MultiPolygon):
-            clipped = max(clipped.geoms, key=lambda geom: geom.area)
-
-        if clipped.is_empty:
-            clipped = _fallback_polygon(point, clip_polygon, meters=25.0)
-
-        geometries.append(clipped)
-        records.append(
-            {
-                "camera_id": row["id"],
-                "camera_name": row["name"],
-                "latitude": row["latitude"],
-                "longitude": row["longitude"],
-                "area": row.get("area", ""),
-                "priority": row.get("priority", ""),
-            }
+        geometries.append(
+            _zone_polygon(vor, idx, clip_polygon, walkable_area, label=row["name"])
         )
+        records.append(_zone_record(row))
 
-    zones = gpd.GeoDataFrame(records, geometry=geometries, crs="EPSG:4326")
-    zones["zone_area_m2"] = zones.to_crs(epsg=3857).area
-    zones["num_vertices"] = zones.geometry.apply(lambda geom: len(geom.exterior.coords) if isinstance(geom, Polygon) else 0)
-    zones["coordinates_lonlat"] = zones.geometry.apply(
-        lambda geom: [list(coord) for coord in geom.exterior.coords]
-    )
+    zones = _finalize_zones(gpd.GeoDataFrame(records, geometry=geometries, crs="EPSG:4326"))
 
     return CorridorVoronoiResult(zones=zones, walkable_area=walkable_area, bounds=bounds)
 
@@ -0,0 +1,282 @@
+"""Incremental maintenance of corridor Voronoi zones as cameras go on/offline.
+
+Adding or removing a camera only changes the Voronoi cells of its Delaunay
+neighbours (cameras sharing a Voronoi ridge with it). ``VersionedZoneSet``
+keeps the current zones plus the neighbour graph, recomputes and re-clips just
+those cells on each update, and bumps a version number so downstream scoring
+can tell which zone map it is using.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+from scipy.spatial import Voronoi
+from shapely.geometry import MultiPolygon, Polygon
+
+from ..corridor import CorridorBounds
+from ..corridor.geometry_cache import DEFAULT_CACHE_DIR, load_walkable_area
+from .generator import _finalize_zones, _zone_polygon, _zone_record
+
+LOGGER = logging.getLogger(__name__)
+
+CAMERA_COLUMNS = ["id", "name", "latitude", "longitude", "area", "priority"]
+
+# scipy's Voronoi (qhull) needs at least this many points in general position.
+_MIN_POINTS = 4
+
+
+@dataclass(slots=True)
+class ZoneUpdate:
+    """Summary of a single change to the zone set."""
+
+    version: int
+    added: list[str]
+    removed: list[str]
+    recomputed: list[str]
+    full_rebuild: bool
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+def _normalize_cameras(cameras: pd.DataFrame | Iterable[dict[str, object]]) -> pd.DataFrame:
+    df = pd.DataFrame(cameras).copy()
+    if "isOnline" in df.columns:
+        df = df[df["isOnline"].astype(str).str.lower() == "true"]
+    missing = {"id", "latitude", "longitude"} - set(df.columns)
+    if missing:
+        raise KeyError(f"Cameras are missing required columns: {sorted(missing)}")
+    for column in ("name", "area", "priority"):
+        if column not in df.columns:
+            df[column] = ""
+    df = df[CAMERA_COLUMNS].dropna(subset=["latitude", "longitude"])
+    df["id"] = df["id"].astype(str)
+    df["latitude"] = df["latitude"].astype(float)
+    df["longitude"] = df["longitude"].astype(float)
+    df = df.drop_duplicates(subset="id", keep="last")
+    return df.sort_values("latitude").reset_index(drop=True)
+
+
+def _ridge_neighbors(vor: Voronoi, ids: list[str]) -> dict[str, set[str]]:
+    neighbors: dict[str, set[str]] = defaultdict(set)
+    for a, b in vor.ridge_points:
+        neighbors[ids[a]].add(ids[b])
+        neighbors[ids[b]].add(ids[a])
+    return dict(neighbors)
+
+
+@dataclass(slots=True)
+class VersionedZoneSet:
+    """Corridor Voronoi zones that can be updated camera-by-camera."""
+
+    bounds: CorridorBounds
+    walkable_area: Polygon | MultiPolygon
+    cameras: pd.DataFrame
+    zones: gpd.GeoDataFrame
+    version: int = 0
+    history: list[ZoneUpdate] = field(default_factory=list)
+    neighbors: dict[str, set[str]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_cameras(
+        cls,
+        cameras: pd.DataFrame | Iterable[dict[str, object]],
+        bounds: CorridorBounds,
+        walkable_area: Polygon | MultiPolygon,
+    ) -> "VersionedZoneSet":
+        """Build version 1 of the zone set from a full camera list."""
+
+        empty = gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
+        zone_set = cls(
+            bounds=bounds,
+            walkable_area=walkable_area,
+            cameras=_normalize_cameras(cameras),
+            zones=empty,
+        )
+        zone_set._rebuild(added=zone_set.cameras["id"].tolist(), removed=[])
+        return zone_set
+
+    @classmethod
+    def from_dcm(
+        cls,
+        cameras: pd.DataFrame | Iterable[dict[str, object]],
+        bounds: CorridorBounds,
+        dcm_path: Path,
+        street_buffer_m: float = 18.0,
+        cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    ) -> "VersionedZoneSet":
+        """Build the zone set, clipping to the (cached) DCM walkable area."""
+
+        walkable = load_walkable_area(dcm_path, bounds, street_buffer_m, cache_dir=cache_dir)
+        return cls.from_cameras(cameras, bounds, walkable)
+
+    @property
+    def camera_ids(self) -> set[str]:
+        return set(self.cameras["id"])
+
+    def update(self, cameras: pd.DataFrame | Iterable[dict[str, object]]) -> ZoneUpdate:
+        """Bring the zone set in line with ``cameras`` (the full current set).
+
+        Cameras whose coordinates changed are treated as removed and re-added.
+        Cameras with an ``isOnline`` column are filtered to online ones.
+        """
+
+        incoming = _normalize_cameras(cameras)
+        old = self.cameras.set_index("id")
+        new = incoming.set_index("id")
+
+        added = sorted(set(new.index) - set(old.index))
+        removed = sorted(set(old.index) - set(new.index))
+        common = new.index.intersection(old.index)
+        moved = common[
+            (new.loc[common, "latitude"] != old.loc[common, "latitude"])
+            | (new.loc[common, "longitude"] != old.loc[common, "longitude"])
+        ]
+        self.cameras = incoming
+
+        if len(incoming) < _MIN_POINTS or len(old) < _MIN_POINTS:
+            return self._rebuild(added=added, removed=removed)
+
+        return self._apply(added=added, removed=removed, moved=sorted(moved))
+
+    def add_camera(self, camera: dict[str, object]) -> ZoneUpdate:
+        """Add (or move) a single camera."""
+
+        others = self.cameras[self.cameras["id"] != str(camera["id"])]
+        return self.update(pd.concat([others, _normalize_cameras([camera])], ignore_index=True))
+
+    def remove_camera(self, camera_id: str) -> ZoneUpdate:
+        """Remove a single camera, e.g. when it goes offline."""
+
+        return self.update(self.cameras[self.cameras["id"] != str(camera_id)])
+
+    def _voronoi(self) -> tuple[Voronoi, list[str]]:
+        points = self.cameras[["longitude", "latitude"]].to_numpy()
+        return Voronoi(points), self.cameras["id"].tolist()
+
+    def _rebuild(self, *, added: list[str], removed: list[str]) -> ZoneUpdate:
+        if self.cameras.empty:
+            raise ValueError("No cameras provided for Voronoi computation")
+        LOGGER.info("Rebuilding all %d Voronoi zones", len(self.cameras))
+        vor, ids = self._voronoi()
+        geometries = {
+            camera_id: _zone_polygon(vor, idx, self.bounds.polygon(), self.walkable_area, label=camera_id)
+            for idx, camera_id in enumerate(ids)
+        }
+        self.neighbors = _ridge_neighbors(vor, ids)
+        self._assemble(geometries)
+        return self._record(added, removed, recomputed=ids, full_rebuild=True)
+
+    def _apply(self, *, added: list[str], removed: list[str], moved: list[str]) -> ZoneUpdate:
+        previous_neighbors = self.neighbors
+        vor, ids = self._voronoi()
+        self.neighbors = _ridge_neighbors(vor, ids)
+
+        affected: set[str] = set(added) | set(moved)
+        for camera_id in set(removed) | set(moved):
+            affected |= previous_neighbors.get(camera_id, set())
+        for camera_id in set(added) | set(moved):
+            affected |= self.neighbors.get(camera_id, set())
+        affected &= set(ids)
+
+        geometries = dict(zip(self.zones["camera_id"].astype(str), self.zones.geometry))
+        clip_polygon = self.bounds.polygon()
+        for idx, camera_id in enumerate(ids):
+            if camera_id in affected:
+                geometries[camera_id] = _zone_polygon(
+                    vor, idx, clip_polygon, self.walkable_area, label=camera_id
+                )
+
+        LOGGER.info(
+            "Updated Voronoi zones: +%d -%d ~%d cameras, re-clipped %d of %d zones",
+            len(added),
+            len(removed),
+            len(moved),
+            len(affected),
+            len(ids),
+        )
+        self._assemble(geometries)
+        return self._record(added, removed, recomputed=sorted(affected), full_rebuild=False)
+
+    def _assemble(self, geometries: dict[str, Polygon]) -> None:
+        records = [_zone_record(row) for _, row in self.cameras.iterrows()]
+        shapes = [geometries[row["id"]] for _, row in self.cameras.iterrows()]
+        self.zones = _finalize_zones(gpd.GeoDataFrame(records, geometry=shapes, crs="EPSG:4326"))
+
+    def _record(
+        self, added: list[str], removed: list[str], *, recomputed: list[str], full_rebuild: bool
+    ) -> ZoneUpdate:
+        self.version += 1
+        update = ZoneUpdate(
+            version=self.version,
+            added=list(added),
+            removed=list(removed),
+            recomputed=list(recomputed),
+            full_rebuild=full_rebuild,
+        )
+        self.history.append(update)
+        return update
+
+    def save(self, directory: Path) -> Path:
+        """Write the current version to ``directory``.
+
+        Each version's zones go to ``zones_v<version>.parquet``; ``zone_set.json``
+        points at the current one so readers never see a half-written version.
+        """
+
+        directory.mkdir(parents=True, exist_ok=True)
+        zones_path = directory / f"zones_v{self.version:05d}.parquet"
+        self.zones.drop(columns=["coordinates_lonlat"]).to_parquet(zones_path, index=False)
+        self.cameras.to_parquet(directory / f"cameras_v{self.version:05d}.parquet", index=False)
+        (directory / "walkable.wkb").write_bytes(shapely.to_wkb(self.walkable_area))
+
+        state = {
+            "version": self.version,
+            "zones": zones_path.name,
+            "cameras": f"cameras_v{self.version:05d}.parquet",
+            "bounds": asdict(self.bounds),
+            "neighbors": {key: sorted(value) for key, value in self.neighbors.items()},
+            "history": [asdict(update) for update in self.history],
+        }
+        tmp_path = directory / "zone_set.json.tmp"
+        tmp_path.write_text(json.dumps(state, indent=2))
+        tmp_path.replace(directory / "zone_set.json")
+        LOGGER.info("Saved zone set version %d to %s", self.version, directory)
+        return zones_path
+
+    @classmethod
+    def load(cls, directory: Path) -> "VersionedZoneSet":
+        """Load the current version written by :meth:`save`."""
+
+        state = json.loads((directory / "zone_set.json").read_text())
+        zones = gpd.read_parquet(directory / state["zones"])
+        zones["coordinates_lonlat"] = zones.geometry.apply(
+            lambda geom: [list(coord) for coord in geom.exterior.coords]
+        )
+        return cls(
+            bounds=CorridorBounds(**state["bounds"]),
+            walkable_area=shapely.from_wkb((directory / "walkable.wkb").read_bytes()),
+            cameras=pd.read_parquet(directory / state["cameras"]),
+            zones=zones,
+            version=int(state["version"]),
+            history=[ZoneUpdate(**update) for update in state.get("history", [])],
+            neighbors={key: set(value) for key, value in state.get("neighbors", {}).items()},
+        )
+
+
+def load_current_zones(directory: Path) -> tuple[int, gpd.GeoDataFrame]:
+    """Return ``(version, zones)`` for the current zone map in ``directory``."""
+
+    state = json.loads((directory / "zone_set.json").read_text())
+    return int(state["version"]), gpd.read_parquet(directory / state["zones"])
+
+
+__all__ = ["VersionedZoneSet", "ZoneUpdate", "load_current_zones"]
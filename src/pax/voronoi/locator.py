@@ -0,0 +1,193 @@
+"""Point-in-zone lookup for Voronoi zones backed by an STRtree index."""
+
+from __future__ import annotations
+
+import logging
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_ZONES_PATH = Path("data/geojson/voronoi_zones.geojson")
+
+# Bump when the pickled layout changes so stale caches are rebuilt.
+_CACHE_VERSION = 1
+
+
+def _first_match(point_idx: np.ndarray, zone_idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Keep the lowest zone index per point so overlaps and ties resolve deterministically."""
+
+    if len(point_idx) == 0:
+        return point_idx, zone_idx
+    order = np.lexsort((zone_idx, point_idx))
+    point_idx, zone_idx = point_idx[order], zone_idx[order]
+    first = np.ones(len(point_idx), dtype=bool)
+    first[1:] = point_idx[1:] != point_idx[:-1]
+    return point_idx[first], zone_idx[first]
+
+
+@dataclass(slots=True)
+class ZoneLocator:
+    """Locate the Voronoi zone containing each of many lon/lat points.
+
+    Zones are held as prepared shapely geometries indexed in an ``STRtree``.
+    Points that fall outside every zone (or exactly on a shared boundary) are
+    assigned to the nearest zone, matching the ``contains`` then
+    ``distance().idxmin()`` fallback used by the scoring scripts.
+    """
+
+    geometries: np.ndarray
+    attributes: pd.DataFrame
+    tree: STRtree = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.geometries = np.asarray(self.geometries, dtype=object)
+        if len(self.geometries) != len(self.attributes):
+            raise ValueError("geometries and attributes must have the same length")
+        if len(self.geometries) == 0:
+            raise ValueError("ZoneLocator requires at least one zone")
+        shapely.prepare(self.geometries)
+        self.tree = STRtree(self.geometries)
+
+    @classmethod
+    def from_geodataframe(cls, zones: gpd.GeoDataFrame) -> "ZoneLocator":
+        """Build a locator from zones in EPSG:4326."""
+
+        if zones.crs is not None and zones.crs.to_epsg() != 4326:
+            zones = zones.to_crs(epsg=4326)
+        attributes = pd.DataFrame(zones.drop(columns=zones.geometry.name)).reset_index(drop=True)
+        return cls(geometries=zones.geometry.to_numpy(), attributes=attributes)
+
+    @classmethod
+    def from_geojson(
+        cls,
+        path: Path = DEFAULT_ZONES_PATH,
+        *,
+        cache_path: Path | None = None,
+        use_cache: bool = True,
+    ) -> "ZoneLocator":
+        """Load zones from GeoJSON, reusing a pickled locator when it is fresh.
+
+        The cache defaults to ``<zones>.locator.pkl`` beside the GeoJSON and is
+        invalidated whenever the source file's size or mtime changes.
+        """
+
+        path = Path(path)
+        cache_path = cache_path or path.with_suffix(".locator.pkl")
+        stat = path.stat()
+        source_key = (_CACHE_VERSION, stat.st_size, stat.st_mtime_ns)
+
+        if use_cache and cache_path.exists():
+            try:
+                with cache_path.open("rb") as fh:
+                    payload = pickle.load(fh)
+                if payload.get("source_key") == source_key:
+                    LOGGER.debug("Loaded zone locator cache %s", cache_path)
+                    return cls(geometries=payload["geometries"], attributes=payload["attributes"])
+                LOGGER.info("Zone locator cache %s is stale; rebuilding", cache_path)
+            except (OSError, pickle.UnpicklingError, EOFError, KeyError) as exc:
+                LOGGER.warning("Ignoring unreadable zone locator cache %s: %s", cache_path, exc)
+
+        LOGGER.info("Building zone locator from %s", path)
+        locator = cls.from_geodataframe(gpd.read_file(path))
+        if use_cache:
+            locator.save(cache_path, source_key=source_key)
+        return locator
+
+    def save(self, path: Path, *, source_key: tuple[int, int, int] | None = None) -> Path:
+        """Pickle the zone geometries and attributes to ``path``."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "source_key": source_key,
+            "geometries": self.geometries,
+            "attributes": self.attributes,
+        }
+        with path.open("wb") as fh:
+            pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        LOGGER.debug("Saved zone locator cache to %s", path)
+        return path
+
+    def __len__(self) -> int:
+        return len(self.geometries)
+
+    def locate_many(
+        self,
+        lons: np.ndarray | list[float],
+        lats: np.ndarray | list[float],
+        *,
+        nearest: bool = True,
+    ) -> np.ndarray:
+        """Return the positional zone index for each point.
+
+        Args:
+            lons: Longitudes (EPSG:4326).
+            lats: Latitudes (EPSG:4326).
+            nearest: When True, points outside every zone get the nearest zone;
+                otherwise they are reported as ``-1``.
+
+        Returns:
+            Integer array of zone positions aligned with the inputs.
+        """
+
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        if lons.shape != lats.shape:
+            raise ValueError("lons and lats must have the same shape")
+
+        points = shapely.points(lons, lats)
+        result = np.full(len(points), -1, dtype=np.int64)
+        if len(points) == 0:
+            return result
+
+        # Envelope hits from the tree, then an exact test on raw coordinates
+        # against the prepared zones (cheaper than a predicate query).
+        point_idx, zone_idx = self.tree.query(points)
+        inside = shapely.contains_xy(self.geometries[zone_idx], lons[point_idx], lats[point_idx])
+        point_idx, zone_idx = _first_match(point_idx[inside], zone_idx[inside])
+        result[point_idx] = zone_idx
+
+        if nearest:
+            missing = np.flatnonzero(result < 0)
+            valid = missing[~(np.isnan(lons[missing]) | np.isnan(lats[missing]))]
+            if len(valid):
+                near_point, near_zone = _first_match(
+                    *self.tree.query_nearest(points[valid], all_matches=True)
+                )
+                result[valid[near_point]] = near_zone
+
+        return result
+
+    def locate(self, lon: float, lat: float, *, nearest: bool = True) -> int:
+        """Return the positional zone index for a single point."""
+
+        return int(self.locate_many([lon], [lat], nearest=nearest)[0])
+
+    def lookup(
+        self,
+        lons: np.ndarray | list[float],
+        lats: np.ndarray | list[float],
+        column: str,
+        *,
+        nearest: bool = True,
+    ) -> np.ndarray:
+        """Return ``column`` of the containing zone for each point (``None`` if unmatched)."""
+
+        if column not in self.attributes.columns:
+            raise KeyError(f"Zone attribute '{column}' not found")
+        positions = self.locate_many(lons, lats, nearest=nearest)
+        values = self.attributes[column].to_numpy(dtype=object)
+        out = np.full(len(positions), None, dtype=object)
+        matched = positions >= 0
+        out[matched] = values[positions[matched]]
+        return out
+
+
+__all__ = ["DEFAULT_ZONES_PATH", "ZoneLocator"]
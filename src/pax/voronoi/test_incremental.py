@@ -0,0 +1,73 @@
+"""Tests for incremental Voronoi zone maintenance."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from shapely.geometry import box
+
+from pax.corridor import CorridorBounds
+from pax.voronoi.incremental import VersionedZoneSet
+
+
+def create_cameras(count: int = 30) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    return pd.DataFrame(
+        {
+            "id": [f"cam-{i}" for i in range(count)],
+            "name": [f"Camera {i}" for i in range(count)],
+            "latitude": rng.uniform(40.75, 40.77, count),
+            "longitude": rng.uniform(-73.99, -73.97, count),
+        }
+    )
+
+
+def create_bounds() -> CorridorBounds:
+    return CorridorBounds(34, 66, "Lexington Avenue", "9 Avenue", 40.75, 40.77, -73.99, -73.97)
+
+
+def assert_same_zones(incremental: VersionedZoneSet, full: VersionedZoneSet) -> None:
+    got = incremental.zones.set_index("camera_id").geometry
+    expected = full.zones.set_index("camera_id").geometry
+    assert list(got.index) == list(expected.index)
+    for camera_id in expected.index:
+        assert got[camera_id].symmetric_difference(expected[camera_id]).area < 1e-12
+
+
+def test_incremental_updates_match_full_rebuild():
+    """Adding/removing cameras re-clips only neighbours yet matches a full rebuild."""
+    cameras = create_cameras()
+    walkable = box(-74.0, 40.74, -73.96, 40.78).difference(box(-73.982, 40.755, -73.978, 40.765))
+    zone_set = VersionedZoneSet.from_cameras(cameras.iloc[:-2], create_bounds(), walkable)
+    assert zone_set.version == 1
+
+    update = zone_set.update(cameras.drop(index=[4]))
+    assert update.added == ["cam-28", "cam-29"]
+    assert update.removed == ["cam-4"]
+    assert not update.full_rebuild
+    assert len(update.recomputed) < len(zone_set.zones)
+    assert_same_zones(zone_set, VersionedZoneSet.from_cameras(cameras.drop(index=[4]), create_bounds(), walkable))
+
+    offline = cameras.drop(index=[4]).assign(isOnline="true")
+    offline.loc[offline["id"] == "cam-10", "isOnline"] = "false"
+    zone_set.update(offline)
+    assert "cam-10" not in zone_set.camera_ids
+    assert zone_set.version == 3
+
+
+def test_save_and_load_current_version(tmp_path: Path):
+    """A saved zone set reloads at the same version and keeps updating incrementally."""
+    cameras = create_cameras()
+    zone_set = VersionedZoneSet.from_cameras(cameras, create_bounds(), box(-74.0, 40.74, -73.96, 40.78))
+    zone_set.remove_camera("cam-0")
+    zone_set.save(tmp_path)
+
+    loaded = VersionedZoneSet.load(tmp_path)
+    assert loaded.version == 2
+    assert loaded.camera_ids == zone_set.camera_ids
+
+    update = loaded.add_camera({"id": "cam-0", "latitude": 40.76, "longitude": -73.98})
+    assert update.version == 3
+    assert not update.full_rebuild
@@ -0,0 +1,61 @@
+"""Tests for the STRtree-backed Voronoi zone locator."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import Point, box
+
+from pax.voronoi.locator import ZoneLocator
+
+
+def create_zones() -> gpd.GeoDataFrame:
+    """Two adjacent unit squares with a gap to the east."""
+    return gpd.GeoDataFrame(
+        {"camera_id": ["west", "east"]},
+        geometry=[box(0.0, 0.0, 1.0, 1.0), box(1.0, 0.0, 2.0, 1.0)],
+        crs="EPSG:4326",
+    )
+
+
+def test_locate_matches_contains_then_nearest():
+    """Bulk lookups agree with the per-point contains/idxmin fallback."""
+    zones = create_zones()
+    locator = ZoneLocator.from_geodataframe(zones)
+
+    rng = np.random.default_rng(7)
+    lons = rng.uniform(-1.0, 3.0, 500)
+    lats = rng.uniform(-1.0, 2.0, 500)
+    result = locator.locate_many(lons, lats)
+
+    for lon, lat, got in zip(lons, lats, result):
+        point = Point(lon, lat)
+        containing = zones[zones.geometry.contains(point)]
+        expected = containing.index[0] if len(containing) else zones.geometry.distance(point).idxmin()
+        assert got == expected
+
+
+def test_locate_without_nearest_and_lookup():
+    """Points outside every zone are -1 unless the nearest fallback is enabled."""
+    locator = ZoneLocator.from_geodataframe(create_zones())
+
+    assert locator.locate(0.5, 0.5) == 0
+    assert locator.locate(5.0, 0.5, nearest=False) == -1
+    assert locator.locate(5.0, 0.5) == 1
+    assert list(locator.lookup([1.5, 9.0], [0.5, 9.0], "camera_id", nearest=False)) == ["east", None]
+
+
+def test_geojson_cache_roundtrip(tmp_path: Path):
+    """A fresh pickle cache is reused and produces identical lookups."""
+    source = tmp_path / "zones.geojson"
+    create_zones().to_file(source, driver="GeoJSON")
+
+    first = ZoneLocator.from_geojson(source)
+    cache = source.with_suffix(".locator.pkl")
+    assert cache.exists()
+
+    second = ZoneLocator.from_geojson(source)
+    lons, lats = [0.2, 1.7, 4.0], [0.2, 0.9, 0.5]
+    assert list(first.locate_many(lons, lats)) == list(second.locate_many(lons, lats))